@@ -8,10 +8,14 @@
 4. 配置文件管理
 """
 
+import time
+_startup_begin = time.perf_counter()
+
 import pythoncom
 pythoncom.CoInitializeEx(pythoncom.COINIT_APARTMENTTHREADED)
 from PyQt5.QtWidgets import QApplication
 import sys
+import traceback
 from pathlib import Path
 
 # 确保能够导入src目录下的模块
@@ -35,11 +39,8 @@ log_system_info()
 from src.utils.qt_app_manager import qt_app_manager, initialize_qt
 from src.utils.qt_compat import log_qt_info
 
-# 导入配置管理器和插件系统
+# 导入配置管理器（插件系统、ASR 模型管理器和主窗口在 main() 中才导入）
 from src.utils.config_manager import config_manager
-from src.core.plugins import PluginManager
-from src.core.asr import ASRModelManager
-from src.ui.main_window import MainWindow
 
 # 先初始化Qt应用（确保主线程COM为STA）
 app = QApplication(sys.argv)
@@ -56,6 +57,7 @@ def main():
         logger.info("配置加载成功")
 
         # 3. 初始化插件系统
+        from src.core.plugins import PluginManager
         plugin_manager = PluginManager()
         plugin_manager.configure(config)
         logger.info("插件系统初始化成功")
@@ -80,18 +82,13 @@ def main():
         logger.info("注册Sherpa-ONNX插件成功")
 
         # 6. 创建ASR管理器
+        from src.core.asr import ASRModelManager
         asr_manager = ASRModelManager()
         logger.info("创建ASR管理器成功")
 
-        # 7. 加载默认模型
-        default_model = config_manager.get_default_model()
-        if not asr_manager.load_model(default_model):
-            logger.error(f"加载默认模型失败: {default_model}")
-            return 1
-        logger.info(f"加载默认模型成功: {default_model}")
-
-        # 8. 创建主窗口
+        # 7. 创建主窗口（默认模型由主窗口在后台线程中加载，窗口不必等待模型加载完成）
         from PyQt5.QtCore import Qt
+        from src.ui.main_window import MainWindow
         window = MainWindow(
             model_manager=asr_manager,
             config_manager=config_manager
@@ -103,9 +100,9 @@ def main():
             logger.warning("无法设置WA_DeleteOnClose属性")
 
         window.show()
-        logger.info("主窗口创建并显示成功")
+        logger.info(f"主窗口创建并显示成功，启动耗时 {time.perf_counter() - _startup_begin:.2f} 秒")
 
-        # 9. 进入事件循环
+        # 8. 进入事件循环
         return qt_app_manager.exec_application()
 
     except Exception as e:
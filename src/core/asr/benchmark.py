@@ -0,0 +1,418 @@
+"""
+ASR 模型基准测试模块
+负责用同一组回放音频（测试集）测量模型的实时率、首个部分结果延迟、最终结果延迟、内存峰值、
+加载时间和词错误率，并与基线结果比较以发现性能回退
+"""
+import json
+import os
+import re
+import sys
+import time
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+# 测试集目录中的参考文本文件：{"音频文件名": "参考文本"}；也可以为每个音频放一个同名 .txt 文件
+REFERENCES_FILE = "references.json"
+
+# 测试集音频：WAV 文件或录音缓存文件（.pcm + .json）
+FIXTURE_EXTENSIONS = (".wav", ".pcm")
+
+# 默认的回退阈值：指标路径 -> 允许的增加量。词错误率（以 wer 结尾的指标）为绝对值，其他为相对基线的比例
+DEFAULT_THRESHOLDS = {
+    "load_seconds": 0.25,
+    "peak_rss_mb": 0.10,
+    "streaming.rtf": 0.10,
+    "streaming.first_partial_latency": 0.20,
+    "streaming.final_latency": 0.20,
+    "streaming.wer": 0.01,
+    "file.rtf": 0.10,
+    "file.wer": 0.01,
+}
+
+# 低于这些变化量的差异视为测量噪声，不算回退（秒或实时率）
+MIN_REGRESSION_DELTA = {
+    "load_seconds": 0.1,
+    "peak_rss_mb": 10.0,
+    "streaming.rtf": 0.005,
+    "streaming.first_partial_latency": 0.05,
+    "streaming.final_latency": 0.05,
+    "file.rtf": 0.005,
+}
+
+
+def normalize_text(text: Optional[str]) -> List[str]:
+    """
+    规范化文本用于计算词错误率：转为大写，去掉标点，按空白分词
+
+    Args:
+        text: 文本
+
+    Returns:
+        List[str]: 单词列表
+    """
+    text = re.sub(r"[^\w\s']", " ", (text or "").upper())
+    return text.split()
+
+
+def word_error_rate(reference: Optional[str], hypothesis: Optional[str]) -> Dict[str, Any]:
+    """
+    计算词错误率（编辑距离：替换、删除、插入）
+
+    Args:
+        reference: 参考文本
+        hypothesis: 识别结果
+
+    Returns:
+        Dict[str, Any]: {"wer", "words", "errors", "substitutions", "deletions", "insertions"}
+    """
+    ref = normalize_text(reference)
+    hyp = normalize_text(hypothesis)
+    # 每个单元格保存 (错误数, 替换, 删除, 插入)
+    previous = [(j, 0, 0, j) for j in range(len(hyp) + 1)]
+    for i in range(1, len(ref) + 1):
+        current = [(i, 0, i, 0)]
+        for j in range(1, len(hyp) + 1):
+            if ref[i - 1] == hyp[j - 1]:
+                current.append(previous[j - 1])
+                continue
+            sub, dele, ins = previous[j - 1], previous[j], current[j - 1]
+            best = min(sub, dele, ins, key=lambda cell: cell[0])
+            if best is sub:
+                current.append((sub[0] + 1, sub[1] + 1, sub[2], sub[3]))
+            elif best is dele:
+                current.append((dele[0] + 1, dele[1], dele[2] + 1, dele[3]))
+            else:
+                current.append((ins[0] + 1, ins[1], ins[2], ins[3] + 1))
+        previous = current
+    errors, substitutions, deletions, insertions = previous[-1]
+    return {
+        "wer": errors / len(ref) if ref else float(bool(hyp)),
+        "words": len(ref),
+        "errors": errors,
+        "substitutions": substitutions,
+        "deletions": deletions,
+        "insertions": insertions,
+    }
+
+
+def load_fixtures(directory: str) -> List[Dict[str, Any]]:
+    """
+    读取测试集：目录中的 WAV/录音缓存文件及其参考文本
+
+    Args:
+        directory: 测试集目录
+
+    Returns:
+        List[Dict[str, Any]]: [{"name", "path", "reference"}]，按文件名排序；没有参考文本时 reference 为 None
+
+    Raises:
+        FileNotFoundError: 目录不存在时
+    """
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"测试集目录不存在: {directory}")
+
+    references = {}
+    references_path = os.path.join(directory, REFERENCES_FILE)
+    if os.path.exists(references_path):
+        with open(references_path, "r", encoding="utf-8") as f:
+            references = json.load(f)
+
+    fixtures = []
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith(FIXTURE_EXTENSIONS):
+            continue
+        path = os.path.join(directory, name)
+        reference = references.get(name)
+        text_path = os.path.splitext(path)[0] + ".txt"
+        if reference is None and os.path.exists(text_path):
+            with open(text_path, "r", encoding="utf-8") as f:
+                reference = f.read().strip()
+        fixtures.append({"name": name, "path": path, "reference": reference})
+    return fixtures
+
+
+def parse_recognizer_text(result: Any) -> str:
+    """
+    取出识别器结果中的文本：Vosk 返回 JSON 字符串（text 或 partial），Sherpa-ONNX 返回文本
+
+    Args:
+        result: Result()/PartialResult()/FinalResult() 的返回值
+
+    Returns:
+        str: 文本
+    """
+    if not result:
+        return ""
+    if isinstance(result, str) and result.lstrip().startswith("{"):
+        try:
+            parsed = json.loads(result)
+            return (parsed.get("text") or parsed.get("partial") or "").strip()
+        except json.JSONDecodeError:
+            pass
+    return str(result).strip()
+
+
+def measure_streaming(recognizer: Any, audio: np.ndarray, sample_rate: int = 16000,
+                      block_size: int = 1600) -> Dict[str, Any]:
+    """
+    按实时识别的方式逐块送入音频（与 AudioWorker 相同的 AcceptWaveform 接口），测量实时率和延迟
+
+    音频不限速地送入，延迟按模拟的实时回放计算：第 i 块在其音频结束时刻到达，识别完成时刻为
+    max(到达时刻, 上一块完成时刻) + 本块识别耗时。
+
+    Args:
+        recognizer: 识别器（Vosk KaldiRecognizer 或 SherpaOnnxASR）
+        audio: 单声道 float32 音频
+        sample_rate: 采样率
+        block_size: 每块样本数
+
+    Returns:
+        Dict[str, Any]: {"text", "audio_seconds", "decode_seconds", "rtf",
+            "first_partial_latency"（从开始回放到第一个非空结果，没有时为 None）,
+            "final_latency"（音频结束到最终结果）, "endpoint_lag"（端点结果相对其音频的平均滞后，没有时为 None）}
+    """
+    from src.core.audio.pcm_converter import PCMConverter
+
+    engine_type = str(getattr(recognizer, "engine_type", "") or "")
+    converter = None if engine_type.startswith("sherpa") else PCMConverter(block_size)
+    duration = len(audio) / sample_rate
+    clock = 0.0
+    decode_seconds = 0.0
+    first_partial = None
+    texts = []
+    endpoint_lags = []
+
+    for start in range(0, len(audio), block_size):
+        block = audio[start:start + block_size]
+        arrival = (start + len(block)) / sample_rate
+        begin = time.perf_counter()
+        data = converter.float_to_pcm16_cbuffer(block) if converter else block
+        if recognizer.AcceptWaveform(data):
+            text = parse_recognizer_text(recognizer.Result())
+            endpoint = True
+        else:
+            text = parse_recognizer_text(recognizer.PartialResult())
+            endpoint = False
+        elapsed = time.perf_counter() - begin
+        decode_seconds += elapsed
+        clock = max(clock, arrival) + elapsed
+        if text and first_partial is None:
+            first_partial = clock
+        if endpoint:
+            texts.append(text)
+            endpoint_lags.append(clock - arrival)
+
+    begin = time.perf_counter()
+    texts.append(parse_recognizer_text(recognizer.FinalResult()))
+    elapsed = time.perf_counter() - begin
+    decode_seconds += elapsed
+    clock = max(clock, duration) + elapsed
+
+    return {
+        "text": " ".join(text for text in texts if text),
+        "audio_seconds": duration,
+        "decode_seconds": decode_seconds,
+        "rtf": decode_seconds / duration if duration else 0.0,
+        "first_partial_latency": first_partial,
+        "final_latency": clock - duration,
+        "endpoint_lag": float(np.mean(endpoint_lags)) if endpoint_lags else None,
+    }
+
+
+def summarize(files: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    汇总各文件的测量结果：实时率按总时长计算，词错误率按总词数计算，延迟取平均值和最大值
+
+    Args:
+        files: 各文件的测量结果
+
+    Returns:
+        Dict[str, Any]: 汇总结果，含各文件结果 files
+    """
+    measured = [item for item in files if not item.get("error")]
+    audio_seconds = sum(item["audio_seconds"] for item in measured)
+    decode_seconds = sum(item["decode_seconds"] for item in measured)
+    summary = {
+        "audio_seconds": audio_seconds,
+        "decode_seconds": decode_seconds,
+        "rtf": decode_seconds / audio_seconds if audio_seconds else None,
+        "wer": None,
+        "files": files,
+    }
+    scored = [item for item in measured if item.get("errors") is not None]
+    words = sum(item["words"] for item in scored)
+    if words:
+        summary["wer"] = sum(item["errors"] for item in scored) / words
+    for key in ("first_partial_latency", "final_latency"):
+        values = [item[key] for item in measured if item.get(key) is not None]
+        if values:
+            summary[key] = float(np.mean(values))
+            summary[f"{key}_max"] = float(np.max(values))
+    return summary
+
+
+def get_peak_rss_mb() -> Optional[float]:
+    """
+    获取当前进程的内存峰值（常驻内存，MB）
+
+    Returns:
+        Optional[float]: 内存峰值，无法获取时返回 None
+    """
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS 以字节为单位，Linux 以 KB 为单位
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        # Windows 上 peak_wset 为工作集峰值
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def _score(item: Dict[str, Any], reference: Optional[str]) -> None:
+    """有参考文本时把词错误率写入测量结果"""
+    if reference is not None:
+        item.update({key: value for key, value in word_error_rate(reference, item.get("text")).items()
+                     if key in ("wer", "words", "errors")})
+
+
+def _create_streaming_recognizer(manager: Any) -> Any:
+    """
+    为一个测试文件创建流式识别器：Vosk 引擎创建新的识别器，Sherpa-ONNX 引擎重置后直接使用
+
+    Args:
+        manager: ASRModelManager
+
+    Returns:
+        识别器
+    """
+    engine = manager.current_engine
+    if hasattr(engine, "create_recognizer"):
+        return engine.create_recognizer()
+    engine.Reset()
+    return engine
+
+
+def benchmark_model(manager: Any, model_name: str, fixtures: List[Dict[str, Any]], sample_rate: int = 16000,
+                    block_size: int = 1600, file_path: bool = True) -> Dict[str, Any]:
+    """
+    测试一个模型：加载（含预热），用测试集分别走流式识别和文件转录两条路径
+
+    内存峰值是进程级的，每个模型应在单独的进程中测试。
+
+    Args:
+        manager: ASRModelManager
+        model_name: 模型名称
+        fixtures: load_fixtures() 返回的测试集
+        sample_rate: 采样率
+        block_size: 流式识别每块样本数
+        file_path: 是否测试文件转录路径
+
+    Returns:
+        Dict[str, Any]: {"model", "engine", "load_seconds", "warmup_seconds", "peak_rss_mb",
+            "streaming", "file", "error"}
+    """
+    from src.core.audio.audio_source import FileAudioSource, read_source_audio
+
+    result = {"model": model_name, "error": None}
+    start_time = time.perf_counter()
+    if not manager.load_model(model_name):
+        result["error"] = "加载模型失败"
+        return result
+    result["load_seconds"] = time.perf_counter() - start_time
+    result["engine"] = manager.get_current_engine_type()
+
+    # 等待后台预热结束，测量的是预热后的稳定状态
+    warmup = getattr(manager, "warmup", None)
+    if warmup is not None and warmup.wait(60):
+        result["warmup_seconds"] = warmup.duration
+
+    streaming = []
+    for fixture in fixtures:
+        item = {"name": fixture["name"]}
+        try:
+            audio = read_source_audio(FileAudioSource(fixture["path"], speed=None), sample_rate)
+            item.update(measure_streaming(_create_streaming_recognizer(manager), audio, sample_rate, block_size))
+            _score(item, fixture["reference"])
+        except Exception as e:
+            item["error"] = str(e)
+        streaming.append(item)
+    result["streaming"] = summarize(streaming)
+
+    if file_path:
+        files = []
+        for fixture in fixtures:
+            item = {"name": fixture["name"]}
+            try:
+                audio_seconds = len(read_source_audio(FileAudioSource(fixture["path"], speed=None), sample_rate))
+                audio_seconds /= sample_rate
+                begin = time.perf_counter()
+                text = manager.transcribe_file(fixture["path"])
+                elapsed = time.perf_counter() - begin
+                if text is None:
+                    raise RuntimeError("文件转录失败")
+                item.update(text=text, audio_seconds=audio_seconds, decode_seconds=elapsed,
+                            rtf=elapsed / audio_seconds if audio_seconds else 0.0)
+                _score(item, fixture["reference"])
+            except Exception as e:
+                item["error"] = str(e)
+            files.append(item)
+        result["file"] = summarize(files)
+
+    result["peak_rss_mb"] = get_peak_rss_mb()
+    return result
+
+
+def _get_metric(result: Dict[str, Any], path: str) -> Optional[float]:
+    """按 "streaming.rtf" 这样的路径取出指标"""
+    value = result
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any],
+                        thresholds: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """
+    与基线结果比较，找出超过阈值的回退
+
+    Args:
+        results: 本次结果 {"models": {模型名称: benchmark_model() 的结果}}
+        baseline: 基线结果，格式相同
+        thresholds: 指标路径 -> 允许的增加量，默认为 DEFAULT_THRESHOLDS
+
+    Returns:
+        List[Dict[str, Any]]: 回退列表 [{"model", "metric", "baseline", "current", "limit"}]；
+            基线中有而本次失败的模型记为 metric "error"
+    """
+    thresholds = DEFAULT_THRESHOLDS if thresholds is None else thresholds
+    regressions = []
+    for model_name, base in (baseline.get("models") or {}).items():
+        current = (results.get("models") or {}).get(model_name)
+        if current is None:
+            continue
+        if current.get("error") and not base.get("error"):
+            regressions.append({"model": model_name, "metric": "error", "baseline": None,
+                                "current": current["error"], "limit": None})
+            continue
+        for metric, allowed in thresholds.items():
+            base_value = _get_metric(base, metric)
+            current_value = _get_metric(current, metric)
+            if base_value is None or current_value is None:
+                continue
+            if metric.endswith("wer"):
+                limit = base_value + allowed
+            else:
+                limit = max(base_value * (1 + allowed), base_value + MIN_REGRESSION_DELTA.get(metric, 0.0))
+            if current_value > limit:
+                regressions.append({"model": model_name, "metric": metric, "baseline": base_value,
+                                    "current": current_value, "limit": limit})
+    return regressions
@@ -0,0 +1,102 @@
+"""
+后台模型加载模块
+负责描述一次在后台线程中进行的模型加载：阶段、进度、取消和结果
+"""
+import threading
+from typing import Optional
+
+# 加载阶段及其开始时的进度（百分比）
+STAGE_VALIDATE = "validate"  # 检查配置和模型文件
+STAGE_CREATE_SESSION = "create_session"  # 创建识别器（ONNX 会话 / Vosk 模型）
+STAGE_WARM_UP = "warm_up"  # 用合成音频预热
+STAGE_READY = "ready"  # 已替换为当前引擎
+
+STAGE_PROGRESS = {
+    STAGE_VALIDATE: 0,
+    STAGE_CREATE_SESSION: 10,
+    STAGE_WARM_UP: 80,
+    STAGE_READY: 100,
+}
+
+
+class ModelLoadCancelled(Exception):
+    """模型加载已被取消"""
+    pass
+
+
+class ModelLoadTask:
+    """一次后台模型加载
+
+    由 ASRModelManager.load_model_async() 创建。加载在后台线程中进行，期间原来的引擎继续工作，
+    新引擎创建并预热完成后才替换当前引擎。
+
+    取消只在阶段之间生效：正在创建的 ONNX 会话无法中断，创建完成后被丢弃，不会替换当前引擎。
+    """
+
+    def __init__(self, model_name: str):
+        """
+        初始化模型加载任务
+
+        Args:
+            model_name: 模型名称
+        """
+        self.model_name = model_name
+        self.stage = STAGE_VALIDATE
+        self.success = False
+        self.error = None  # 失败原因
+        self._cancel_event = threading.Event()
+        self._done = threading.Event()
+        self.thread = None
+
+    def cancel(self) -> None:
+        """请求取消加载"""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """是否已请求取消"""
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self) -> None:
+        """
+        已请求取消时抛出 ModelLoadCancelled
+
+        Raises:
+            ModelLoadCancelled: 已请求取消时
+        """
+        if self.cancelled:
+            raise ModelLoadCancelled(self.model_name)
+
+    @property
+    def progress(self) -> int:
+        """当前阶段开始时的进度（百分比）"""
+        return STAGE_PROGRESS.get(self.stage, 0)
+
+    @property
+    def done(self) -> bool:
+        """加载是否已经结束（成功、失败或取消）"""
+        return self._done.is_set()
+
+    def finish(self, success: bool, error: Optional[str] = None) -> None:
+        """
+        标记加载结束
+
+        Args:
+            success: 是否成功
+            error: 失败原因
+        """
+        self.success = success
+        self.error = error
+        self._done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待加载结束
+
+        Args:
+            timeout: 超时时间（秒），None 表示一直等待
+
+        Returns:
+            bool: 是否已经结束
+        """
+        return self._done.wait(timeout)
@@ -4,10 +4,11 @@ ASR模型管理模块
 """
 import os
 import logging
+import threading
 import traceback
 import numpy as np
 import vosk
-from typing import Optional, Dict, Any, Union, List
+from typing import Optional, Dict, Any, Union, List, Tuple
 from PyQt5.QtCore import QObject, pyqtSignal
 
 # 信号管理器类
@@ -54,6 +55,9 @@ except ImportError:
     HAS_SHERPA_ONNX = False
     print("警告: 未安装 sherpa_onnx 模块，Sherpa-ONNX 功能将不可用")
 
+# 开始识别前等待模型预热结束的最长时间（秒）
+WARMUP_WAIT_TIMEOUT = 30.0
+
 class ASRModelManager(QObject):
     """ASR模型管理器类"""
 
@@ -63,6 +67,8 @@ class ASRModelManager(QObject):
     recognition_stopped = pyqtSignal()  # 识别停止信号
     recognition_result = pyqtSignal(str)  # 识别结果信号，参数为识别文本
     error_occurred = pyqtSignal(str)  # 错误信号，参数为错误信息
+    model_load_progress = pyqtSignal(str, str, int)  # 后台加载进度信号，参数为模型名称、阶段、进度百分比
+    model_load_finished = pyqtSignal(str, bool, str)  # 后台加载结束信号，参数为模型名称、是否成功、失败原因
 
     def __init__(self):
         """初始化ASR模型管理器"""
@@ -88,6 +94,13 @@ class ASRModelManager(QObject):
 
         # 用于音频转录的引擎
         self.current_engine = None
+        # 最近一次文件转录的分段时间戳 [{"start", "end", "text"}]
+        self.last_segments = []
+        # 当前引擎的预热（ModelWarmup），预热完成后才发射 model_loaded
+        self.warmup = None
+        # 正在进行的后台模型加载（ModelLoadTask）
+        self._load_task = None
+        self._load_lock = threading.Lock()
 
         # 音频设备相关
         self.current_device = None
@@ -240,8 +253,7 @@ class ASRModelManager(QObject):
 
             logger.info(f"模型加载成功: {model_name}")
 
-            # 发射模型加载成功信号
-            self.model_loaded.emit(True)
+            # 模型加载成功信号由 initialize_engine 在模型预热完成后发射
 
             # 更新状态
             self.signals.status_updated.emit(f"已加载模型: {model_name}")
@@ -261,6 +273,133 @@ class ASRModelManager(QObject):
 
             return False
 
+    def load_model_async(self, model_name: str) -> Any:
+        """在后台线程中加载ASR模型
+
+        检查模型文件、创建识别器、预热都在后台线程中进行，期间原来的引擎继续工作；
+        新引擎就绪后才替换当前引擎。正在进行的上一次后台加载会被取消。
+        进度通过 model_load_progress 报告，结束时发射 model_load_finished，成功时还会发射 model_loaded。
+
+        Args:
+            model_name: 模型名称
+
+        Returns:
+            ModelLoadTask: 加载任务，可用于取消或等待
+        """
+        from src.core.asr.model_loader import ModelLoadTask
+
+        task = ModelLoadTask(model_name)
+        with self._load_lock:
+            if self._load_task is not None and not self._load_task.done:
+                logger.info(f"取消正在进行的模型加载: {self._load_task.model_name}")
+                self._load_task.cancel()
+            self._load_task = task
+        task.thread = threading.Thread(target=self._run_load_task, args=(task,),
+                                       name=f"ModelLoad-{model_name}", daemon=True)
+        task.thread.start()
+        return task
+
+    def cancel_model_load(self) -> bool:
+        """取消正在进行的后台模型加载
+
+        Returns:
+            bool: 是否有加载被取消
+        """
+        with self._load_lock:
+            task = self._load_task
+        if task is None or task.done:
+            return False
+        task.cancel()
+        return True
+
+    def is_loading(self) -> bool:
+        """是否有正在进行的后台模型加载
+
+        加载结束时发射 model_load_finished，成功时还会发射 model_loaded。
+
+        Returns:
+            bool: 是否正在加载
+        """
+        with self._load_lock:
+            task = self._load_task
+        return task is not None and not task.done
+
+    def _set_load_stage(self, task: Any, stage: str) -> None:
+        """进入加载阶段并报告进度"""
+        task.check_cancelled()
+        task.stage = stage
+        logger.info(f"模型加载 {task.model_name}: {stage} ({task.progress}%)")
+        self.model_load_progress.emit(task.model_name, stage, task.progress)
+
+    def _run_load_task(self, task: Any) -> None:
+        """后台加载线程"""
+        from src.core.asr import model_loader
+        from src.core.asr.warmup import ModelWarmup, get_warmup_seconds
+
+        model_name = task.model_name
+        engine = None
+        try:
+            self._set_load_stage(task, model_loader.STAGE_VALIDATE)
+            model_config = self.models_config.get(model_name)
+            if not model_config or not model_config.get("enabled", False):
+                raise ValueError(f"模型 {model_name} 在配置中不存在或未启用")
+            model_path = model_config.get("path", "")
+            if not model_path or not os.path.exists(model_path):
+                raise ValueError(f"模型路径不存在: {model_path}")
+            if not self.validate_model_files(model_path, model_name):
+                raise ValueError(f"模型路径验证失败: {model_path}")
+
+            self._set_load_stage(task, model_loader.STAGE_CREATE_SESSION)
+            engine = self._create_engine(model_name, model_config, logger)
+            if engine is None:
+                raise RuntimeError(f"创建引擎失败: {model_name}")
+
+            self._set_load_stage(task, model_loader.STAGE_WARM_UP)
+            warmup = None
+            seconds = get_warmup_seconds()
+            if seconds > 0 and hasattr(engine, "warm_up"):
+                warmup = ModelWarmup(model_name, engine.warm_up, seconds).start()
+                while not warmup.wait(0.1):
+                    task.check_cancelled()
+
+            with self._load_lock:
+                task.check_cancelled()
+                # 替换当前引擎；原来的引擎在不再被使用后释放
+                self.current_engine = engine
+                self.model_type = model_name
+                self.current_model_type = model_name
+                self.current_model = True
+                self.warmup = warmup
+                task.stage = model_loader.STAGE_READY
+        except model_loader.ModelLoadCancelled:
+            logger.info(f"模型加载已取消: {model_name}")
+            self._dispose_engine(engine)
+            task.finish(False, "已取消")
+            self.model_load_finished.emit(model_name, False, "已取消")
+            return
+        except Exception as e:
+            error_msg = f"加载模型失败: {e}"
+            logger.error(error_msg)
+            logger.error(traceback.format_exc())
+            self._dispose_engine(engine)
+            task.finish(False, str(e))
+            self.model_load_finished.emit(model_name, False, str(e))
+            self.model_loaded.emit(False)
+            self.error_occurred.emit(error_msg)
+            return
+
+        logger.info(f"模型加载成功: {model_name}")
+        task.finish(True)
+        self.model_load_progress.emit(model_name, model_loader.STAGE_READY, task.progress)
+        self.model_load_finished.emit(model_name, True, "")
+        self.model_loaded.emit(True)
+        self.signals.status_updated.emit(f"已加载模型: {model_name}")
+
+    def _dispose_engine(self, engine: Any) -> None:
+        """释放未被使用的引擎（如加载被取消时）持有的识别器"""
+        if engine is not None and hasattr(engine, "_release_recognizer"):
+            engine._release_recognizer()
+
     def _load_vosk_model(self, model_path: str) -> Any:
         """
         加载VOSK模型
@@ -353,22 +492,25 @@ class ASRModelManager(QObject):
             # 这是 sherpa-onnx 1.11.2 版本的正确 API
             try:
                 # 从配置中获取参数
-                num_threads = config_section.get("num_threads", 4)
+                from src.core.asr.runtime_config import resolve_runtime
+                runtime = resolve_runtime(config_section, model_name)
                 sample_rate = config_section.get("sample_rate", 16000)
                 feature_dim = config_section.get("feature_dim", 80)
                 decoding_method = config_section.get("decoding_method", "greedy_search")
 
                 logger.debug(f"开始创建 OnlineRecognizer 实例...")
 
-                model = sherpa_onnx.OnlineRecognizer.from_transducer(
+                # 从全局识别器池获取，调用方用完后应通过 get_recognizer_pool().release() 归还
+                from src.core.asr.recognizer_pool import get_recognizer_pool
+                model = get_recognizer_pool().acquire(
                     encoder=encoder_file,  # 已经是完整路径
                     decoder=decoder_file,  # 已经是完整路径
                     joiner=joiner_file,    # 已经是完整路径
                     tokens=tokens_file,     # 已经是完整路径
-                    num_threads=num_threads,
                     sample_rate=sample_rate,
                     feature_dim=feature_dim,
-                    decoding_method=decoding_method
+                    decoding_method=decoding_method,
+                    **runtime
                 )
                 logger.info("成功创建 OnlineRecognizer 实例")
             except Exception as e:
@@ -478,6 +620,69 @@ class ASRModelManager(QObject):
             logger.error(traceback.format_exc())
             return False
 
+    def _get_sherpa_model_params(self, engine_type: str) -> Tuple[str, str]:
+        """
+        获取 Sherpa-ONNX 引擎的模型类型和模型名称
+
+        Args:
+            engine_type: 引擎类型（配置中的模型名称）
+
+        Returns:
+            Tuple[str, str]: (模型类型 int8/standard, 模型名称)
+        """
+        if engine_type == "sherpa_0626_int8":
+            return "int8", "0626"
+        if engine_type == "sherpa_0626_std" or engine_type == "sherpa_0626":
+            return "standard", "0626"
+        return ("int8" if engine_type == "sherpa_int8" else "standard"), ""
+
+    def create_model_recognizer(self, model_name: str) -> Optional[Any]:
+        """
+        为指定模型创建独立的识别器，不改变当前引擎（用于识别跟不上实时时切换的备用模型）
+
+        Args:
+            model_name: 配置中的模型名称
+
+        Returns:
+            Optional[Any]: 识别器实例，失败时返回 None
+        """
+        model_config = self.models_config.get(model_name)
+        if not model_config or not model_config.get("enabled", False):
+            logger.error(f"模型 {model_name} 不存在或未启用")
+            return None
+
+        model_path = model_config.get("path", "")
+        if not self._validate_model_path(model_path, model_name):
+            logger.error(f"模型路径验证失败: {model_path}")
+            return None
+
+        try:
+            if model_name.startswith("sherpa"):
+                model_type, sherpa_name = self._get_sherpa_model_params(model_name)
+                # 配置中的 type（int8/standard）决定加载哪组模型文件
+                model_type = model_config.get("type", model_type)
+                from src.core.asr.runtime_config import get_model_runtime
+                recognizer = SherpaOnnxASR(model_path, {"type": model_type, "name": sherpa_name,
+                                                        "runtime": get_model_runtime(model_name)})
+                if not recognizer.setup():
+                    logger.error(f"初始化 Sherpa-ONNX 模型失败: {model_name}")
+                    return None
+            elif model_name == "vosk" or model_name == "vosk_small":
+                recognizer = VoskASR(model_path).create_recognizer()
+                if not recognizer:
+                    return None
+                model_name = "vosk_small"
+            else:
+                logger.error(f"不支持的模型: {model_name}")
+                return None
+        except Exception as e:
+            logger.error(f"为模型 {model_name} 创建识别器失败: {e}")
+            return None
+
+        recognizer.engine_type = model_name
+        logger.info(f"已为模型 {model_name} 创建识别器")
+        return recognizer
+
     def create_recognizer(self) -> Optional[Any]:
         """创建识别器实例"""
         if not self.current_engine:
@@ -506,6 +711,8 @@ class ASRModelManager(QObject):
             logger.info("使用传统方式创建Vosk识别器")
             model = vosk.Model(self.current_engine.model_path)
             recognizer = vosk.KaldiRecognizer(model, 16000)
+            # 完整结果带每个词的起止时间，用于字幕时间戳
+            recognizer.SetWords(True)
             # 设置引擎类型，确保与模型类型一致
             recognizer.engine_type = "vosk_small"
             logger.info(f"Vosk识别器创建成功，引擎类型: {engine_type}")
@@ -613,99 +820,11 @@ class ASRModelManager(QObject):
             # 记录当前引擎状态
             sherpa_logger.info(f"当前引擎: {type(self.current_engine).__name__ if self.current_engine else None}")
 
-            # 初始化引擎
-            if engine_type == "vosk" or engine_type == "vosk_small":
-                sherpa_logger.info(f"创建 VoskASR 实例，路径: {model_config['path']}")
-                # 检查模型路径是否存在
-                if not os.path.exists(model_config["path"]):
-                    sherpa_logger.error(f"Vosk 模型路径不存在: {model_config['path']}")
-                    return False
-
-                # 使用更新后的验证方法，明确传入模型类型
-                if not self._validate_model_path(model_config["path"], engine_type):
-                    sherpa_logger.error(f"Vosk 模型路径验证失败: {model_config['path']}")
-                    return False
-
-                try:
-                    # 创建 VoskASR 实例
-                    self.current_engine = VoskASR(model_config["path"])
-                    sherpa_logger.info(f"VoskASR 实例创建成功: {self.current_engine}")
-
-                    # 检查引擎是否成功初始化
-                    if not self.current_engine.model or not self.current_engine.recognizer:
-                        error_msg = "VoskASR 引擎初始化失败，模型或识别器为空"
-                        sherpa_logger.error(error_msg)
-                        print(error_msg)
-                        return False
-
-                    # 为VoskASR实例添加engine_type属性，确保与模型类型一致
-                    self.current_engine.engine_type = "vosk_small"
-                    sherpa_logger.info(f"设置VoskASR引擎类型为: vosk_small")
-
-                    sherpa_logger.info("VoskASR 引擎初始化成功")
-                except Exception as e:
-                    error_msg = f"创建 VoskASR 实例失败: {e}"
-                    sherpa_logger.error(error_msg)
-                    print(error_msg)
-                    import traceback
-                    error_trace = traceback.format_exc()
-                    sherpa_logger.error(error_trace)
-                    print(error_trace)
-                    return False
-
-            elif engine_type.startswith("sherpa"):
-                sherpa_logger.info(f"创建 SherpaOnnxASR 实例，路径: {model_config.get('path', '')}")
-
-                # 检查模型路径是否存在
-                if not os.path.exists(model_config["path"]):
-                    sherpa_logger.error(f"Sherpa-ONNX 模型路径不存在: {model_config.get('path', '未知路径')}")
-                    return False
-
-                # 使用更新后的验证方法，明确传入模型类型
-                if not self._validate_model_path(model_config["path"], engine_type):
-                    sherpa_logger.error(f"Sherpa-ONNX 模型路径验证失败: {model_config['path']}")
-                    return False
-
-                # 检查模型类型
-                if engine_type == "sherpa_0626_int8":
-                    model_type = "int8"
-                    model_name = "0626"
-                elif engine_type == "sherpa_0626_std" or engine_type == "sherpa_0626":
-                    model_type = "standard"
-                    model_name = "0626"
-                else:
-                    model_type = "int8" if engine_type == "sherpa_int8" else "standard"
-                    model_name = ""
-                sherpa_logger.info(f"Sherpa-ONNX 模型类型: {model_type}, 模型名称: {model_name}")
-
-                # 记录模型路径和配置
-                sherpa_logger.info(f"模型路径: {model_config['path']}")
-                sherpa_logger.info(f"模型配置: {model_config.get('config', {})}")
-
-                # 创建 SherpaOnnxASR 实例
-                try:
-                    sherpa_logger.info(f"创建 SherpaOnnxASR 实例，路径: {model_config['path']}, 类型: {model_type}, 名称: {model_name}")
-                    self.current_engine = SherpaOnnxASR(model_config["path"], {"type": model_type, "name": model_name})
-                    sherpa_logger.info(f"SherpaOnnxASR 实例创建成功: {self.current_engine}")
-
-                    # 调用 setup 方法初始化引擎
-                    sherpa_logger.info("开始初始化 Sherpa-ONNX 引擎...")
-                    if not self.current_engine.setup():
-                        error_msg = "初始化 Sherpa-ONNX 引擎失败"
-                        sherpa_logger.error(error_msg)
-                        print(error_msg)
-                        return False
-
-                    sherpa_logger.info("Sherpa-ONNX 引擎初始化成功")
-
-                except Exception as e:
-                    error_msg = f"创建 SherpaOnnxASR 实例失败: {e}"
-                    sherpa_logger.error(error_msg)
-                    print(error_msg)
-                    return False
-            else:
-                sherpa_logger.error(f"不支持的引擎类型: {engine_type}")
+            # 在旁边创建新引擎，成功后才替换当前引擎：创建失败时继续使用原来的引擎
+            engine = self._create_engine(engine_type, model_config, sherpa_logger)
+            if engine is None:
                 return False
+            self.current_engine = engine
 
             # 记录最终引擎状态
             sherpa_logger.info(f"初始化后的引擎: {type(self.current_engine).__name__ if self.current_engine else None}")
@@ -746,9 +865,8 @@ class ASRModelManager(QObject):
                     self.model_type = current_engine_type
                     sherpa_logger.info(f"模型类型已从 {old_model_type} 更新为: {self.model_type}")
 
-            # 发射模型加载完成信号
-            sherpa_logger.info("发射模型加载完成信号")
-            self.model_loaded.emit(True)
+            # 在后台线程中预热模型，完成后发射模型加载完成信号
+            self._start_warmup(engine_type)
 
             return True
 
@@ -763,6 +881,168 @@ class ASRModelManager(QObject):
 
             return False
 
+    def _create_engine(self, engine_type: str, model_config: Dict[str, Any], sherpa_logger: Any) -> Optional[Any]:
+        """验证模型文件并创建引擎实例，不修改当前引擎
+
+        Args:
+            engine_type: 引擎类型
+            model_config: 模型配置
+            sherpa_logger: 日志记录器
+
+        Returns:
+            Any: 初始化好的引擎实例，失败时返回 None
+        """
+        engine = None
+        if engine_type == "vosk" or engine_type == "vosk_small":
+            sherpa_logger.info(f"创建 VoskASR 实例，路径: {model_config['path']}")
+            # 检查模型路径是否存在
+            if not os.path.exists(model_config["path"]):
+                sherpa_logger.error(f"Vosk 模型路径不存在: {model_config['path']}")
+                return None
+
+            # 使用更新后的验证方法，明确传入模型类型
+            if not self._validate_model_path(model_config["path"], engine_type):
+                sherpa_logger.error(f"Vosk 模型路径验证失败: {model_config['path']}")
+                return None
+
+            try:
+                # 创建 VoskASR 实例
+                engine = VoskASR(model_config["path"])
+                sherpa_logger.info(f"VoskASR 实例创建成功: {engine}")
+
+                # 检查引擎是否成功初始化
+                if not engine.model or not engine.recognizer:
+                    error_msg = "VoskASR 引擎初始化失败，模型或识别器为空"
+                    sherpa_logger.error(error_msg)
+                    print(error_msg)
+                    return None
+
+                # 为VoskASR实例添加engine_type属性，确保与模型类型一致
+                engine.engine_type = "vosk_small"
+                sherpa_logger.info(f"设置VoskASR引擎类型为: vosk_small")
+
+                sherpa_logger.info("VoskASR 引擎初始化成功")
+            except Exception as e:
+                error_msg = f"创建 VoskASR 实例失败: {e}"
+                sherpa_logger.error(error_msg)
+                print(error_msg)
+                import traceback
+                error_trace = traceback.format_exc()
+                sherpa_logger.error(error_trace)
+                print(error_trace)
+                return None
+
+        elif engine_type.startswith("sherpa"):
+            sherpa_logger.info(f"创建 SherpaOnnxASR 实例，路径: {model_config.get('path', '')}")
+
+            # 检查模型路径是否存在
+            if not os.path.exists(model_config["path"]):
+                sherpa_logger.error(f"Sherpa-ONNX 模型路径不存在: {model_config.get('path', '未知路径')}")
+                return None
+
+            # 使用更新后的验证方法，明确传入模型类型
+            if not self._validate_model_path(model_config["path"], engine_type):
+                sherpa_logger.error(f"Sherpa-ONNX 模型路径验证失败: {model_config['path']}")
+                return None
+
+            # 检查模型类型
+            model_type, model_name = self._get_sherpa_model_params(engine_type)
+            sherpa_logger.info(f"Sherpa-ONNX 模型类型: {model_type}, 模型名称: {model_name}")
+
+            # 记录模型路径和配置
+            sherpa_logger.info(f"模型路径: {model_config['path']}")
+            sherpa_logger.info(f"模型配置: {model_config.get('config', {})}")
+
+            # 创建 SherpaOnnxASR 实例
+            try:
+                sherpa_logger.info(f"创建 SherpaOnnxASR 实例，路径: {model_config['path']}, "
+                                   f"类型: {model_type}, 名称: {model_name}")
+                from src.core.asr.runtime_config import get_model_runtime
+                engine = SherpaOnnxASR(model_config["path"], {"type": model_type, "name": model_name,
+                                                              "runtime": get_model_runtime(engine_type)})
+                sherpa_logger.info(f"SherpaOnnxASR 实例创建成功: {engine}")
+
+                # 调用 setup 方法初始化引擎
+                sherpa_logger.info("开始初始化 Sherpa-ONNX 引擎...")
+                if not engine.setup():
+                    error_msg = "初始化 Sherpa-ONNX 引擎失败"
+                    sherpa_logger.error(error_msg)
+                    print(error_msg)
+                    return None
+
+                sherpa_logger.info("Sherpa-ONNX 引擎初始化成功")
+
+            except Exception as e:
+                error_msg = f"创建 SherpaOnnxASR 实例失败: {e}"
+                sherpa_logger.error(error_msg)
+                print(error_msg)
+                return None
+        else:
+            sherpa_logger.error(f"不支持的引擎类型: {engine_type}")
+            return None
+
+        return engine
+
+    def _start_warmup(self, engine_type: str) -> None:
+        """在后台线程中预热当前引擎，预热完成后发射模型加载完成信号
+
+        Args:
+            engine_type: 引擎类型
+        """
+        from src.core.asr.warmup import ModelWarmup, get_warmup_seconds
+
+        engine = self.current_engine
+        seconds = get_warmup_seconds()
+        if seconds <= 0 or not hasattr(engine, "warm_up"):
+            logger.info("发射模型加载完成信号")
+            self.model_loaded.emit(True)
+            return
+
+        def on_done(warmup: ModelWarmup) -> None:
+            if self.current_engine is not engine:
+                # 预热期间已经切换到其他引擎
+                return
+            logger.info(f"模型预热完成: {engine_type}, 耗时 {warmup.duration * 1000:.0f} ms")
+            logger.info("发射模型加载完成信号")
+            self.model_loaded.emit(True)
+            self.signals.status_updated.emit(f"模型已就绪: {engine_type}")
+
+        logger.info(f"开始预热模型: {engine_type}, 合成音频 {seconds:.1f} 秒")
+        self.warmup = ModelWarmup(engine_type, engine.warm_up, seconds)
+        self.warmup.add_done_callback(on_done)
+        self.warmup.start()
+
+    def is_warming_up(self) -> bool:
+        """当前引擎是否正在预热
+
+        预热结束时发射 model_loaded，界面线程应等待该信号而不是调用 wait_for_warmup。
+
+        Returns:
+            bool: 是否有正在进行的预热
+        """
+        warmup = self.warmup
+        return warmup is not None and not warmup.done
+
+    def wait_for_warmup(self, timeout: float = WARMUP_WAIT_TIMEOUT) -> bool:
+        """等待当前引擎的预热结束
+
+        同步加载模型（load_model）后预热在后台进行，非界面线程开始识别前调用，避免预热与识别同时使用识别器。
+
+        Args:
+            timeout: 超时时间（秒）
+
+        Returns:
+            bool: 预热是否已经结束，没有正在进行的预热时返回 True
+        """
+        warmup = self.warmup
+        if warmup is None or warmup.done:
+            return True
+        logger.info("等待模型预热完成")
+        if not warmup.wait(timeout):
+            logger.warning(f"模型预热超过 {timeout:.0f} 秒未完成，直接开始识别")
+            return False
+        return True
+
     def transcribe(self, audio_data: Union[bytes, np.ndarray]) -> Optional[str]:
         """转录音频数据
 
@@ -881,6 +1161,21 @@ class ASRModelManager(QObject):
             file_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
             sherpa_logger.info(f"文件大小: {file_size:.2f} MB")
 
+            # 同一文件用同一模型和解码参数转录过时直接返回缓存的结果，不进行任何解码
+            self.last_segments = []
+            from src.core.asr.transcript_cache import get_transcript_cache
+            transcript_cache = get_transcript_cache()
+            cache_key = self._get_transcript_cache_key(engine_type) if transcript_cache else None
+            if cache_key:
+                cached = transcript_cache.get(file_path, *cache_key)
+                if cached is not None:
+                    stats = transcript_cache.get_stats()
+                    sherpa_logger.info(f"使用转录结果缓存 (命中率 {stats['hit_rate']:.0%}): {file_path}")
+                    self.last_segments = cached["segments"]
+                    return cached["text"]
+            cacheable = True
+            segments = None  # 本次转录得到的分段，None 表示取引擎的 last_segments
+
             # 对于vosk_small引擎，确保使用正确的方式处理
             if engine_type == "vosk_small":
                 sherpa_logger.info("使用vosk_small引擎转录文件")
@@ -898,15 +1193,22 @@ class ASRModelManager(QObject):
                     signals = TranscriptionSignals()
                     transcriber = FileTranscriber(signals)
 
-                    # 收集转录结果
+                    # 收集转录结果和分段（引擎的 last_segments 不属于本次转录）
                     transcription_result = []
+                    segments = []
+                    errors = []
 
                     # 连接信号
                     def on_new_text(text):
                         if text and not text.startswith("[使用") and not text.startswith("PARTIAL:"):
                             transcription_result.append(text)
 
+                    def on_new_segment(segment):
+                        segments.append(segment.to_dict())
+
                     signals.new_text.connect(on_new_text)
+                    signals.new_segment.connect(on_new_segment)
+                    signals.error_occurred.connect(errors.append)
 
                     # 开始转录
                     transcriber.start_transcription(file_path, self.current_engine)
@@ -924,6 +1226,10 @@ class ASRModelManager(QObject):
                         sherpa_logger.warning("转录超时，强制停止")
                         transcriber.stop_transcription()
 
+                    # 被停止（超时或用户停止）或出错时结果不完整，不写入缓存
+                    if transcriber.stopped or errors:
+                        cacheable = False
+
                     # 合并结果
                     if transcription_result:
                         result = " ".join(transcription_result)
@@ -944,6 +1250,11 @@ class ASRModelManager(QObject):
             if result:
                 result_preview = result[:100] + "..." if len(result) > 100 else result
                 sherpa_logger.info(f"转录结果: {result_preview}")
+                if segments is None:
+                    segments = getattr(self.current_engine, "last_segments", None) or []
+                self.last_segments = list(segments)
+                if cache_key and cacheable:
+                    transcript_cache.put(file_path, *cache_key, result, self.last_segments)
             else:
                 sherpa_logger.warning("转录结果为空")
 
@@ -954,6 +1265,40 @@ class ASRModelManager(QObject):
             sherpa_logger.error(traceback.format_exc())
             return None
 
+    def _get_transcript_cache_key(self, engine_type: str) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """获取当前引擎的转录结果缓存键
+
+        Args:
+            engine_type: 引擎类型（即模型 ID）
+
+        Returns:
+            Tuple[str, str, Dict[str, Any]]: (模型 ID, 模型路径, 解码参数)，无法确定模型路径时返回 None
+        """
+        model_path = (self.models_config.get(engine_type) or {}).get("path")
+        if not model_path or not os.path.exists(model_path):
+            return None
+
+        engine = self.current_engine
+        params = {"engine": type(engine).__name__, "sample_rate": getattr(engine, "sample_rate", 16000)}
+        if hasattr(engine, "_recognizer_kwargs") and getattr(engine, "config", None):
+            # 模型文件由校验和覆盖；线程数、设备编号和并行进程数不影响识别结果
+            params.update({key: value for key, value in engine._recognizer_kwargs().items()
+                           if key not in ("encoder", "decoder", "joiner", "tokens", "num_threads", "device")})
+            parallel_config = engine._get_parallel_config()
+            if parallel_config:
+                params["parallel"] = {key: value for key, value in parallel_config.items() if key != "workers"}
+        return engine_type, model_path, params
+
+    def get_transcript_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """获取转录结果缓存的统计信息（命中率等）
+
+        Returns:
+            Dict[str, Any]: 统计信息，未启用缓存时返回 None
+        """
+        from src.core.asr.transcript_cache import get_transcript_cache
+        transcript_cache = get_transcript_cache()
+        return transcript_cache.get_stats() if transcript_cache else None
+
     def reset(self) -> None:
         """重置当前引擎状态"""
         if self.current_engine:
@@ -1195,18 +1540,12 @@ class ASRModelManager(QObject):
             List[Dict[str, Any]]: 音频设备列表
         """
         try:
-            # 使用 soundcard 库获取音频设备
-            try:
-                import soundcard as sc
-            except ImportError:
-                logger.error("未安装 soundcard 模块，无法获取音频设备列表")
-                return []
-
-            # 获取所有扬声器（输出设备）
-            speakers = sc.all_speakers()
+            # 使用缓存的设备注册表，避免每次都同步查询音频后端
+            from src.core.audio.device_registry import get_device_registry
+            registry_devices = get_device_registry().get_devices()
 
-            # 获取所有麦克风（输入设备）
-            microphones = sc.all_microphones(include_loopback=True)
+            speakers = [device for device in registry_devices if not device.is_input]
+            microphones = [device for device in registry_devices if device.is_input]
 
             # 合并设备列表
             devices = []
@@ -0,0 +1,299 @@
+"""
+并行文件转录模块
+负责把长音频在静音处切分为片段，用进程池并行识别后按原始时间顺序拼接
+"""
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, Callable, Iterable, List, Tuple
+
+import numpy as np
+
+from src.core.asr.recognizer_pool import create_transducer
+
+# 避免 log10(0)
+_EPS = 1e-10
+
+# 工作进程中的识别器（每个进程一个）
+_worker_recognizer = None
+
+
+def find_segments(samples: np.ndarray, sample_rate: int = 16000, target_seconds: float = 30.0,
+                  max_seconds: float = 60.0, frame_ms: int = 20, pause_ms: int = 200) -> List[Tuple[int, int]]:
+    """
+    在静音处把音频切分为片段
+
+    每个片段从 target_seconds / 2 到 max_seconds 之间选取平均能量最低的一段停顿（pause_ms 毫秒）作为切点，
+    切点取停顿中点，避免切断单词；找不到明显停顿时也会在 max_seconds 处强制切分。
+
+    Args:
+        samples: 单声道 float32 音频
+        sample_rate: 采样率
+        target_seconds: 目标片段时长（秒）
+        max_seconds: 最大片段时长（秒）
+        frame_ms: 计算能量的子帧长度（毫秒）
+        pause_ms: 停顿的最短时长（毫秒），用于平滑能量
+
+    Returns:
+        List[Tuple[int, int]]: 片段的样本区间（左闭右开），按时间顺序排列
+
+    Raises:
+        ValueError: 参数无效时
+    """
+    if not 0 < target_seconds <= max_seconds:
+        raise ValueError(f"目标片段时长必须大于0且不超过最大片段时长: {target_seconds}, {max_seconds}")
+
+    total = len(samples)
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    max_frames = max(1, int(max_seconds * sample_rate) // frame_length)
+    if total <= max_frames * frame_length:
+        return [(0, total)] if total else []
+
+    # 每个子帧的能量（dB），再用 pause_ms 的滑动平均找持续的停顿而不是单个过零点
+    num_frames = total // frame_length
+    frames = np.asarray(samples[:num_frames * frame_length], dtype=np.float32).reshape(num_frames, frame_length)
+    energy_db = 10.0 * np.log10(np.einsum('ij,ij->i', frames, frames) / frame_length + _EPS)
+    window = max(1, int(round(pause_ms / frame_ms)))
+    smoothed = np.convolve(energy_db, np.ones(window) / window, mode="same")
+
+    min_frames = max(1, int(target_seconds * sample_rate / 2) // frame_length)
+    segments = []
+    start_frame = 0
+    while num_frames - start_frame > max_frames:
+        lo = start_frame + min_frames
+        hi = start_frame + max_frames
+        cut_frame = lo + int(np.argmin(smoothed[lo:hi]))
+        segments.append((start_frame * frame_length, cut_frame * frame_length))
+        start_frame = cut_frame
+    segments.append((start_frame * frame_length, total))
+    return segments
+
+
+def decode_blocks(recognizer: Any, blocks: Iterable[np.ndarray], sample_rate: int = 16000,
+                  segments: Optional[List[Dict[str, Any]]] = None) -> str:
+    """
+    用一个新的流依次解码音频块，每块送入后立即解码，端点处取出句子并重置流
+
+    Args:
+        recognizer: sherpa-onnx OnlineRecognizer
+        blocks: 单声道 float32 音频块
+        sample_rate: 采样率
+        segments: 指定时追加每个句子的 {"start", "end", "text"}（秒，以端点检测时已送入的音频计）
+
+    Returns:
+        str: 识别文本
+    """
+    stream = recognizer.create_stream()
+    texts = []
+    fed = 0
+    start = 0
+
+    def collect(end: int) -> None:
+        nonlocal start
+        text = recognizer.get_result(stream).strip()
+        texts.append(text)
+        if text and segments is not None:
+            segments.append({"start": start / sample_rate, "end": end / sample_rate, "text": text})
+        start = end
+
+    def decode() -> None:
+        while recognizer.is_ready(stream):
+            recognizer.decode_stream(stream)
+            if recognizer.is_endpoint(stream):
+                collect(fed)
+                recognizer.reset(stream)
+
+    for block in blocks:
+        stream.accept_waveform(sample_rate, block)
+        fed += len(block)
+        decode()
+    # 尾部填充让最后几帧也能被解码
+    stream.accept_waveform(sample_rate, np.zeros(int(0.2 * sample_rate), dtype=np.float32))
+    stream.input_finished()
+    decode()
+    collect(fed)
+    return " ".join(text for text in texts if text)
+
+
+def decode_samples(recognizer: Any, samples: np.ndarray, sample_rate: int = 16000) -> str:
+    """
+    用一个新的流解码一段完整音频
+
+    Args:
+        recognizer: sherpa-onnx OnlineRecognizer
+        samples: 单声道 float32 音频
+        sample_rate: 采样率
+
+    Returns:
+        str: 识别文本
+    """
+    return decode_blocks(recognizer, [samples], sample_rate)
+
+
+def _init_worker(factory: Callable[..., Any], recognizer_kwargs: Dict[str, Any]) -> None:
+    """工作进程初始化：创建本进程的识别器"""
+    global _worker_recognizer
+    _worker_recognizer = factory(**recognizer_kwargs)
+
+
+def _transcribe_segment(index: int, samples: np.ndarray, sample_rate: int) -> Tuple[int, str]:
+    """在工作进程中识别一个片段"""
+    return index, decode_samples(_worker_recognizer, samples, sample_rate)
+
+
+class ParallelFileTranscriber:
+    """并行文件转录器
+
+    - 用 find_segments() 在静音处把整段 PCM 切分为片段
+    - 片段提交到 ProcessPoolExecutor，每个工作进程在初始化时创建自己的识别器，
+      片段之间互不依赖，可以占满多个 CPU 核心
+    - 结果按片段顺序拼接，并保留每个片段在原始音频中的起止时间
+
+    workers 为 1 时在当前进程中顺序识别（不创建进程池）。
+    """
+
+    def __init__(self, recognizer_kwargs: Dict[str, Any], workers: Optional[int] = None, sample_rate: int = 16000,
+                 target_segment_seconds: float = 30.0, max_segment_seconds: float = 60.0,
+                 factory: Optional[Callable[..., Any]] = None):
+        """
+        初始化并行文件转录器
+
+        Args:
+            recognizer_kwargs: 创建识别器的参数（与 OnlineRecognizer.from_transducer 相同）
+            workers: 工作进程数，None 或 0 表示使用 CPU 核心数
+            sample_rate: 音频采样率
+            target_segment_seconds: 目标片段时长（秒）
+            max_segment_seconds: 最大片段时长（秒）
+            factory: 创建识别器的函数，必须可以被 pickle（模块级函数）；默认使用 sherpa-onnx
+        """
+        self.recognizer_kwargs = dict(recognizer_kwargs)
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.sample_rate = sample_rate
+        self.target_segment_seconds = target_segment_seconds
+        self.max_segment_seconds = max_segment_seconds
+        self.factory = factory or create_transducer
+
+    @classmethod
+    def from_config(cls, recognizer_kwargs: Dict[str, Any], config: Optional[Dict[str, Any]],
+                    sample_rate: int = 16000) -> "ParallelFileTranscriber":
+        """
+        根据配置字典（config.json 中的 asr.parallel_transcription）创建转录器
+
+        Args:
+            recognizer_kwargs: 创建识别器的参数
+            config: 配置字典
+            sample_rate: 音频采样率
+
+        Returns:
+            ParallelFileTranscriber: 转录器实例
+        """
+        config = config or {}
+        return cls(
+            recognizer_kwargs,
+            workers=config.get("workers"),
+            sample_rate=sample_rate,
+            target_segment_seconds=config.get("target_segment_seconds", 30.0),
+            max_segment_seconds=config.get("max_segment_seconds", 60.0),
+        )
+
+    def transcribe(self, samples: np.ndarray, recognizer: Any = None) -> Dict[str, Any]:
+        """
+        并行识别一段完整音频
+
+        Args:
+            samples: 单声道 float32 音频
+            recognizer: 已加载的识别器，只有一个片段或 workers 为 1 时在当前进程中使用，None 表示新建
+
+        Returns:
+            Dict[str, Any]: 识别结果，格式见 transcribe_blocks()
+        """
+        return self.transcribe_blocks([np.asarray(samples, dtype=np.float32)], recognizer)
+
+    def transcribe_blocks(self, blocks: Iterable[np.ndarray], recognizer: Any = None) -> Dict[str, Any]:
+        """
+        并行识别按块到达的音频（如 FFmpegPCMReader 的输出）
+
+        缓冲的音频超过最大片段时长时切出一个片段提交识别，同时最多有 2 * workers 个片段在等待结果，
+        因此内存占用与音频总长度无关。音频不足两个片段时直接在当前进程中识别，不创建进程池。
+
+        Args:
+            blocks: 单声道 float32 音频块
+            recognizer: 已加载的识别器，只有一个片段或 workers 为 1 时在当前进程中使用，None 表示新建
+
+        Returns:
+            Dict[str, Any]: 识别结果，包括：
+                text: 按顺序拼接的文本
+                segments: 每个片段的 start/end（秒）和 text
+                audio_seconds / wall_seconds: 音频时长和实际耗时
+                audio_hours_per_wall_hour: 吞吐量（每小时处理的音频小时数）
+                workers: 使用的工作进程数
+        """
+        start_time = time.perf_counter()
+        max_samples = int(self.max_segment_seconds * self.sample_rate)
+        spans: List[Tuple[int, int]] = []
+        texts: List[str] = []
+        in_flight = deque()  # (片段序号, Future)
+        executor = None
+        local_recognizer = recognizer
+
+        def collect(limit: int) -> None:
+            """等待最早提交的片段，直到等待中的片段不超过 limit 个"""
+            while len(in_flight) > limit:
+                index, future = in_flight.popleft()
+                texts[index] = future.result()[1]
+
+        def submit(segment: np.ndarray) -> None:
+            """识别一个片段：有进程池时提交到进程池，否则在当前进程中识别"""
+            nonlocal local_recognizer
+            index = len(spans)
+            start = spans[-1][1] if spans else 0
+            spans.append((start, start + len(segment)))
+            texts.append("")
+            if executor is None:
+                if local_recognizer is None:
+                    local_recognizer = self.factory(**self.recognizer_kwargs)
+                texts[index] = decode_samples(local_recognizer, segment, self.sample_rate)
+                return
+            collect(2 * self.workers - 1)
+            in_flight.append((index, executor.submit(_transcribe_segment, index, segment, self.sample_rate)))
+
+        buffer: List[np.ndarray] = []
+        buffered = 0
+        try:
+            for block in blocks:
+                buffer.append(np.asarray(block, dtype=np.float32))
+                buffered += len(block)
+                while buffered > max_samples:
+                    data = buffer[0] if len(buffer) == 1 else np.concatenate(buffer)
+                    # 只在最大片段时长（多取 1 秒用于平滑）的范围内找切点
+                    cut = find_segments(data[:max_samples + self.sample_rate], self.sample_rate,
+                                        self.target_segment_seconds, self.max_segment_seconds)[0][1]
+                    if executor is None and self.workers > 1:
+                        # 音频至少有两个片段，此时才创建进程池
+                        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                       initargs=(self.factory, self.recognizer_kwargs))
+                    submit(data[:cut])
+                    buffer = [data[cut:]]
+                    buffered = len(buffer[0])
+            if buffered:
+                submit(buffer[0] if len(buffer) == 1 else np.concatenate(buffer))
+            collect(0)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        wall_seconds = time.perf_counter() - start_time
+        audio_seconds = (spans[-1][1] if spans else 0) / self.sample_rate
+        segments = [
+            {"start": start / self.sample_rate, "end": end / self.sample_rate, "text": text}
+            for (start, end), text in zip(spans, texts)
+        ]
+        return {
+            "text": " ".join(text for text in texts if text),
+            "segments": segments,
+            "audio_seconds": audio_seconds,
+            "wall_seconds": wall_seconds,
+            "audio_hours_per_wall_hour": audio_seconds / wall_seconds if wall_seconds > 0 else 0.0,
+            "workers": self.workers if executor is not None else 1,
+        }
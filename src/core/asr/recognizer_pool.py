@@ -0,0 +1,243 @@
+"""
+识别器池模块
+负责在进程内共享按模型文件和解码参数区分的 sherpa-onnx OnlineRecognizer，
+避免引擎、插件和模型管理器为同一组模型文件重复加载 ONNX 会话
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Tuple
+
+
+def make_pool_key(encoder: str, decoder: str, joiner: str, tokens: str, num_threads: int = 4,
+                  decoding_method: str = "greedy_search", **options) -> Tuple:
+    """
+    生成识别器池的键：模型文件（规范化的绝对路径）、线程数、解码方法和其他识别器参数
+
+    端点检测规则等参数也会写入识别器配置，参数不同的识别器不能共享，因此同样作为键的一部分。
+
+    Args:
+        encoder: encoder 模型文件
+        decoder: decoder 模型文件
+        joiner: joiner 模型文件
+        tokens: tokens 文件
+        num_threads: 线程数
+        decoding_method: 解码方法
+        **options: 其他传给 OnlineRecognizer.from_transducer 的参数
+
+    Returns:
+        tuple: 可哈希的键
+    """
+    files = tuple(os.path.normcase(os.path.abspath(path)) for path in (encoder, decoder, joiner, tokens))
+    return files + (int(num_threads), decoding_method, tuple(sorted(options.items())))
+
+
+def create_transducer(**kwargs) -> Any:
+    """使用 sherpa-onnx 创建 transducer 识别器"""
+    import sherpa_onnx
+    return sherpa_onnx.OnlineRecognizer.from_transducer(**kwargs)
+
+
+class _PoolEntry:
+    """池中的一个识别器"""
+
+    def __init__(self, key: Tuple, size_bytes: int):
+        self.key = key
+        self.size_bytes = size_bytes
+        self.recognizer = None
+        self.refcount = 0
+        self.loads = 0
+        self.hits = 0
+        self.error = None  # 创建失败时的异常，等待同一次创建的调用方都会收到
+        self.build_lock = threading.Lock()
+
+
+class RecognizerPool:
+    """进程内共享的识别器池
+
+    - 按 make_pool_key() 的键缓存识别器，第一次 acquire() 时才创建（同一个键只创建一次，
+      不同键可以并发创建）
+    - acquire()/release() 维护引用计数，引用计数为 0 的识别器继续保留，再次使用时无需重新加载
+    - 已加载识别器的估算内存（模型文件大小之和）超过 memory_budget_mb 时，
+      按最近最少使用顺序释放引用计数为 0 的识别器；正在使用的识别器不会被释放
+
+    sherpa-onnx 的识别器可以同时服务多个流，共享同一个识别器的使用方各自创建流即可。
+    """
+
+    def __init__(self, memory_budget_mb: float = 1024.0, factory: Optional[Callable[..., Any]] = None):
+        """
+        初始化识别器池
+
+        Args:
+            memory_budget_mb: 已加载识别器的内存预算（MB），0 表示空闲的识别器立即释放
+            factory: 创建识别器的函数，参数与 OnlineRecognizer.from_transducer 相同；默认使用 sherpa-onnx
+        """
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.factory = factory or create_transducer
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, _PoolEntry]" = OrderedDict()  # 最近使用的在末尾
+        self._by_recognizer: Dict[int, _PoolEntry] = {}
+        self.evictions = 0
+
+    def acquire(self, encoder: str, decoder: str, joiner: str, tokens: str, num_threads: int = 4,
+                decoding_method: str = "greedy_search", **options) -> Any:
+        """
+        获取（必要时创建）识别器，并增加引用计数；用完后需调用 release()
+
+        Args:
+            encoder: encoder 模型文件
+            decoder: decoder 模型文件
+            joiner: joiner 模型文件
+            tokens: tokens 文件
+            num_threads: 线程数
+            decoding_method: 解码方法
+            **options: 其他传给 OnlineRecognizer.from_transducer 的参数
+
+        Returns:
+            识别器实例
+
+        Raises:
+            Exception: 创建识别器失败时，异常原样抛出
+        """
+        key = make_pool_key(encoder, decoder, joiner, tokens, num_threads, decoding_method, **options)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                size = sum(os.path.getsize(path) for path in (encoder, decoder, joiner) if os.path.exists(path))
+                entry = _PoolEntry(key, size)
+                self._entries[key] = entry
+            entry.refcount += 1
+            self._entries.move_to_end(key)
+
+        with entry.build_lock:
+            if entry.recognizer is not None:
+                entry.hits += 1
+                return entry.recognizer
+            if entry.error is None:
+                try:
+                    recognizer = self.factory(
+                        encoder=encoder, decoder=decoder, joiner=joiner, tokens=tokens,
+                        num_threads=num_threads, decoding_method=decoding_method, **options
+                    )
+                except Exception as e:
+                    entry.error = e
+            if entry.error is not None:
+                # 创建失败：等待中的调用方也抛出同一个异常，不再各自重试；
+                # 最后一个离开的调用方移除条目，之后的 acquire() 重新创建
+                with self._lock:
+                    entry.refcount -= 1
+                    if entry.refcount == 0 and self._entries.get(key) is entry:
+                        del self._entries[key]
+                raise entry.error
+            with self._lock:
+                entry.recognizer = recognizer
+                entry.loads += 1
+                self._by_recognizer[id(recognizer)] = entry
+                self._evict_locked()
+            return recognizer
+
+    def release(self, recognizer: Any) -> bool:
+        """
+        释放一次对识别器的引用
+
+        Args:
+            recognizer: acquire() 返回的识别器
+
+        Returns:
+            bool: 识别器是否由本池管理
+        """
+        with self._lock:
+            entry = self._by_recognizer.get(id(recognizer))
+            if entry is None or entry.recognizer is not recognizer:
+                return False
+            entry.refcount = max(0, entry.refcount - 1)
+            self._evict_locked()
+            return True
+
+    def _loaded_bytes(self) -> int:
+        """已加载识别器的估算内存（字节），调用方需持有锁"""
+        return sum(entry.size_bytes for entry in self._entries.values() if entry.recognizer is not None)
+
+    def _evict_locked(self) -> None:
+        """超过内存预算时按 LRU 顺序释放空闲识别器，调用方需持有锁"""
+        loaded = self._loaded_bytes()
+        for key, entry in list(self._entries.items()):
+            if loaded <= self.memory_budget:
+                break
+            if entry.refcount > 0 or entry.recognizer is None:
+                continue
+            self._by_recognizer.pop(id(entry.recognizer), None)
+            del self._entries[key]
+            loaded -= entry.size_bytes
+            self.evictions += 1
+
+    def clear(self) -> int:
+        """
+        释放所有空闲识别器
+
+        Returns:
+            int: 释放的识别器数
+        """
+        with self._lock:
+            idle = [key for key, entry in self._entries.items()
+                    if entry.refcount == 0 and entry.recognizer is not None]
+            for key in idle:
+                entry = self._entries.pop(key)
+                self._by_recognizer.pop(id(entry.recognizer), None)
+            self.evictions += len(idle)
+            return len(idle)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取池状态
+
+        Returns:
+            Dict[str, Any]: 状态信息
+        """
+        with self._lock:
+            entries = [
+                {
+                    "encoder": entry.key[0],
+                    "num_threads": entry.key[4],
+                    "decoding_method": entry.key[5],
+                    "refcount": entry.refcount,
+                    "size_mb": entry.size_bytes / (1024 * 1024),
+                    "loads": entry.loads,
+                    "hits": entry.hits,
+                }
+                for entry in self._entries.values() if entry.recognizer is not None
+            ]
+            return {
+                "recognizers": len(entries),
+                "loaded_mb": self._loaded_bytes() / (1024 * 1024),
+                "budget_mb": self.memory_budget / (1024 * 1024),
+                "evictions": self.evictions,
+                "entries": entries,
+            }
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_recognizer_pool() -> RecognizerPool:
+    """
+    获取全局识别器池，内存预算来自配置 asr.recognizer_pool.memory_budget_mb
+
+    Returns:
+        RecognizerPool: 全局识别器池
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            memory_budget_mb = 1024.0
+            try:
+                from src.utils.config_manager import config_manager
+                pool_config = config_manager.get_config("asr", "recognizer_pool", default={}) or {}
+                memory_budget_mb = float(pool_config.get("memory_budget_mb", memory_budget_mb))
+            except ImportError:
+                pass
+            except Exception as e:
+                print(f"加载识别器池配置失败，使用默认值: {e}")
+            _default_pool = RecognizerPool(memory_budget_mb)
+        return _default_pool
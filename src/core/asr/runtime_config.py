@@ -0,0 +1,222 @@
+"""
+模型运行时配置模块
+负责解析和校验每个模型的 runtime 配置（asr.models.<模型>.config.runtime），
+生成创建 sherpa-onnx 识别器时的运行时参数，并按本机实测结果调整线程数
+"""
+import os
+import time
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# sherpa-onnx 支持的执行提供程序
+SUPPORTED_PROVIDERS = ("cpu", "cuda", "coreml", "directml", "xnnpack", "nnapi", "trt")
+
+# ONNX Runtime 的会话选项：sherpa-onnx 在内部创建会话，Python 接口只提供 num_threads
+# （同时用作 intra-op 和 inter-op 线程数）和 provider，这些选项无法传入
+UNSUPPORTED_SESSION_OPTIONS = (
+    "intra_op_num_threads", "inter_op_num_threads", "graph_optimization_level",
+    "enable_cpu_mem_arena", "enable_mem_pattern", "allow_spinning", "execution_mode",
+)
+
+DEFAULT_RUNTIME = {"num_threads": 4, "provider": "cpu"}
+
+
+def validate_runtime_config(runtime: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    校验 runtime 配置
+
+    无效的值使用默认值，未知或不支持的选项忽略，并在返回的问题列表中说明。
+
+    Args:
+        runtime: runtime 配置，例如 {"num_threads": 2, "provider": "cpu"}
+
+    Returns:
+        Tuple[Dict[str, Any], List[str]]: (规范化后的配置, 问题列表)
+    """
+    result = dict(DEFAULT_RUNTIME)
+    problems = []
+    if runtime is None:
+        return result, problems
+    if not isinstance(runtime, dict):
+        return result, [f"runtime 配置应为对象，实际为 {type(runtime).__name__}，使用默认值"]
+
+    for key, value in runtime.items():
+        if key == "num_threads":
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                problems.append(f"num_threads 应为正整数，实际为 {value!r}，使用 {result['num_threads']}")
+            else:
+                result["num_threads"] = value
+        elif key == "provider":
+            provider = str(value).lower()
+            if provider not in SUPPORTED_PROVIDERS:
+                problems.append(f"不支持的 provider: {value!r}，可选 {', '.join(SUPPORTED_PROVIDERS)}，使用 cpu")
+            else:
+                result["provider"] = provider
+        elif key == "device":
+            if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+                problems.append(f"device 应为非负整数，实际为 {value!r}，已忽略")
+            else:
+                result["device"] = value
+        elif key == "tuned":
+            # 自动调优的记录，不影响识别器
+            continue
+        elif key in UNSUPPORTED_SESSION_OPTIONS:
+            problems.append(f"sherpa-onnx 不支持设置 ONNX Runtime 会话选项 {key}，已忽略（线程数请使用 num_threads）")
+        else:
+            problems.append(f"未知的 runtime 选项 {key}，已忽略")
+    return result, problems
+
+
+def resolve_runtime(model_config: Optional[Dict[str, Any]], model_name: str = "") -> Dict[str, Any]:
+    """
+    从模型配置中得到创建识别器的运行时参数
+
+    兼容旧配置：runtime 中没有 num_threads 时使用模型配置中的 num_threads。
+
+    Args:
+        model_config: 模型的 config 配置（或插件配置），可包含 num_threads 和 runtime
+        model_name: 模型名称，用于日志
+
+    Returns:
+        Dict[str, Any]: 运行时参数（num_threads、provider，以及可选的 device），
+            可直接作为 OnlineRecognizer.from_transducer 的关键字参数
+    """
+    model_config = model_config or {}
+    runtime = model_config.get("runtime")
+    if "num_threads" in model_config and not (isinstance(runtime, dict) and "num_threads" in runtime):
+        runtime = dict(runtime) if isinstance(runtime, dict) else {}
+        runtime["num_threads"] = model_config["num_threads"]
+
+    result, problems = validate_runtime_config(runtime)
+    for problem in problems:
+        print(f"模型 {model_name} 的运行时配置: {problem}")
+    return result
+
+
+def get_model_runtime(model_name: str) -> Dict[str, Any]:
+    """
+    获取模型的运行时参数，配置来自 asr.models.<模型>.config
+
+    Args:
+        model_name: 模型名称
+
+    Returns:
+        Dict[str, Any]: 运行时参数，读取配置失败时返回默认值
+    """
+    try:
+        from src.utils.config_manager import config_manager
+        model_config = config_manager.get_model_config(model_name) or {}
+    except ImportError:
+        model_config = {}
+    return resolve_runtime(model_config.get("config"), model_name)
+
+
+def save_model_runtime(model_name: str, runtime: Dict[str, Any]) -> bool:
+    """
+    把运行时参数写回配置文件 asr.models.<模型>.config.runtime
+
+    Args:
+        model_name: 模型名称
+        runtime: 运行时参数
+
+    Returns:
+        bool: 是否保存成功
+    """
+    try:
+        from src.utils.config_manager import config_manager
+    except ImportError:
+        return False
+    if not config_manager.get_model_config(model_name):
+        print(f"模型 {model_name} 不存在，无法保存运行时配置")
+        return False
+    if not config_manager.set_config(runtime, "asr", "models", model_name, "config", "runtime"):
+        return False
+    return config_manager.save_config("main")
+
+
+def default_thread_counts(max_threads: Optional[int] = None) -> List[int]:
+    """
+    自动调优时尝试的线程数：1、2、4 …… 直到 CPU 核数（包含 CPU 核数本身）
+
+    Args:
+        max_threads: 最大线程数，默认为 CPU 核数
+
+    Returns:
+        List[int]: 线程数列表
+    """
+    max_threads = max(1, max_threads or os.cpu_count() or 1)
+    counts = []
+    count = 1
+    while count < max_threads:
+        counts.append(count)
+        count *= 2
+    counts.append(max_threads)
+    return counts
+
+
+def measure_decode_rtf(recognizer: Any, audio: np.ndarray, sample_rate: int = 16000,
+                       block_seconds: float = 0.1) -> float:
+    """
+    用一个新的流按实时识别的块大小解码音频，测量实时率
+
+    Args:
+        recognizer: sherpa-onnx OnlineRecognizer
+        audio: 单声道 float32 音频
+        sample_rate: 采样率
+        block_seconds: 每次送入的音频时长（秒）
+
+    Returns:
+        float: 解码耗时与音频时长之比
+    """
+    from src.core.asr.parallel_transcriber import decode_blocks
+
+    block = max(1, int(block_seconds * sample_rate))
+    blocks = (audio[start:start + block] for start in range(0, len(audio), block))
+    start_time = time.perf_counter()
+    decode_blocks(recognizer, blocks, sample_rate)
+    return (time.perf_counter() - start_time) / (len(audio) / sample_rate)
+
+
+def tune_num_threads(build_recognizer: Callable[[int], Any], audio: np.ndarray,
+                     thread_counts: Optional[Sequence[int]] = None, sample_rate: int = 16000,
+                     repeats: int = 3, tolerance: float = 0.05,
+                     warmup_seconds: float = 1.0) -> Dict[str, Any]:
+    """
+    依次用不同的线程数创建识别器并解码同一段音频，选出本机最合适的线程数
+
+    每个线程数先预热，再取 repeats 次测量的中位数。实时率与最好结果相差不超过 tolerance
+    的线程数中选最少的一个：多开线程收益很小时，少占用共享服务器的 CPU，尾延迟也更稳定。
+
+    Args:
+        build_recognizer: 根据线程数创建识别器的函数
+        audio: 单声道 float32 音频（回放用的录音或合成音频）
+        thread_counts: 尝试的线程数，默认为 default_thread_counts()
+        sample_rate: 采样率
+        repeats: 每个线程数的测量次数
+        tolerance: 允许比最好结果慢的比例
+        warmup_seconds: 每个识别器的预热音频时长（秒）
+
+    Returns:
+        Dict[str, Any]: {"best": 选出的线程数, "results": [{"num_threads", "rtf", "runs"}]}
+
+    Raises:
+        ValueError: 音频为空时
+    """
+    from src.core.asr.warmup import warm_up_online_recognizer
+
+    if len(audio) == 0:
+        raise ValueError("调优用的音频为空")
+    results = []
+    for num_threads in thread_counts or default_thread_counts():
+        recognizer = build_recognizer(num_threads)
+        if warmup_seconds > 0:
+            warm_up_online_recognizer(recognizer, warmup_seconds, sample_rate)
+        runs = [measure_decode_rtf(recognizer, audio, sample_rate) for _ in range(max(1, repeats))]
+        results.append({"num_threads": num_threads, "rtf": float(np.median(runs)), "runs": runs})
+        # 先释放，避免创建下一个识别器时同时占用两份模型内存
+        del recognizer
+
+    best_rtf = min(result["rtf"] for result in results)
+    best = min(result["num_threads"] for result in results if result["rtf"] <= best_rtf * (1 + tolerance))
+    return {"best": best, "results": results}
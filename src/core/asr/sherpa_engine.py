@@ -1,8 +1,13 @@
 import os
+import re
+import logging
 import numpy as np
 from typing import Optional, Union, Dict, Any
 import sherpa_onnx
 
+from src.core.audio.pcm_converter import PCMConverter
+from src.utils.async_logging import is_enabled_for
+
 class SherpaOnnxASR:
     """Sherpa-ONNX ASR 引擎实现"""
 
@@ -41,10 +46,22 @@ class SherpaOnnxASR:
         self.model_dir = model_dir
         self.model_config = model_config
         self.recognizer = None
+        self._pool = None  # 识别器来自的识别器池
         self.stream = None
         self.config = None
         self.sample_rate = 16000
         self.is_int8 = True  # 默认使用int8量化模型
+        self._pcm_converter = PCMConverter()  # 字节输入转换为 float32 时复用缓冲区
+
+        # 流式识别状态（AcceptWaveform/Result/PartialResult）
+        self.current_stream = None
+        self._partial_text = ""  # 当前句子的假设，每个块解码后更新
+        self._delivered_text = ""  # 已通过 PartialDelta 交付的部分结果
+        self._final_text = ""  # 端点处得到、尚未被 Result 取出的完整结果
+        self.accepted_samples = 0  # AcceptWaveform 累计接收的样本数（本引擎的时间，Reset 后继续累计）
+        self._segment_start_sample = 0  # 当前句子开始时的 accepted_samples
+        self._final_timing = None  # 最近一次完整结果的时间信息，见 LastResultTiming()
+        self.last_segments = []  # 最近一次文件转录的分段时间戳 [{"start", "end", "text"}]
 
         # 如果提供了配置，检查是否使用int8模型
         if model_config and "type" in model_config:
@@ -241,6 +258,15 @@ class SherpaOnnxASR:
             except ImportError:
                 sherpa_logger.warning("无法导入 config_manager，使用默认配置")
 
+            # 运行时参数（线程数、执行提供程序），来自模型配置的 config.runtime
+            if self.model_config.get("runtime"):
+                from src.core.asr.runtime_config import resolve_runtime
+                runtime = resolve_runtime({"num_threads": self.config["num_threads"],
+                                           "runtime": self.model_config["runtime"]},
+                                          self.model_config.get("name", ""))
+                self.config.update(runtime)
+                sherpa_logger.info(f"运行时参数: {runtime}")
+
             # 使用 OnlineRecognizer 类的 from_transducer 静态方法创建实例
             # 这是 sherpa-onnx 版本的 API
             try:
@@ -310,22 +336,11 @@ class SherpaOnnxASR:
                     # 检查sherpa_onnx版本
                     sherpa_logger.info(f"sherpa_onnx版本: {sherpa_onnx.__version__ if hasattr(sherpa_onnx, '__version__') else '未知'}")
 
-                    # 创建OnlineRecognizer实例
-                    self.recognizer = sherpa_onnx.OnlineRecognizer.from_transducer(
-                        encoder=self.config["encoder"],
-                        decoder=self.config["decoder"],
-                        joiner=self.config["joiner"],
-                        tokens=self.config["tokens"],
-                        num_threads=self.config.get("num_threads", 4),
-                        sample_rate=self.config.get("sample_rate", 16000),
-                        feature_dim=self.config.get("feature_dim", 80),
-                        decoding_method=self.config.get("decoding_method", "greedy_search"),
-                        # 添加端点检测参数
-                        enable_endpoint_detection=bool(self.config.get("enable_endpoint", 1)),
-                        rule1_min_trailing_silence=float(self.config.get("rule1_min_trailing_silence", 3.0)),
-                        rule2_min_trailing_silence=float(self.config.get("rule2_min_trailing_silence", 1.5)),
-                        rule3_min_utterance_length=float(self.config.get("rule3_min_utterance_length", 25))
-                    )
+                    # 从全局识别器池获取 OnlineRecognizer 实例，相同模型文件和参数的识别器只加载一次
+                    from src.core.asr.recognizer_pool import get_recognizer_pool
+                    self._release_recognizer()
+                    self._pool = get_recognizer_pool()
+                    self.recognizer = self._pool.acquire(**self._recognizer_kwargs())
                     sherpa_logger.info("OnlineRecognizer 实例创建成功")
 
                     # 添加引擎类型标记
@@ -387,6 +402,48 @@ class SherpaOnnxASR:
             print(error_trace)
             return False
 
+    def _recognizer_kwargs(self) -> Dict[str, Any]:
+        """
+        获取创建 OnlineRecognizer 的参数（OnlineRecognizer.from_transducer 的关键字参数）
+
+        Returns:
+            Dict[str, Any]: 识别器参数
+        """
+        kwargs = {
+            "encoder": self.config["encoder"],
+            "decoder": self.config["decoder"],
+            "joiner": self.config["joiner"],
+            "tokens": self.config["tokens"],
+            "num_threads": self.config.get("num_threads", 4),
+            "provider": self.config.get("provider", "cpu"),
+            "sample_rate": self.config.get("sample_rate", 16000),
+            "feature_dim": self.config.get("feature_dim", 80),
+            "decoding_method": self.config.get("decoding_method", "greedy_search"),
+            # 端点检测参数
+            "enable_endpoint_detection": bool(self.config.get("enable_endpoint", 1)),
+            "rule1_min_trailing_silence": float(self.config.get("rule1_min_trailing_silence", 3.0)),
+            "rule2_min_trailing_silence": float(self.config.get("rule2_min_trailing_silence", 1.5)),
+            "rule3_min_utterance_length": float(self.config.get("rule3_min_utterance_length", 25)),
+        }
+        if "device" in self.config:
+            kwargs["device"] = self.config["device"]
+        return kwargs
+
+    def warm_up(self, seconds: float = 1.0) -> float:
+        """
+        用一个临时流和合成音频预热识别器，消除第一次识别的延迟
+
+        Args:
+            seconds: 合成音频时长（秒）
+
+        Returns:
+            float: 预热耗时（秒）
+        """
+        from src.core.asr.warmup import warm_up_online_recognizer
+        if not self.recognizer:
+            return 0.0
+        return warm_up_online_recognizer(self.recognizer, seconds, self.sample_rate)
+
     def transcribe(self, audio_data: Union[bytes, np.ndarray]) -> Optional[str]:
         """
         转录音频数据
@@ -409,11 +466,9 @@ class SherpaOnnxASR:
                 return None
 
             # 确保音频数据是numpy数组
-            if isinstance(audio_data, bytes):
-                # 将字节转换为16位整数数组
-                import array
-                audio_array = array.array('h', audio_data)
-                audio_data = np.array(audio_array, dtype=np.float32) / 32768.0
+            if isinstance(audio_data, (bytes, bytearray, memoryview)):
+                # 将16位PCM字节转换为float32（复用缓冲区）
+                audio_data = self._pcm_converter.pcm16_to_float(audio_data)
 
             # 确保音频数据是单声道
             if len(audio_data.shape) > 1:
@@ -620,205 +675,67 @@ class SherpaOnnxASR:
                 print(error_msg)
                 return None
 
-            # 使用 ffmpeg 将文件转换为 16kHz 单声道 PCM 格式
-            import subprocess
-            import tempfile
-            import wave
-
-            # 创建临时 WAV 文件
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_wav:
-                temp_wav_path = temp_wav.name
-
-            sherpa_logger.info(f"创建临时 WAV 文件: {temp_wav_path}")
-
-            # 使用 ffmpeg 转换
-            ffmpeg_cmd = [
-                'ffmpeg',
-                '-i', file_path,
-                '-ar', '16000',  # 采样率 16kHz
-                '-ac', '1',      # 单声道
-                '-f', 'wav',     # WAV 格式
-                '-y',            # 覆盖已有文件
-                temp_wav_path
-            ]
-
-            # 确保 self.recognizer 已经正确初始化
-            if not self.recognizer:
-                error_msg = "未初始化识别器，无法转录文件"
-                sherpa_logger.error(error_msg)
-                print(error_msg)
-                return None
-
-            cmd_str = ' '.join(ffmpeg_cmd)
-            sherpa_logger.info(f"执行命令: {cmd_str}")
-            print(f"执行命令: {cmd_str}")
-
-            try:
-                subprocess.run(ffmpeg_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                sherpa_logger.info("ffmpeg 命令执行成功")
-            except subprocess.CalledProcessError as e:
-                error_msg = f"ffmpeg 命令执行失败: {e}"
-                sherpa_logger.error(error_msg)
-                print(error_msg)
-                return None
-
-            # 读取 WAV 文件
-            try:
-                with wave.open(temp_wav_path, 'rb') as wav_file:
-                    # 检查格式
-                    channels = wav_file.getnchannels()
-                    sample_width = wav_file.getsampwidth()
-                    sample_rate = wav_file.getframerate()
-
-                    sherpa_logger.info(f"WAV 文件格式: 通道数={channels}, 采样宽度={sample_width}, 采样率={sample_rate}")
+            # 使用 ffmpeg 把文件流式解码为 16kHz 单声道 PCM，按固定大小的块直接送入识别器：
+            # 不生成临时 WAV 文件，也不把整个文件读入内存，ffmpeg 解码与识别同时进行
+            # 同一文件已经解码过（如换模型再次转录）时直接读取解码音频缓存
+            from src.core.audio.ffmpeg_reader import FFmpegPCMReader
+            from src.core.audio.pcm_cache import get_decoded_audio_cache
+            from src.core.asr.parallel_transcriber import decode_blocks
 
-                    if channels != 1 or sample_width != 2 or sample_rate != 16000:
-                        error_msg = (f"WAV 文件格式不正确: 通道数={channels}, "
-                                     f"采样宽度={sample_width}, 采样率={sample_rate}")
-                        sherpa_logger.error(error_msg)
-                        print(error_msg)
-                        return None
-
-                    # 读取所有帧
-                    frames = wav_file.readframes(wav_file.getnframes())
-                    sherpa_logger.info(f"读取 WAV 文件帧数: {wav_file.getnframes()}")
+            def open_reader():
+                reader = FFmpegPCMReader(file_path, sample_rate=16000, block_samples=16000,
+                                         cache=get_decoded_audio_cache())
+                return reader.open()
 
-                    # 转换为 numpy 数组
-                    audio_data = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
-                    sherpa_logger.info(f"音频数据长度: {len(audio_data)} 样本，最大值: {np.max(np.abs(audio_data))}")
-            except Exception as e:
-                error_msg = f"读取 WAV 文件失败: {e}"
-                sherpa_logger.error(error_msg)
-                print(error_msg)
-                import traceback
-                sherpa_logger.error(traceback.format_exc())
-                return None
-
-            # 删除临时文件
             try:
-                os.unlink(temp_wav_path)
-                sherpa_logger.info(f"删除临时 WAV 文件: {temp_wav_path}")
-            except Exception as e:
-                sherpa_logger.warning(f"删除临时 WAV 文件失败: {e}")
-                pass
-
-            # 创建流
-            try:
-                sherpa_logger.info("创建流...")
-                stream = self.recognizer.create_stream()
-                sherpa_logger.info("流创建成功")
-            except Exception as e:
-                error_msg = f"创建流失败: {e}"
+                reader = open_reader()
+            except OSError as e:
+                error_msg = f"ffmpeg 启动失败: {e}"
                 sherpa_logger.error(error_msg)
                 print(error_msg)
-                import traceback
-                sherpa_logger.error(traceback.format_exc())
                 return None
 
-            # 处理音频数据
-            # 分块处理，每次处理 10 秒的数据
-            chunk_size = 16000 * 10  # 10 秒的数据
-            sherpa_logger.info(f"分块处理音频数据，每块 {chunk_size} 样本 (10 秒)")
-
-            for i in range(0, len(audio_data), chunk_size):
-                chunk = audio_data[i:i+chunk_size]
-                sherpa_logger.debug(f"处理块 {i//chunk_size + 1}/{(len(audio_data) + chunk_size - 1)//chunk_size}，长度: {len(chunk)} 样本")
-
-                # 处理这个块
-                try:
-                    stream.accept_waveform(16000, chunk)
-                    sherpa_logger.debug("接受音频数据成功")
-
-                    # 检查端点
-                    if self.config["enable_endpoint"]:
-                        # 移除重复的端点检测逻辑
-                        pass
-                except Exception as e:
-                    error_msg = f"接受音频数据失败: {e}"
-                    sherpa_logger.error(error_msg)
-                    print(error_msg)
-                    continue
-
-                # 解码
-                try:
-                    decode_count = 0
-                    while self.recognizer.is_ready(stream):
-                        self.recognizer.decode_stream(stream)
-                        decode_count += 1
-                    sherpa_logger.debug(f"解码完成，解码次数: {decode_count}")
-                except Exception as e:
-                    error_msg = f"解码失败: {e}"
-                    sherpa_logger.error(error_msg)
-                    print(error_msg)
-                    continue
-
-            # 添加尾部填充
-            try:
-                sherpa_logger.info("添加尾部填充...")
-                tail_paddings = np.zeros(int(0.2 * 16000), dtype=np.float32)
-                stream.accept_waveform(16000, tail_paddings)
-                sherpa_logger.info("尾部填充添加成功")
-            except Exception as e:
-                error_msg = f"添加尾部填充失败: {e}"
-                sherpa_logger.error(error_msg)
-                print(error_msg)
-
-            # 标记输入结束
-            try:
-                sherpa_logger.info("标记输入结束...")
-                stream.input_finished()
-                sherpa_logger.info("输入结束标记成功")
-            except Exception as e:
-                error_msg = f"标记输入结束失败: {e}"
-                sherpa_logger.error(error_msg)
-                print(error_msg)
-
-            # 解码
-            try:
-                sherpa_logger.info("最终解码...")
-
-                # 检查端点
-                if self.config["enable_endpoint"]:
-                    # 移除重复的端点检测逻辑
-                    pass
-
-                decode_count = 0
-                while self.recognizer.is_ready(stream):
-                    self.recognizer.decode_stream(stream)
-                    decode_count += 1
-                sherpa_logger.info(f"最终解码完成，解码次数: {decode_count}")
-            except Exception as e:
-                error_msg = f"最终解码失败: {e}"
-                sherpa_logger.error(error_msg)
-                print(error_msg)
+            if reader.cache_hit:
+                sherpa_logger.info(f"使用解码音频缓存: {file_path}")
+            else:
+                cmd_str = ' '.join(reader.command)
+                sherpa_logger.info(f"执行命令: {cmd_str}")
+                print(f"执行命令: {cmd_str}")
 
-            # 获取最终结果
+            self.last_segments = []
             try:
-                sherpa_logger.info("获取最终结果...")
-                result = self.recognizer.get_result(stream)
-                sherpa_logger.info(f"原始最终结果: {result}")
-            except Exception as e:
-                error_msg = f"获取最终结果失败: {e}"
+                # 并行模式：在静音处切分，由多个进程同时识别
+                parallel_result = None
+                parallel_config = self._get_parallel_config()
+                if parallel_config is not None:
+                    try:
+                        parallel_result = self._transcribe_parallel(reader, parallel_config, sherpa_logger)
+                    except Exception as e:
+                        # 进程池失败等：已读取的音频无法重放，重新解码文件后改为串行转录
+                        sherpa_logger.error(f"并行转录失败，改为串行转录: {e}")
+                        reader.close()
+                        reader = open_reader()
+                if parallel_result is not None:
+                    result = parallel_result["text"]
+                    segments = [segment for segment in parallel_result["segments"] if segment["text"]]
+                else:
+                    segments = []
+                    result = decode_blocks(self.recognizer, reader, 16000, segments)
+            except (RuntimeError, OSError) as e:
+                error_msg = f"转录文件失败: {e}"
                 sherpa_logger.error(error_msg)
                 print(error_msg)
                 return None
+            finally:
+                reader.close()
 
-            # 过滤掉非英文字符
+            sherpa_logger.info(f"解码完成，音频时长: {reader.seconds_read:.1f} 秒")
+            sherpa_logger.info(f"原始最终结果: {result}")
+            result = self._filter_result(result, sherpa_logger)
             if result:
-                try:
-                    import re
-                    # 只保留英文字母、数字、标点符号和空格
-                    filtered_result = re.sub(r'[^\x00-\x7F]+', '', result)
-                    sherpa_logger.info(f"过滤后的最终结果: {filtered_result}")
-                    return filtered_result
-                except Exception as e:
-                    error_msg = f"过滤结果失败: {e}"
-                    sherpa_logger.error(error_msg)
-                    print(error_msg)
-                    return result  # 返回未过滤的结果
-            else:
-                sherpa_logger.warning("没有最终结果")
-                return None
+                self.last_segments = [dict(segment, text=re.sub(r'[^\x00-\x7F]+', '', segment["text"]))
+                                      for segment in segments]
+            return result
 
         except Exception as e:
             error_msg = f"Sherpa-ONNX 转录文件错误: {e}"
@@ -836,15 +753,81 @@ class SherpaOnnxASR:
             print(error_trace)
             return None
 
+    def _filter_result(self, result: Optional[str], sherpa_logger: Any) -> Optional[str]:
+        """
+        过滤文件转录结果中的非英文字符
+
+        Args:
+            result: 原始转录文本
+            sherpa_logger: 日志记录器
+
+        Returns:
+            str: 过滤后的文本，没有结果时返回None
+        """
+        if not result:
+            sherpa_logger.warning("没有最终结果")
+            return None
+        try:
+            import re
+            # 只保留英文字母、数字、标点符号和空格
+            filtered_result = re.sub(r'[^\x00-\x7F]+', '', result)
+            sherpa_logger.info(f"过滤后的最终结果: {filtered_result}")
+            return filtered_result
+        except Exception as e:
+            error_msg = f"过滤结果失败: {e}"
+            sherpa_logger.error(error_msg)
+            print(error_msg)
+            return result  # 返回未过滤的结果
+
+    def _get_parallel_config(self) -> Optional[Dict[str, Any]]:
+        """
+        获取并行文件转录配置 asr.parallel_transcription
+
+        Returns:
+            Optional[Dict[str, Any]]: 启用并行模式时返回配置，否则返回 None
+        """
+        try:
+            from src.utils.config_manager import config_manager
+            parallel_config = config_manager.get_config("asr", "parallel_transcription", default={}) or {}
+        except ImportError:
+            return None
+        return parallel_config if parallel_config.get("enabled", False) else None
+
+    def _transcribe_parallel(self, blocks: Any, parallel_config: Dict[str, Any],
+                             sherpa_logger: Any) -> Dict[str, Any]:
+        """
+        并行转录按块到达的音频
+
+        Args:
+            blocks: 16kHz 单声道 float32 音频块（如 FFmpegPCMReader）
+            parallel_config: 并行转录配置
+            sherpa_logger: 日志记录器
+
+        Returns:
+            Dict[str, Any]: ParallelFileTranscriber.transcribe_blocks() 的结果
+        """
+        from src.core.asr.parallel_transcriber import ParallelFileTranscriber
+        transcriber = ParallelFileTranscriber.from_config(self._recognizer_kwargs(), parallel_config)
+        result = transcriber.transcribe_blocks(blocks, recognizer=self.recognizer)
+        sherpa_logger.info(
+            f"并行转录完成: {len(result['segments'])} 个片段, {result['workers']} 个进程, "
+            f"音频 {result['audio_seconds']:.1f} 秒, 耗时 {result['wall_seconds']:.1f} 秒, "
+            f"吞吐量 {result['audio_hours_per_wall_hour']:.1f} 音频小时/小时"
+        )
+        return result
+
     def AcceptWaveform(self, audio_data: np.ndarray) -> bool:
         """
         接受音频数据并进行处理（兼容Vosk API）
 
+        每个块只解码一次并缓存当前假设；只有 sherpa-onnx 检测到端点（句子结束）时才返回 True，
+        此时该句的文本由 Result() 取出，流通过 recognizer.reset() 复用，不重新创建。
+
         Args:
             audio_data: 音频数据，numpy数组
 
         Returns:
-            bool: 是否有完整的识别结果
+            bool: 是否检测到端点且有完整的识别结果
         """
         try:
             # 获取日志记录器
@@ -864,7 +847,7 @@ class SherpaOnnxASR:
                 return False
 
             # 创建新的流
-            if not hasattr(self, 'current_stream') or self.current_stream is None:
+            if self.current_stream is None:
                 try:
                     self.current_stream = self.recognizer.create_stream()
                     sherpa_logger.debug("创建新的流")
@@ -873,43 +856,41 @@ class SherpaOnnxASR:
                     return False
 
             # 确保音频数据是numpy数组
-            if isinstance(audio_data, bytes):
-                # 将字节转换为16位整数数组
-                import array
-                audio_array = array.array('h', audio_data)
-                audio_data = np.array(audio_array, dtype=np.float32) / 32768.0
-                sherpa_logger.debug(f"将字节数据转换为numpy数组，长度: {len(audio_data)}")
+            if isinstance(audio_data, (bytes, bytearray, memoryview)):
+                # 将16位PCM字节转换为float32（复用缓冲区）
+                audio_data = self._pcm_converter.pcm16_to_float(audio_data)
 
             # 确保音频数据是单声道
             if len(audio_data.shape) > 1:
                 audio_data = np.mean(audio_data, axis=1)
-                sherpa_logger.debug(f"将多声道数据转换为单声道，形状: {audio_data.shape}")
 
-            # 处理音频数据
             try:
                 self.current_stream.accept_waveform(self.sample_rate, audio_data)
-                sherpa_logger.debug(f"接受音频数据，长度: {len(audio_data)}")
-            except Exception as e:
-                sherpa_logger.error(f"接受音频数据错误: {e}")
-                import traceback
-                sherpa_logger.error(traceback.format_exc())
-                return False
+                self.accepted_samples += len(audio_data)
 
-            # 检查是否有完整的识别结果
-            # 这里我们使用一个简单的启发式方法：如果当前流中有文本，则认为有完整的结果
-            try:
-                # 解码
+                # 解码并缓存当前假设，Result()/PartialResult() 不再重复解码
                 while self.recognizer.is_ready(self.current_stream):
                     self.recognizer.decode_stream(self.current_stream)
+                self._partial_text = self.recognizer.get_result(self.current_stream)
 
-                # 获取当前结果
-                result = self.recognizer.get_result(self.current_stream)
-                has_result = bool(result and result.strip())
-                sherpa_logger.debug(f"当前结果: {result}, 是否有结果: {has_result}")
+                if not self.recognizer.is_endpoint(self.current_stream):
+                    return False
 
-                return has_result
+                # 端点：当前假设成为完整结果，流重置后继续用于下一句
+                timing = self._take_segment_timing(self.current_stream)
+                self.recognizer.reset(self.current_stream)
+                text = self._partial_text.strip()
+                self._partial_text = ""
+                self._delivered_text = ""
+                if not text:
+                    return False
+                self._final_text = text
+                self._final_timing = timing
+                if is_enabled_for(sherpa_logger, logging.DEBUG):
+                    sherpa_logger.debug(f"检测到端点，完整结果: {text}")
+                return True
             except Exception as e:
-                sherpa_logger.error(f"检查结果错误: {e}")
+                sherpa_logger.error(f"处理音频数据错误: {e}")
                 import traceback
                 sherpa_logger.error(traceback.format_exc())
                 return False
@@ -920,73 +901,166 @@ class SherpaOnnxASR:
             print(traceback.format_exc())
             return False
 
-    def Result(self) -> str:
+    def _take_segment_timing(self, stream: Any) -> Dict[str, Any]:
         """
-        获取当前识别结果（兼容Vosk API）
+        取出当前句子的起止位置和每个词的起止位置，并把下一句的开始位置移到这里
+
+        sherpa-onnx 的 token 时间戳以句子开始（流创建或上次端点重置）为零点。
+
+        Args:
+            stream: 当前的流
 
         Returns:
-            str: 当前识别结果
+            Dict[str, Any]: {"start_sample", "end_sample", "words"}，样本位置以 accepted_samples 计
         """
-        try:
-            # 检查识别器和流是否已初始化
-            if not self.recognizer or not hasattr(self, 'current_stream') or self.current_stream is None:
-                return ""
+        from src.core.asr.transcript_segment import words_from_tokens
+
+        start = self._segment_start_sample
+        end = self.accepted_samples
+        self._segment_start_sample = end
+        words = []
+        get_result_all = getattr(self.recognizer, 'get_result_all', None)
+        if get_result_all is not None:
+            try:
+                result = get_result_all(stream)
+                words = words_from_tokens(list(result.tokens), list(result.timestamps), start, end,
+                                          self.sample_rate)
+            except Exception as e:
+                self._logger.debug(f"获取 token 时间戳错误: {e}")
+        if words:
+            return {"start_sample": words[0].start_sample, "end_sample": words[-1].end_sample, "words": words}
+        return {"start_sample": start, "end_sample": end, "words": []}
 
-            # 解码
-            while self.recognizer.is_ready(self.current_stream):
-                self.recognizer.decode_stream(self.current_stream)
+    def LastResultTiming(self) -> Optional[Dict[str, Any]]:
+        """
+        获取最近一次完整结果（Result()/FinalResult()）的时间信息
 
-            # 获取结果
-            result = self.recognizer.get_result(self.current_stream)
+        Returns:
+            Optional[Dict[str, Any]]: {"start_sample", "end_sample", "words": [WordTiming]}，
+                样本位置以本引擎 AcceptWaveform 接收的音频计（accepted_samples），没有时返回 None
+        """
+        return self._final_timing
 
-            # 重置流
-            self.current_stream = self.recognizer.create_stream()
+    def _format_sentence(self, text: str) -> str:
+        """
+        格式化完整结果：在大写字母处断句，去除末尾空格并确保以句号结尾
 
-            # 处理结果
-            if result:
-                # 使用正则表达式处理结果，确保每个句子以句号结尾
-                import re
-                result = re.sub(r'(?<=[a-zA-Z0-9])(?=[A-Z])', '. ', result)
-                result = re.sub(r'\s+$', '', result)  # 去除末尾空格
-                if not result.endswith('.'):
-                    result += '.'  # 确保结果以句号结尾
-
-            return result if result else ""
-        except Exception as e:
-            print(f"Result 错误: {e}")
-            import traceback
-            print(traceback.format_exc())
+        Args:
+            text: 识别文本
+
+        Returns:
+            str: 格式化后的文本，空文本返回空字符串
+        """
+        if not text:
             return ""
+        import re
+        text = re.sub(r'(?<=[a-zA-Z0-9])(?=[A-Z])', '. ', text)
+        text = re.sub(r'\s+$', '', text)  # 去除末尾空格
+        if not text.endswith('.'):
+            text += '.'  # 确保结果以句号结尾
+        return text
+
+    def Result(self) -> str:
+        """
+        获取最近一次端点处的完整识别结果（兼容Vosk API）
+
+        Returns:
+            str: 完整识别结果，没有新的完整结果时返回空字符串
+        """
+        result, self._final_text = self._final_text, ""
+        return self._format_sentence(result)
 
     def PartialResult(self) -> str:
         """
-        获取部分识别结果（兼容Vosk API）
+        获取当前句子的部分识别结果（兼容Vosk API），使用 AcceptWaveform 缓存的结果，不重复解码
 
         Returns:
             str: 部分识别结果
         """
-        try:
-            # 检查识别器和流是否已初始化
-            if not self.recognizer or not hasattr(self, 'current_stream') or self.current_stream is None:
-                return ""
+        return self._partial_text
 
-            # 解码
-            while self.recognizer.is_ready(self.current_stream):
-                self.recognizer.decode_stream(self.current_stream)
+    def PartialDelta(self) -> Dict[str, Any]:
+        """
+        获取自上次调用以来部分结果新增的文本（新解码出的 token）
+
+        贪心搜索的部分结果只会在末尾追加，通常只需要处理新增部分；
+        假设被改写（如使用 modified_beam_search）时 replaced 为 True，delta 为完整文本。
 
-            # 获取部分结果
-            result = self.recognizer.get_result(self.current_stream)
+        Returns:
+            Dict[str, Any]: {"text": 完整部分结果, "delta": 新增文本, "replaced": 是否改写了之前的结果}
+        """
+        text = self._partial_text
+        delivered = self._delivered_text
+        self._delivered_text = text
+        if text.startswith(delivered):
+            return {"text": text, "delta": text[len(delivered):], "replaced": False}
+        return {"text": text, "delta": text, "replaced": True}
+
+    def FinalResult(self) -> str:
+        """
+        结束输入并取出当前句子剩余的识别结果（兼容Vosk API），之后重新开始新的流
 
-            return result if result else ""
+        Returns:
+            str: 最终识别结果，没有时返回空字符串
+        """
+        try:
+            text = self._final_text
+            stream = self.current_stream
+            if self.recognizer and stream is not None:
+                # 添加尾部填充并标记输入结束，让最后几帧也被解码
+                stream.accept_waveform(self.sample_rate, np.zeros(int(0.2 * self.sample_rate), dtype=np.float32))
+                stream.input_finished()
+                while self.recognizer.is_ready(stream):
+                    self.recognizer.decode_stream(stream)
+                rest = self.recognizer.get_result(stream).strip()
+                if rest:
+                    self._final_timing = self._take_segment_timing(stream)
+                text = " ".join(part for part in (text, rest) if part)
+            timing = self._final_timing
+            self.Reset()
+            self._final_timing = timing
+            return self._format_sentence(text)
         except Exception as e:
-            print(f"PartialResult 错误: {e}")
+            print(f"FinalResult 错误: {e}")
             import traceback
             print(traceback.format_exc())
             return ""
 
+    def Reset(self) -> None:
+        """丢弃当前句子的音频和结果，下一个块从新的流开始（兼容Vosk API）"""
+        self.current_stream = None
+        self._partial_text = ""
+        self._delivered_text = ""
+        self._final_text = ""
+        self._segment_start_sample = self.accepted_samples
+        self._final_timing = None
+
+    def create_decoder_hub(self, **kwargs) -> Optional[Any]:
+        """
+        创建共享本引擎识别器（同一份模型权重）的多路识别中心
+
+        Args:
+            **kwargs: 传给 StreamingDecoderHub 的参数（max_batch、latency_slo_ms 等）
+
+        Returns:
+            Optional[StreamingDecoderHub]: 识别中心，识别器未初始化时返回 None
+        """
+        if not self.recognizer:
+            return None
+        from src.core.asr.streaming_hub import StreamingDecoderHub
+        return StreamingDecoderHub(self.recognizer, self.sample_rate, **kwargs)
+
+    def _release_recognizer(self) -> None:
+        """把识别器归还给识别器池"""
+        pool = getattr(self, '_pool', None)
+        if pool is not None and self.recognizer is not None:
+            pool.release(self.recognizer)
+        self._pool = None
+        self.recognizer = None
+
     def __del__(self):
         """清理资源"""
-        self.recognizer = None
+        self._release_recognizer()
         self.stream = None
         if hasattr(self, 'current_stream'):
             self.current_stream = None
@@ -0,0 +1,353 @@
+"""
+流式识别中心模块
+负责让多路音频（会话）共享同一个 sherpa-onnx OnlineRecognizer，并把就绪的流合并为一次批量解码
+"""
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Callable, List
+
+import numpy as np
+
+from src.core.audio.pipeline_stats import LatencyStats
+
+# 识别结果回调：(会话ID, 文本, 是否为完整结果)
+ResultCallback = Callable[[int, str, bool], None]
+
+
+class DecoderSession:
+    """一路音频的识别会话
+
+    音频由任意线程通过 StreamingDecoderHub.accept_waveform() 放入 pending 队列，
+    只有解码线程会把它送入 sherpa-onnx 流，因此流不会在解码期间被其他线程修改。
+    """
+
+    def __init__(self, session_id: int, name: str, stream: Any, on_result: Optional[ResultCallback],
+                 latency_slo: float):
+        """
+        初始化会话
+
+        Args:
+            session_id: 会话ID
+            name: 会话名称（如音频来源名称）
+            stream: sherpa-onnx 流
+            on_result: 识别结果回调
+            latency_slo: 延迟目标（秒）：音频到达后应在此时间内完成解码
+        """
+        self.id = session_id
+        self.name = name
+        self.stream = stream
+        self.on_result = on_result
+        self.latency_slo = latency_slo
+
+        self.pending = deque()  # 尚未送入流的音频块
+        self.oldest_pending_time = None  # 最早一块尚未解码完的音频的到达时间
+        self.closing = False
+        self.input_finished = False  # 关闭后已向流标记输入结束
+        self.partial_text = ""
+
+        self.frames = 0
+        self.decodes = 0
+        self.finals = 0
+        self.slo_violations = 0
+        self.latency = LatencyStats()
+
+    @property
+    def deadline(self) -> float:
+        """最早一块未解码音频的截止时间，没有积压时为无穷大"""
+        if self.oldest_pending_time is None:
+            return float("inf")
+        return self.oldest_pending_time + self.latency_slo
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取会话统计
+
+        Returns:
+            Dict[str, Any]: 统计信息
+        """
+        return {
+            "name": self.name,
+            "frames": self.frames,
+            "decodes": self.decodes,
+            "finals": self.finals,
+            "slo_violations": self.slo_violations,
+            "latency": self.latency.get_stats(),
+        }
+
+
+class StreamingDecoderHub:
+    """多路流式识别中心
+
+    所有会话共享一个已加载的识别器（一份模型权重）。每个调度周期（tick）：
+    1. 把各会话 pending 队列中的音频送入各自的流
+    2. 收集可以解码的流，按截止时间从早到晚排序（最早截止优先），最多取 max_batch 个，
+       这样积压最久的会话先被服务，单个会话无法长期占满批次
+    3. 用一次 decode_streams() 批量解码，然后检查端点并通过回调发送部分结果和完整结果
+
+    音频从到达到该会话积压全部解码完成的时间记为延迟，超过 latency_slo 记为一次违约。
+    可以由 start() 启动的后台线程驱动，也可以在测试或自有循环中直接调用 tick()。
+    """
+
+    def __init__(self, recognizer: Any, sample_rate: int = 16000, max_batch: int = 16,
+                 latency_slo_ms: float = 300.0, idle_wait: float = 0.01):
+        """
+        初始化识别中心
+
+        Args:
+            recognizer: sherpa-onnx OnlineRecognizer（需要支持 decode_streams）
+            sample_rate: 输入音频采样率
+            max_batch: 每次批量解码的最大流数
+            latency_slo_ms: 默认的会话延迟目标（毫秒）
+            idle_wait: 后台线程没有可解码的流时的最长等待时间（秒）
+        """
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.max_batch = max(1, int(max_batch))
+        self.latency_slo = latency_slo_ms / 1000.0
+        self.idle_wait = idle_wait
+
+        self._sessions: Dict[int, DecoderSession] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._data_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self.ticks = 0
+        self.batches = 0
+        self.decoded_streams = 0
+        self.batch_seconds = LatencyStats()
+
+    def open_session(self, name: Optional[str] = None, on_result: Optional[ResultCallback] = None,
+                     latency_slo_ms: Optional[float] = None) -> int:
+        """
+        注册一路音频
+
+        Args:
+            name: 会话名称
+            on_result: 识别结果回调 (会话ID, 文本, 是否为完整结果)，在解码线程中调用
+            latency_slo_ms: 该会话的延迟目标（毫秒），None 表示使用默认值
+
+        Returns:
+            int: 会话ID
+        """
+        stream = self.recognizer.create_stream()
+        slo = self.latency_slo if latency_slo_ms is None else latency_slo_ms / 1000.0
+        with self._lock:
+            session_id = next(self._ids)
+            self._sessions[session_id] = DecoderSession(
+                session_id, name or f"session-{session_id}", stream, on_result, slo
+            )
+        return session_id
+
+    def accept_waveform(self, session_id: int, samples: np.ndarray) -> bool:
+        """
+        放入一块音频（可在任意线程调用）
+
+        Args:
+            session_id: 会话ID
+            samples: 单声道 float32 音频
+
+        Returns:
+            bool: 会话存在且未关闭时返回 True
+        """
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.closing:
+                return False
+            session.pending.append(np.asarray(samples, dtype=np.float32))
+            session.frames += len(samples)
+            if session.oldest_pending_time is None:
+                session.oldest_pending_time = now
+        self._data_event.set()
+        return True
+
+    def close_session(self, session_id: int) -> bool:
+        """
+        结束一路音频：剩余音频解码完后发送最终结果并移除会话
+
+        Args:
+            session_id: 会话ID
+
+        Returns:
+            bool: 会话是否存在
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return False
+            session.closing = True
+        self._data_event.set()
+        return True
+
+    @property
+    def session_count(self) -> int:
+        """当前会话数"""
+        with self._lock:
+            return len(self._sessions)
+
+    def _feed_pending(self) -> List[DecoderSession]:
+        """
+        把各会话的待处理音频送入流，并处理已关闭的会话
+
+        Returns:
+            List[DecoderSession]: 所有会话
+        """
+        with self._lock:
+            sessions = list(self._sessions.values())
+            feeds = []
+            for session in sessions:
+                chunks = list(session.pending)
+                session.pending.clear()
+                feeds.append((session, chunks, session.closing))
+
+        for session, chunks, closing in feeds:
+            for chunk in chunks:
+                session.stream.accept_waveform(self.sample_rate, chunk)
+            if closing and not session.input_finished:
+                # 尾部填充让最后几帧也能被解码
+                session.stream.accept_waveform(self.sample_rate, np.zeros(int(0.2 * self.sample_rate), np.float32))
+                session.stream.input_finished()
+                session.input_finished = True
+        return sessions
+
+    def tick(self) -> int:
+        """
+        执行一个调度周期
+
+        Returns:
+            int: 本周期解码的流数
+        """
+        self.ticks += 1
+        sessions = self._feed_pending()
+
+        ready = [session for session in sessions if self.recognizer.is_ready(session.stream)]
+        ready.sort(key=lambda session: session.deadline)
+        batch = ready[:self.max_batch]
+
+        if batch:
+            start = time.perf_counter()
+            self.recognizer.decode_streams([session.stream for session in batch])
+            self.batch_seconds.add(time.perf_counter() - start)
+            self.batches += 1
+            self.decoded_streams += len(batch)
+
+        now = time.monotonic()
+        for session in batch:
+            session.decodes += 1
+            self._collect_result(session, now)
+
+        # 已关闭且解码完的会话：发送最终结果并移除
+        for session in sessions:
+            if session.input_finished and not self.recognizer.is_ready(session.stream):
+                self._finish_session(session)
+        return len(batch)
+
+    def _collect_result(self, session: DecoderSession, now: float) -> None:
+        """
+        解码后检查会话的结果、端点和延迟
+
+        Args:
+            session: 会话
+            now: 当前时间（time.monotonic()）
+        """
+        if not self.recognizer.is_ready(session.stream):
+            # 已到达的音频全部解码完成
+            with self._lock:
+                caught_up = not session.pending
+                arrival = session.oldest_pending_time
+                if caught_up:
+                    session.oldest_pending_time = None
+            if caught_up and arrival is not None:
+                latency = now - arrival
+                session.latency.add(latency)
+                if latency > session.latency_slo:
+                    session.slo_violations += 1
+
+        text = self.recognizer.get_result(session.stream).strip()
+        if self.recognizer.is_endpoint(session.stream):
+            self.recognizer.reset(session.stream)
+            session.partial_text = ""
+            if text:
+                session.finals += 1
+                self._emit(session, text, True)
+        elif text != session.partial_text:
+            session.partial_text = text
+            self._emit(session, text, False)
+
+    def _finish_session(self, session: DecoderSession) -> None:
+        """
+        发送会话的最终结果并移除会话
+
+        Args:
+            session: 会话
+        """
+        text = self.recognizer.get_result(session.stream).strip()
+        with self._lock:
+            self._sessions.pop(session.id, None)
+        if text:
+            session.finals += 1
+            self._emit(session, text, True)
+
+    def _emit(self, session: DecoderSession, text: str, is_final: bool) -> None:
+        """调用会话的结果回调，回调异常不影响其他会话"""
+        if not session.on_result:
+            return
+        try:
+            session.on_result(session.id, text, is_final)
+        except Exception as e:
+            print(f"会话 {session.name} 的结果回调错误: {e}")
+
+    def start(self) -> None:
+        """启动后台解码线程"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="StreamingDecoderHub", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """
+        停止后台解码线程（未关闭的会话保持原状）
+
+        Args:
+            timeout: 等待线程退出的时间（秒）
+        """
+        self._stop_event.set()
+        self._data_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        """后台解码线程"""
+        while not self._stop_event.is_set():
+            try:
+                decoded = self.tick()
+            except Exception as e:
+                print(f"批量解码错误: {e}")
+                decoded = 0
+            if not decoded:
+                self._data_event.wait(self.idle_wait)
+                self._data_event.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取识别中心及各会话的统计
+
+        Returns:
+            Dict[str, Any]: 统计信息
+        """
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return {
+            "sessions": len(sessions),
+            "ticks": self.ticks,
+            "batches": self.batches,
+            "mean_batch_size": self.decoded_streams / self.batches if self.batches else 0.0,
+            "batch": self.batch_seconds.get_stats(),
+            "session_stats": {session.id: session.get_stats() for session in sessions},
+        }
@@ -0,0 +1,283 @@
+"""
+转录结果缓存模块
+负责把文件转录结果（文本和分段时间戳）持久化到 SQLite，同一文件用同一模型和解码参数再次转录时不再进行识别
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional, List
+
+from src.core.audio.pcm_cache import file_fingerprint
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    audio_hash TEXT NOT NULL,
+    model_id TEXT NOT NULL,
+    model_checksum TEXT NOT NULL,
+    params_hash TEXT NOT NULL,
+    params TEXT NOT NULL,
+    text TEXT NOT NULL,
+    segments TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (audio_hash, model_id, model_checksum, params_hash)
+)
+"""
+
+
+def model_checksum(model_path: str) -> str:
+    """
+    计算模型文件的校验和：目录下所有文件（或单个文件）的相对路径和内容指纹
+
+    模型文件被替换、重新下载或修改后校验和随之变化，旧的转录结果不再命中。
+
+    Args:
+        model_path: 模型目录或模型文件
+
+    Returns:
+        str: 十六进制校验和
+
+    Raises:
+        OSError: 无法读取模型文件时
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if os.path.isfile(model_path):
+        digest.update(file_fingerprint(model_path).encode())
+        return digest.hexdigest()
+    if not os.path.isdir(model_path):
+        raise FileNotFoundError(f"模型路径不存在: {model_path}")
+    for root, dirs, files in os.walk(model_path):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, model_path).replace(os.sep, "/")
+            digest.update(f"{relative}:{file_fingerprint(path)}\n".encode())
+    return digest.hexdigest()
+
+
+def params_hash(params: Dict[str, Any]) -> str:
+    """
+    计算解码参数的哈希（与键的顺序无关）
+
+    Args:
+        params: 解码参数，值必须能被序列化为 JSON
+
+    Returns:
+        str: 十六进制哈希
+    """
+    text = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class TranscriptCache:
+    """转录结果缓存
+
+    - 键为 (音频内容指纹, 模型 ID, 模型文件校验和, 解码参数哈希)，任意一项变化都不会命中
+    - 值为转录文本和分段时间戳 [{"start", "end", "text"}]
+    - 写入新结果时删除同一模型 ID 下模型校验和不同的旧条目（模型文件已经变化）
+    - 记录命中、未命中次数，get_stats() 返回命中率
+    """
+
+    def __init__(self, db_path: str):
+        """
+        初始化转录结果缓存
+
+        Args:
+            db_path: SQLite 数据库文件路径（目录不存在时自动创建），":memory:" 表示只保存在内存中
+        """
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(db_path)) if db_path != ":memory:" else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 转录在后台线程中进行，连接由锁保护，允许跨线程使用
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(_SCHEMA)
+
+    def _key(self, file_path: str, model_id: str, model_path: str, params: Dict[str, Any]) -> tuple:
+        """计算缓存键"""
+        return file_fingerprint(file_path), model_id, model_checksum(model_path), params_hash(params)
+
+    def get(self, file_path: str, model_id: str, model_path: str,
+            params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        查找文件的转录结果
+
+        Args:
+            file_path: 音频/视频文件
+            model_id: 模型 ID（如配置中的模型类型）
+            model_path: 模型目录或文件，用于计算模型校验和
+            params: 解码参数
+
+        Returns:
+            Optional[Dict[str, Any]]: {"text", "segments", "created"}，未命中时返回 None
+        """
+        try:
+            key = self._key(file_path, model_id, model_path, params or {})
+        except OSError as e:
+            print(f"计算转录缓存键失败: {e}")
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, segments, created FROM transcripts WHERE audio_hash = ? AND model_id = ? "
+                "AND model_checksum = ? AND params_hash = ?", key).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE transcripts SET hits = hits + 1, last_used = ? WHERE audio_hash = ? AND model_id = ? "
+                    "AND model_checksum = ? AND params_hash = ?", (time.time(),) + key)
+            self.hits += 1
+        return {"text": row[0], "segments": json.loads(row[1]), "created": row[2]}
+
+    def put(self, file_path: str, model_id: str, model_path: str, params: Optional[Dict[str, Any]],
+            text: str, segments: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """
+        保存文件的转录结果
+
+        Args:
+            file_path: 音频/视频文件
+            model_id: 模型 ID
+            model_path: 模型目录或文件
+            params: 解码参数
+            text: 转录文本
+            segments: 分段时间戳 [{"start", "end", "text"}]
+
+        Returns:
+            bool: 是否成功
+        """
+        params = params or {}
+        try:
+            key = self._key(file_path, model_id, model_path, params)
+        except OSError as e:
+            print(f"计算转录缓存键失败: {e}")
+            return False
+        now = time.time()
+        try:
+            with self._lock, self._conn:
+                # 同一模型的文件已经变化，旧结果不会再被命中
+                cursor = self._conn.execute(
+                    "DELETE FROM transcripts WHERE model_id = ? AND model_checksum != ?", (model_id, key[2]))
+                self.invalidations += cursor.rowcount
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO transcripts (audio_hash, model_id, model_checksum, params_hash, "
+                    "params, text, segments, created, last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    key + (json.dumps(params, sort_keys=True, ensure_ascii=False, default=str), text,
+                           json.dumps(segments or [], ensure_ascii=False), now, now))
+                self.stores += 1
+        except sqlite3.Error as e:
+            print(f"保存转录缓存失败: {e}")
+            return False
+        return True
+
+    def invalidate_model(self, model_id: str, model_path: Optional[str] = None) -> int:
+        """
+        删除模型的缓存条目
+
+        Args:
+            model_id: 模型 ID
+            model_path: 指定时只删除与该模型文件当前校验和不同的条目（模型文件已经变化）
+
+        Returns:
+            int: 删除的条目数
+        """
+        query, args = "DELETE FROM transcripts WHERE model_id = ?", (model_id,)
+        if model_path is not None:
+            try:
+                checksum = model_checksum(model_path)
+            except OSError as e:
+                print(f"计算模型校验和失败: {e}")
+                checksum = ""
+            query, args = query + " AND model_checksum != ?", (model_id, checksum)
+        with self._lock, self._conn:
+            removed = self._conn.execute(query, args).rowcount
+            self.invalidations += removed
+        return removed
+
+    def invalidate_file(self, file_path: str) -> int:
+        """
+        删除文件的所有缓存条目
+
+        Args:
+            file_path: 音频/视频文件
+
+        Returns:
+            int: 删除的条目数
+        """
+        try:
+            audio_hash = file_fingerprint(file_path)
+        except OSError:
+            return 0
+        with self._lock, self._conn:
+            removed = self._conn.execute("DELETE FROM transcripts WHERE audio_hash = ?", (audio_hash,)).rowcount
+            self.invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        """删除所有缓存条目"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM transcripts")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计
+
+        Returns:
+            Dict[str, Any]: 统计信息
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "invalidations": self.invalidations,
+        }
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_transcript_cache() -> Optional[TranscriptCache]:
+    """
+    获取全局转录结果缓存，配置来自 asr.transcript_cache
+
+    Returns:
+        Optional[TranscriptCache]: 缓存实例，未启用或无法创建时返回 None
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            try:
+                from src.utils.config_manager import config_manager
+                cache_config = config_manager.get_config("asr", "transcript_cache", default={}) or {}
+            except ImportError:
+                return None
+            if not cache_config.get("enabled", False):
+                return None
+            try:
+                _default_cache = TranscriptCache(cache_config.get("path", "cache/transcripts.sqlite3"))
+            except (OSError, sqlite3.Error) as e:
+                print(f"创建转录结果缓存失败: {e}")
+                return None
+        return _default_cache
@@ -0,0 +1,341 @@
+"""
+转录分段模块
+定义带时间戳的完整识别结果（句子及其中每个词在音频流中的起止样本位置），
+负责把识别器给出的词/token 时间映射为音频流中的位置，并生成 SRT 字幕
+"""
+import bisect
+import json
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+# SentencePiece/BPE token 的词首标记
+WORD_BOUNDARY = "▁"
+
+# sherpa-onnx 只给出每个 token 的开始时间，最后一个 token 的时长按此估计（秒），
+# 避免把端点检测前的尾部静音算进句子
+LAST_TOKEN_SECONDS = 0.4
+
+
+@dataclass
+class WordTiming:
+    """一个词的文本及起止样本位置（左闭右开）"""
+    text: str
+    start_sample: int
+    end_sample: int
+
+
+@dataclass
+class TranscriptSegment:
+    """一个完整识别结果（句子）及其在音频流中的位置"""
+    text: str
+    start_sample: int  # 音频流内绝对样本位置（左闭右开）
+    end_sample: int
+    sample_rate: int = 16000
+    words: List[WordTiming] = field(default_factory=list)
+    captured_at: Optional[float] = None  # 句子最后一个样本的录音时间（time.time()）
+    emitted_at: Optional[float] = None  # 识别结果发出的时间（time.time()）
+
+    @property
+    def start(self) -> float:
+        """开始时间（秒）"""
+        return self.start_sample / self.sample_rate
+
+    @property
+    def end(self) -> float:
+        """结束时间（秒）"""
+        return self.end_sample / self.sample_rate
+
+    @property
+    def latency(self) -> Optional[float]:
+        """端到端延迟：句子最后一个样本录下到识别结果发出的时间（秒），未知时为 None"""
+        if self.captured_at is None or self.emitted_at is None:
+            return None
+        return self.emitted_at - self.captured_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为与文件转录分段相同格式的字典
+
+        Returns:
+            Dict[str, Any]: {"start", "end", "text", "words": [{"text", "start", "end"}]}，时间单位为秒
+        """
+        return {
+            "start": self.start,
+            "end": self.end,
+            "text": self.text,
+            "words": [
+                {"text": word.text, "start": word.start_sample / self.sample_rate,
+                 "end": word.end_sample / self.sample_rate}
+                for word in self.words
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], sample_rate: int = 16000) -> "TranscriptSegment":
+        """
+        从 {"start", "end", "text"}（秒）格式的分段创建，例如文件转录的 last_segments
+
+        Args:
+            data: 分段字典，可包含 words
+            sample_rate: 采样率
+
+        Returns:
+            TranscriptSegment: 分段
+        """
+        return cls(
+            text=data.get("text", ""),
+            start_sample=int(round(float(data["start"]) * sample_rate)),
+            end_sample=int(round(float(data["end"]) * sample_rate)),
+            sample_rate=sample_rate,
+            words=[
+                WordTiming(word.get("text", ""), int(round(float(word["start"]) * sample_rate)),
+                           int(round(float(word["end"]) * sample_rate)))
+                for word in data.get("words") or []
+            ],
+        )
+
+
+def words_from_vosk_result(result: Dict[str, Any], sample_rate: int = 16000) -> List[WordTiming]:
+    """
+    从 Vosk 结果（SetWords(True) 时的 "result" 字段）中取出每个词的起止位置
+
+    Vosk 的词时间以识别器创建以来接收的音频计，Reset() 后继续累计。
+
+    Args:
+        result: 解析后的 Vosk 结果 JSON
+        sample_rate: 采样率
+
+    Returns:
+        List[WordTiming]: 每个词的起止位置（识别器已接收的样本数计）
+    """
+    words = []
+    for word in result.get("result") or []:
+        try:
+            words.append(WordTiming(str(word.get("word", "")), int(round(float(word["start"]) * sample_rate)),
+                                    int(round(float(word["end"]) * sample_rate))))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return words
+
+
+def _is_cjk(text: str) -> bool:
+    """文本是否为单个表意文字（中日韩文字每个 token 作为一个词）"""
+    return len(text) == 1 and unicodedata.category(text) == "Lo"
+
+
+def words_from_tokens(tokens: Sequence[str], timestamps: Sequence[float], start_sample: int, end_sample: int,
+                      sample_rate: int = 16000) -> List[WordTiming]:
+    """
+    把 sherpa-onnx 的 token 和 token 开始时间合并为词
+
+    以词首标记（▁）或空格开头的 token 开始一个新词，中日韩文字每个 token 是一个词，
+    其余 token 接在前一个词后面。每个词在下一个词开始时结束，最后一个词的时长按
+    LAST_TOKEN_SECONDS 估计，且不超过 end_sample。
+
+    Args:
+        tokens: token 列表
+        timestamps: 每个 token 的开始时间（秒，以句子开始为零点）
+        start_sample: 句子开始的样本位置
+        end_sample: 端点检测时的样本位置
+        sample_rate: 采样率
+
+    Returns:
+        List[WordTiming]: 每个词的起止位置
+    """
+    words = []
+    for token, timestamp in zip(tokens, timestamps):
+        position = min(end_sample, start_sample + int(round(float(timestamp) * sample_rate)))
+        text = token.replace(WORD_BOUNDARY, " ")
+        new_word = (not words or text.startswith(" ") or _is_cjk(text.strip())
+                    or _is_cjk(words[-1].text[-1:]))
+        text = text.strip()
+        if not text:
+            continue
+        if new_word:
+            if words:
+                words[-1].end_sample = max(words[-1].start_sample, position)
+            words.append(WordTiming(text, position, position))
+        else:
+            words[-1].text += text
+            words[-1].end_sample = position
+    if words:
+        last = words[-1]
+        estimated_end = min(end_sample, last.start_sample + int(LAST_TOKEN_SECONDS * sample_rate))
+        last.end_sample = max(last.end_sample, estimated_end)
+    return words
+
+
+def parse_result_timing(recognizer: Any, result: Any, sample_rate: int = 16000) -> Optional[Dict[str, Any]]:
+    """
+    取出识别器最近一次完整结果的时间信息
+
+    Vosk 的结果是带 "result" 词列表的 JSON；提供 LastResultTiming() 的识别器
+    （SherpaOnnxASR）从该方法取得。
+
+    Args:
+        recognizer: 识别器
+        result: Result()/FinalResult() 的返回值
+        sample_rate: 采样率
+
+    Returns:
+        Optional[Dict[str, Any]]: {"start_sample", "end_sample", "words"}，样本位置以识别器已接收的
+            音频计；识别器不提供时间信息时返回 None
+    """
+    if isinstance(result, str) and result.lstrip().startswith("{"):
+        try:
+            result = json.loads(result)
+        except json.JSONDecodeError:
+            return None
+    if isinstance(result, dict):
+        words = words_from_vosk_result(result, sample_rate)
+        if not words:
+            return None
+        return {"start_sample": words[0].start_sample, "end_sample": words[-1].end_sample, "words": words}
+
+    last_result_timing = getattr(recognizer, "LastResultTiming", None)
+    if last_result_timing is None:
+        return None
+    timing = last_result_timing()
+    if not isinstance(timing, dict):
+        return None
+    return timing
+
+
+class SampleMap:
+    """送入识别器的音频与音频流位置的对应关系
+
+    VAD 只把语音送入识别器，识别器的时间（已接收的样本数）与音频流中的位置不同。
+    每次送入识别器时记录这段音频在音频流中的起始位置，之后把识别器时间换算回音频流位置。
+    连续的片段合并为一段，只保留最近 max_pieces 段。
+    """
+
+    def __init__(self, max_pieces: int = 4096):
+        """
+        初始化对应关系
+
+        Args:
+            max_pieces: 最多保留的片段数
+        """
+        self.max_pieces = max(2, int(max_pieces))
+        self.fed = 0  # 已送入识别器的样本数
+        self._fed_starts = []
+        self._stream_starts = []
+        self._lengths = []
+
+    def add(self, stream_start: int, length: int) -> None:
+        """
+        记录一段送入识别器的音频
+
+        Args:
+            stream_start: 这段音频在音频流中的起始样本位置
+            length: 样本数
+        """
+        if length <= 0:
+            return
+        if self._lengths and self._stream_starts[-1] + self._lengths[-1] == stream_start:
+            self._lengths[-1] += length
+        else:
+            self._fed_starts.append(self.fed)
+            self._stream_starts.append(stream_start)
+            self._lengths.append(length)
+            if len(self._lengths) > self.max_pieces:
+                drop = len(self._lengths) - self.max_pieces // 2
+                del self._fed_starts[:drop], self._stream_starts[:drop], self._lengths[:drop]
+        self.fed += length
+
+    def to_stream(self, fed_position: int) -> Optional[int]:
+        """
+        把已送入识别器的样本位置换算为音频流中的位置
+
+        用于开始位置：正好在两段之间时返回后一段的开头（结束位置使用 to_stream_end()）；
+        超出记录范围时截断到两端。
+
+        Args:
+            fed_position: 已送入识别器的样本位置
+
+        Returns:
+            Optional[int]: 音频流中的位置，没有任何记录时返回 None
+        """
+        if not self._lengths:
+            return None
+        index = bisect.bisect_right(self._fed_starts, fed_position) - 1
+        if index < 0:
+            return self._stream_starts[0]
+        offset = min(max(0, fed_position - self._fed_starts[index]), self._lengths[index])
+        return self._stream_starts[index] + offset
+
+    def to_stream_end(self, fed_position: int) -> Optional[int]:
+        """
+        把结束位置（不包含）换算为音频流中的位置，正好在两段之间时返回前一段的末尾
+
+        Args:
+            fed_position: 已送入识别器的样本位置
+
+        Returns:
+            Optional[int]: 音频流中的位置，没有任何记录时返回 None
+        """
+        if not self._lengths:
+            return None
+        index = bisect.bisect_left(self._fed_starts, fed_position) - 1
+        if index < 0:
+            return self._stream_starts[0]
+        offset = min(max(0, fed_position - self._fed_starts[index]), self._lengths[index])
+        return self._stream_starts[index] + offset
+
+
+def format_srt_time(seconds: float) -> str:
+    """
+    格式化 SRT 时间
+
+    Args:
+        seconds: 秒数
+
+    Returns:
+        str: HH:MM:SS,mmm
+    """
+    milliseconds = max(0, int(round(seconds * 1000)))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
+
+
+def segments_to_srt(segments: Sequence[TranscriptSegment]) -> str:
+    """
+    生成 SRT 字幕，时间取自分段在音频流中的起止位置
+
+    Args:
+        segments: 分段列表
+
+    Returns:
+        str: SRT 文本
+    """
+    cues = []
+    for segment in segments:
+        text = segment.text.strip()
+        if not text:
+            continue
+        end = max(segment.end, segment.start)
+        cues.append(f"{len(cues) + 1}\n{format_srt_time(segment.start)} --> {format_srt_time(end)}\n{text}\n")
+    return "\n".join(cues)
+
+
+def write_srt(path: str, segments: Sequence[TranscriptSegment]) -> bool:
+    """
+    把分段写入 SRT 文件
+
+    Args:
+        path: 文件路径
+        segments: 分段列表
+
+    Returns:
+        bool: 是否写入成功
+    """
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(segments_to_srt(segments))
+        return True
+    except OSError as e:
+        print(f"写入SRT文件失败: {e}")
+        return False
@@ -4,6 +4,10 @@ import numpy as np
 from typing import Optional, Union
 from vosk import Model, KaldiRecognizer
 
+from src.core.audio.pcm_converter import PCMConverter
+from src.core.audio.ffmpeg_reader import FFmpegPCMReader
+from src.core.audio.pcm_cache import get_decoded_audio_cache
+
 
 class VoskASR:
     """VOSK ASR 引擎封装类"""
@@ -19,6 +23,8 @@ class VoskASR:
         self.model = None
         self.recognizer = None
         self.sample_rate = 16000
+        self._pcm_converter = PCMConverter()  # numpy 输入转换为 PCM 时复用缓冲区
+        self.last_segments = []  # 最近一次文件转录的分段时间戳 [{"start", "end", "text"}]
 
         # 设置引擎类型为vosk_small
         self.engine_type = "vosk_small"
@@ -61,7 +67,7 @@ class VoskASR:
         try:
             # 确保音频数据是字节类型
             if isinstance(audio_data, np.ndarray):
-                audio_data = (audio_data * 32767).astype(np.int16).tobytes()
+                audio_data = self._pcm_converter.float_to_pcm16_cbuffer(audio_data)
 
             if self.recognizer.AcceptWaveform(audio_data):
                 result = json.loads(self.recognizer.Result())
@@ -139,68 +145,83 @@ class VoskASR:
             print(traceback.format_exc())
             return None
 
+    def warm_up(self, seconds: float = 1.0) -> float:
+        """用一个临时识别器和合成音频预热模型，消除第一次识别的延迟
+
+        Args:
+            seconds: 合成音频时长（秒）
+
+        Returns:
+            float: 预热耗时（秒）
+        """
+        from src.core.asr.warmup import warm_up_vosk_model
+        if not self.model:
+            return 0.0
+        return warm_up_vosk_model(self.model, seconds, self.sample_rate)
+
     def transcribe_file(self, file_path: str) -> Optional[str]:
         """转录音频文件
 
+        使用 ffmpeg 流式解码（支持非WAV格式并自动重采样），同一文件已经解码过时直接读取解码音频缓存
+
         Args:
             file_path: 音频文件路径
 
         Returns:
             str: 转录文本，如果失败则返回 None
         """
-        import wave
-
         try:
             if not os.path.exists(file_path):
                 print(f"File not found: {file_path}")
                 return None
 
-            # 检查文件是否为WAV格式
-            if not file_path.lower().endswith('.wav'):
-                print(f"File is not a WAV file: {file_path}")
-                # 可以在这里添加转换为WAV格式的代码
-                return None
-
-            # 打开WAV文件
-            with wave.open(file_path, 'rb') as wf:
-                # 检查采样率
-                if wf.getframerate() != self.sample_rate:
-                    print(f"Sample rate mismatch: {wf.getframerate()} != {self.sample_rate}")
-                    # 可以在这里添加重采样的代码
-                    return None
-
-                # 创建新的识别器
-                recognizer = KaldiRecognizer(self.model, self.sample_rate)
-                recognizer.SetWords(True)
-
-                # 设置引擎类型
-                recognizer.engine_type = "vosk_small"
-
-                # 读取音频数据并进行识别
-                results = []
-                chunk_size = 4000  # 每次读取的帧数
-
-                # 读取整个文件的所有帧
-                all_frames = []
-                while True:
-                    frames = wf.readframes(chunk_size)
-                    if not frames:
-                        break
-                    all_frames.append(frames)
+            # 创建新的识别器
+            recognizer = KaldiRecognizer(self.model, self.sample_rate)
+            recognizer.SetWords(True)
 
-                # 重置文件指针
-                wf.rewind()
+            # 设置引擎类型
+            recognizer.engine_type = "vosk_small"
 
+            # 读取音频数据并进行识别
+            results = []
+            segments = []
+            chunk_size = 4000  # 每块的样本数
+            self.last_segments = []
+
+            def add_segment(result: dict) -> None:
+                # SetWords(True) 时结果带有每个词的起止时间
+                words = result.get("result") or []
+                if words:
+                    segments.append({"start": float(words[0]["start"]), "end": float(words[-1]["end"]),
+                                     "text": result.get("text", "").strip()})
+
+            def accept(frames: bytes) -> None:
+                if recognizer.AcceptWaveform(frames):
+                    result = json.loads(recognizer.Result())
+                    if result.get("text", "").strip():
+                        results.append(result.get("text", ""))
+                        add_segment(result)
+
+            def accept_head(head: list) -> None:
                 # 先处理前几个块，确保开头部分被正确识别
-                for i in range(min(5, len(all_frames))):
-                    recognizer.AcceptWaveform(all_frames[i])
-
-                # 处理所有音频块
-                for frames in all_frames:
-                    if recognizer.AcceptWaveform(frames):
-                        result = json.loads(recognizer.Result())
-                        if result.get("text", "").strip():
-                            results.append(result.get("text", ""))
+                for frames in head:
+                    recognizer.AcceptWaveform(frames)
+                for frames in head:
+                    accept(frames)
+
+            with FFmpegPCMReader(file_path, sample_rate=self.sample_rate, block_samples=chunk_size,
+                                 as_float=False, cache=get_decoded_audio_cache()) as reader:
+                head = []
+                for frames in reader:
+                    if head is None:
+                        accept(frames)
+                        continue
+                    head.append(frames)
+                    if len(head) == 5:
+                        accept_head(head)
+                        head = None
+                if head:
+                    accept_head(head)
 
                 # 获取最终结果
                 final_result_str = recognizer.FinalResult()
@@ -213,6 +234,7 @@ class VoskASR:
                 if final_text:
                     # 将最终结果添加到结果列表
                     results.append(final_text)
+                    add_segment(final_result)
 
                 # 合并所有结果
                 if results:
@@ -225,6 +247,7 @@ class VoskASR:
                         combined_result += '.'
 
                     print(f"文件转录合并结果: {combined_result}")
+                    self.last_segments = segments
                     return combined_result
                 else:
                     print("没有获取到任何转录结果")
@@ -0,0 +1,215 @@
+"""
+模型预热模块
+负责在模型加载后用一段合成音频走一遍完整的识别流程（ONNX Runtime 的延迟分配和算子选择、Vosk 的模型页面载入），
+消除第一次真实识别的延迟，预热在后台线程中进行
+"""
+import threading
+import time
+from typing import Dict, Any, Callable, List, Optional
+
+import numpy as np
+
+# 每次送入的合成音频时长（秒），与实时识别的块大小相当
+_CHUNK_SECONDS = 0.1
+
+
+def synthetic_audio(seconds: float, sample_rate: int = 16000) -> np.ndarray:
+    """
+    生成预热用的合成音频：低幅度的固定噪声
+
+    噪声而不是静音，让特征提取、编码器和搜索都走与真实语音相同的路径；固定种子保证每次相同。
+
+    Args:
+        seconds: 时长（秒）
+        sample_rate: 采样率
+
+    Returns:
+        np.ndarray: 单声道 float32 音频
+    """
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(seconds * sample_rate)) * 0.01).astype(np.float32)
+
+
+def warm_up_online_recognizer(recognizer: Any, seconds: float = 1.0, sample_rate: int = 16000) -> float:
+    """
+    用一个临时流预热 sherpa-onnx OnlineRecognizer
+
+    Args:
+        recognizer: sherpa-onnx OnlineRecognizer
+        seconds: 合成音频时长（秒）
+        sample_rate: 采样率
+
+    Returns:
+        float: 预热耗时（秒）
+    """
+    start_time = time.perf_counter()
+    stream = recognizer.create_stream()
+    samples = synthetic_audio(seconds, sample_rate)
+    chunk = max(1, int(_CHUNK_SECONDS * sample_rate))
+    for start in range(0, len(samples), chunk):
+        stream.accept_waveform(sample_rate, samples[start:start + chunk])
+        while recognizer.is_ready(stream):
+            recognizer.decode_stream(stream)
+    stream.input_finished()
+    while recognizer.is_ready(stream):
+        recognizer.decode_stream(stream)
+    recognizer.get_result(stream)
+    return time.perf_counter() - start_time
+
+
+def warm_up_vosk_model(model: Any, seconds: float = 1.0, sample_rate: int = 16000) -> float:
+    """
+    用一个临时识别器预热 Vosk 模型
+
+    Args:
+        model: vosk.Model
+        seconds: 合成音频时长（秒）
+        sample_rate: 采样率
+
+    Returns:
+        float: 预热耗时（秒）
+    """
+    from vosk import KaldiRecognizer
+
+    start_time = time.perf_counter()
+    recognizer = KaldiRecognizer(model, sample_rate)
+    pcm = (synthetic_audio(seconds, sample_rate) * 32767).astype(np.int16).tobytes()
+    chunk = max(2, int(_CHUNK_SECONDS * sample_rate) * 2)
+    for start in range(0, len(pcm), chunk):
+        recognizer.AcceptWaveform(pcm[start:start + chunk])
+    recognizer.FinalResult()
+    return time.perf_counter() - start_time
+
+
+# 每个模型最近一次的预热耗时（秒）
+_warmup_stats: Dict[str, Dict[str, Any]] = {}
+_warmup_stats_lock = threading.Lock()
+
+
+def get_warmup_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    获取各模型的预热统计
+
+    Returns:
+        Dict[str, Dict[str, Any]]: 模型名称 -> {"seconds", "audio_seconds", "count", "success"}
+    """
+    with _warmup_stats_lock:
+        return {name: dict(stats) for name, stats in _warmup_stats.items()}
+
+
+def get_warmup_seconds() -> float:
+    """
+    获取预热用的合成音频时长，配置来自 asr.warmup
+
+    Returns:
+        float: 时长（秒），未启用预热时返回 0
+    """
+    try:
+        from src.utils.config_manager import config_manager
+        warmup_config = config_manager.get_config("asr", "warmup", default={}) or {}
+    except ImportError:
+        return 0.0
+    if not warmup_config.get("enabled", False):
+        return 0.0
+    return max(0.0, float(warmup_config.get("audio_seconds", 1.0)))
+
+
+class ModelWarmup:
+    """在后台线程中预热一个模型
+
+    用法：
+        warmup = ModelWarmup("sherpa_0626_std", engine.warm_up, 1.0)
+        warmup.add_done_callback(lambda w: model_loaded.emit(True))
+        warmup.start()
+
+    回调在预热线程中调用（预热前已完成时在调用方线程中立即调用）；预热失败不影响模型使用，只记录错误。
+    """
+
+    def __init__(self, name: str, warm_up: Callable[[float], Any], audio_seconds: float = 1.0):
+        """
+        初始化模型预热
+
+        Args:
+            name: 模型名称，用于日志和统计
+            warm_up: 预热函数，参数为合成音频时长（秒）
+            audio_seconds: 合成音频时长（秒）
+        """
+        self.name = name
+        self.audio_seconds = audio_seconds
+        self.duration = None  # 预热耗时（秒）
+        self.error = None
+        self._warm_up = warm_up
+        self._done = threading.Event()
+        self._callbacks: List[Callable[["ModelWarmup"], None]] = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self) -> "ModelWarmup":
+        """
+        启动预热线程
+
+        Returns:
+            ModelWarmup: 自身
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"ModelWarmup-{self.name}", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        """预热线程"""
+        start_time = time.perf_counter()
+        try:
+            self._warm_up(self.audio_seconds)
+        except Exception as e:
+            self.error = e
+            print(f"模型预热失败 ({self.name}): {e}")
+        self.duration = time.perf_counter() - start_time
+
+        with _warmup_stats_lock:
+            stats = _warmup_stats.setdefault(self.name, {"count": 0})
+            stats.update(seconds=self.duration, audio_seconds=self.audio_seconds, success=self.error is None)
+            stats["count"] += 1
+
+        with self._lock:
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._call(callback)
+
+    def _call(self, callback: Callable[["ModelWarmup"], None]) -> None:
+        """调用完成回调"""
+        try:
+            callback(self)
+        except Exception as e:
+            print(f"模型预热回调失败 ({self.name}): {e}")
+
+    def add_done_callback(self, callback: Callable[["ModelWarmup"], None]) -> None:
+        """
+        添加预热完成回调
+
+        Args:
+            callback: 回调函数，参数为本对象
+        """
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        self._call(callback)
+
+    @property
+    def done(self) -> bool:
+        """预热是否已经结束（无论成功与否）"""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待预热结束
+
+        Args:
+            timeout: 超时时间（秒），None 表示一直等待
+
+        Returns:
+            bool: 是否已经结束
+        """
+        return self._done.wait(timeout)
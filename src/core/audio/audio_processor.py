@@ -2,14 +2,39 @@
 音频处理模块
 负责音频捕获和处理
 """
+import atexit
+import functools
+import logging
 import time
 import json
+import threading
 import numpy as np
-import soundcard as sc
-from typing import List, Any
+try:
+    import soundcard as sc
+except (ImportError, OSError):
+    # 没有音频后端（如未安装 PulseAudio 的 Linux）时仍可使用文件或合成音频源
+    sc = None
+from typing import List, Any, Dict, Optional, Callable
 from PyQt5.QtCore import QObject, pyqtSignal, QThread
 
 from src.core.signals import TranscriptionSignals
+from src.core.audio.ring_buffer import AudioRingBuffer, DROP_OLDEST
+from src.core.audio.vad import VoiceActivityDetector
+from src.core.audio.resampler import PolyphaseResampler
+from src.core.audio.pcm_converter import PCMConverter
+from src.core.audio.block_size_controller import AdaptiveBlockSizeController
+from src.core.audio.multi_source import CaptureSource, MultiSourceScheduler, MODE_MIX, MODE_SEPARATE
+from src.core.audio.pcm_spool import PCMSpoolWriter, PCMSpoolReader, make_spool_path
+from src.core.audio.audio_source import open_audio_source
+from src.core.audio.pipeline_stats import LatencyStats
+from src.core.asr.transcript_segment import SampleMap, TranscriptSegment, WordTiming, parse_result_timing
+from src.core.audio.device_registry import get_device_registry
+from src.utils.async_logging import LogRateLimiter, is_enabled_for
+from src.core.audio.backpressure import (
+    BackpressureController, resolve_fallback_model, LEVEL_NAMES, LEVEL_NORMAL, LEVEL_DROP_SILENCE, LEVEL_SKIP_PARTIALS,
+    LEVEL_FALLBACK_MODEL, ACTION_SILENCE_DROPPED, ACTION_PARTIALS_SKIPPED, ACTION_MODEL_SWITCHES,
+    ACTION_FALLBACK_FAILURES
+)
 
 class AudioDevice:
     """音频设备类"""
@@ -37,24 +62,141 @@ class AudioWorker(QObject):
     new_text = pyqtSignal(str)
     status = pyqtSignal(str)
     progress = pyqtSignal(int, str)
+    source_text = pyqtSignal(str, str)  # 多设备分路识别时的结果 (来源名称, 文本)
+    new_segment = pyqtSignal(object)  # 带时间戳的完整结果（TranscriptSegment）
+
+    def __init__(self, device, sample_rate, buffer_size, recognizer,
+                 ring_buffer_seconds=2.0, drop_policy=DROP_OLDEST, max_batch_blocks=4, vad_config=None,
+                 capture_sample_rate=None, adaptive_block_config=None,
+                 multi_source_config=None, recognizer_factory=None, spool_config=None,
+                 backpressure_config=None, fallback_recognizer_factory=None, hot_swap_config=None):
+        """
+        初始化音频处理工作线程
 
-    def __init__(self, device, sample_rate, buffer_size, recognizer):
+        Args:
+            device: 音频设备或音频源（AudioSource），或它们的列表（多设备采集）
+            sample_rate: 采样率
+            buffer_size: 每次捕获的样本数
+            recognizer: 识别器
+            ring_buffer_seconds: 捕获线程与识别线程之间环形缓冲区的时长（秒）
+            drop_policy: 环形缓冲区满时的丢弃策略，drop_oldest 或 drop_newest
+            max_batch_blocks: 识别线程落后时，一次最多合并处理的块数
+            vad_config: 语音活动检测配置（audio.vad），enabled 为 False 时不做检测
+            capture_sample_rate: 设备原生采样率，提供且与 sample_rate 不同时以该采样率录音，
+                再由多相重采样器转换为 sample_rate；None 表示由音频后端直接输出 sample_rate
+            adaptive_block_config: 自适应块大小配置（audio.adaptive_block），enabled 为 True 时
+                根据识别实时率在 [min_block_size, max_block_size] 内调整每次送入识别器的块大小
+            multi_source_config: 多设备采集配置（audio.multi_source），mode 为 mix 时混音为一路，
+                为 separate 时每个设备使用独立的识别器并给结果加来源标签
+            recognizer_factory: 分路识别时为第二个及以后的设备创建识别器的函数
+            spool_config: 录音缓存配置（audio.spool），enabled 为 True 时把捕获的音频写入
+                内存映射文件，之后可用 PCMSpoolReader 重放
+            backpressure_config: 背压降级配置（audio.backpressure），enabled 为 True 时根据缓冲区中
+                积压的音频时长逐级丢弃非语音、跳过部分结果、切换到备用模型
+            fallback_recognizer_factory: 创建备用（更快的）识别器的函数，降级到最高级别时在后台调用
+            hot_swap_config: 热切换模型配置（audio.hot_swap），max_wait_seconds 为新识别器就绪后
+                等待句子结束的最长时间，超时后强制切换
+        """
         super().__init__()
-        self.device = device
+        self.devices = list(device) if isinstance(device, (list, tuple)) else [device]
+        self.device = self.devices[0]
         self.sample_rate = sample_rate
         self.buffer_size = buffer_size
         self.recognizer = recognizer
         self.running = True
         self._last_partial_result = ""  # 保存最后一个部分结果
 
+        # 环形缓冲区相关参数（容量至少容纳一个批次）
+        self.max_batch_blocks = max(1, int(max_batch_blocks))
+        self.ring_buffer_frames = max(int(ring_buffer_seconds * sample_rate), buffer_size * self.max_batch_blocks)
+        self.drop_policy = drop_policy
+        self.ring_buffer = None
+        self._capture_threads = []
+        self._capture_error = None
+
+        # 自适应块大小控制器
+        adaptive_block_config = adaptive_block_config or {}
+        self.block_controller = None
+        if adaptive_block_config.get("enabled", False):
+            self.block_controller = AdaptiveBlockSizeController.from_config(
+                adaptive_block_config, buffer_size, sample_rate
+            )
+        max_block_size = self.block_controller.max_size if self.block_controller else buffer_size
+        self.ring_buffer_frames = max(self.ring_buffer_frames, max_block_size * self.max_batch_blocks)
+
+        # Vosk 分支的 PCM 转换复用缓冲区，稳态下每个块不再分配内存
+        self._pcm_converter = PCMConverter(max_block_size * self.max_batch_blocks)
+
+        # 原生采样率捕获
+        self.capture_sample_rate = capture_sample_rate or sample_rate
+
+        # 语音活动检测器
+        vad_config = vad_config or {}
+        self.vad = None
+        if vad_config.get("enabled", True):
+            self.vad = VoiceActivityDetector.from_config(vad_config, sample_rate)
+        self._vad_config = vad_config
+        self._shed_vad = None  # 关闭 VAD 时，降级丢弃非语音使用的检测器
+
+        # 背压降级：识别跟不上实时时逐级降低识别负载
+        backpressure_config = backpressure_config or {}
+        self.backpressure = None
+        if backpressure_config.get("enabled", False):
+            self.backpressure = BackpressureController.from_config(backpressure_config, sample_rate)
+        self._shed_level = LEVEL_NORMAL  # 当前执行的降级级别（分路识别时同步给各通道）
+        self.fallback_recognizer_factory = fallback_recognizer_factory
+        self._primary_recognizer = recognizer
+        self._fallback_recognizer = None
+        self._fallback_thread = None
+        self._fallback_failed = False
+
+        # 热切换模型：新识别器在后台创建，就绪后在下一个句子结束处替换当前识别器
+        hot_swap_config = hot_swap_config or {}
+        self.hot_swap_max_wait = float(hot_swap_config.get("max_wait_seconds", 10.0))
+        self._pending_swap = None  # (识别器, 名称, 备用识别器工厂, 就绪时间)
+        self._swap_generation = 0  # 新的切换请求使之前未完成的请求失效
+        self._swap_lock = threading.Lock()  # 保护 _pending_swap 和 _swap_generation（后台线程也会修改）
+        self.swap_stats = {"swaps": 0, "forced": 0, "failures": 0, "replayed_seconds": 0.0, "last_wait_seconds": 0.0}
+
+        # 识别结果时间戳：识别器的时间以它接收的样本数计，VAD 跳过的静音不计入，
+        # 通过 SampleMap 换算为音频流中的位置（从环形缓冲区读出的样本数，与录音缓存的位置一致）
+        self._stream_position = 0  # 已从环形缓冲区读出的样本数
+        self._sample_map = SampleMap()
+        self._recognizer_clocks = {}  # 换下的识别器 -> 它已接收的样本数
+        self._recognizer_origin = -self._get_recognizer_clock(recognizer)  # 识别器时间零点对应的已送入样本数
+        self._segment_start_fed = 0  # 当前句子开始时已送入识别器的样本数
+        self._capture_started_at = None  # 开始录音的时间（time.time()）
+
         # 静音检测相关参数
-        self.silence_threshold = 0.01  # 静音阈值
         self.silence_frames = 0  # 连续静音帧计数
         self.silence_frames_threshold = 15  # 静音帧阈值（约1.5秒，取决于buffer_size和采样率）
         self.last_sentence_end_time = time.time()  # 上次句子结束时间
         self.current_partial_text = ""  # 当前累积的部分文本
         self.sentence_in_progress = False  # 是否有句子正在进行中
 
+        # 多设备采集
+        multi_source_config = multi_source_config or {}
+        self.multi_source_mode = multi_source_config.get("mode", MODE_MIX)
+        self.source_gains = multi_source_config.get("gains", {}) or {}
+        self.max_skew_ms = multi_source_config.get("max_skew_ms", 500)
+        self.start_timeout_ms = multi_source_config.get("start_timeout_ms", 1000)
+        self._channels = []
+        if len(self.devices) > 1 and self.multi_source_mode == MODE_SEPARATE:
+            self._create_channels(recognizer_factory, vad_config)
+
+        # 各阶段耗时统计：capture:<设备名>（每块录音）、queue（识别前在缓冲区中排队的音频时长）、
+        # vad、decode、end_to_end（句子最后一个样本录下到完整结果发出）
+        self.stage_stats = {"queue": LatencyStats(), "vad": LatencyStats(), "decode": LatencyStats(),
+                            "end_to_end": LatencyStats()}
+
+        # 每块音频都会产生的日志（静音计数、缓冲区溢出、逐块的识别调用等）限频记录
+        self._log_limiter = LogRateLimiter()
+
+        # 录音缓存
+        self.spool_config = spool_config or {}
+        self.spool = None
+        self.spool_path = None
+
         # 尝试初始化COM（在主线程中）
         try:
             from src.utils.com_handler import com_handler
@@ -105,153 +247,138 @@ class AudioWorker(QObject):
             engine_type = getattr(self.recognizer, 'engine_type', None)
             sherpa_logger.info(f"开始音频处理，引擎类型: {engine_type}")
 
-            with sc.get_microphone(id=str(self.device.id), include_loopback=True).recorder(
-                samplerate=self.sample_rate
-            ) as mic:
-                self.status.emit(f"正在从 {self.device.name} 捕获音频...")
-                sherpa_logger.info(f"正在从 {self.device.name} 捕获音频...")
-
-                while self.running:
-                    # 捕获音频数据
-                    data = mic.record(numframes=self.buffer_size)
-
-                    # 记录音频数据信息
-                    sherpa_logger.debug(f"捕获音频数据，形状: {data.shape}")
-
-                    # 转换为单声道
-                    if data.shape[1] > 1:
-                        data = np.mean(data, axis=1)
-                        sherpa_logger.debug(f"转换为单声道，形状: {data.shape}")
-
-                    # 检查音频数据是否有效
-                    max_amplitude = np.max(np.abs(data))
-
-                    # 静音检测
-                    if max_amplitude < self.silence_threshold:
-                        sherpa_logger.debug(f"检测到静音，最大振幅: {max_amplitude}，静音帧计数: {self.silence_frames}")
-                        self.silence_frames += 1
-
-                        # 如果有句子正在进行中，且静音持续足够长时间，认为句子结束
-                        if self.sentence_in_progress and self.silence_frames >= self.silence_frames_threshold:
-                            sherpa_logger.info(f"检测到静音持续{self.silence_frames}帧，判定当前句子结束")
-
-                            # 如果有当前部分文本，将其作为完整句子提交
-                            if self._last_partial_result:
-                                # 格式化文本
-                                text = self._last_partial_result
-                                if len(text) > 0:
-                                    text = text[0].upper() + text[1:]
-                                if text[-1] not in ['.', '?', '!']:
-                                    text += '.'
-
-                                sherpa_logger.info(f"静音检测触发句子结束，发送完整文本: {text}")
-                                self.new_text.emit(text)
-
-                                # 重置状态
-                                self._last_partial_result = ""
-                                self.sentence_in_progress = False
-                                self.last_sentence_end_time = time.time()
+            # 创建捕获线程与识别线程之间的环形缓冲区，每个设备一个捕获线程
+            self._capture_error = None
+            if len(self.devices) > 1:
+                sources = [
+                    CaptureSource(device.name, self.sample_rate, self.ring_buffer_frames, self.drop_policy,
+                                  gain=float(self.source_gains.get(device.name, 1.0)))
+                    for device in self.devices
+                ]
+                self.ring_buffer = MultiSourceScheduler(
+                    sources, self.sample_rate, self.max_skew_ms, self.start_timeout_ms
+                )
+                sinks = sources
+            else:
+                self.ring_buffer = AudioRingBuffer(self.ring_buffer_frames, self.drop_policy)
+                sinks = [self.ring_buffer]
+
+            self._open_spool(sherpa_logger)
+
+            if self.backpressure:
+                capacity_seconds = self.ring_buffer_frames / self.sample_rate
+                if self.backpressure.thresholds[-1] >= capacity_seconds:
+                    sherpa_logger.warning(
+                        f"降级阈值 {self.backpressure.thresholds} 秒超过环形缓冲区容量 {capacity_seconds:.1f} 秒，"
+                        f"较高级别在缓冲区溢出前不会触发"
+                    )
+
+            self._capture_threads = []
+            self._capture_started_at = time.time()
+            for index, (device, sink) in enumerate(zip(self.devices, sinks)):
+                thread = threading.Thread(
+                    target=self._capture_loop, args=(sherpa_logger, device, sink),
+                    name=f"AudioCapture-{index}", daemon=True
+                )
+                thread.start()
+                self._capture_threads.append(thread)
+
+            device_names = "、".join(device.name for device in self.devices)
+            self.status.emit(f"正在从 {device_names} 捕获音频...")
+            sherpa_logger.info(f"正在从 {device_names} 捕获音频...")
+            if len(self.devices) > 1:
+                sherpa_logger.info(f"多设备采集模式: {self.multi_source_mode}")
+
+            max_block_size = self.block_controller.max_size if self.block_controller else self.buffer_size
+            batch_buffer = np.empty(max_block_size * self.max_batch_blocks, dtype=np.float32)
+            reported_overruns = 0
+            block_size = self._get_block_size()
+            if self.block_controller:
+                self.status.emit(
+                    f"自适应块大小已启用，初始块: {block_size} 样本 ({self.block_controller.block_ms:.0f} ms)"
+                )
+
+            # 停止后继续处理缓冲区中剩余的完整块
+            while self.running or self.ring_buffer.available() >= block_size:
+                # 等待至少一个完整的块
+                if not self.ring_buffer.wait_for_data(block_size, timeout=0.1):
+                    continue
+
+                # 一次取走积压的所有完整块（最多 max_batch_blocks 个），减少识别调用次数
+                available = self.ring_buffer.available()
+                queue_seconds = self._backlog_seconds(available, block_size)
+                self.stage_stats["queue"].add(queue_seconds)
+                if self.backpressure:
+                    self._update_backpressure(queue_seconds, sherpa_logger)
+                frames = min(available - available % block_size, block_size * self.max_batch_blocks)
+                if self._channels:
+                    # 分路识别：按来源读取对齐的音频
+                    data = self.ring_buffer.read_sources(frames)
+                    if data.shape[1] == 0:
+                        continue
+                else:
+                    data = self.ring_buffer.read(frames, out=batch_buffer)
+                    if len(data) == 0:
+                        continue
+
+                # 写入录音缓存（分路识别时每个来源一个声道）
+                if self.spool:
+                    self._write_spool(data.T if self._channels else data, sherpa_logger,
+                                      self.ring_buffer.read_timestamp(self.sample_rate))
+
+                # 记录溢出情况
+                if self.ring_buffer.overruns != reported_overruns:
+                    reported_overruns = self.ring_buffer.overruns
+                    self._log_limiter.log(
+                        sherpa_logger, logging.WARNING, "overrun",
+                        "音频环形缓冲区溢出 %d 次，累计丢弃 %d 个样本（策略: %s）",
+                        reported_overruns, self.ring_buffer.dropped_frames, self.drop_policy
+                    )
 
-                        # 如果静音时间太长，跳过此帧
-                        if self.silence_frames > 2:  # 允许短暂静音
-                            continue
+                try:
+                    if self._channels:
+                        decode_stats = self._process_sources(data, sherpa_logger)
+                    elif self._pending_swap is not None:
+                        decode_stats = self._process_blocks_for_swap(data, sherpa_logger)
                     else:
-                        # 如果检测到声音，重置静音计数
-                        if self.silence_frames > 0:
-                            sherpa_logger.debug(f"检测到声音，重置静音帧计数，之前为: {self.silence_frames}")
-                            self.silence_frames = 0
-
-                        # 标记有句子正在进行中
-                        self.sentence_in_progress = True
-
-                    try:
-                        # 处理音频数据
-                        engine_type = getattr(self.recognizer, 'engine_type', None)
-                        sherpa_logger.debug(f"处理音频数据，引擎类型: {engine_type}")
-
-                        if engine_type and engine_type.startswith('sherpa'):
-                            # 对于 Sherpa-ONNX 模型，直接传递 numpy 数组
-                            sherpa_logger.debug(f"使用 Sherpa-ONNX 模型，直接传递 numpy 数组")
-                            accept_result = self.recognizer.AcceptWaveform(data)
-                        else:
-                            # 对于 Vosk 模型，转换为 16 位整数字节
-                            data_bytes = (data * 32767).astype(np.int16).tobytes()
-                            sherpa_logger.debug(f"使用 Vosk 模型，转换为 16 位整数字节，长度: {len(data_bytes)}")
-                            accept_result = self.recognizer.AcceptWaveform(data_bytes)
-
-                        sherpa_logger.debug(f"AcceptWaveform 结果: {accept_result}")
-
-                        if accept_result:
-                            # 获取完整结果
-                            result = self.recognizer.Result()
-                            sherpa_logger.info(f"完整结果: {result}, 类型: {type(result)}")
-
-                            text = self._parse_result(result)
-                            sherpa_logger.info(f"解析后的完整结果: {text}")
-
-                            if text:
-                                sherpa_logger.info(f"发送完整文本: {text}")
-                                self.new_text.emit(text)
-                            else:
-                                sherpa_logger.warning(f"完整文本为空，不发送")
-                        else:
-                            # 获取部分结果
-                            partial = self.recognizer.PartialResult()
-                            sherpa_logger.debug(f"部分结果: {partial}, 类型: {type(partial)}")
-
-                            text = self._parse_partial_result(partial)
-                            sherpa_logger.debug(f"解析后的部分结果: {text}")
-
-                            # 保存最新的部分结果，无论是否发送
-                            if text:
-                                self._last_partial_result = text
-                                print(f"在process中保存最新部分结果: {text}")
-
-                                # 检查是否需要因为静音而结束句子
-                                current_time = time.time()
-                                time_since_last_sentence = current_time - self.last_sentence_end_time
+                        decode_stats = self._process_block(data, sherpa_logger)
+
+                    # 根据识别实时率调整块大小
+                    if self.block_controller and decode_stats:
+                        if self.block_controller.update(*decode_stats):
+                            block_size = self._get_block_size()
+                            stats = self.block_controller.get_stats()
+                            message = (
+                                f"块大小调整为 {block_size} 样本 ({stats['block_ms']:.0f} ms)，"
+                                f"RTF: {stats['rtf']:.2f}"
+                            )
+                            sherpa_logger.info(message)
+                            self.status.emit(message)
+
+                    # 更新进度
+                    current_time = time.time()
+                    if current_time - last_progress_update >= 0.5:
+                        elapsed_seconds = current_time - start_time
+                        minutes = int(elapsed_seconds // 60)
+                        seconds = int(elapsed_seconds % 60)
+                        time_str = f"转录时长: {minutes:02d}:{seconds:02d}"
+                        if self.block_controller and self.block_controller.rtf is not None:
+                            controller = self.block_controller
+                            time_str += f" | 块: {controller.block_ms:.0f} ms, RTF: {controller.rtf:.2f}"
+                        self.progress.emit(50, time_str)
+                        last_progress_update = current_time
 
-                                # 如果静音持续足够长，且距离上次句子结束已经过了足够时间，认为是新句子
-                                if self.silence_frames >= self.silence_frames_threshold and time_since_last_sentence > 2.0:
-                                    # 格式化文本
-                                    complete_text = text
-                                    if len(complete_text) > 0:
-                                        complete_text = complete_text[0].upper() + complete_text[1:]
-                                    if complete_text[-1] not in ['.', '?', '!']:
-                                        complete_text += '.'
-
-                                    sherpa_logger.info(f"静音检测触发句子结束，发送完整文本: {complete_text}")
-                                    self.new_text.emit(complete_text)
-
-                                    # 重置状态
-                                    self._last_partial_result = ""
-                                    self.sentence_in_progress = False
-                                    self.last_sentence_end_time = current_time
-                                else:
-                                    # 正常发送部分文本
-                                    sherpa_logger.debug(f"发送部分文本: {text}")
-                                    self.new_text.emit("PARTIAL:" + text)
-                            else:
-                                sherpa_logger.debug(f"部分文本为空，不发送")
-
-                        # 更新进度
-                        current_time = time.time()
-                        if current_time - last_progress_update >= 0.5:
-                            elapsed_seconds = current_time - start_time
-                            minutes = int(elapsed_seconds // 60)
-                            seconds = int(elapsed_seconds % 60)
-                            time_str = f"转录时长: {minutes:02d}:{seconds:02d}"
-                            self.progress.emit(50, time_str)
-                            last_progress_update = current_time
+                except Exception as e:
+                    error_msg = f"音频处理错误: {str(e)}"
+                    self.error.emit(error_msg)
+                    # 每块都出错时限频记录，错误堆栈只写入日志
+                    import traceback
+                    self._log_limiter.log(sherpa_logger, logging.ERROR, "process_error", "%s\n%s",
+                                          error_msg, traceback.format_exc())
 
-                    except Exception as e:
-                        error_msg = f"音频处理错误: {str(e)}"
-                        self.error.emit(error_msg)
-                        sherpa_logger.error(error_msg)
-                        import traceback
-                        error_trace = traceback.format_exc()
-                        sherpa_logger.error(error_trace)
-                        print(error_trace)
+            # 捕获线程异常退出时，向外报告错误
+            if self._capture_error is not None:
+                raise self._capture_error
 
         except Exception as e:
             error_msg = f"音频捕获错误: {str(e)}"
@@ -262,6 +389,12 @@ class AudioWorker(QObject):
             sherpa_logger.error(error_trace)
             print(error_trace)
         finally:
+            # 确保捕获线程已经退出，再把不足一个块的剩余音频送入识别器
+            self._stop_capture_thread(sherpa_logger)
+            self._process_tail(sherpa_logger)
+            self._flush_channels(sherpa_logger)
+            self._close_spool(sherpa_logger)
+
             # 在结束前获取最终结果
             try:
                 if hasattr(self, 'recognizer') and self.recognizer:
@@ -292,6 +425,7 @@ class AudioWorker(QObject):
                                         text += '.'
                                     sherpa_logger.info(f"发送最终文本: {text}")
                                     self.new_text.emit(text)
+                                    self._emit_segment(text, final_result)
                                 elif hasattr(self, '_last_partial_result') and self._last_partial_result:
                                     # 如果最终结果为空但有最后一个部分结果，使用部分结果作为最终结果
                                     text = self._last_partial_result
@@ -325,6 +459,7 @@ class AudioWorker(QObject):
                                         text += '.'
                                     sherpa_logger.info(f"使用最后一个部分结果作为最终文本: {text}")
                                     self.new_text.emit(text)
+                                    self._emit_segment(text)
                             except json.JSONDecodeError:
                                 sherpa_logger.error(f"解析最终结果JSON失败: {final_result}")
 
@@ -338,6 +473,7 @@ class AudioWorker(QObject):
                                         text += '.'
                                     sherpa_logger.info(f"JSON解析失败，使用最后一个部分结果作为最终文本: {text}")
                                     self.new_text.emit(text)
+                                    self._emit_segment(text)
                     else:
                         # 对于其他模型，尝试调用FinalResult方法
                         if hasattr(self.recognizer, 'FinalResult'):
@@ -350,6 +486,7 @@ class AudioWorker(QObject):
                                 if text:
                                     sherpa_logger.info(f"发送最终文本: {text}")
                                     self.new_text.emit(text)
+                                    self._emit_segment(text, final_result)
                                 elif hasattr(self, '_last_partial_result') and self._last_partial_result:
                                     # 如果最终结果为空但有最后一个部分结果，使用部分结果作为最终结果
                                     text = self._last_partial_result
@@ -360,47 +497,969 @@ class AudioWorker(QObject):
                                         text += '.'
                                     sherpa_logger.info(f"使用最后一个部分结果作为最终文本: {text}")
                                     self.new_text.emit(text)
+                                    self._emit_segment(text)
             except Exception as e:
                 sherpa_logger.error(f"获取最终结果错误: {e}")
                 import traceback
                 sherpa_logger.error(traceback.format_exc())
 
-                # 如果获取最终结果失败但有最后一个部分结果，使用部分结果作为最终结果
-                if hasattr(self, '_last_partial_result') and self._last_partial_result:
-                    text = self._last_partial_result
-                    # 记录使用的部分结果
-                    sherpa_logger.info(f"获取最终结果失败，使用的最后一个部分结果原始值: {text}")
+                # 如果获取最终结果失败但有最后一个部分结果，使用部分结果作为最终结果
+                if hasattr(self, '_last_partial_result') and self._last_partial_result:
+                    text = self._last_partial_result
+                    # 记录使用的部分结果
+                    sherpa_logger.info(f"获取最终结果失败，使用的最后一个部分结果原始值: {text}")
+
+                    # 检查是否是完整的句子（通过检查是否包含"and"等连接词判断）
+                    # 如果不是完整句子，可能是因为部分结果被截断了
+                    if text and (" and " in text or text.endswith(" and")):
+                        # 尝试从完整结果中找到匹配的句子
+                        # 这里假设完整结果已经在UI中显示
+                        try:
+                            from src.ui.main_window import MainWindow
+                            if hasattr(MainWindow, 'instance') and MainWindow.instance:
+                                if hasattr(MainWindow.instance, 'subtitle_widget'):
+                                    subtitle_widget = MainWindow.instance.subtitle_widget
+                                    if hasattr(subtitle_widget, 'transcript_text') and subtitle_widget.transcript_text:
+                                        # 查找最近的完整结果中是否包含当前部分结果
+                                        for complete_text in reversed(subtitle_widget.transcript_text):
+                                            if text in complete_text:
+                                                text = complete_text
+                                                sherpa_logger.info(f"找到匹配的完整结果: {text}")
+                                                break
+                        except Exception as e:
+                            sherpa_logger.error(f"尝试查找完整结果时出错: {e}")
+
+                    # 格式化文本
+                    if len(text) > 0:
+                        text = text[0].upper() + text[1:]
+                    if text[-1] not in ['.', '?', '!']:
+                        text += '.'
+                    sherpa_logger.info(f"获取最终结果失败，使用最后一个部分结果作为最终文本: {text}")
+                    self.new_text.emit(text)
+                    self._emit_segment(text)
+
+            sherpa_logger.info("音频处理结束")
+            self.finished.emit()
+
+    def _capture_loop(self, sherpa_logger, device, sink):
+        """
+        音频捕获线程：只负责录音、转换为单声道并写入环形缓冲区，不等待识别线程
+
+        Args:
+            sherpa_logger: 日志记录器
+            device: 音频设备
+            sink: 写入目标（AudioRingBuffer 或多设备采集的 CaptureSource）
+        """
+        try:
+            # soundcard 在 Windows 上需要在录音线程中初始化 COM
+            try:
+                from src.utils.com_handler import com_handler
+                com_handler.initialize_com()
+            except Exception as e:
+                sherpa_logger.error(f"捕获线程COM初始化错误: {e}")
+
+            # 以原生采样率录音时，由多相重采样器转换为模型采样率
+            resampler = None
+            # 启用自适应块大小时按最小块录音，保证小块时的延迟
+            capture_frames = self.block_controller.min_size if self.block_controller else self.buffer_size
+            if self.capture_sample_rate != self.sample_rate:
+                resampler = PolyphaseResampler(self.capture_sample_rate, self.sample_rate)
+                capture_frames = int(np.ceil(capture_frames * self.capture_sample_rate / self.sample_rate))
+                sherpa_logger.info(f"以原生采样率捕获: {resampler.get_info()}")
+
+            capture_stats = LatencyStats()
+            self.stage_stats[f"capture:{device.name}"] = capture_stats
+
+            source = open_audio_source(device)
+            with source.recorder(samplerate=self.capture_sample_rate) as mic:
+                while self.running:
+                    # 捕获音频数据
+                    record_start = time.perf_counter()
+                    data = mic.record(numframes=capture_frames)
+                    captured_at = time.monotonic()  # 本块最后一个样本的捕获时间，随数据写入样本时钟
+                    capture_stats.add(time.perf_counter() - record_start)
+
+                    # 文件或合成音频源结束
+                    if len(data) == 0:
+                        sherpa_logger.info(f"音频源 {device.name} 已结束")
+                        break
+
+                    # 转换为单声道
+                    if data.ndim > 1:
+                        data = np.mean(data, axis=1) if data.shape[1] > 1 else data[:, 0]
+
+                    if resampler:
+                        data = resampler.process(data)
+
+                    # 不限速的音频源等待识别线程腾出空间，保证不丢数据
+                    if not source.realtime:
+                        while self.running and sink.free_space() < len(data):
+                            time.sleep(0.001)
+
+                    sink.write(data, captured_at)
+        except Exception as e:
+            sherpa_logger.error(f"音频捕获线程错误 ({device.name}): {e}")
+            # 多设备采集时单个设备出错不影响其他设备，由调度器用静音补齐
+            if len(self.devices) == 1:
+                self._capture_error = e
+        finally:
+            # 通知识别线程处理完剩余数据后结束
+            if len(self.devices) == 1:
+                self.running = False
+
+    def _stop_capture_thread(self, sherpa_logger):
+        """
+        停止并等待捕获线程退出
+
+        Args:
+            sherpa_logger: 日志记录器
+        """
+        self.running = False
+        for thread in self._capture_threads:
+            if thread.is_alive():
+                thread.join(timeout=2.0)
+                if thread.is_alive():
+                    sherpa_logger.warning(f"音频捕获线程 {thread.name} 未能在2秒内退出")
+        if self.ring_buffer:
+            sherpa_logger.info(f"音频环形缓冲区统计: {self.ring_buffer.get_stats()}")
+        if self.vad:
+            sherpa_logger.info(f"语音活动检测统计: {self.vad.get_stats()}")
+        if self.block_controller:
+            sherpa_logger.info(f"自适应块大小统计: {self.block_controller.get_stats()}")
+        if self.backpressure:
+            stats = self.backpressure.get_stats()
+            sherpa_logger.info(
+                f"背压降级统计: 最大积压 {stats['max_queue_seconds']:.2f} 秒，级别变化 {stats['transitions']} 次，"
+                f"各级别时长 {stats['seconds_in_level']}，措施 {stats['actions']}"
+            )
+
+    def _create_channels(self, recognizer_factory, vad_config):
+        """
+        为分路识别创建每个来源的识别通道
+
+        每个通道是一个不运行 process() 的 AudioWorker，只持有该来源的识别器、
+        VAD 和部分结果等状态，由本工作线程的调度循环驱动。
+
+        Args:
+            recognizer_factory: 为第二个及以后的设备创建识别器的函数
+            vad_config: 语音活动检测配置
+
+        Raises:
+            ValueError: 没有提供 recognizer_factory 时
+        """
+        if recognizer_factory is None:
+            raise ValueError("多设备分路识别需要提供 recognizer_factory")
+
+        for index, device in enumerate(self.devices):
+            recognizer = self.recognizer if index == 0 else recognizer_factory()
+            channel = AudioWorker(device, self.sample_rate, self.buffer_size, recognizer, vad_config=vad_config)
+            channel.backpressure = self.backpressure
+            channel.new_text.connect(lambda text, name=device.name: self._emit_source_text(name, text))
+            self._channels.append(channel)
+
+        # 最终结果由各通道分别处理
+        self.recognizer = None
+
+    def _emit_source_text(self, source_name, text):
+        """
+        发送带来源标签的识别结果
+
+        Args:
+            source_name: 来源名称
+            text: 识别结果，部分结果以 PARTIAL: 开头
+        """
+        self.source_text.emit(source_name, text)
+        if text.startswith("PARTIAL:"):
+            self.new_text.emit(f"PARTIAL:[{source_name}] {text[len('PARTIAL:'):]}")
+        else:
+            self.new_text.emit(f"[{source_name}] {text}")
+
+    def _process_sources(self, matrix, sherpa_logger):
+        """
+        分路识别：把每个来源的音频送入各自的识别通道
+
+        Args:
+            matrix: 形状为 (来源数, 样本数) 的对齐音频
+            sherpa_logger: 日志记录器
+
+        Returns:
+            tuple: (音频样本数, 所有通道识别耗时之和)，全部为静音时返回 None。
+                各通道串行识别，耗时之和才反映能否跟上实时
+        """
+        decoded = False
+        total_seconds = 0.0
+        for channel, data in zip(self._channels, matrix):
+            decode_stats = channel._process_block(data, sherpa_logger)
+            if decode_stats:
+                decoded = True
+                total_seconds += decode_stats[1]
+        if not decoded:
+            return None
+        return matrix.shape[1], total_seconds
+
+    def _flush_channels(self, sherpa_logger):
+        """
+        分路识别结束时获取各通道的最终结果
+
+        Args:
+            sherpa_logger: 日志记录器
+        """
+        for channel in self._channels:
+            try:
+                text = None
+                if hasattr(channel.recognizer, 'FinalResult'):
+                    text = channel._parse_result(channel.recognizer.FinalResult())
+                if not text and channel._last_partial_result:
+                    text = channel._last_partial_result
+                    if text[-1] not in ['.', '?', '!']:
+                        text += '.'
+                if text:
+                    sherpa_logger.info(f"发送 {channel.device.name} 的最终文本: {text}")
+                    channel.new_text.emit(text)
+            except Exception as e:
+                sherpa_logger.error(f"获取 {channel.device.name} 最终结果错误: {e}")
+
+    def _open_spool(self, sherpa_logger):
+        """
+        按配置创建录音缓存，失败时只记录日志，不影响转录
+
+        Args:
+            sherpa_logger: 日志记录器
+        """
+        if not self.spool_config.get("enabled", False):
+            return
+        try:
+            path = make_spool_path(self.spool_config.get("directory", "spool"))
+            self.spool = PCMSpoolWriter(
+                path,
+                self.sample_rate,
+                channels=len(self._channels) or 1,
+                dtype=self.spool_config.get("dtype", "float32"),
+                initial_seconds=self.spool_config.get("initial_seconds", 60.0)
+            )
+            self.spool_path = path
+            sherpa_logger.info(f"录音缓存已启用: {path}")
+        except Exception as e:
+            sherpa_logger.error(f"创建录音缓存失败: {e}")
+            self.spool = None
+
+    def _write_spool(self, data, sherpa_logger, captured_at=None):
+        """
+        写入录音缓存，出错时关闭缓存并继续转录
+
+        Args:
+            data: 音频数据，形状为 (样本数,) 或 (样本数, 声道数)
+            sherpa_logger: 日志记录器
+            captured_at: 最后一个样本的捕获时间（time.monotonic），None 表示取当前时间
+        """
+        # 录音缓存记录墙上时间，按当前两个时钟的差换算
+        timestamp = None if captured_at is None else captured_at + time.time() - time.monotonic()
+        try:
+            self.spool.write(data, timestamp)
+        except Exception as e:
+            sherpa_logger.error(f"写入录音缓存失败，停止缓存: {e}")
+            self._close_spool(sherpa_logger)
+
+    def _close_spool(self, sherpa_logger):
+        """
+        关闭录音缓存
+
+        Args:
+            sherpa_logger: 日志记录器
+        """
+        if not self.spool:
+            return
+        spool, self.spool = self.spool, None
+        try:
+            spool.close()
+            sherpa_logger.info(f"录音缓存已保存: {spool.path}，时长 {spool.duration:.1f} 秒")
+        except Exception as e:
+            sherpa_logger.error(f"关闭录音缓存失败: {e}")
+
+    def _process_tail(self, sherpa_logger):
+        """
+        停止后把缓冲区中不足一个块的剩余音频送入识别器，之后再取最终结果，避免丢失最后一句的结尾
+
+        Args:
+            sherpa_logger: 日志记录器
+        """
+        ring_buffer = getattr(self, 'ring_buffer', None)
+        if ring_buffer is None:
+            return
+        try:
+            frames = ring_buffer.available()
+            if frames <= 0:
+                return
+            if self._channels:
+                data = ring_buffer.read_sources(frames)
+                if data.shape[1] == 0:
+                    return
+            else:
+                data = ring_buffer.read(frames)
+                if len(data) == 0:
+                    return
+            if self.spool:
+                self._write_spool(data.T if self._channels else data, sherpa_logger,
+                                  ring_buffer.read_timestamp(self.sample_rate))
+            sherpa_logger.info(f"处理停止时剩余的 {frames} 个样本")
+            if self._channels:
+                self._process_sources(data, sherpa_logger)
+            elif self._pending_swap is not None:
+                self._process_blocks_for_swap(data, sherpa_logger)
+            else:
+                self._process_block(data, sherpa_logger)
+        except Exception as e:
+            sherpa_logger.error(f"处理剩余音频错误: {e}")
+
+    def _backlog_seconds(self, available, block_size):
+        """
+        计算识别积压的音频时长
+
+        即将识别的这一块不算积压，否则块较大时（如 0.5 秒、1 秒的块）即使没有积压也会一直降级
+
+        Args:
+            available: 缓冲区中的样本数
+            block_size: 本次识别的块大小（样本数）
+
+        Returns:
+            float: 积压的音频时长（秒）
+        """
+        return max(0, available - block_size) / self.sample_rate
+
+    def _update_backpressure(self, queue_seconds, sherpa_logger):
+        """
+        根据缓冲区中积压的音频时长更新降级级别，并执行相应措施
+
+        Args:
+            queue_seconds: 积压的音频时长（秒）
+            sherpa_logger: 日志记录器
+        """
+        change = self.backpressure.update(queue_seconds)
+        if change:
+            old_level, new_level = change
+            self._set_shed_level(new_level)
+            message = (
+                f"识别积压 {queue_seconds:.2f} 秒，降级级别 {LEVEL_NAMES[old_level]} -> {LEVEL_NAMES[new_level]}"
+            )
+            if new_level > old_level:
+                sherpa_logger.warning(message)
+            else:
+                sherpa_logger.info(message)
+            self.status.emit(message)
+        self._apply_fallback(sherpa_logger)
+
+    def _set_shed_level(self, level):
+        """
+        设置本工作线程及各识别通道的降级级别
+
+        Args:
+            level: 降级级别（LEVEL_* 常量）
+        """
+        for worker in [self] + self._channels:
+            worker._shed_level = level
+            if level >= LEVEL_SKIP_PARTIALS:
+                # 不再更新部分结果，避免静音断句时发送过时的部分结果
+                worker._last_partial_result = ""
+            if level < LEVEL_DROP_SILENCE and worker._shed_vad:
+                worker._shed_vad.reset()
+
+    def _get_shed_vad(self):
+        """
+        获取降级丢弃非语音时使用的检测器（关闭 VAD 时才会用到，按需创建）
+
+        Returns:
+            VoiceActivityDetector: 语音活动检测器
+        """
+        if self._shed_vad is None:
+            self._shed_vad = VoiceActivityDetector.from_config(self._vad_config, self.sample_rate)
+        return self._shed_vad
+
+    def _apply_fallback(self, sherpa_logger):
+        """
+        按降级级别在主识别器和备用识别器之间切换
+
+        进入最高级别时在后台线程创建备用识别器（加载模型可能需要数秒，不能阻塞识别线程），
+        创建完成后切换；级别恢复到 normal 时切回主识别器。分路识别时不切换模型。
+
+        Args:
+            sherpa_logger: 日志记录器
+        """
+        if self._channels or not self.fallback_recognizer_factory:
+            return
+
+        if self._shed_level >= LEVEL_FALLBACK_MODEL:
+            if self.recognizer is not self._primary_recognizer or self._fallback_failed:
+                return
+            if self._fallback_recognizer is not None:
+                self._swap_recognizer(self._fallback_recognizer, "备用模型", sherpa_logger)
+            elif self._fallback_thread is None:
+                sherpa_logger.warning("识别持续落后，开始在后台创建备用识别器")
+                self._fallback_thread = threading.Thread(
+                    target=self._load_fallback_recognizer, args=(sherpa_logger,),
+                    name="BackpressureFallback", daemon=True
+                )
+                self._fallback_thread.start()
+        elif self._shed_level == LEVEL_NORMAL and self.recognizer is not self._primary_recognizer:
+            self._swap_recognizer(self._primary_recognizer, "主模型", sherpa_logger)
+
+    def _load_fallback_recognizer(self, sherpa_logger):
+        """
+        后台线程：创建备用识别器，失败后本次转录不再重试
+
+        Args:
+            sherpa_logger: 日志记录器
+        """
+        factory = self.fallback_recognizer_factory
+        recognizer = None
+        try:
+            recognizer = factory()
+        except Exception as e:
+            sherpa_logger.error(f"创建备用识别器失败: {e}")
+        if factory is not self.fallback_recognizer_factory:
+            # 创建期间已热切换到其他模型，这个备用识别器属于原来的模型
+            return
+        if recognizer is None:
+            self._fallback_failed = True
+            self.backpressure.record_action(ACTION_FALLBACK_FAILURES)
+            return
+        sherpa_logger.info(f"备用识别器已就绪，引擎类型: {getattr(recognizer, 'engine_type', None)}")
+        self._fallback_recognizer = recognizer
+
+    def _flush_recognizer(self, sherpa_logger):
+        """
+        取出当前识别器中未完成的结果并发送
+
+        Args:
+            sherpa_logger: 日志记录器
+        """
+        try:
+            flush = getattr(self.recognizer, 'FinalResult', None) or getattr(self.recognizer, 'Result', None)
+            result = flush() if flush else None
+            text = self._parse_result(result) if flush else None
+            if text:
+                sherpa_logger.info(f"切换识别器前发送完整文本: {text}")
+                self.new_text.emit(text)
+                self._emit_segment(text, result)
+        except Exception as e:
+            sherpa_logger.error(f"切换识别器前获取结果错误: {e}")
+
+    def _end_utterance(self, sherpa_logger):
+        """
+        VAD 检测到语音结束时结束当前句子
+
+        静音不送入识别器，识别器的端点规则（尾部静音 1.5/3 秒）不会触发，
+        因此直接取出这一句的最终结果（Vosk 和 sherpa-onnx 的 FinalResult 之后都从新的句子开始）
+
+        Args:
+            sherpa_logger: 日志记录器
+        """
+        final_result = getattr(self.recognizer, 'FinalResult', None)
+        if final_result is None:
+            return
+        try:
+            result = final_result()
+            text = self._parse_result(result)
+        except Exception as e:
+            sherpa_logger.error(f"语音结束时获取最终结果错误: {e}")
+            return
+
+        if text:
+            sherpa_logger.info(f"语音结束，发送完整文本: {text}")
+            self.new_text.emit(text)
+            self._emit_segment(text, result)
+        self._last_partial_result = ""
+        self.sentence_in_progress = False
+        self.last_sentence_end_time = time.time()
+
+    def _swap_recognizer(self, recognizer, label, sherpa_logger):
+        """
+        切换识别器：先取出旧识别器中未完成的结果并发送，再换用新识别器
+
+        Args:
+            recognizer: 新识别器
+            label: 用于日志的识别器名称
+            sherpa_logger: 日志记录器
+        """
+        self._flush_recognizer(sherpa_logger)
+        self._use_recognizer(recognizer)
+        self._last_partial_result = ""
+        self.backpressure.record_action(ACTION_MODEL_SWITCHES)
+        message = f"识别器已切换到{label}，引擎类型: {getattr(recognizer, 'engine_type', None)}"
+        sherpa_logger.warning(message)
+        self.status.emit(message)
+
+    def request_recognizer_swap(self, recognizer_factory, label="新模型", fallback_recognizer_factory=None):
+        """
+        请求热切换识别器，不停止捕获
+
+        新识别器在后台线程中创建，期间继续用当前识别器识别；就绪后在下一个句子结束处切换，
+        并把当前识别器在端点之后已经收到的音频重放给新识别器，不丢失音频。分路识别时不支持。
+
+        Args:
+            recognizer_factory: 创建新识别器的函数
+            label: 用于日志和状态的新模型名称
+            fallback_recognizer_factory: 新模型的备用识别器工厂（背压降级用），None 表示不再降级切换模型
+
+        Returns:
+            bool: 是否已开始创建新识别器
+        """
+        if self._channels:
+            return False
+        with self._swap_lock:
+            self._swap_generation += 1
+            self._pending_swap = None
+            generation = self._swap_generation
+        thread = threading.Thread(
+            target=self._build_swap_recognizer,
+            args=(recognizer_factory, label, fallback_recognizer_factory, generation),
+            name="RecognizerHotSwap", daemon=True
+        )
+        thread.start()
+        return True
+
+    def _build_swap_recognizer(self, recognizer_factory, label, fallback_recognizer_factory, generation):
+        """
+        后台线程：创建热切换用的新识别器
+
+        Args:
+            recognizer_factory: 创建新识别器的函数
+            label: 新模型名称
+            fallback_recognizer_factory: 新模型的备用识别器工厂
+            generation: 请求序号，已有更新的请求时丢弃结果
+        """
+        # 导入日志工具
+        try:
+            from src.utils.sherpa_logger import sherpa_logger
+        except ImportError:
+            # 如果导入失败，创建一个简单的日志记录器
+            class DummyLogger:
+                def debug(self, msg): print(f"DEBUG: {msg}")
+                def info(self, msg): print(f"INFO: {msg}")
+                def warning(self, msg): print(f"WARNING: {msg}")
+                def error(self, msg): print(f"ERROR: {msg}")
+            sherpa_logger = DummyLogger()
+
+        recognizer = None
+        try:
+            recognizer = recognizer_factory()
+        except Exception as e:
+            sherpa_logger.error(f"创建新识别器失败: {e}")
+        if recognizer is None:
+            self.swap_stats["failures"] += 1
+            self.status.emit(f"创建 {label} 识别器失败，继续使用当前模型")
+            return
+        with self._swap_lock:
+            if generation != self._swap_generation or not self.running:
+                return
+            self._pending_swap = (recognizer, label, fallback_recognizer_factory, time.time())
+        self.status.emit(f"{label} 已就绪，将在当前句子结束时切换")
+
+    def _process_blocks_for_swap(self, data, sherpa_logger):
+        """
+        等待热切换时逐块识别，使端点（切换点）落在一个块内，切换后只需重放这一块中完整结果之后的音频
+
+        Args:
+            data: 单声道 float32 音频数据，长度为块大小的整数倍
+            sherpa_logger: 日志记录器
+
+        Returns:
+            tuple: (送入识别器的样本数, 识别耗时秒数)，全部被跳过时返回 None
+        """
+        total_samples = 0
+        total_seconds = 0.0
+        for start in range(0, len(data), self.buffer_size):
+            decode_stats = self._process_block(data[start:start + self.buffer_size], sherpa_logger)
+            if decode_stats:
+                total_samples += decode_stats[0]
+                total_seconds += decode_stats[1]
+        if not total_samples:
+            return None
+        return total_samples, total_seconds
+
+    def _check_pending_swap(self, sherpa_logger):
+        """
+        没有句子正在进行（切换不会截断句子）或等待超时时完成热切换
+
+        Args:
+            sherpa_logger: 日志记录器
+        """
+        pending = self._pending_swap
+        if pending is None:
+            return
+        if not self.sentence_in_progress:
+            self._complete_swap(None, sherpa_logger)
+        elif time.time() - pending[3] > self.hot_swap_max_wait:
+            sherpa_logger.warning(f"等待句子结束超过 {self.hot_swap_max_wait:.0f} 秒，强制切换识别器")
+            self._complete_swap(None, sherpa_logger, flush=True)
+
+    def _complete_swap(self, replay, sherpa_logger, flush=False):
+        """
+        切换到已就绪的新识别器
+
+        Args:
+            replay: 当前识别器在端点之后已经收到、需要重放给新识别器的音频，None 表示不重放
+            sherpa_logger: 日志记录器
+            flush: 是否先取出当前识别器未完成的结果并发送（强制切换时）
+        """
+        # 只读取一次：request_recognizer_swap() 可能同时把它清空
+        with self._swap_lock:
+            pending, self._pending_swap = self._pending_swap, None
+        if pending is None:
+            return
+        recognizer, label, fallback_recognizer_factory, ready_time = pending
+
+        if flush:
+            self._flush_recognizer(sherpa_logger)
+            self.swap_stats["forced"] += 1
+
+        self._use_recognizer(recognizer, len(replay) if replay is not None else 0)
+        self._primary_recognizer = recognizer
+        self._last_partial_result = ""
+        # 备用识别器属于原来的模型
+        self.fallback_recognizer_factory = fallback_recognizer_factory
+        self._fallback_recognizer = None
+        self._fallback_thread = None
+        self._fallback_failed = False
+
+        if replay is not None and len(replay):
+            self.swap_stats["replayed_seconds"] += len(replay) / self.sample_rate
+            if self._accept_waveform(replay):
+                result = self.recognizer.Result()
+                text = self._parse_result(result)
+                if text:
+                    self.new_text.emit(text)
+                    self._emit_segment(text, result)
+
+        self.swap_stats["swaps"] += 1
+        self.swap_stats["last_wait_seconds"] = time.time() - ready_time
+        message = f"识别器已热切换到 {label}，引擎类型: {getattr(recognizer, 'engine_type', None)}"
+        sherpa_logger.info(message)
+        self.status.emit(message)
+
+    def _samples_after_result(self, data, result):
+        """
+        取出本次送入识别器的音频中位于完整结果之后的部分
+
+        Args:
+            data: 刚送入识别器、产生完整结果的音频
+            result: 识别器返回的完整结果
+
+        Returns:
+            np.ndarray: 完整结果最后一个词之后的音频；识别器不提供时间信息时无法确定端点位置，
+                返回空数组（不重放，避免重复识别这一句）
+        """
+        timing = parse_result_timing(self.recognizer, result, self.sample_rate)
+        if not timing:
+            return data[:0]
+        block_start = self._sample_map.fed - len(data)
+        offset = self._recognizer_origin + timing["end_sample"] - block_start
+        return data[min(max(offset, 0), len(data)):]
+
+    def _get_recognizer_clock(self, recognizer):
+        """
+        获取识别器已接收的样本数（识别器的时间）
+
+        Args:
+            recognizer: 识别器
+
+        Returns:
+            int: 本线程之前送入的样本数；第一次使用时取识别器自己记录的 accepted_samples，没有时为 0
+        """
+        clock = self._recognizer_clocks.get(id(recognizer))
+        if clock is None:
+            accepted = getattr(recognizer, 'accepted_samples', 0)
+            clock = accepted if isinstance(accepted, int) else 0
+        return clock
+
+    def _use_recognizer(self, recognizer, replay_samples=0):
+        """
+        换用识别器，并记录它的时间零点对应的已送入样本数
+
+        Args:
+            recognizer: 新识别器
+            replay_samples: 接下来要重放给新识别器的、已经送入旧识别器的样本数
+        """
+        fed = self._sample_map.fed
+        self._recognizer_clocks[id(self.recognizer)] = fed - self._recognizer_origin
+        self.recognizer = recognizer
+        self._recognizer_origin = fed - replay_samples - self._get_recognizer_clock(recognizer)
+
+    def _emit_segment(self, text, result=None):
+        """
+        发送带时间戳的完整结果
+
+        识别器提供词时间（Vosk 的 "result"、SherpaOnnxASR.LastResultTiming()）时按词时间计算起止位置，
+        否则取上一句结束以来送入识别器的音频。
+
+        Args:
+            text: 已格式化的完整结果文本
+            result: 识别器返回的原始结果，None 表示没有（由部分结果或静音检测得到的句子）
+        """
+        try:
+            fed_end = self._sample_map.fed
+            timing = parse_result_timing(self.recognizer, result, self.sample_rate) if result is not None else None
+            sample_map = self._sample_map
+            if timing:
+                origin = self._recognizer_origin
+                start = sample_map.to_stream(origin + timing["start_sample"])
+                end = sample_map.to_stream_end(origin + timing["end_sample"])
+                words = [
+                    WordTiming(word.text, sample_map.to_stream(origin + word.start_sample),
+                               sample_map.to_stream_end(origin + word.end_sample))
+                    for word in timing.get("words") or []
+                ]
+            else:
+                start = sample_map.to_stream(self._segment_start_fed)
+                end = sample_map.to_stream_end(fed_end)
+                words = []
+            self._segment_start_fed = fed_end
+            if start is None or end is None:
+                return
+
+            segment = TranscriptSegment(text, start, end, self.sample_rate, words)
+            if self._capture_started_at is not None:
+                # 按实时录音估计；环形缓冲区溢出丢弃的音频不计入流位置，估计值会偏早
+                segment.captured_at = self._capture_started_at + end / self.sample_rate
+            segment.emitted_at = time.time()
+            if segment.latency is not None:
+                self.stage_stats["end_to_end"].add(max(0.0, segment.latency))
+            self.new_segment.emit(segment)
+        except Exception as e:
+            try:
+                from src.utils.sherpa_logger import sherpa_logger
+                sherpa_logger.debug(f"发送分段时间戳错误: {e}")
+            except ImportError:
+                pass
+
+    def _accept_waveform(self, data):
+        """
+        把单声道 float32 音频送入识别器
+
+        Args:
+            data: 单声道 float32 音频数据
+
+        Returns:
+            bool: 识别器是否给出了完整结果（检测到端点）
+        """
+        engine_type = getattr(self.recognizer, 'engine_type', None)
+        if engine_type and engine_type.startswith('sherpa'):
+            # 对于 Sherpa-ONNX 模型，直接传递 numpy 数组
+            return self.recognizer.AcceptWaveform(data)
+        # 对于 Vosk 模型，转换为 16 位整数 PCM（复用缓冲区，不复制）
+        return self.recognizer.AcceptWaveform(self._pcm_converter.float_to_pcm16_cbuffer(data))
+
+    def _get_block_size(self) -> int:
+        """
+        获取当前每次送入识别器的块大小
+
+        Returns:
+            int: 块大小（样本数）
+        """
+        if self.block_controller:
+            return self.block_controller.block_size
+        return self.buffer_size
 
-                    # 检查是否是完整的句子（通过检查是否包含"and"等连接词判断）
-                    # 如果不是完整句子，可能是因为部分结果被截断了
-                    if text and (" and " in text or text.endswith(" and")):
-                        # 尝试从完整结果中找到匹配的句子
-                        # 这里假设完整结果已经在UI中显示
-                        try:
-                            from src.ui.main_window import MainWindow
-                            if hasattr(MainWindow, 'instance') and MainWindow.instance:
-                                if hasattr(MainWindow.instance, 'subtitle_widget'):
-                                    subtitle_widget = MainWindow.instance.subtitle_widget
-                                    if hasattr(subtitle_widget, 'transcript_text') and subtitle_widget.transcript_text:
-                                        # 查找最近的完整结果中是否包含当前部分结果
-                                        for complete_text in reversed(subtitle_widget.transcript_text):
-                                            if text in complete_text:
-                                                text = complete_text
-                                                sherpa_logger.info(f"找到匹配的完整结果: {text}")
-                                                break
-                        except Exception as e:
-                            sherpa_logger.error(f"尝试查找完整结果时出错: {e}")
+    def get_capture_stats(self) -> Dict[str, Any]:
+        """
+        获取捕获环形缓冲区的统计信息（溢出次数、丢弃样本数等）
+
+        Returns:
+            Dict[str, Any]: 统计信息，尚未开始捕获时返回空字典
+        """
+        if not self.ring_buffer:
+            return {}
+        stats = self.ring_buffer.get_stats()
+        stats["dropped_blocks"] = self.ring_buffer.dropped_frames / self.buffer_size
+        stats["stages"] = {name: stage.get_stats() for name, stage in list(self.stage_stats.items())}
+        if self.backpressure:
+            stats["backpressure"] = self.backpressure.get_stats()
+        if self.swap_stats["swaps"] or self.swap_stats["failures"]:
+            stats["hot_swap"] = dict(self.swap_stats)
+        if self._channels:
+            # 分路识别时 VAD 和识别耗时记录在各通道中
+            stats["channels"] = {
+                channel.device.name: {name: stage.get_stats() for name, stage in channel.stage_stats.items()}
+                for channel in self._channels
+            }
+        return stats
+
+    def _process_block(self, data, sherpa_logger):
+        """
+        处理一批单声道音频：静音检测、送入识别器并发送识别结果
+
+        Args:
+            data: 单声道 float32 音频数据，长度为块大小的整数倍
+            sherpa_logger: 日志记录器
+
+        Returns:
+            tuple: (送入识别器的样本数, 识别耗时秒数)，静音被跳过时返回 None
+        """
+        # 逐块的调试日志在级别关闭时不格式化
+        debug = is_enabled_for(sherpa_logger, logging.DEBUG)
+
+        # 静音帧以 buffer_size 为单位计数，与块大小无关
+        num_blocks = len(data) / self.buffer_size
+        block_start = self._stream_position
+        self._stream_position += len(data)
+
+        # 新识别器已就绪时，在句子之间切换
+        self._check_pending_swap(sherpa_logger)
+
+        # 语音活动检测：只把语音（及其前后填充）送入识别器；
+        # 关闭 VAD 时，降级后也丢弃非语音
+        vad = self.vad
+        if vad is None and self._shed_level >= LEVEL_DROP_SILENCE:
+            vad = self._get_shed_vad()
+        if vad:
+            vad_start = time.perf_counter()
+            vad_origin = block_start - vad.position  # 检测器内的样本位置换算为音频流位置
+            vad_result = vad.process(data)
+            self.stage_stats["vad"].add(time.perf_counter() - vad_start)
+            for span_start, span_end in vad_result.spans:
+                self._sample_map.add(vad_origin + span_start, span_end - span_start)
+            if vad is self._shed_vad:
+                dropped = max(0, len(data) - len(vad_result.speech))
+                self.backpressure.record_action(ACTION_SILENCE_DROPPED, dropped / self.sample_rate)
+            data = vad_result.speech
+            is_silence = not vad_result.has_speech
+            # 语音结束后 VAD 只保留很短的拖尾，识别器收不到端点规则需要的尾部静音
+            utterance_ended = vad_result.speech_ended and not vad_result.is_speech
+        else:
+            self._sample_map.add(block_start, len(data))
+            is_silence = False
+            utterance_ended = False
+
+        if is_silence:
+            self._log_limiter.log(sherpa_logger, logging.DEBUG, "silence", "VAD检测到静音，静音帧计数: %s",
+                                  self.silence_frames)
+            self.silence_frames += num_blocks
+
+            if utterance_ended and self.sentence_in_progress:
+                self._end_utterance(sherpa_logger)
+                return None
+
+            # 如果有句子正在进行中，且静音持续足够长时间，认为句子结束
+            if self.sentence_in_progress and self.silence_frames >= self.silence_frames_threshold:
+                sherpa_logger.info(f"检测到静音持续{self.silence_frames}帧，判定当前句子结束")
 
+                # 如果有当前部分文本，将其作为完整句子提交
+                if self._last_partial_result:
                     # 格式化文本
+                    text = self._last_partial_result
                     if len(text) > 0:
                         text = text[0].upper() + text[1:]
                     if text[-1] not in ['.', '?', '!']:
                         text += '.'
-                    sherpa_logger.info(f"获取最终结果失败，使用最后一个部分结果作为最终文本: {text}")
+
+                    sherpa_logger.info(f"静音检测触发句子结束，发送完整文本: {text}")
                     self.new_text.emit(text)
+                    self._emit_segment(text)
+
+                    # 重置状态
+                    self._last_partial_result = ""
+                    self.sentence_in_progress = False
+                    self.last_sentence_end_time = time.time()
+
+                    # 静音没有送入识别器，识别器检测不到端点；重置识别器，避免这句话再出现在下一个完整结果中
+                    reset = getattr(self.recognizer, 'Reset', None)
+                    if reset:
+                        reset()
+
+            # 静音不送入识别器
+            return None
+        else:
+            # 如果检测到声音，重置静音计数
+            if self.silence_frames > 0:
+                if debug:
+                    sherpa_logger.debug(f"检测到声音，重置静音帧计数，之前为: {self.silence_frames}")
+                self.silence_frames = 0
+
+            # 标记有句子正在进行中
+            self.sentence_in_progress = True
+
+        # 处理音频数据
+        decode_start = time.perf_counter()
+        accept_result = self._accept_waveform(data)
+        self._log_limiter.log(sherpa_logger, logging.DEBUG, "accept", "处理音频数据，引擎类型: %s，AcceptWaveform 结果: %s",
+                              getattr(self.recognizer, 'engine_type', None), accept_result)
+
+        if accept_result:
+            # 获取完整结果
+            result = self.recognizer.Result()
+            decode_seconds = time.perf_counter() - decode_start
+            sherpa_logger.info(f"完整结果: {result}, 类型: {type(result)}")
+
+            text = self._parse_result(result)
+            sherpa_logger.info(f"解析后的完整结果: {text}")
+
+            if text:
+                sherpa_logger.info(f"发送完整文本: {text}")
+                self.new_text.emit(text)
+                self._emit_segment(text, result)
+            else:
+                sherpa_logger.warning(f"完整文本为空，不发送")
+
+            # 句子结束处完成热切换；端点之后的音频已经送入旧识别器，重放给新识别器
+            if self._pending_swap is not None:
+                self._complete_swap(self._samples_after_result(data, result), sherpa_logger)
+        elif self._shed_level >= LEVEL_SKIP_PARTIALS:
+            # 降级：不获取部分结果，只在识别器给出完整结果时输出
+            decode_seconds = time.perf_counter() - decode_start
+            self.backpressure.record_action(ACTION_PARTIALS_SKIPPED)
+        else:
+            # 获取部分结果；识别器提供 PartialDelta 时，没有新的 token 就不重复发送相同的部分结果
+            partial_delta = getattr(self.recognizer, 'PartialDelta', None)
+            if partial_delta:
+                delta = partial_delta()
+                partial = delta["text"] if delta["delta"] or delta["replaced"] else ""
+            else:
+                partial = self.recognizer.PartialResult()
+            decode_seconds = time.perf_counter() - decode_start
+            if debug:
+                sherpa_logger.debug(f"部分结果: {partial}, 类型: {type(partial)}")
 
-            sherpa_logger.info("音频处理结束")
-            self.finished.emit()
+            text = self._parse_partial_result(partial)
+            if debug:
+                sherpa_logger.debug(f"解析后的部分结果: {text}")
+
+            # 保存最新的部分结果，无论是否发送
+            if text:
+                self._last_partial_result = text
+
+                # 检查是否需要因为静音而结束句子
+                current_time = time.time()
+                time_since_last_sentence = current_time - self.last_sentence_end_time
+
+                # 如果静音持续足够长，且距离上次句子结束已经过了足够时间，认为是新句子
+                if self.silence_frames >= self.silence_frames_threshold and time_since_last_sentence > 2.0:
+                    # 格式化文本
+                    complete_text = text
+                    if len(complete_text) > 0:
+                        complete_text = complete_text[0].upper() + complete_text[1:]
+                    if complete_text[-1] not in ['.', '?', '!']:
+                        complete_text += '.'
+
+                    sherpa_logger.info(f"静音检测触发句子结束，发送完整文本: {complete_text}")
+                    self.new_text.emit(complete_text)
+                    self._emit_segment(complete_text)
+
+                    # 重置状态
+                    self._last_partial_result = ""
+                    self.sentence_in_progress = False
+                    self.last_sentence_end_time = current_time
+                else:
+                    # 正常发送部分文本
+                    if debug:
+                        sherpa_logger.debug(f"发送部分文本: {text}")
+                    self.new_text.emit("PARTIAL:" + text)
+            else:
+                self._log_limiter.log(sherpa_logger, logging.DEBUG, "empty_partial", "部分文本为空，不发送")
+
+        if utterance_ended and not accept_result:
+            self._end_utterance(sherpa_logger)
+
+        self.stage_stats["decode"].add(decode_seconds)
+        return len(data), decode_seconds
 
     def _parse_result(self, result):
         """解析完整识别结果"""
@@ -416,13 +1475,16 @@ class AudioWorker(QObject):
                     def warning(self, msg): print(f"WARNING: {msg}")
                     def error(self, msg): print(f"ERROR: {msg}")
                 sherpa_logger = DummyLogger()
+            debug = is_enabled_for(sherpa_logger, logging.DEBUG)
 
             # 记录原始结果
-            sherpa_logger.debug(f"解析完整结果: {result}, 类型: {type(result)}")
+            if debug:
+                sherpa_logger.debug(f"解析完整结果: {result}, 类型: {type(result)}")
 
             # 检查引擎类型
             engine_type = getattr(self.recognizer, 'engine_type', None)
-            sherpa_logger.debug(f"引擎类型: {engine_type}")
+            if debug:
+                sherpa_logger.debug(f"引擎类型: {engine_type}")
 
             # 如果是Vosk引擎，特殊处理
             if engine_type == "vosk_small" or engine_type == "vosk":
@@ -432,15 +1494,18 @@ class AudioWorker(QObject):
                     try:
                         result_json = json.loads(result)
                         text = result_json.get('text', '').strip()
-                        sherpa_logger.debug(f"Vosk JSON解析结果: {text}")
+                        if debug:
+                            sherpa_logger.debug(f"Vosk JSON解析结果: {text}")
                     except json.JSONDecodeError:
                         # 如果不是有效的JSON，直接使用文本
                         text = result.strip()
-                        sherpa_logger.debug(f"Vosk非JSON结果: {text}")
+                        if debug:
+                            sherpa_logger.debug(f"Vosk非JSON结果: {text}")
                 else:
                     # 如果不是字符串，尝试转换为字符串
                     text = str(result).strip()
-                    sherpa_logger.debug(f"Vosk非字符串结果: {text}")
+                    if debug:
+                        sherpa_logger.debug(f"Vosk非字符串结果: {text}")
 
                 # 格式化文本
                 if text:
@@ -448,7 +1513,8 @@ class AudioWorker(QObject):
                         text = text[0].upper() + text[1:]
                     if text[-1] not in ['.', '?', '!']:
                         text += '.'
-                    sherpa_logger.debug(f"Vosk格式化后结果: {text}")
+                    if debug:
+                        sherpa_logger.debug(f"Vosk格式化后结果: {text}")
                     return text
                 return None
 
@@ -514,13 +1580,16 @@ class AudioWorker(QObject):
                     def warning(self, msg): print(f"WARNING: {msg}")
                     def error(self, msg): print(f"ERROR: {msg}")
                 sherpa_logger = DummyLogger()
+            debug = is_enabled_for(sherpa_logger, logging.DEBUG)
 
             # 记录原始结果
-            sherpa_logger.debug(f"解析部分结果: {partial}, 类型: {type(partial)}")
+            if debug:
+                sherpa_logger.debug(f"解析部分结果: {partial}, 类型: {type(partial)}")
 
             # 检查引擎类型
             engine_type = getattr(self.recognizer, 'engine_type', None)
-            sherpa_logger.debug(f"引擎类型: {engine_type}")
+            if debug:
+                sherpa_logger.debug(f"引擎类型: {engine_type}")
 
             # 如果是Vosk引擎，特殊处理
             if engine_type == "vosk_small" or engine_type == "vosk":
@@ -530,24 +1599,28 @@ class AudioWorker(QObject):
                     try:
                         partial_json = json.loads(partial)
                         partial_text = partial_json.get('partial', '').strip()
-                        sherpa_logger.debug(f"Vosk JSON解析部分结果: {partial_text}")
+                        if debug:
+                            sherpa_logger.debug(f"Vosk JSON解析部分结果: {partial_text}")
 
                         # 格式化部分文本 - 首字母大写，但不添加句尾标点
                         if partial_text:
                             if len(partial_text) > 0:
                                 partial_text = partial_text[0].upper() + partial_text[1:]
-                            sherpa_logger.debug(f"Vosk格式化后的部分结果: {partial_text}")
+                            if debug:
+                                sherpa_logger.debug(f"Vosk格式化后的部分结果: {partial_text}")
 
                         # 保存最新的部分结果，用于后续处理
                         # 这对于在停止转录时获取最后一个单词特别有用
                         self._last_partial_result = partial_text
-                        print(f"保存最新部分结果: {partial_text}")  # 添加打印，便于调试
+                        if debug:
+                            sherpa_logger.debug(f"保存最新部分结果: {partial_text}")
 
                         return partial_text
                     except json.JSONDecodeError:
                         # 如果不是有效的JSON，直接使用文本
                         partial_text = partial.strip()
-                        sherpa_logger.debug(f"Vosk非JSON部分结果: {partial_text}")
+                        if debug:
+                            sherpa_logger.debug(f"Vosk非JSON部分结果: {partial_text}")
 
                         # 格式化部分文本
                         if partial_text:
@@ -556,13 +1629,15 @@ class AudioWorker(QObject):
 
                         # 保存最新的部分结果
                         self._last_partial_result = partial_text
-                        print(f"保存最新部分结果(非JSON): {partial_text}")  # 添加打印，便于调试
+                        if debug:
+                            sherpa_logger.debug(f"保存最新部分结果(非JSON): {partial_text}")
 
                         return partial_text
                 else:
                     # 如果不是字符串，尝试转换为字符串
                     partial_text = str(partial).strip()
-                    sherpa_logger.debug(f"Vosk非字符串部分结果: {partial_text}")
+                    if debug:
+                        sherpa_logger.debug(f"Vosk非字符串部分结果: {partial_text}")
 
                     # 格式化部分文本
                     if partial_text:
@@ -643,6 +1718,21 @@ class AudioWorker(QObject):
             print(traceback.format_exc())
             return ""
 
+
+# 正在捕获的处理器。进程退出时先停止它们的工作线程，
+# 避免 QThread 在运行中被销毁导致进程崩溃（例如没有调用 stop_capture 就退出时）
+_active_processors = set()
+
+
+def _stop_active_captures():
+    """停止所有仍在运行的捕获工作线程"""
+    for processor in list(_active_processors):
+        processor._shutdown_worker_thread()
+
+
+atexit.register(_stop_active_captures)
+
+
 class AudioProcessor(QObject):
     """音频处理器类"""
     # 定义 Qt 信号
@@ -650,6 +1740,7 @@ class AudioProcessor(QObject):
     error_signal = pyqtSignal(str)
     status_signal = pyqtSignal(str)
     progress_signal = pyqtSignal(int, str)
+    capture_stopped = pyqtSignal()  # 工作线程处理完剩余音频、发送最终结果并退出后发射
 
     def __init__(self, signals: TranscriptionSignals):
         super().__init__()
@@ -660,32 +1751,132 @@ class AudioProcessor(QObject):
         self.sample_rate = 16000
         self.buffer_size = 4000
         self.worker_thread = None
+        self._stopping = []  # 停止后仍在处理剩余音频的 (QThread, AudioWorker)，线程退出前保留引用
+
+        # 捕获环形缓冲区配置
+        self.ring_buffer_seconds = 2.0
+        self.drop_policy = "drop_oldest"
+        self.max_batch_blocks = 4
+        self.vad_config = {}
+        self.capture_sample_rate = None  # None 表示由音频后端重采样
+        self.adaptive_block_config = {}
+        self.multi_source_config = {}
+        self.spool_config = {}
+        self.backpressure_config = {}
+        self.hot_swap_config = {}
+        self.last_spool_path = None  # 最近一次实时转录的录音缓存
+        self.current_devices = []  # 多设备采集时选中的设备
+        self.device_registry = get_device_registry()
+        self._load_capture_config()
+
+    def _load_capture_config(self):
+        """从配置文件加载音频捕获相关配置"""
+        try:
+            from src.utils.config_manager import config_manager
+            capture_config = config_manager.get_config("audio", "capture", default={}) or {}
+            self.ring_buffer_seconds = float(capture_config.get("ring_buffer_seconds", self.ring_buffer_seconds))
+            self.drop_policy = capture_config.get("drop_policy", self.drop_policy)
+            self.max_batch_blocks = int(capture_config.get("max_batch_blocks", self.max_batch_blocks))
+            self.vad_config = config_manager.get_config("audio", "vad", default={}) or {}
+            self.adaptive_block_config = config_manager.get_config("audio", "adaptive_block", default={}) or {}
+            self.multi_source_config = config_manager.get_config("audio", "multi_source", default={}) or {}
+            self.spool_config = config_manager.get_config("audio", "spool", default={}) or {}
+            self.backpressure_config = config_manager.get_config("audio", "backpressure", default={}) or {}
+            self.hot_swap_config = config_manager.get_config("audio", "hot_swap", default={}) or {}
+            if capture_config.get("native_rate", False):
+                self.capture_sample_rate = int(capture_config.get("capture_sample_rate", 48000))
+            devices_config = config_manager.get_config("audio", "devices", default={}) or {}
+            self.device_registry.refresh_interval = float(
+                devices_config.get("refresh_interval", self.device_registry.refresh_interval)
+            )
+        except ImportError:
+            pass
+        except Exception as e:
+            print(f"加载音频捕获配置失败，使用默认值: {e}")
 
-    def get_audio_devices(self) -> List[AudioDevice]:
+    def get_capture_stats(self) -> Dict[str, Any]:
         """
-        获取音频设备列表
+        获取当前捕获的环形缓冲区统计信息
 
         Returns:
-            List[AudioDevice]: 音频设备列表
+            Dict[str, Any]: 统计信息，未在捕获时返回空字典
         """
-        devices = []
-
+        worker = getattr(self, 'worker', None)
+        if not self.is_capturing or not worker:
+            return {}
         try:
-            # 获取所有输入设备
-            speakers = sc.all_speakers()
-            for speaker in speakers:
-                devices.append(AudioDevice(speaker.id, speaker.name, False))
+            return worker.get_capture_stats()
+        except RuntimeError:
+            # worker 已被 Qt 删除
+            return {}
+
+    def _shutdown_worker_thread(self, timeout_ms: int = 2000) -> None:
+        """
+        通知工作线程停止，并等待 QThread 退出
 
-            # 获取所有输出设备
-            mics = sc.all_microphones(include_loopback=True)
-            for mic in mics:
-                devices.append(AudioDevice(mic.id, mic.name, True))
+        Args:
+            timeout_ms: 等待时间（毫秒）
+        """
+        _active_processors.discard(self)
+        try:
+            worker = getattr(self, 'worker', None)
+            if worker:
+                worker.running = False
+            threads = [thread for thread, _ in self._stopping]
+            if self.worker_thread and self.worker_thread not in threads:
+                threads.append(self.worker_thread)
+            for thread in threads:
+                if thread.isRunning():
+                    thread.quit()
+                    thread.wait(timeout_ms)
+        except RuntimeError:
+            # Qt 对象已被删除
+            pass
+
+    def replay_spool(self, recognizer: Any, path: Optional[str] = None, start: float = 0.0,
+                     end: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        用指定识别器重放录音缓存（不受实时速度限制）
 
-            return devices
+        Args:
+            recognizer: 识别器
+            path: 缓存文件路径，默认为最近一次实时转录的缓存
+            start: 起始时间（秒，相对录音开始）
+            end: 结束时间（秒），None 表示到录音末尾
 
+        Returns:
+            Optional[Dict[str, Any]]: 识别结果和耗时统计，失败时返回 None
+        """
+        path = path or self.last_spool_path
+        if not path:
+            self.error_signal.emit("没有可重放的录音缓存")
+            return None
+        try:
+            with PCMSpoolReader(path) as reader:
+                if reader.sample_rate != self.sample_rate:
+                    self.error_signal.emit(f"录音缓存采样率 {reader.sample_rate} 与当前采样率 {self.sample_rate} 不一致")
+                    return None
+                return reader.replay(
+                    recognizer, start, end, block_size=self.buffer_size,
+                    on_result=lambda result: self.signals.new_text.emit(result["text"])
+                )
         except Exception as e:
-            print(f"获取音频设备失败: {e}")
-            return []
+            self.error_signal.emit(f"重放录音缓存失败: {e}")
+            return None
+
+    def get_audio_devices(self) -> List[AudioDevice]:
+        """
+        获取音频设备列表
+
+        Returns:
+            List[AudioDevice]: 音频设备列表
+        """
+        # 设备列表由注册表缓存，只在第一次调用时同步枚举，之后由后台线程刷新
+        return self.device_registry.get_devices()
+
+    def refresh_audio_devices(self) -> None:
+        """请求重新枚举音频设备，变化通过 device_registry.devices_changed 通知"""
+        self.device_registry.request_refresh()
 
     def set_current_device(self, device: AudioDevice) -> bool:
         """
@@ -703,8 +1894,73 @@ class AudioProcessor(QObject):
         self.current_device = device
         return True
 
-    def start_capture(self, recognizer: Any) -> bool:
-        """开始捕获音频"""
+    def set_current_devices(self, devices: List[AudioDevice]) -> bool:
+        """
+        设置多设备同时采集（如系统输出回环 + 麦克风）
+
+        Args:
+            devices: 音频设备列表，第一个设备同时作为当前设备
+
+        Returns:
+            bool: 设置是否成功
+        """
+        devices = [device for device in devices or [] if device]
+        if not devices:
+            return False
+
+        self.current_devices = devices
+        self.current_device = devices[0]
+        return True
+
+    def get_fallback_model(self, model_name: Optional[str]) -> Optional[str]:
+        """
+        获取识别跟不上实时时切换到的备用模型
+
+        Args:
+            model_name: 当前模型名称
+
+        Returns:
+            Optional[str]: 备用模型名称，未启用降级或没有配置备用模型时返回 None
+        """
+        if not self.backpressure_config.get("enabled", False):
+            return None
+        return resolve_fallback_model(model_name, self.backpressure_config.get("fallback_models"))
+
+    def swap_recognizer(self, recognizer_factory: Callable[[], Any], label: str = "新模型",
+                        fallback_recognizer_factory: Optional[Callable[[], Any]] = None) -> bool:
+        """
+        捕获过程中热切换识别器（如切换了模型），不停止捕获、不丢失音频
+
+        Args:
+            recognizer_factory: 创建新识别器的函数，在后台线程中调用
+            label: 新模型名称
+            fallback_recognizer_factory: 新模型的备用识别器工厂
+
+        Returns:
+            bool: 是否已开始切换，未在捕获或分路识别时返回 False
+        """
+        worker = getattr(self, 'worker', None)
+        if not self.is_capturing or not worker:
+            return False
+        try:
+            return worker.request_recognizer_swap(recognizer_factory, label, fallback_recognizer_factory)
+        except RuntimeError:
+            # worker 已被 Qt 删除
+            return False
+
+    def start_capture(self, recognizer: Any, recognizer_factory: Optional[Callable[[], Any]] = None,
+                      fallback_recognizer_factory: Optional[Callable[[], Any]] = None) -> bool:
+        """
+        开始捕获音频
+
+        Args:
+            recognizer: 识别器
+            recognizer_factory: 多设备分路识别时为其他设备创建识别器的函数
+            fallback_recognizer_factory: 识别跟不上实时时创建备用（更快的）识别器的函数
+
+        Returns:
+            bool: 是否成功启动
+        """
         if self.is_capturing:
             return False
 
@@ -712,14 +1968,37 @@ class AudioProcessor(QObject):
             self.error_signal.emit("未选择音频设备")
             return False
 
+        # 选择了多个设备时同时采集
+        device = self.current_device
+        if len(self.current_devices) > 1 and self.current_device in self.current_devices:
+            device = self.current_devices
+
         # 创建工作线程
+        try:
+            worker = AudioWorker(
+                device,
+                self.sample_rate,
+                self.buffer_size,
+                recognizer,
+                ring_buffer_seconds=self.ring_buffer_seconds,
+                drop_policy=self.drop_policy,
+                max_batch_blocks=self.max_batch_blocks,
+                vad_config=self.vad_config,
+                capture_sample_rate=self.capture_sample_rate,
+                adaptive_block_config=self.adaptive_block_config,
+                multi_source_config=self.multi_source_config,
+                recognizer_factory=recognizer_factory,
+                spool_config=self.spool_config,
+                backpressure_config=self.backpressure_config,
+                fallback_recognizer_factory=fallback_recognizer_factory,
+                hot_swap_config=self.hot_swap_config
+            )
+        except ValueError as e:
+            self.error_signal.emit(str(e))
+            return False
+
         self.worker_thread = QThread()
-        self.worker = AudioWorker(
-            self.current_device,
-            self.sample_rate,
-            self.buffer_size,
-            recognizer
-        )
+        self.worker = worker
         self.worker.moveToThread(self.worker_thread)
 
         # 连接信号
@@ -727,15 +2006,18 @@ class AudioProcessor(QObject):
         self.worker.finished.connect(self.worker_thread.quit)
         self.worker.finished.connect(self.worker.deleteLater)
         self.worker_thread.finished.connect(self.worker_thread.deleteLater)
+        self.worker_thread.finished.connect(functools.partial(self._on_worker_thread_finished, self.worker_thread))
 
         # 转发信号到TranscriptionSignals实例
         self.worker.new_text.connect(lambda x: self.signals.new_text.emit(x))
+        self.worker.new_segment.connect(lambda x: self.signals.new_segment.emit(x))
         self.worker.error.connect(lambda x: self.signals.error_occurred.emit(x))
         self.worker.status.connect(lambda x: self.signals.status_updated.emit(x))
         self.worker.progress.connect(lambda x, y: self.signals.progress_updated.emit(x, y))
 
         # 启动线程
         self.is_capturing = True
+        _active_processors.add(self)
         self.worker_thread.start()
 
         return True
@@ -761,373 +2043,7 @@ class AudioProcessor(QObject):
         if hasattr(self, 'worker') and self.worker:
             self.worker.running = False
             sherpa_logger.info("已标记工作线程为停止状态")
-
-        # 在停止捕获前，获取最终结果
-        try:
-            if hasattr(self, 'worker') and self.worker and hasattr(self.worker, 'recognizer'):
-                recognizer = self.worker.recognizer
-                sherpa_logger.info("获取最终识别结果")
-
-                # 检查引擎类型
-                engine_type = getattr(recognizer, 'engine_type', None)
-                sherpa_logger.info(f"引擎类型: {engine_type}")
-
-                # 获取最终结果
-                try:
-                    # 对于Vosk模型，调用FinalResult方法
-                    if engine_type == "vosk_small" or engine_type == "vosk":
-                        final_result = recognizer.FinalResult()
-                        sherpa_logger.info(f"Vosk最终结果: {final_result}")
-
-                        # 解析最终结果
-                        if isinstance(final_result, str):
-                            try:
-                                result_json = json.loads(final_result)
-                                text = result_json.get('text', '').strip()
-                                sherpa_logger.info(f"解析后的最终结果: {text}")
-
-                                # 如果有文本，发送到UI
-                                if text:
-                                    # 格式化文本
-                                    if len(text) > 0:
-                                        text = text[0].upper() + text[1:]
-                                    if text[-1] not in ['.', '?', '!']:
-                                        text += '.'
-                                    sherpa_logger.info(f"发送最终文本: {text}")
-                                    self.signals.new_text.emit(text)
-                                elif hasattr(self.worker, '_last_partial_result') and self.worker._last_partial_result:
-                                    # 如果最终结果为空但有最后一个部分结果，使用部分结果作为最终结果
-                                    # 注意：此时self.worker._last_partial_result可能已经是匹配过的完整结果
-                                    # 因为在SubtitleWidget的update_text方法中，我们已经尝试匹配完整结果
-                                    text = self.worker._last_partial_result
-                                    # 记录使用的部分结果
-                                    sherpa_logger.info(f"使用的最后一个部分结果原始值: {text}")
-
-                                    # 尝试查找匹配的完整句子
-                                    try:
-                                        from src.ui.main_window import MainWindow
-                                        if hasattr(MainWindow, 'instance') and MainWindow.instance:
-                                            if hasattr(MainWindow.instance, 'subtitle_widget'):
-                                                subtitle_widget = MainWindow.instance.subtitle_widget
-                                                if hasattr(subtitle_widget, '_find_matching_complete_text'):
-                                                    matched_text = subtitle_widget._find_matching_complete_text(text)
-                                                    if matched_text:
-                                                        sherpa_logger.info(f"找到匹配的完整句子: {matched_text}")
-                                                        text = matched_text
-                                    except Exception as e:
-                                        sherpa_logger.error(f"尝试查找匹配的完整句子时出错: {e}")
-
-                                    # 检查是否是完整的句子（通过检查是否包含"and"等连接词判断）
-                                    # 如果不是完整句子，可能是因为部分结果被截断了
-                                    if text:
-                                        # 尝试从完整结果中找到匹配的句子
-                                        # 这里假设完整结果已经在UI中显示
-                                        try:
-                                            from src.ui.main_window import MainWindow
-                                            if hasattr(MainWindow, 'instance') and MainWindow.instance:
-                                                if hasattr(MainWindow.instance, 'subtitle_widget'):
-                                                    subtitle_widget = MainWindow.instance.subtitle_widget
-                                                    if hasattr(subtitle_widget, 'transcript_text') and subtitle_widget.transcript_text:
-                                                        # 打印完整的transcript_text列表，便于调试
-                                                        sherpa_logger.info(f"当前完整文本列表: {subtitle_widget.transcript_text}")
-
-                                                        # 首先检查是否有以"and"结尾的部分结果
-                                                        if " and " in text or text.endswith(" and"):
-                                                            sherpa_logger.info(f"检测到以'and'结尾的部分结果: {text}")
-                                                            # 特殊处理以"and"结尾的情况
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查是否有包含相同前缀但更完整的句子
-                                                                if complete_text.startswith(text.rstrip(" and")) and "and " in complete_text:
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(and特殊处理): {text}")
-                                                                    break
-
-                                                        # 如果没有找到匹配，继续使用常规匹配逻辑
-                                                        if text.endswith(" and"):
-                                                            # 查找最近的完整结果中是否包含当前部分结果
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查部分结果是否是完整结果的前缀（去掉末尾的"and"）
-                                                                prefix = text.rstrip(" and")
-                                                                if prefix and complete_text.startswith(prefix):
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(前缀匹配-去除and): {text}")
-                                                                    break
-
-                                                        # 如果仍然没有找到匹配，使用常规匹配逻辑
-                                                        if text.endswith(" and"):
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查部分结果（去掉末尾的"and"）是否包含在完整结果中
-                                                                prefix = text.rstrip(" and")
-                                                                if prefix and prefix in complete_text:
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(子串匹配-去除and): {text}")
-                                                                    break
-
-                                                        # 如果仍然没有找到匹配，使用常规匹配逻辑
-                                                        for complete_text in reversed(subtitle_widget.transcript_text):
-                                                            # 检查部分结果是否是完整结果的前缀
-                                                            if complete_text.startswith(text):
-                                                                text = complete_text
-                                                                sherpa_logger.info(f"找到匹配的完整结果(前缀匹配): {text}")
-                                                                break
-                                                            # 检查部分结果是否包含在完整结果中
-                                                            elif text in complete_text:
-                                                                text = complete_text
-                                                                sherpa_logger.info(f"找到匹配的完整结果(子串匹配): {text}")
-                                                                break
-                                                            # 检查完整结果是否包含部分结果的大部分内容
-                                                            elif len(text) > 10:  # 只对较长的部分结果进行相似度检查
-                                                                # 计算部分结果的单词
-                                                                partial_words = text.split()
-                                                                # 计算完整结果的单词
-                                                                complete_words = complete_text.split()
-                                                                # 计算共同单词的数量
-                                                                common_words = set(partial_words) & set(complete_words)
-                                                                # 如果共同单词的数量超过部分结果单词数量的80%，认为匹配
-                                                                if len(common_words) >= 0.8 * len(partial_words):
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(相似度匹配): {text}")
-                                                                    break
-
-                                                                # 如果部分结果以"and"结尾，特殊处理
-                                                                if text.endswith(" and"):
-                                                                    # 计算去掉"and"后的相似度
-                                                                    partial_words_no_and = text.rstrip(" and").split()
-                                                                    if partial_words_no_and:
-                                                                        common_words_no_and = set(partial_words_no_and) & set(complete_words)
-                                                                        if len(common_words_no_and) >= 0.8 * len(partial_words_no_and):
-                                                                            text = complete_text
-                                                                            sherpa_logger.info(f"找到匹配的完整结果(相似度匹配-去除and): {text}")
-                                                                            break
-                                        except Exception as e:
-                                            sherpa_logger.error(f"尝试查找完整结果时出错: {e}")
-
-                                    # 格式化文本
-                                    if len(text) > 0:
-                                        text = text[0].upper() + text[1:]
-                                    if text[-1] not in ['.', '?', '!']:
-                                        text += '.'
-                                    sherpa_logger.info(f"使用最后一个部分结果作为最终文本: {text}")
-                                    self.signals.new_text.emit(text)
-                            except json.JSONDecodeError:
-                                sherpa_logger.error(f"解析最终结果JSON失败: {final_result}")
-
-                                # 如果JSON解析失败但有最后一个部分结果，使用部分结果作为最终结果
-                                if hasattr(self.worker, '_last_partial_result') and self.worker._last_partial_result:
-                                    text = self.worker._last_partial_result
-                                    # 记录使用的部分结果
-                                    sherpa_logger.info(f"JSON解析失败，使用的最后一个部分结果原始值: {text}")
-
-                                    # 检查是否是完整的句子（通过检查是否包含"and"等连接词判断）
-                                    # 如果不是完整句子，可能是因为部分结果被截断了
-                                    if text:
-                                        # 尝试从完整结果中找到匹配的句子
-                                        # 这里假设完整结果已经在UI中显示
-                                        try:
-                                            from src.ui.main_window import MainWindow
-                                            if hasattr(MainWindow, 'instance') and MainWindow.instance:
-                                                if hasattr(MainWindow.instance, 'subtitle_widget'):
-                                                    subtitle_widget = MainWindow.instance.subtitle_widget
-                                                    if hasattr(subtitle_widget, 'transcript_text') and subtitle_widget.transcript_text:
-                                                        # 打印完整的transcript_text列表，便于调试
-                                                        sherpa_logger.info(f"当前完整文本列表: {subtitle_widget.transcript_text}")
-
-                                                        # 首先检查是否有以"and"结尾的部分结果
-                                                        if " and " in text or text.endswith(" and"):
-                                                            sherpa_logger.info(f"检测到以'and'结尾的部分结果: {text}")
-                                                            # 特殊处理以"and"结尾的情况
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查是否有包含相同前缀但更完整的句子
-                                                                if complete_text.startswith(text.rstrip(" and")) and "and " in complete_text:
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(and特殊处理): {text}")
-                                                                    break
-
-                                                        # 如果没有找到匹配，继续使用常规匹配逻辑
-                                                        if text.endswith(" and"):
-                                                            # 查找最近的完整结果中是否包含当前部分结果
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查部分结果是否是完整结果的前缀（去掉末尾的"and"）
-                                                                prefix = text.rstrip(" and")
-                                                                if prefix and complete_text.startswith(prefix):
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(前缀匹配-去除and): {text}")
-                                                                    break
-
-                                                        # 如果仍然没有找到匹配，使用常规匹配逻辑
-                                                        if text.endswith(" and"):
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查部分结果（去掉末尾的"and"）是否包含在完整结果中
-                                                                prefix = text.rstrip(" and")
-                                                                if prefix and prefix in complete_text:
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(子串匹配-去除and): {text}")
-                                                                    break
-
-                                                        # 如果仍然没有找到匹配，使用常规匹配逻辑
-                                                        for complete_text in reversed(subtitle_widget.transcript_text):
-                                                            # 检查部分结果是否是完整结果的前缀
-                                                            if complete_text.startswith(text):
-                                                                text = complete_text
-                                                                sherpa_logger.info(f"找到匹配的完整结果(前缀匹配): {text}")
-                                                                break
-                                                            # 检查部分结果是否包含在完整结果中
-                                                            elif text in complete_text:
-                                                                text = complete_text
-                                                                sherpa_logger.info(f"找到匹配的完整结果(子串匹配): {text}")
-                                                                break
-                                                            # 检查完整结果是否包含部分结果的大部分内容
-                                                            elif len(text) > 10:  # 只对较长的部分结果进行相似度检查
-                                                                # 计算部分结果的单词
-                                                                partial_words = text.split()
-                                                                # 计算完整结果的单词
-                                                                complete_words = complete_text.split()
-                                                                # 计算共同单词的数量
-                                                                common_words = set(partial_words) & set(complete_words)
-                                                                # 如果共同单词的数量超过部分结果单词数量的80%，认为匹配
-                                                                if len(common_words) >= 0.8 * len(partial_words):
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(相似度匹配): {text}")
-                                                                    break
-
-                                                                # 如果部分结果以"and"结尾，特殊处理
-                                                                if text.endswith(" and"):
-                                                                    # 计算去掉"and"后的相似度
-                                                                    partial_words_no_and = text.rstrip(" and").split()
-                                                                    if partial_words_no_and:
-                                                                        common_words_no_and = set(partial_words_no_and) & set(complete_words)
-                                                                        if len(common_words_no_and) >= 0.8 * len(partial_words_no_and):
-                                                                            text = complete_text
-                                                                            sherpa_logger.info(f"找到匹配的完整结果(相似度匹配-去除and): {text}")
-                                                                            break
-                                        except Exception as e:
-                                            sherpa_logger.error(f"尝试查找完整结果时出错: {e}")
-
-                                    # 格式化文本
-                                    if len(text) > 0:
-                                        text = text[0].upper() + text[1:]
-                                    if text[-1] not in ['.', '?', '!']:
-                                        text += '.'
-                                    sherpa_logger.info(f"JSON解析失败，使用最后一个部分结果作为最终文本: {text}")
-                                    self.signals.new_text.emit(text)
-                    else:
-                        # 对于其他模型，尝试调用FinalResult方法
-                        if hasattr(recognizer, 'FinalResult'):
-                            final_result = recognizer.FinalResult()
-                            sherpa_logger.info(f"其他模型最终结果: {final_result}")
-
-                            # 如果是字符串，尝试解析
-                            if isinstance(final_result, str):
-                                text = final_result.strip()
-                                if text:
-                                    sherpa_logger.info(f"发送最终文本: {text}")
-                                    self.signals.new_text.emit(text)
-                                elif hasattr(self.worker, '_last_partial_result') and self.worker._last_partial_result:
-                                    # 如果最终结果为空但有最后一个部分结果，使用部分结果作为最终结果
-                                    text = self.worker._last_partial_result
-                                    # 记录使用的部分结果
-                                    sherpa_logger.info(f"其他模型使用的最后一个部分结果原始值: {text}")
-
-                                    # 检查是否是完整的句子（通过检查是否包含"and"等连接词判断）
-                                    # 如果不是完整句子，可能是因为部分结果被截断了
-                                    if text:
-                                        # 尝试从完整结果中找到匹配的句子
-                                        # 这里假设完整结果已经在UI中显示
-                                        try:
-                                            from src.ui.main_window import MainWindow
-                                            if hasattr(MainWindow, 'instance') and MainWindow.instance:
-                                                if hasattr(MainWindow.instance, 'subtitle_widget'):
-                                                    subtitle_widget = MainWindow.instance.subtitle_widget
-                                                    if hasattr(subtitle_widget, 'transcript_text') and subtitle_widget.transcript_text:
-                                                        # 打印完整的transcript_text列表，便于调试
-                                                        sherpa_logger.info(f"当前完整文本列表: {subtitle_widget.transcript_text}")
-
-                                                        # 首先检查是否有以"and"结尾的部分结果
-                                                        if " and " in text or text.endswith(" and"):
-                                                            sherpa_logger.info(f"检测到以'and'结尾的部分结果: {text}")
-                                                            # 特殊处理以"and"结尾的情况
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查是否有包含相同前缀但更完整的句子
-                                                                if complete_text.startswith(text.rstrip(" and")) and "and " in complete_text:
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(and特殊处理): {text}")
-                                                                    break
-
-                                                        # 如果没有找到匹配，继续使用常规匹配逻辑
-                                                        if text.endswith(" and"):
-                                                            # 查找最近的完整结果中是否包含当前部分结果
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查部分结果是否是完整结果的前缀（去掉末尾的"and"）
-                                                                prefix = text.rstrip(" and")
-                                                                if prefix and complete_text.startswith(prefix):
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(前缀匹配-去除and): {text}")
-                                                                    break
-
-                                                        # 如果仍然没有找到匹配，使用常规匹配逻辑
-                                                        if text.endswith(" and"):
-                                                            for complete_text in reversed(subtitle_widget.transcript_text):
-                                                                # 检查部分结果（去掉末尾的"and"）是否包含在完整结果中
-                                                                prefix = text.rstrip(" and")
-                                                                if prefix and prefix in complete_text:
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(子串匹配-去除and): {text}")
-                                                                    break
-
-                                                        # 如果仍然没有找到匹配，使用常规匹配逻辑
-                                                        for complete_text in reversed(subtitle_widget.transcript_text):
-                                                            # 检查部分结果是否是完整结果的前缀
-                                                            if complete_text.startswith(text):
-                                                                text = complete_text
-                                                                sherpa_logger.info(f"找到匹配的完整结果(前缀匹配): {text}")
-                                                                break
-                                                            # 检查部分结果是否包含在完整结果中
-                                                            elif text in complete_text:
-                                                                text = complete_text
-                                                                sherpa_logger.info(f"找到匹配的完整结果(子串匹配): {text}")
-                                                                break
-                                                            # 检查完整结果是否包含部分结果的大部分内容
-                                                            elif len(text) > 10:  # 只对较长的部分结果进行相似度检查
-                                                                # 计算部分结果的单词
-                                                                partial_words = text.split()
-                                                                # 计算完整结果的单词
-                                                                complete_words = complete_text.split()
-                                                                # 计算共同单词的数量
-                                                                common_words = set(partial_words) & set(complete_words)
-                                                                # 如果共同单词的数量超过部分结果单词数量的80%，认为匹配
-                                                                if len(common_words) >= 0.8 * len(partial_words):
-                                                                    text = complete_text
-                                                                    sherpa_logger.info(f"找到匹配的完整结果(相似度匹配): {text}")
-                                                                    break
-
-                                                                # 如果部分结果以"and"结尾，特殊处理
-                                                                if text.endswith(" and"):
-                                                                    # 计算去掉"and"后的相似度
-                                                                    partial_words_no_and = text.rstrip(" and").split()
-                                                                    if partial_words_no_and:
-                                                                        common_words_no_and = set(partial_words_no_and) & set(complete_words)
-                                                                        if len(common_words_no_and) >= 0.8 * len(partial_words_no_and):
-                                                                            text = complete_text
-                                                                            sherpa_logger.info(f"找到匹配的完整结果(相似度匹配-去除and): {text}")
-                                                                            break
-                                        except Exception as e:
-                                            sherpa_logger.error(f"尝试查找完整结果时出错: {e}")
-
-                                    # 格式化文本
-                                    if len(text) > 0:
-                                        text = text[0].upper() + text[1:]
-                                    if text[-1] not in ['.', '?', '!']:
-                                        text += '.'
-                                    sherpa_logger.info(f"使用最后一个部分结果作为最终文本: {text}")
-                                    self.signals.new_text.emit(text)
-                except Exception as e:
-                    sherpa_logger.error(f"获取最终结果错误: {e}")
-                    import traceback
-                    sherpa_logger.error(traceback.format_exc())
-        except Exception as e:
-            sherpa_logger.error(f"处理最终结果时发生错误: {e}")
-            import traceback
-            sherpa_logger.error(traceback.format_exc())
+            self.last_spool_path = getattr(self.worker, 'spool_path', None) or self.last_spool_path
 
         # 添加安全检查，防止访问已删除的对象
         try:
@@ -1139,15 +2055,16 @@ class AudioProcessor(QObject):
                     # 如果worker对象已被删除，记录错误但继续执行
                     sherpa_logger.warning(f"警告: 设置worker.running=False时出错: {e}")
 
-            # 然后尝试停止线程
+            # 然后让线程在处理完剩余音频后退出，不在调用线程（界面线程）中等待。
+            # 工作线程处理完缓冲区中剩余的音频并发送最终结果后退出，之后发射 capture_stopped；
+            # 最终结果只由工作线程发送，这里不调用识别器（识别器不能跨线程使用，且会重复发送最后一句）
             if hasattr(self, 'worker_thread') and self.worker_thread:
                 try:
-                    # 检查线程是否仍在运行
                     if self.worker_thread.isRunning():
                         self.worker_thread.quit()
-                        # 设置较短的超时时间，避免长时间等待
-                        if not self.worker_thread.wait(1000):  # 等待最多1秒
-                            sherpa_logger.warning("警告: 线程未能在1秒内停止")
+                        # 线程退出前保留引用，即使在此期间重新开始捕获也不会销毁正在运行的线程
+                        self._stopping.append((self.worker_thread, getattr(self, 'worker', None)))
+                        sherpa_logger.info("等待工作线程处理剩余音频")
                 except RuntimeError as e:
                     # 如果线程对象已被删除，记录错误但继续执行
                     sherpa_logger.warning(f"警告: 停止线程时出错: {e}")
@@ -1157,10 +2074,27 @@ class AudioProcessor(QObject):
             import traceback
             sherpa_logger.error(traceback.format_exc())
 
-        # 无论如何，确保捕获标志被重置
+        # 无论如何，确保捕获标志被重置；仍在处理剩余音频时，由 _on_worker_thread_finished 移出 _active_processors
         self.is_capturing = False
+        if not self._stopping:
+            _active_processors.discard(self)
+            self.capture_stopped.emit()
         return True
 
+    def _on_worker_thread_finished(self, thread):
+        """
+        工作线程退出（剩余音频已处理、最终结果已发送）
+
+        Args:
+            thread: 退出的 QThread
+        """
+        stopping = any(item[0] is thread for item in self._stopping)
+        self._stopping = [item for item in self._stopping if item[0] is not thread]
+        if not self.is_capturing and not self._stopping:
+            _active_processors.discard(self)
+        if stopping:
+            self.capture_stopped.emit()
+
     def _capture_audio_thread(self, recognizer: Any) -> None:
         """
         音频捕获线程（已废弃）
@@ -0,0 +1,367 @@
+"""
+音频源模块
+为 AudioWorker 提供统一的录音接口：声卡设备、WAV/PCM 文件回放和合成音频，
+使整个转录流水线可以在没有声卡的环境中运行和测试
+"""
+import os
+import time
+import wave
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from src.core.audio.resampler import PolyphaseResampler
+
+
+class AudioRecorder:
+    """录音会话
+
+    接口与 soundcard 的 recorder 一致：在 with 语句中使用，record(numframes) 返回
+    形状为 (样本数,) 或 (样本数, 声道数) 的 float32 数组。音频源结束时返回空数组。
+
+    speed 控制回放速度：1 为实时，N 为 N 倍速，0 或 None 为不限速。
+    """
+
+    def __init__(self, samplerate: int, speed: Optional[float] = 1.0):
+        """
+        初始化录音会话
+
+        Args:
+            samplerate: 输出采样率
+            speed: 回放速度倍数
+        """
+        self.samplerate = int(samplerate)
+        self.speed = speed
+        self.frames = 0  # 已输出的样本数
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        """释放资源"""
+
+    def _read(self, numframes: int) -> np.ndarray:
+        """读取最多 numframes 个样本（由子类实现）"""
+        raise NotImplementedError
+
+    def record(self, numframes: int) -> np.ndarray:
+        """
+        读取一块音频，按 speed 限速
+
+        Args:
+            numframes: 样本数
+
+        Returns:
+            np.ndarray: float32 音频，音频源结束时为空数组
+        """
+        data = self._read(numframes)
+        self.frames += len(data)
+        if self.speed and len(data):
+            # 按已输出的音频时长限速，不累积 sleep 误差
+            due = self._start + self.frames / (self.samplerate * self.speed)
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        return data
+
+
+class AudioSource:
+    """音频源基类
+
+    提供与 AudioDevice 相同的 id/name 属性，可以代替设备传给 AudioWorker。
+    realtime 为 False 的音频源（不限速回放）在缓冲区满时由捕获线程等待，而不是丢弃数据。
+    """
+
+    realtime = True
+
+    def __init__(self, source_id: str, name: str):
+        """
+        初始化音频源
+
+        Args:
+            source_id: 音频源ID
+            name: 音频源名称
+        """
+        self.id = source_id
+        self.name = name
+        self.is_input = True
+
+    def recorder(self, samplerate: int) -> AudioRecorder:
+        """
+        创建录音会话
+
+        Args:
+            samplerate: 输出采样率
+
+        Returns:
+            AudioRecorder: 录音会话
+        """
+        raise NotImplementedError
+
+    def __str__(self):
+        return f"{self.name} ({self.id})"
+
+
+class SoundcardSource(AudioSource):
+    """声卡设备（包括系统输出的回环录音）"""
+
+    def __init__(self, device: Any):
+        """
+        初始化声卡音频源
+
+        Args:
+            device: AudioDevice 或具有 id/name 属性的设备对象
+        """
+        super().__init__(str(device.id), device.name)
+        self.device = device
+
+    def recorder(self, samplerate: int):
+        """创建 soundcard 录音会话"""
+        # 延迟导入：没有音频后端的环境（如无 PulseAudio 的 Linux）仍可使用其他音频源
+        import soundcard as sc
+        return sc.get_microphone(id=self.id, include_loopback=True).recorder(samplerate=samplerate)
+
+
+class _FileRecorder(AudioRecorder):
+    """按块读取 WAV/PCM 文件的录音会话"""
+
+    def __init__(self, source: "FileAudioSource", samplerate: int):
+        super().__init__(samplerate, source.speed)
+        self.source = source
+        self._reader = None
+        self._spool = None
+        self._position = 0
+        self._file_rate = None
+        self._resampler = None
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._open()
+
+    def _open(self) -> None:
+        """打开文件，按文件格式选择读取方式"""
+        path = self.source.path
+        if path.lower().endswith(".wav"):
+            self._reader = wave.open(path, "rb")
+            if self._reader.getsampwidth() not in (1, 2, 4):
+                raise ValueError(f"不支持的WAV采样位宽: {self._reader.getsampwidth() * 8} 位")
+            self._file_rate = self._reader.getframerate()
+        else:
+            # 录音缓存文件（带 .json 元数据）
+            from src.core.audio.pcm_spool import PCMSpoolReader
+            self._spool = PCMSpoolReader(path)
+            self._file_rate = self._spool.sample_rate
+        if self._file_rate != self.samplerate:
+            self._resampler = PolyphaseResampler(self._file_rate, self.samplerate)
+
+    def _rewind(self) -> None:
+        """回到文件开头（循环播放）"""
+        if self._reader:
+            self._reader.rewind()
+        self._position = 0
+
+    def _read_file(self, numframes: int) -> np.ndarray:
+        """以文件采样率读取最多 numframes 个单声道样本"""
+        if self._reader:
+            raw = self._reader.readframes(numframes)
+            width = self._reader.getsampwidth()
+            channels = self._reader.getnchannels()
+            if width == 1:
+                samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+            elif width == 2:
+                samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+            else:
+                samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+            if channels > 1:
+                samples = samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+            return samples
+
+        end = min(self._spool.frames, self._position + numframes)
+        start_seconds = self._position / self._file_rate
+        end_seconds = end / self._file_rate
+        self._position = end
+        blocks = list(self._spool.iter_blocks(start_seconds, end_seconds, block_size=max(1, numframes)))
+        return blocks[0].copy() if blocks else np.zeros(0, dtype=np.float32)
+
+    def _read(self, numframes: int) -> np.ndarray:
+        # 按采样率比例多读一些，重采样后凑足 numframes
+        while len(self._pending) < numframes:
+            want = numframes - len(self._pending)
+            if self._resampler:
+                want = int(np.ceil(want * self._file_rate / self.samplerate)) + 1
+            samples = self._read_file(want)
+            if len(samples) == 0:
+                if not self.source.loop:
+                    break
+                self._rewind()
+                samples = self._read_file(want)
+                if len(samples) == 0:
+                    break
+            if self._resampler:
+                samples = self._resampler.process(samples)
+            self._pending = np.concatenate((self._pending, samples))
+
+        data, self._pending = self._pending[:numframes], self._pending[numframes:]
+        return data.astype(np.float32, copy=False)
+
+    def close(self) -> None:
+        if self._reader:
+            self._reader.close()
+            self._reader = None
+        if self._spool:
+            self._spool.close()
+            self._spool = None
+
+
+class FileAudioSource(AudioSource):
+    """WAV 文件或录音缓存（.pcm + .json）回放音频源"""
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0, loop: bool = False):
+        """
+        初始化文件音频源
+
+        Args:
+            path: WAV 文件或录音缓存文件路径
+            speed: 回放速度倍数，1 为实时，0 或 None 为不限速
+            loop: 是否循环播放
+
+        Raises:
+            FileNotFoundError: 文件不存在时
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"音频文件不存在: {path}")
+        super().__init__(f"file:{path}", os.path.basename(path))
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.realtime = bool(speed)
+
+    def recorder(self, samplerate: int) -> AudioRecorder:
+        """创建文件回放会话"""
+        return _FileRecorder(self, samplerate)
+
+
+class _SyntheticRecorder(AudioRecorder):
+    """逐段生成合成音频的录音会话"""
+
+    def __init__(self, source: "SyntheticAudioSource", samplerate: int):
+        super().__init__(samplerate, source.speed)
+        self.source = source
+        self._rng = np.random.default_rng(source.seed)
+        self._segment = 0
+        self._offset = 0  # 当前段内已生成的样本数
+
+    def _generate(self, segment: Dict[str, Any], start: int, frames: int) -> np.ndarray:
+        """生成一段中从 start 开始的 frames 个样本"""
+        kind = segment.get("type", "silence")
+        amplitude = float(segment.get("amplitude", 0.3))
+        if kind == "tone":
+            t = (np.arange(start, start + frames) / self.samplerate).astype(np.float64)
+            return (amplitude * np.sin(2 * np.pi * float(segment.get("frequency", 440.0)) * t)).astype(np.float32)
+        if kind == "noise":
+            return (amplitude * self._rng.standard_normal(frames)).astype(np.float32)
+        if kind == "silence":
+            return np.zeros(frames, dtype=np.float32)
+        raise ValueError(f"未知的合成音频类型: {kind}")
+
+    def _read(self, numframes: int) -> np.ndarray:
+        segments = self.source.segments
+        output = np.zeros(numframes, dtype=np.float32)
+        filled = 0
+        while filled < numframes:
+            if self._segment >= len(segments):
+                if not self.source.loop:
+                    break
+                self._segment = 0
+            segment = segments[self._segment]
+            length = int(round(float(segment.get("seconds", 1.0)) * self.samplerate))
+            frames = min(numframes - filled, length - self._offset)
+            if frames > 0:
+                output[filled:filled + frames] = self._generate(segment, self._offset, frames)
+                filled += frames
+                self._offset += frames
+            if self._offset >= length:
+                self._segment += 1
+                self._offset = 0
+        return output[:filled]
+
+
+class SyntheticAudioSource(AudioSource):
+    """合成音频源：按顺序生成正弦音、噪声和静音段
+
+    每段是一个字典，例如：
+        {"type": "tone", "frequency": 440, "amplitude": 0.3, "seconds": 1.0}
+        {"type": "noise", "amplitude": 0.05, "seconds": 0.5}
+        {"type": "silence", "seconds": 2.0}
+    """
+
+    def __init__(self, segments: Optional[List[Dict[str, Any]]] = None, speed: Optional[float] = 1.0,
+                 loop: bool = False, seed: int = 0, name: str = "合成音频"):
+        """
+        初始化合成音频源
+
+        Args:
+            segments: 音频段列表，默认为 1 秒正弦音和 1 秒静音交替
+            speed: 生成速度倍数，1 为实时，0 或 None 为不限速
+            loop: 是否循环生成
+            seed: 噪声随机数种子
+            name: 音频源名称
+        """
+        super().__init__("synthetic", name)
+        self.segments = segments or [
+            {"type": "tone", "frequency": 440.0, "amplitude": 0.3, "seconds": 1.0},
+            {"type": "silence", "seconds": 1.0},
+        ]
+        self.speed = speed
+        self.loop = loop
+        self.seed = seed
+        self.realtime = bool(speed)
+
+    @property
+    def duration(self) -> float:
+        """一轮所有音频段的总时长（秒）"""
+        return sum(float(segment.get("seconds", 1.0)) for segment in self.segments)
+
+    def recorder(self, samplerate: int) -> AudioRecorder:
+        """创建合成音频会话"""
+        return _SyntheticRecorder(self, samplerate)
+
+
+def open_audio_source(device: Any) -> AudioSource:
+    """
+    把 AudioWorker 的设备参数转换为音频源
+
+    Args:
+        device: AudioSource，或 AudioDevice 等声卡设备
+
+    Returns:
+        AudioSource: 音频源
+    """
+    if isinstance(device, AudioSource):
+        return device
+    return SoundcardSource(device)
+
+
+def read_source_audio(source: AudioSource, samplerate: int, block_size: int = 16000) -> np.ndarray:
+    """
+    读出音频源的全部音频（用于离线测试和调优，音频源应不限速且不循环）
+
+    Args:
+        source: 音频源
+        samplerate: 采样率
+        block_size: 每次读取的样本数
+
+    Returns:
+        np.ndarray: 单声道 float32 音频
+    """
+    blocks = []
+    with source.recorder(samplerate) as recorder:
+        while True:
+            block = recorder.record(block_size)
+            if len(block) == 0:
+                break
+            blocks.append(block)
+    return np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.float32)
@@ -0,0 +1,195 @@
+"""
+背压与降级策略模块
+负责在识别跟不上实时（捕获缓冲区中积压的音频越来越多）时逐级降低识别负载
+"""
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+
+# 降级级别，数值越大降级越多；高级别包含所有低级别的措施
+LEVEL_NORMAL = 0  # 正常识别
+LEVEL_DROP_SILENCE = 1  # 丢弃非语音音频（即使关闭了 VAD）
+LEVEL_SKIP_PARTIALS = 2  # 不再获取和发送部分结果，只输出完整结果
+LEVEL_FALLBACK_MODEL = 3  # 切换到更快的备用模型（如 *_int8）
+
+LEVEL_NAMES = ("normal", "drop_silence", "skip_partials", "fallback_model")
+
+# 各降级措施的计量名称
+ACTION_SILENCE_DROPPED = "silence_dropped_seconds"  # 因降级丢弃的非语音音频时长（秒）
+ACTION_PARTIALS_SKIPPED = "partials_skipped"  # 跳过的部分结果次数
+ACTION_MODEL_SWITCHES = "model_switches"  # 识别器切换次数（切到备用模型及切回）
+ACTION_FALLBACK_FAILURES = "fallback_failures"  # 创建备用识别器失败次数
+
+
+def resolve_fallback_model(model_name: Optional[str], fallback_models: Optional[Dict[str, str]]) -> Optional[str]:
+    """
+    查找模型的备用（更快的）模型
+
+    Args:
+        model_name: 当前模型名称（如 sherpa_onnx_std）
+        fallback_models: 模型名称到备用模型名称的映射（audio.backpressure.fallback_models）
+
+    Returns:
+        Optional[str]: 备用模型名称，没有配置或与当前模型相同时返回 None
+    """
+    if not model_name or not fallback_models:
+        return None
+    fallback = fallback_models.get(model_name)
+    if not fallback or fallback == model_name:
+        return None
+    return fallback
+
+
+class BackpressureController:
+    """基于排队时长的降级控制器
+
+    每次识别线程取数据前用缓冲区中积压的音频时长（秒）调用 update()：
+    - 积压达到某一级的阈值时立即升到该级（可以跨级）
+    - 积压低于当前级阈值的 recover_ratio 倍，且在当前级停留了至少 min_hold_seconds 秒后
+      才降一级，避免在阈值附近来回切换（切换模型的代价很高）
+
+    控制器只负责决定级别并记录计量，具体措施由 AudioWorker 执行并通过 record_action() 计量。
+    """
+
+    def __init__(self, sample_rate: int = 16000, drop_silence_seconds: float = 0.5,
+                 skip_partials_seconds: float = 1.0, fallback_seconds: float = 1.5,
+                 recover_ratio: float = 0.5, min_hold_seconds: float = 2.0, max_events: int = 100):
+        """
+        初始化降级控制器
+
+        Args:
+            sample_rate: 采样率
+            drop_silence_seconds: 进入“丢弃非语音”级别的积压时长（秒）
+            skip_partials_seconds: 进入“跳过部分结果”级别的积压时长（秒）
+            fallback_seconds: 进入“切换备用模型”级别的积压时长（秒）
+            recover_ratio: 积压低于当前级阈值的该倍数时才允许降级（0-1）
+            min_hold_seconds: 每一级至少停留的时间（秒）
+            max_events: 保留的最近级别变化事件数
+
+        Raises:
+            ValueError: 阈值不是正数或不是递增时
+        """
+        thresholds = (drop_silence_seconds, skip_partials_seconds, fallback_seconds)
+        if thresholds[0] <= 0 or not thresholds[0] <= thresholds[1] <= thresholds[2]:
+            raise ValueError(f"降级阈值必须为正数且递增: {thresholds}")
+        if not 0 < recover_ratio <= 1:
+            raise ValueError(f"恢复比例无效: {recover_ratio}")
+
+        self.sample_rate = sample_rate
+        # thresholds[i] 为进入第 i+1 级的积压时长
+        self.thresholds = tuple(float(value) for value in thresholds)
+        self.recover_ratio = recover_ratio
+        self.min_hold_seconds = min_hold_seconds
+
+        self.level = LEVEL_NORMAL
+        self.transitions = 0
+        self.max_queue_seconds = 0.0
+        self.last_queue_seconds = 0.0
+        self.events = deque(maxlen=max_events)
+        self.actions = {
+            ACTION_SILENCE_DROPPED: 0.0,
+            ACTION_PARTIALS_SKIPPED: 0,
+            ACTION_MODEL_SWITCHES: 0,
+            ACTION_FALLBACK_FAILURES: 0,
+        }
+        self._level_seconds = [0.0] * len(LEVEL_NAMES)
+        self._level_since = None
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]], sample_rate: int = 16000) -> "BackpressureController":
+        """
+        根据配置字典创建控制器
+
+        Args:
+            config: 配置字典（config.json 中的 audio.backpressure）
+            sample_rate: 采样率
+
+        Returns:
+            BackpressureController: 控制器实例
+        """
+        config = config or {}
+        keys = ("drop_silence_seconds", "skip_partials_seconds", "fallback_seconds",
+                "recover_ratio", "min_hold_seconds", "max_events")
+        kwargs = {key: config[key] for key in keys if key in config}
+        return cls(sample_rate=sample_rate, **kwargs)
+
+    @property
+    def level_name(self) -> str:
+        """当前级别名称"""
+        return LEVEL_NAMES[self.level]
+
+    def update(self, queue_seconds: float, now: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        """
+        记录一次排队时长并按需调整级别
+
+        Args:
+            queue_seconds: 缓冲区中积压的音频时长（秒）
+            now: 当前时间（time.monotonic()），None 表示取当前时间
+
+        Returns:
+            Optional[tuple]: 级别发生变化时返回 (原级别, 新级别)，否则返回 None
+        """
+        now = time.monotonic() if now is None else now
+        if self._level_since is None:
+            self._level_since = now
+        self.last_queue_seconds = queue_seconds
+        self.max_queue_seconds = max(self.max_queue_seconds, queue_seconds)
+
+        target = sum(1 for threshold in self.thresholds if queue_seconds >= threshold)
+        if target > self.level:
+            new_level = target
+        elif (self.level > LEVEL_NORMAL
+              and queue_seconds < self.thresholds[self.level - 1] * self.recover_ratio
+              and now - self._level_since >= self.min_hold_seconds):
+            new_level = self.level - 1
+        else:
+            return None
+
+        old_level = self.level
+        self._level_seconds[old_level] += now - self._level_since
+        self._level_since = now
+        self.level = new_level
+        self.transitions += 1
+        self.events.append({
+            "time": time.time(),
+            "from": LEVEL_NAMES[old_level],
+            "to": LEVEL_NAMES[new_level],
+            "queue_seconds": queue_seconds,
+        })
+        return old_level, new_level
+
+    def record_action(self, action: str, amount: float = 1) -> None:
+        """
+        计量一次降级措施
+
+        Args:
+            action: 措施名称（ACTION_* 常量）
+            amount: 计量值（次数或秒数）
+        """
+        self.actions[action] = self.actions.get(action, 0) + amount
+
+    def get_stats(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        获取控制器状态和各降级措施的计量
+
+        Args:
+            now: 当前时间（time.monotonic()），None 表示取当前时间
+
+        Returns:
+            Dict[str, Any]: 状态信息
+        """
+        now = time.monotonic() if now is None else now
+        level_seconds = list(self._level_seconds)
+        if self._level_since is not None:
+            level_seconds[self.level] += now - self._level_since
+        return {
+            "level": self.level,
+            "level_name": self.level_name,
+            "thresholds": self.thresholds,
+            "last_queue_seconds": self.last_queue_seconds,
+            "max_queue_seconds": self.max_queue_seconds,
+            "transitions": self.transitions,
+            "seconds_in_level": dict(zip(LEVEL_NAMES, level_seconds)),
+            "actions": dict(self.actions),
+            "events": list(self.events),
+        }
@@ -0,0 +1,159 @@
+"""
+自适应块大小控制模块
+负责根据识别耗时（实时率）调整每次送入识别器的音频块大小
+"""
+from typing import Dict, Any, Optional
+
+
+class AdaptiveBlockSizeController:
+    """基于实时率（RTF）的块大小控制器
+
+    RTF = 识别耗时 / 音频时长。控制器对 RTF 做指数平滑：
+    - 平滑 RTF 高于 target_rtf_high（识别器跟不上）时按 grow_factor 增大块，
+      减少每次调用的固定开销
+    - 平滑 RTF 低于 target_rtf_low（CPU 有余量）时按 shrink_factor 减小块，
+      降低部分结果的延迟
+    - 每次调整后至少间隔 cooldown 次测量才允许再次调整，避免来回抖动
+
+    块大小始终是 quantum 的整数倍，并限制在 [min_size, max_size] 内。
+    """
+
+    def __init__(self, initial_size: int, min_size: int, max_size: int, sample_rate: int = 16000,
+                 target_rtf_low: float = 0.3, target_rtf_high: float = 0.7,
+                 smoothing: float = 0.3, grow_factor: float = 1.5, shrink_factor: float = 0.75,
+                 cooldown: int = 4, quantum: int = 160):
+        """
+        初始化控制器
+
+        Args:
+            initial_size: 初始块大小（样本数）
+            min_size: 最小块大小（样本数）
+            max_size: 最大块大小（样本数）
+            sample_rate: 采样率
+            target_rtf_low: RTF 低于此值时减小块
+            target_rtf_high: RTF 高于此值时增大块
+            smoothing: RTF 指数平滑系数（0-1，越大越跟随最新测量）
+            grow_factor: 增大块时的倍数
+            shrink_factor: 减小块时的倍数
+            cooldown: 两次调整之间的最少测量次数
+            quantum: 块大小的对齐单位（样本数，默认 10 毫秒）
+
+        Raises:
+            ValueError: 参数无效时
+        """
+        if min_size <= 0 or max_size < min_size:
+            raise ValueError(f"块大小范围无效: [{min_size}, {max_size}]")
+        if not 0 < target_rtf_low < target_rtf_high:
+            raise ValueError(f"目标RTF范围无效: [{target_rtf_low}, {target_rtf_high}]")
+
+        self.sample_rate = sample_rate
+        self.quantum = max(1, int(quantum))
+        self.min_size = self._align(min_size)
+        self.max_size = max(self.min_size, self._align(max_size))
+        self.target_rtf_low = target_rtf_low
+        self.target_rtf_high = target_rtf_high
+        self.smoothing = smoothing
+        self.grow_factor = grow_factor
+        self.shrink_factor = shrink_factor
+        self.cooldown = max(1, int(cooldown))
+
+        self.block_size = self._clamp(initial_size)
+        self.rtf = None  # 平滑后的 RTF，尚无测量时为 None
+        self.last_rtf = None  # 最近一次测量的 RTF
+        self.adjustments = 0
+        self._since_adjust = 0
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]], initial_size: int,
+                    sample_rate: int = 16000) -> "AdaptiveBlockSizeController":
+        """
+        根据配置字典创建控制器，未配置的边界以 initial_size 为基准
+
+        Args:
+            config: 配置字典（config.json 中的 audio.adaptive_block）
+            initial_size: 初始块大小（通常为 buffer_size）
+            sample_rate: 采样率
+
+        Returns:
+            AdaptiveBlockSizeController: 控制器实例
+        """
+        config = config or {}
+        keys = ("target_rtf_low", "target_rtf_high", "smoothing", "grow_factor",
+                "shrink_factor", "cooldown", "quantum")
+        kwargs = {key: config[key] for key in keys if key in config}
+        return cls(
+            initial_size,
+            int(config.get("min_block_size", max(1, initial_size // 4))),
+            int(config.get("max_block_size", initial_size * 4)),
+            sample_rate=sample_rate,
+            **kwargs
+        )
+
+    def _align(self, size: float) -> int:
+        """对齐到 quantum 的整数倍（至少一个 quantum）"""
+        return max(self.quantum, int(round(size / self.quantum)) * self.quantum)
+
+    def _clamp(self, size: float) -> int:
+        """对齐并限制在块大小范围内"""
+        return min(self.max_size, max(self.min_size, self._align(size)))
+
+    @property
+    def block_ms(self) -> float:
+        """当前块时长（毫秒）"""
+        return self.block_size * 1000.0 / self.sample_rate
+
+    def update(self, frames: int, elapsed: float) -> bool:
+        """
+        记录一次识别的耗时并按需调整块大小
+
+        Args:
+            frames: 本次送入识别器的样本数
+            elapsed: 本次识别耗时（秒）
+
+        Returns:
+            bool: 块大小是否发生变化
+        """
+        if frames <= 0:
+            return False
+
+        self.last_rtf = elapsed / (frames / self.sample_rate)
+        if self.rtf is None:
+            self.rtf = self.last_rtf
+        else:
+            self.rtf += self.smoothing * (self.last_rtf - self.rtf)
+
+        self._since_adjust += 1
+        if self._since_adjust < self.cooldown:
+            return False
+
+        if self.rtf > self.target_rtf_high:
+            new_size = self._clamp(self.block_size * self.grow_factor)
+        elif self.rtf < self.target_rtf_low:
+            new_size = self._clamp(self.block_size * self.shrink_factor)
+        else:
+            return False
+
+        if new_size == self.block_size:
+            return False
+
+        self.block_size = new_size
+        self.adjustments += 1
+        self._since_adjust = 0
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取控制器状态
+
+        Returns:
+            Dict[str, Any]: 状态信息
+        """
+        return {
+            "block_size": self.block_size,
+            "block_ms": self.block_ms,
+            "rtf": self.rtf,
+            "last_rtf": self.last_rtf,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "adjustments": self.adjustments,
+        }
@@ -0,0 +1,228 @@
+"""
+音频设备注册表模块
+负责缓存音频设备列表，在后台线程中刷新，并以增量（新增/移除/变更）的形式通知设备变化
+"""
+import threading
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+def device_key(device: Any) -> str:
+    """
+    生成设备的稳定键：方向 + 后端设备ID
+
+    同一个物理设备既可能作为扬声器（输出）也可能作为回环麦克风（输入）出现，
+    后端 ID 相同，因此需要带上方向。
+
+    Args:
+        device: 具有 id/is_input 属性的设备对象
+
+    Returns:
+        str: 设备键
+    """
+    direction = "in" if getattr(device, "is_input", True) else "out"
+    return f"{direction}:{device.id}"
+
+
+def enumerate_soundcard_devices() -> List[Any]:
+    """
+    通过 soundcard 枚举所有扬声器和麦克风（包括回环设备）
+
+    Returns:
+        List[AudioDevice]: 设备列表，扬声器在前
+
+    Raises:
+        Exception: 音频后端不可用或枚举失败时
+    """
+    # 使用 audio_processor 已导入的 soundcard 模块（没有音频后端时为 None）
+    from src.core.audio import audio_processor
+    sc = audio_processor.sc
+    if sc is None:
+        raise RuntimeError("音频后端不可用（未安装 soundcard 或缺少系统音频库）")
+    AudioDevice = audio_processor.AudioDevice
+
+    devices = [AudioDevice(speaker.id, speaker.name, False) for speaker in sc.all_speakers()]
+    devices.extend(AudioDevice(mic.id, mic.name, True) for mic in sc.all_microphones(include_loopback=True))
+    return devices
+
+
+class DeviceRegistry(QObject):
+    """音频设备注册表
+
+    第一次调用 get_devices() 时同步枚举一次，之后都返回缓存。start() 启动后台线程，
+    每隔 refresh_interval 秒或在 request_refresh() 时重新枚举，
+    与缓存比较后通过 devices_changed 信号只发送变化的部分。
+
+    键相同的设备保持同一个对象，界面和 AudioProcessor 持有的设备引用在刷新后仍然有效。
+    信号可能在后台线程中发出，接收方应为 QObject 的槽，由 Qt 排队到其所在线程。
+    """
+
+    devices_changed = pyqtSignal(list, list, list)  # (新增设备, 移除设备, 名称变更的设备)
+    refresh_failed = pyqtSignal(str)
+
+    def __init__(self, enumerator: Optional[Callable[[], List[Any]]] = None, refresh_interval: float = 5.0):
+        """
+        初始化设备注册表
+
+        Args:
+            enumerator: 枚举设备的函数，失败时抛出异常；默认使用 soundcard
+            refresh_interval: 后台刷新间隔（秒），0 表示只在请求时刷新
+        """
+        super().__init__()
+        self.enumerator = enumerator or enumerate_soundcard_devices
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.Lock()
+        self._devices: Dict[str, Any] = {}
+        self._loaded = False
+        self._refresh_requested = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.refresh_count = 0
+        self.last_error = None
+
+    def get_devices(self) -> List[Any]:
+        """
+        获取缓存的设备列表，尚未枚举过时同步枚举一次
+
+        Returns:
+            List[AudioDevice]: 设备列表（按枚举顺序）
+        """
+        if not self._loaded:
+            self.refresh()
+        with self._lock:
+            return list(self._devices.values())
+
+    def get_device(self, key: str) -> Optional[Any]:
+        """
+        按设备键查找设备
+
+        Args:
+            key: device_key() 生成的设备键
+
+        Returns:
+            Optional[AudioDevice]: 设备，不存在时返回 None
+        """
+        with self._lock:
+            return self._devices.get(key)
+
+    def refresh(self) -> Optional[Tuple[List[Any], List[Any], List[Any]]]:
+        """
+        立即重新枚举设备并更新缓存
+
+        Returns:
+            Optional[tuple]: (新增, 移除, 变更) 设备列表，枚举失败时返回 None（缓存保持不变）
+        """
+        try:
+            enumerated = self.enumerator()
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"枚举音频设备失败: {e}")
+            self.refresh_failed.emit(str(e))
+            return None
+
+        with self._lock:
+            old = self._devices
+            new = {}
+            added, changed = [], []
+            for device in enumerated:
+                key = device_key(device)
+                if key in new:
+                    continue
+                existing = old.get(key)
+                if existing is None:
+                    new[key] = device
+                    added.append(device)
+                    continue
+                if existing.name != device.name:
+                    existing.name = device.name
+                    changed.append(existing)
+                new[key] = existing
+            removed = [device for key, device in old.items() if key not in new]
+            self._devices = new
+            self._loaded = True
+            self.refresh_count += 1
+            self.last_error = None
+
+        if added or removed or changed:
+            self.devices_changed.emit(added, removed, changed)
+        return added, removed, changed
+
+    def request_refresh(self) -> None:
+        """请求后台线程尽快刷新（未启动后台线程时同步刷新）"""
+        if self._thread and self._thread.is_alive():
+            self._refresh_requested.set()
+        else:
+            self.refresh()
+
+    def start(self) -> None:
+        """启动后台刷新线程"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="AudioDeviceRegistry", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """
+        停止后台刷新线程
+
+        Args:
+            timeout: 等待线程退出的时间（秒）
+        """
+        self._stop_event.set()
+        self._refresh_requested.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _refresh_loop(self) -> None:
+        """后台刷新线程"""
+        # soundcard 在 Windows 上需要在枚举线程中初始化 COM
+        try:
+            from src.utils.com_handler import com_handler
+            com_handler.initialize_com()
+        except Exception as e:
+            print(f"设备刷新线程COM初始化错误: {e}")
+
+        while not self._stop_event.is_set():
+            self._refresh_requested.wait(self.refresh_interval or None)
+            self._refresh_requested.clear()
+            if self._stop_event.is_set():
+                break
+            self.refresh()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取注册表状态
+
+        Returns:
+            Dict[str, Any]: 状态信息
+        """
+        with self._lock:
+            count = len(self._devices)
+        return {
+            "devices": count,
+            "refresh_count": self.refresh_count,
+            "running": bool(self._thread and self._thread.is_alive()),
+            "last_error": self.last_error,
+        }
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_device_registry() -> DeviceRegistry:
+    """
+    获取使用 soundcard 枚举的全局设备注册表
+
+    Returns:
+        DeviceRegistry: 全局设备注册表
+    """
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = DeviceRegistry()
+        return _default_registry
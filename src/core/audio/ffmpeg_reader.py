@@ -0,0 +1,296 @@
+"""
+FFmpeg 流式解码模块
+负责把 ffmpeg 输出的 16 位 PCM 按固定大小的块流式交给识别器，内存占用与文件长度无关
+"""
+import queue
+import subprocess
+import threading
+from collections import deque
+from typing import Any, BinaryIO, Callable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from src.core.audio.pcm_cache import DecodedAudioCache
+
+# 队列结束标记
+_END = object()
+
+
+def build_ffmpeg_command(file_path: str, sample_rate: int = 16000, ffmpeg: str = "ffmpeg") -> List[str]:
+    """
+    生成把任意音频/视频文件解码为单声道 16 位 PCM 并写到标准输出的 ffmpeg 命令
+
+    Args:
+        file_path: 输入文件路径
+        sample_rate: 输出采样率
+        ffmpeg: ffmpeg 可执行文件
+
+    Returns:
+        List[str]: 命令参数
+    """
+    return [
+        ffmpeg,
+        '-nostdin',
+        '-loglevel', 'error',
+        '-i', file_path,
+        '-ar', str(sample_rate),  # 采样率
+        '-ac', '1',               # 单声道
+        '-f', 's16le',            # 16 位小端 PCM
+        '-'
+    ]
+
+
+class PCMBlockReader:
+    """从二进制流中按固定大小读取 16 位 PCM 块
+
+    后台线程读取并转换数据，最多预读 prefetch_blocks 块：读取（以及 ffmpeg 解码）与识别同时进行，
+    而内存中最多只有 prefetch_blocks + 1 块音频。
+    """
+
+    def __init__(self, stream: BinaryIO, block_samples: int = 8000, prefetch_blocks: int = 8,
+                 as_float: bool = True, tee: Optional[Callable[[bytes], None]] = None):
+        """
+        初始化 PCM 块读取器
+
+        Args:
+            stream: 16 位小端 PCM 的二进制流
+            block_samples: 每块的样本数（最后一块可能更短）
+            prefetch_blocks: 最多预读的块数
+            as_float: True 时输出 [-1, 1] 范围的 float32 数组，False 时输出原始字节
+            tee: 每块原始字节的额外接收者（如写入解码音频缓存），在后台线程中调用；出错后不再调用
+        """
+        if block_samples <= 0:
+            raise ValueError(f"每块的样本数必须大于0: {block_samples}")
+        self.stream = stream
+        self.block_bytes = int(block_samples) * 2
+        self.as_float = as_float
+        self.tee = tee
+        self.tee_failed = False
+        self.samples_read = 0
+        self.error = None
+
+        self._queue = queue.Queue(maxsize=max(1, int(prefetch_blocks)))
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _put(self, item: Any) -> bool:
+        """放入队列，停止时放弃"""
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self) -> None:
+        """后台读取线程"""
+        pending = b""
+        try:
+            while not self._stop_event.is_set():
+                data = self.stream.read(self.block_bytes - len(pending))
+                if not data:
+                    break
+                pending += data
+                if len(pending) < self.block_bytes:
+                    continue
+                if not self._put(self._convert(pending)):
+                    return
+                pending = b""
+            # 丢弃不完整的半个样本
+            pending = pending[:len(pending) - len(pending) % 2]
+            if pending:
+                self._put(self._convert(pending))
+        except Exception as e:
+            self.error = e
+        finally:
+            self._put(_END)
+
+    def _convert(self, data: bytes) -> Union[bytes, np.ndarray]:
+        """把一块 PCM 字节转换为输出格式"""
+        if self.tee is not None:
+            try:
+                self.tee(data)
+            except Exception as e:
+                print(f"PCM 数据转存失败: {e}")
+                self.tee = None
+                self.tee_failed = True
+        if not self.as_float:
+            return data
+        return np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+
+    def __iter__(self) -> Iterator[Union[bytes, np.ndarray]]:
+        """依次返回音频块，读取结束后停止"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="PCMBlockReader", daemon=True)
+            self._thread.start()
+        while True:
+            item = self._queue.get()
+            if item is _END:
+                return
+            self.samples_read += len(item) // 2 if isinstance(item, bytes) else len(item)
+            yield item
+
+    def close(self) -> None:
+        """停止后台读取线程"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+class FFmpegPCMReader:
+    """用 ffmpeg 流式解码音频文件
+
+    ffmpeg 把文件解码为单声道 16 位 PCM 写到管道，PCMBlockReader 按固定大小的块读取，
+    不生成临时 WAV 文件，也不把整个文件读入内存。
+
+    指定 cache 时先查找解码音频缓存：命中则直接从内存映射的缓存文件按块读取，不启动 ffmpeg；
+    未命中则在解码的同时写入缓存，ffmpeg 成功结束且全部读完后才加入缓存。
+
+    用法：
+        with FFmpegPCMReader(path) as reader:
+            for block in reader:
+                recognizer.AcceptWaveform(block)
+    """
+
+    def __init__(self, file_path: str, sample_rate: int = 16000, block_samples: int = 8000,
+                 prefetch_blocks: int = 8, as_float: bool = True, ffmpeg: str = "ffmpeg",
+                 cache: Optional[DecodedAudioCache] = None):
+        """
+        初始化 ffmpeg 读取器
+
+        Args:
+            file_path: 音频/视频文件路径
+            sample_rate: 输出采样率
+            block_samples: 每块的样本数
+            prefetch_blocks: 最多预读的块数
+            as_float: True 时输出 float32 数组，False 时输出 16 位 PCM 字节（如供 Vosk 使用）
+            ffmpeg: ffmpeg 可执行文件
+            cache: 解码音频缓存，None 表示不使用缓存
+        """
+        self.file_path = file_path
+        self.sample_rate = sample_rate
+        self.block_samples = block_samples
+        self.prefetch_blocks = prefetch_blocks
+        self.as_float = as_float
+        self.command = build_ffmpeg_command(file_path, sample_rate, ffmpeg)
+        self.cache = cache
+
+        self.process = None
+        self.returncode = None
+        self.cache_hit = False
+        self._reader = None
+        self._cached = None  # 命中缓存时的内存映射数组
+        self._cached_samples_read = 0
+        self._cache_writer = None
+        self._stderr_lines = deque(maxlen=20)
+        self._stderr_thread = None
+
+    def open(self) -> "FFmpegPCMReader":
+        """
+        打开缓存条目，或启动 ffmpeg 进程
+
+        Returns:
+            FFmpegPCMReader: 自身
+
+        Raises:
+            OSError: 无法启动 ffmpeg 时
+        """
+        if self.cache is not None:
+            self._cached = self.cache.load(self.file_path, self.sample_rate)
+            if self._cached is not None:
+                self.cache_hit = True
+                self.returncode = 0
+                return self
+            self._cache_writer = self.cache.writer(self.file_path, self.sample_rate)
+
+        self.process = subprocess.Popen(self.command, stdin=subprocess.DEVNULL,
+                                        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        # 持续读取 stderr，避免管道写满导致 ffmpeg 阻塞
+        self._stderr_thread = threading.Thread(target=self._drain_stderr, name="FFmpegStderr", daemon=True)
+        self._stderr_thread.start()
+        tee = self._cache_writer.write if self._cache_writer else None
+        self._reader = PCMBlockReader(self.process.stdout, self.block_samples, self.prefetch_blocks,
+                                      self.as_float, tee)
+        return self
+
+    def _drain_stderr(self) -> None:
+        """读取 ffmpeg 的错误输出，保留最后几行"""
+        for line in self.process.stderr:
+            self._stderr_lines.append(line.decode('utf-8', errors='ignore').rstrip())
+
+    def __iter__(self) -> Iterator[Union[bytes, np.ndarray]]:
+        """依次返回音频块；ffmpeg 失败时在结束后抛出异常"""
+        if self.process is None and not self.cache_hit:
+            self.open()
+        if self.cache_hit:
+            yield from self._iter_cached()
+            return
+        yield from self._reader
+        if self._reader.error is not None:
+            raise self._reader.error
+        self.returncode = self.process.wait()
+        if self.returncode != 0:
+            self._stderr_thread.join(timeout=1.0)
+            raise RuntimeError(f"ffmpeg 解码失败 (返回码 {self.returncode}): {self.stderr}")
+        # 完整解码成功，加入缓存
+        if self._cache_writer and not self._reader.tee_failed:
+            self._cache_writer.commit()
+            self._cache_writer = None
+
+    def _iter_cached(self) -> Iterator[Union[bytes, np.ndarray]]:
+        """从内存映射的缓存文件按块读取"""
+        for start in range(0, len(self._cached), self.block_samples):
+            block = self._cached[start:start + self.block_samples]
+            self._cached_samples_read += len(block)
+            if self.as_float:
+                yield block.astype(np.float32) / 32768.0
+            else:
+                yield block.tobytes()
+
+    @property
+    def samples_read(self) -> int:
+        """已经交给调用方的样本数"""
+        if self.cache_hit:
+            return self._cached_samples_read
+        return self._reader.samples_read if self._reader else 0
+
+    @property
+    def seconds_read(self) -> float:
+        """已经交给调用方的音频时长（秒）"""
+        return self.samples_read / self.sample_rate
+
+    @property
+    def stderr(self) -> str:
+        """ffmpeg 错误输出的最后几行"""
+        return "\n".join(self._stderr_lines)
+
+    def close(self) -> None:
+        """终止 ffmpeg 进程并停止读取线程，未完成的缓存条目被丢弃"""
+        self._cached = None
+        if self.process and self.process.poll() is None:
+            # 先结束进程，阻塞在管道读取上的线程会读到结束
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=1.0)
+            except Exception:
+                self.process.kill()
+        if self._reader:
+            self._reader.close()
+        if self.process:
+            self.returncode = self.process.returncode
+            if self._stderr_thread:
+                self._stderr_thread.join(timeout=1.0)
+            for pipe in (self.process.stdout, self.process.stderr):
+                if pipe:
+                    pipe.close()
+        if self._cache_writer:
+            self._cache_writer.abort()
+            self._cache_writer = None
+
+    def __enter__(self) -> "FFmpegPCMReader":
+        return self.open()
+
+    def __exit__(self, *args) -> None:
+        self.close()
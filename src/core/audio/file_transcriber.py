@@ -7,10 +7,12 @@ import json
 import time
 import threading
 import subprocess
-import tempfile
-from typing import Any, Optional
+from typing import Any
 
 from src.core.signals import TranscriptionSignals
+from src.core.audio.ffmpeg_reader import FFmpegPCMReader
+from src.core.audio.pcm_cache import get_decoded_audio_cache
+from src.core.asr.transcript_segment import TranscriptSegment, parse_result_timing
 
 class FileTranscriber:
     """文件转录器类"""
@@ -24,6 +26,7 @@ class FileTranscriber:
         """
         self.signals = signals
         self.is_transcribing = False
+        self.stopped = False  # 最近一次转录是否被停止（结果不完整）
         self.transcription_thread = None
         self.temp_files = []  # 临时文件列表，用于清理
         self.ffmpeg_process = None
@@ -68,6 +71,7 @@ class FileTranscriber:
 
             # 设置转录标志
             self.is_transcribing = True
+            self.stopped = False
 
             # 发送转录开始信号
             if hasattr(self.signals, 'transcription_started'):
@@ -171,6 +175,7 @@ class FileTranscriber:
 
             # 清除转录标志
             self.is_transcribing = False
+            self.stopped = True
             sherpa_logger.debug("转录标志已清除")
 
             # 终止ffmpeg进程
@@ -368,6 +373,10 @@ class FileTranscriber:
             full_text = f"{header}\n\n{text}"
 
             self.signals.new_text.emit(full_text)
+
+            # 文件转录的分段时间戳（秒，以文件开头为零点）
+            for segment in getattr(model_manager, 'last_segments', None) or []:
+                self.signals.new_segment.emit(TranscriptSegment.from_dict(segment))
         else:
             sherpa_logger.warning(f"没有转录结果 (模型: {model_type}, 引擎: {engine_type})")
             # 发送一个提示信息到字幕窗口
@@ -413,64 +422,75 @@ class FileTranscriber:
         status_msg = f"使用 Vosk 模型 (引擎: {engine_type}) 转录文件..."
         self.signals.status_updated.emit(status_msg)
 
-        # 第一阶段：转换为WAV格式（0-20%）
-        sherpa_logger.info(f"第一阶段：转换音频格式... (引擎: {engine_type})")
-        self.signals.status_updated.emit(f"第一阶段：转换音频格式... (引擎: {engine_type})")
-        wav_file = self._convert_to_wav(file_path)
-        if not wav_file or not self.is_transcribing:
-            sherpa_logger.warning(f"转换WAV格式失败或转录已停止 (引擎: {engine_type})")
-            self.signals.transcription_finished.emit()
+        # 使用 ffmpeg 流式解码：PCM 按固定大小的块直接送入识别器，ffmpeg 解码与识别同时进行，
+        # 不生成临时 WAV 文件，内存占用与文件长度无关；同一文件已经解码过时直接读取解码音频缓存
+        sherpa_logger.info(f"流式解码并识别音频... (引擎: {engine_type})")
+        self.signals.status_updated.emit(f"正在转录... (引擎: {engine_type})")
+        self.signals.progress_updated.emit(5, "转录中: 5%")
+
+        reader = FFmpegPCMReader(file_path, sample_rate=16000, block_samples=4000, as_float=False,
+                                 cache=get_decoded_audio_cache())
+        try:
+            reader.open()
+        except OSError as e:
+            error_msg = f"ffmpeg 启动失败: {e}"
+            sherpa_logger.error(error_msg)
+            self.signals.error_occurred.emit(error_msg)
             return
+        if reader.cache_hit:
+            sherpa_logger.info(f"使用解码音频缓存，跳过 ffmpeg 解码 (引擎: {engine_type})")
+        self.ffmpeg_process = reader.process
 
-        # 第二阶段：读取音频数据（20-50%）
-        sherpa_logger.info(f"第二阶段：读取音频数据... (引擎: {engine_type})")
-        self.signals.status_updated.emit(f"第二阶段：读取音频数据... (引擎: {engine_type})")
-        all_chunks = []
-        total_bytes = 0
+        # 收集所有部分结果
+        all_results = []
         last_update_time = time.time()
 
-        # 使用 ffmpeg 提取音频
-        sherpa_logger.info(f"使用 ffmpeg 提取音频... (引擎: {engine_type})")
-        self.ffmpeg_process = subprocess.Popen([
-            'ffmpeg',
-            '-i', wav_file,
-            '-ar', '16000',
-            '-ac', '1',
-            '-f', 's16le',
-            '-'
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-
-        # 读取所有音频数据
-        sherpa_logger.info(f"开始读取音频数据... (引擎: {engine_type})")
-        while self.is_transcribing:
-            chunk = self.ffmpeg_process.stdout.read(4000)
-            if not chunk:
-                break
-
-            all_chunks.append(chunk)
-            total_bytes += len(chunk)
-
-            # 更新读取进度（20-50%）
-            current_time = time.time()
-            if current_time - last_update_time >= 0.2:  # 每0.2秒更新一次
-                current_position = total_bytes / (16000 * 2)  # 16kHz, 16-bit
-                progress = 20 + min(30, int((current_position / duration) * 30))
-
-                time_str = f"{int(current_position//60):02d}:{int(current_position%60):02d}"
-                total_str = f"{int(duration//60):02d}:{int(duration%60):02d}"
-                format_text = f"读取中: {time_str} / {total_str} ({progress}%)"
-
-                self.signals.progress_updated.emit(progress, format_text)
-                last_update_time = current_time
-
-        # 确保 ffmpeg 进程终止
-        sherpa_logger.info(f"音频数据读取完成，终止 ffmpeg 进程... (引擎: {engine_type})")
-        if self.ffmpeg_process:
-            self.ffmpeg_process.terminate()
-            try:
-                self.ffmpeg_process.wait(timeout=5)
-            except:
-                self.ffmpeg_process.kill()
+        try:
+            for chunk in reader:
+                if not self.is_transcribing:
+                    break
+
+                # 处理音频数据
+                if recognizer.AcceptWaveform(chunk):
+                    result = json.loads(recognizer.Result())
+                    if result.get('text', '').strip():
+                        text = result['text'].strip()
+                        sherpa_logger.info(f"部分结果: {text[:100]}..." if len(text) > 100 else f"部分结果: {text}")
+                        all_results.append(text)
+                        self._emit_segment(text, result)
+
+                        # 收集部分结果，但不立即显示，避免频繁更新界面
+                        if len(all_results) % 5 == 0:  # 每5个结果更新一次
+                            combined_text = " ".join(all_results)
+                            formatted_text = self._format_text(combined_text)
+
+                            # 添加模型和引擎信息到字幕
+                            header = f"[使用 Vosk 模型 (引擎: {engine_type}) 转录中...]"
+                            full_text = f"{header}\n\n{formatted_text}"
+
+                            self.signals.new_text.emit(full_text)
+
+                # 更新转录进度（5-99%）
+                current_time = time.time()
+                if current_time - last_update_time >= 0.2:  # 每0.2秒更新一次
+                    current_position = reader.seconds_read
+                    progress = 5 + min(94, int((current_position / duration) * 94)) if duration > 0 else 5
+
+                    time_str = f"{int(current_position//60):02d}:{int(current_position%60):02d}"
+                    total_str = f"{int(duration//60):02d}:{int(duration%60):02d}"
+                    format_text = f"转录中: {time_str} / {total_str} ({progress}%)"
+
+                    self.signals.progress_updated.emit(progress, format_text)
+                    last_update_time = current_time
+        except RuntimeError as e:
+            # 停止转录时 ffmpeg 被终止，不属于错误
+            if self.is_transcribing:
+                error_msg = f"转录文件失败: {e}"
+                sherpa_logger.error(error_msg)
+                self.signals.error_occurred.emit(error_msg)
+                return
+        finally:
+            reader.close()
             self.ffmpeg_process = None
 
         if not self.is_transcribing:
@@ -478,46 +498,6 @@ class FileTranscriber:
             self.signals.transcription_finished.emit()
             return
 
-        # 第三阶段：处理音频数据（50-99%）
-        sherpa_logger.info(f"第三阶段：处理 {len(all_chunks)} 个音频块... (引擎: {engine_type})")
-        self.signals.status_updated.emit(f"第三阶段：处理 {len(all_chunks)} 个音频块... (引擎: {engine_type})")
-        total_chunks = len(all_chunks)
-
-        # 收集所有部分结果
-        all_results = []
-
-        for i, chunk in enumerate(all_chunks):
-            if not self.is_transcribing:
-                sherpa_logger.warning(f"转录已停止 (引擎: {engine_type})")
-                break
-
-            # 处理音频数据
-            if recognizer.AcceptWaveform(chunk):
-                result = json.loads(recognizer.Result())
-                if result.get('text', '').strip():
-                    text = result['text'].strip()
-                    sherpa_logger.info(f"部分结果: {text[:100]}..." if len(text) > 100 else f"部分结果: {text}")
-                    all_results.append(text)
-
-                    # 收集部分结果，但不立即显示，避免频繁更新界面
-                    if len(all_results) % 5 == 0:  # 每5个结果更新一次
-                        combined_text = " ".join(all_results)
-                        formatted_text = self._format_text(combined_text)
-
-                        # 添加模型和引擎信息到字幕
-                        header = f"[使用 Vosk 模型 (引擎: {engine_type}) 转录中...]"
-                        full_text = f"{header}\n\n{formatted_text}"
-
-                        self.signals.new_text.emit(full_text)
-
-            # 更新处理进度（50-99%）
-            current_time = time.time()
-            if current_time - last_update_time >= 0.2:
-                progress = 50 + min(49, int((i / total_chunks) * 49))
-                format_text = f"处理中: {progress}%"
-                self.signals.progress_updated.emit(progress, format_text)
-                last_update_time = current_time
-
         # 处理最终结果
         sherpa_logger.info(f"处理最终结果... (引擎: {engine_type})")
         final_result = json.loads(recognizer.FinalResult())
@@ -526,6 +506,7 @@ class FileTranscriber:
         if final_text:
             # 将最终结果添加到所有结果中
             all_results.append(final_text)
+            self._emit_segment(final_text, final_result)
             sherpa_logger.info(f"最终结果: {final_text[:100]}..." if len(final_text) > 100 else f"最终结果: {final_text}")
 
         # 合并所有结果
@@ -557,61 +538,19 @@ class FileTranscriber:
             self.signals.status_updated.emit(f"文件转录完成，但没有结果 (引擎: {engine_type})")
             sherpa_logger.info(f"文件转录完成，但没有结果 (引擎: {engine_type})")
 
-    def _convert_to_wav(self, file_path: str) -> Optional[str]:
+    def _emit_segment(self, text: str, result: dict) -> None:
         """
-        将文件转换为WAV格式
+        发送带时间戳的分段，时间取自 Vosk 结果中的词时间（识别器为本文件新建，以文件开头为零点）
 
         Args:
-            file_path: 原始文件路径
-
-        Returns:
-            str: WAV文件路径，如果转换失败则返回None
+            text: 分段文本
+            result: 解析后的 Vosk 结果
         """
-        try:
-            # 创建临时文件
-            fd, temp_wav = tempfile.mkstemp(suffix='.wav')
-            os.close(fd)
-            self.temp_files.append(temp_wav)
-
-            # 使用ffmpeg转换为WAV格式
-            self.signals.status_updated.emit(f"正在转换文件格式...")
-            self.signals.progress_updated.emit(5, "转换格式: 5%")
-
-            # 使用ffmpeg转换
-            self.ffmpeg_process = subprocess.Popen([
-                'ffmpeg',
-                '-i', file_path,
-                '-ar', '16000',  # 采样率16kHz
-                '-ac', '1',      # 单声道
-                '-y',            # 覆盖已有文件
-                temp_wav
-            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-
-            # 等待转换完成
-            while self.ffmpeg_process.poll() is None:
-                if not self.is_transcribing:
-                    self.ffmpeg_process.terminate()
-                    try:
-                        self.ffmpeg_process.wait(timeout=1.0)
-                    except:
-                        self.ffmpeg_process.kill()
-                    return None
-                time.sleep(0.1)
-
-            # 检查转换结果
-            if self.ffmpeg_process.returncode != 0:
-                stderr = self.ffmpeg_process.stderr.read().decode('utf-8', errors='ignore')
-                self.signals.error_occurred.emit(f"转换格式失败: {stderr}")
-                return None
-
-            self.signals.progress_updated.emit(20, "转换格式完成: 20%")
-            return temp_wav
-
-        except Exception as e:
-            self.signals.error_occurred.emit(f"转换格式错误: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+        timing = parse_result_timing(None, result)
+        if timing:
+            self.signals.new_segment.emit(
+                TranscriptSegment(text, timing["start_sample"], timing["end_sample"], words=timing["words"])
+            )
 
     def _cleanup_temp_files(self) -> None:
         """清理临时文件"""
@@ -0,0 +1,301 @@
+"""
+多设备音频采集模块
+负责把多个设备的捕获流按时间戳对齐，并混音为一路或按来源分别输出
+"""
+import time
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from src.core.audio.ring_buffer import AudioRingBuffer, DROP_OLDEST
+
+# 多设备输出模式
+MODE_MIX = "mix"  # 混音为一路送入同一个识别器
+MODE_SEPARATE = "separate"  # 每个来源使用独立的识别器，结果带来源标签
+MULTI_SOURCE_MODES = (MODE_MIX, MODE_SEPARATE)
+
+
+class CaptureSource:
+    """单个设备的捕获流
+
+    由该设备的捕获线程调用 write() 写入，由调度器读取。第一次写入时记录流的起始
+    时间（单调时钟），调度器据此把各设备对齐到同一时间轴。
+    """
+
+    def __init__(self, name: str, sample_rate: int, capacity: int,
+                 drop_policy: str = DROP_OLDEST, gain: float = 1.0):
+        """
+        初始化捕获流
+
+        Args:
+            name: 来源名称（用于结果标签和统计）
+            sample_rate: 采样率
+            capacity: 环形缓冲区容量（样本数）
+            drop_policy: 环形缓冲区的丢弃策略
+            gain: 混音增益
+        """
+        self.name = name
+        self.sample_rate = sample_rate
+        self.gain = gain
+        self.ring = AudioRingBuffer(capacity, drop_policy)
+        self.start_time = None  # 第一个样本的捕获时间（time.monotonic）
+
+        # 以下状态只由调度器（消费者线程）修改
+        self.aligned = False
+        self.pending_padding = 0  # 对齐时需要在开头补的静音样本数
+        self.debt = 0  # 已用静音代替、数据到达后需要丢弃的样本数
+        self.filled_frames = 0  # 累计用静音填充的样本数
+
+    def write(self, data: np.ndarray, timestamp: Optional[float] = None) -> int:
+        """
+        写入一块捕获数据（仅由捕获线程调用）
+
+        Args:
+            data: 单声道 float32 音频数据
+            timestamp: 本块最后一个样本的捕获时间，默认为当前时间
+
+        Returns:
+            int: 实际写入的样本数
+        """
+        if self.start_time is None:
+            end = time.monotonic() if timestamp is None else timestamp
+            self.start_time = end - len(data) / self.sample_rate
+        return self.ring.write(data, timestamp)
+
+    def free_space(self) -> int:
+        """环形缓冲区的剩余空间（样本数）"""
+        return self.ring.free_space()
+
+    def readable(self) -> int:
+        """对齐后可读取的样本数（含补齐的静音，扣除待丢弃的样本）"""
+        if not self.aligned:
+            return 0
+        return max(0, self.ring.available() - self.debt) + self.pending_padding
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取统计信息
+
+        Returns:
+            Dict[str, Any]: 统计信息
+        """
+        stats = self.ring.get_stats()
+        stats.update({
+            "name": self.name,
+            "gain": self.gain,
+            "aligned": self.aligned,
+            "filled_frames": self.filled_frames,
+        })
+        return stats
+
+
+class MultiSourceScheduler:
+    """多来源对齐调度器
+
+    对齐规则：
+    - 所有来源都开始捕获（或超过 start_timeout 秒）后，以最早的起始时间为时间轴原点，
+      较晚开始的来源在开头补静音
+    - 各来源都有数据时按最少的一方读取；某个来源落后领先者超过 max_skew 时，
+      不再等待，用静音补齐它的缺口，之后它的迟到数据会被丢弃以保持对齐
+    - 超时后才开始捕获的来源，按其起始时间接入时间轴的对应位置
+
+    消费者接口与 AudioRingBuffer 一致（available / wait_for_data / read），
+    混音模式下可直接替代单设备的环形缓冲区；按来源输出时使用 read_sources()。
+    """
+
+    def __init__(self, sources: List[CaptureSource], sample_rate: int,
+                 max_skew_ms: float = 500, start_timeout_ms: float = 1000):
+        """
+        初始化调度器
+
+        Args:
+            sources: 捕获流列表
+            sample_rate: 采样率
+            max_skew_ms: 允许来源之间的最大落后时长（毫秒），超过时用静音补齐
+            start_timeout_ms: 等待所有来源开始捕获的超时（毫秒）
+
+        Raises:
+            ValueError: 没有来源时
+        """
+        if not sources:
+            raise ValueError("至少需要一个音频来源")
+
+        self.sources = sources
+        self.sample_rate = sample_rate
+        self.max_skew = int(max_skew_ms * sample_rate / 1000)
+        self.start_timeout = start_timeout_ms / 1000.0
+        self.gains = np.array([source.gain for source in sources], dtype=np.float32)
+
+        self._created = time.monotonic()
+        self._origin = None  # 时间轴原点（time.monotonic）
+        self._position = 0  # 已读取的时间轴位置（样本数）
+        self._matrix = np.zeros((len(sources), 0), dtype=np.float32)
+        self._scratch = np.zeros(0, dtype=np.float32)
+
+    @property
+    def overruns(self) -> int:
+        """所有来源的环形缓冲区溢出次数之和"""
+        return sum(source.ring.overruns for source in self.sources)
+
+    @property
+    def dropped_frames(self) -> int:
+        """所有来源因溢出丢弃的样本数之和"""
+        return sum(source.ring.dropped_frames for source in self.sources)
+
+    def _ensure_matrix(self, frames: int) -> None:
+        """确保工作矩阵至少能容纳 frames 列"""
+        if self._matrix.shape[1] < frames:
+            self._matrix = np.zeros((len(self.sources), frames), dtype=np.float32)
+            self._scratch = np.zeros(frames, dtype=np.float32)
+
+    def _align(self) -> bool:
+        """按起始时间把来源接入时间轴，返回是否已有时间轴"""
+        started = [source for source in self.sources if source.start_time is not None]
+        if self._origin is None:
+            if not started:
+                return False
+            if len(started) < len(self.sources) and time.monotonic() - self._created < self.start_timeout:
+                return False
+            self._origin = min(source.start_time for source in started)
+
+        for source in started:
+            if source.aligned:
+                continue
+            offset = int(round((source.start_time - self._origin) * self.sample_rate)) - self._position
+            if offset >= 0:
+                source.pending_padding = offset
+            else:
+                source.debt = -offset
+            source.aligned = True
+        return True
+
+    def available(self) -> int:
+        """
+        获取所有来源对齐后可读取的样本数
+
+        Returns:
+            int: 可读取的样本数
+        """
+        if not self._align():
+            return 0
+        readable = [source.readable() for source in self.sources]
+        return max(min(readable), max(readable) - self.max_skew)
+
+    def wait_for_data(self, min_frames: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        等待至少 min_frames 个对齐的样本
+
+        Args:
+            min_frames: 需要的最少样本数
+            timeout: 超时时间（秒）
+
+        Returns:
+            bool: 是否已有足够的数据
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.available() < min_frames:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            # 等待领先来源的新数据，同时定期重新检查其他来源
+            wait = 0.01 if remaining is None else min(0.01, remaining)
+            self.sources[0].ring.wait_for_data(self.sources[0].ring.available() + 1, wait)
+        return True
+
+    def read_timestamp(self, sample_rate: Optional[int] = None) -> Optional[float]:
+        """
+        获取最近一次读取的最后一个样本在时间轴上的捕获时间（与 AudioRingBuffer 接口一致）
+
+        Args:
+            sample_rate: 采样率，默认为调度器的采样率
+
+        Returns:
+            Optional[float]: 捕获时间（time.monotonic），还没有时间轴时返回 None
+        """
+        if self._origin is None:
+            return None
+        return self._origin + self._position / (sample_rate or self.sample_rate)
+
+    def read_sources(self, max_frames: Optional[int] = None) -> np.ndarray:
+        """
+        按来源读取对齐的音频
+
+        Args:
+            max_frames: 最多读取的样本数，None 表示读取全部可用数据
+
+        Returns:
+            np.ndarray: 形状为 (来源数, 样本数) 的内部矩阵视图，下一次读取前有效
+        """
+        frames = self.available()
+        if max_frames is not None:
+            frames = min(frames, int(max_frames))
+        if frames <= 0:
+            return self._matrix[:, :0]
+        self._ensure_matrix(frames)
+
+        for row, source in zip(self._matrix, self.sources):
+            target = row[:frames]
+            filled = 0
+
+            # 开头补齐的静音
+            padding = min(source.pending_padding, frames)
+            target[:padding] = 0.0
+            source.pending_padding -= padding
+            filled += padding
+
+            # 丢弃已用静音代替过的迟到数据
+            while source.debt and source.ring.available():
+                discarded = len(source.ring.read(min(source.debt, len(self._scratch)), out=self._scratch))
+                source.debt -= discarded
+
+            if source.aligned and not source.debt:
+                data = source.ring.read(frames - filled, out=target[filled:])
+                filled += len(data)
+
+            # 落后超过 max_skew 的部分用静音补齐，之后到达的数据需要丢弃
+            shortfall = frames - filled
+            if shortfall:
+                target[filled:] = 0.0
+                source.filled_frames += shortfall
+                if source.aligned:
+                    source.debt += shortfall
+
+        self._position += frames
+        return self._matrix[:, :frames]
+
+    def read(self, max_frames: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        读取对齐并按增益混音后的单路音频，结果截断到 [-1, 1]
+
+        Args:
+            max_frames: 最多读取的样本数，None 表示读取全部可用数据
+            out: 可选的输出缓冲区
+
+        Returns:
+            np.ndarray: 混音结果
+        """
+        if out is not None:
+            max_frames = len(out) if max_frames is None else min(max_frames, len(out))
+        matrix = self.read_sources(max_frames)
+        frames = matrix.shape[1]
+        if out is None:
+            out = np.empty(frames, dtype=np.float32)
+        mixed = out[:frames]
+        np.dot(self.gains, matrix, out=mixed)
+        np.clip(mixed, -1.0, 1.0, out=mixed)
+        return mixed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取统计信息
+
+        Returns:
+            Dict[str, Any]: 统计信息，sources 中为各来源的统计
+        """
+        return {
+            "position": self._position,
+            "aligned": self._origin is not None,
+            "overruns": self.overruns,
+            "dropped_frames": self.dropped_frames,
+            "sources": [source.get_stats() for source in self.sources],
+        }
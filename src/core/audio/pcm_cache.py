@@ -0,0 +1,285 @@
+"""
+解码音频缓存模块
+负责按文件内容缓存 ffmpeg 解码得到的单声道 16 位 PCM，同一文件再次转录（如换模型对比）时跳过解码
+"""
+import hashlib
+import os
+import threading
+import uuid
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
+
+# 缓存文件扩展名：原始 16 位小端 PCM，可直接内存映射
+CACHE_SUFFIX = ".s16"
+# 正在写入的临时文件扩展名
+TEMP_SUFFIX = ".part"
+
+
+def file_fingerprint(path: str, sample_blocks: int = 8, block_size: int = 64 * 1024) -> str:
+    """
+    计算文件的快速内容指纹：文件大小 + 修改时间 + 均匀分布的若干数据块的哈希
+
+    不读取整个文件，几 GB 的视频也只需要读取 sample_blocks * block_size 字节。
+
+    Args:
+        path: 文件路径
+        sample_blocks: 采样的数据块数（包括开头和结尾）
+        block_size: 每个数据块的字节数
+
+    Returns:
+        str: 十六进制指纹
+
+    Raises:
+        OSError: 无法读取文件时
+    """
+    stat = os.stat(path)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(path, "rb") as f:
+        if stat.st_size <= sample_blocks * block_size:
+            digest.update(f.read())
+        else:
+            last = stat.st_size - block_size
+            for i in range(sample_blocks):
+                f.seek(last * i // (sample_blocks - 1))
+                digest.update(f.read(block_size))
+    return digest.hexdigest()
+
+
+class CacheWriter:
+    """写入一个缓存条目：数据先写入临时文件，commit() 时原子地改名为缓存文件"""
+
+    def __init__(self, cache: "DecodedAudioCache", path: str):
+        """
+        初始化缓存写入器
+
+        Args:
+            cache: 所属的缓存
+            path: 缓存文件路径
+        """
+        self.cache = cache
+        self.path = path
+        self.temp_path = f"{path}.{uuid.uuid4().hex}{TEMP_SUFFIX}"
+        self._file = open(self.temp_path, "wb")
+        self.bytes_written = 0
+
+    def write(self, data: bytes) -> None:
+        """
+        写入一段 16 位 PCM
+
+        Args:
+            data: PCM 字节
+        """
+        self._file.write(data)
+        self.bytes_written += len(data)
+
+    def commit(self) -> bool:
+        """
+        完成写入并加入缓存
+
+        Returns:
+            bool: 是否成功
+        """
+        try:
+            self._file.close()
+            os.replace(self.temp_path, self.path)
+        except OSError as e:
+            print(f"写入解码音频缓存失败: {e}")
+            self.abort()
+            return False
+        self.cache.evict()
+        return True
+
+    def abort(self) -> None:
+        """放弃写入（如解码失败或被取消），删除临时文件"""
+        try:
+            self._file.close()
+            if os.path.exists(self.temp_path):
+                os.remove(self.temp_path)
+        except OSError as e:
+            print(f"删除解码音频缓存临时文件失败: {e}")
+
+
+class DecodedAudioCache:
+    """解码音频缓存
+
+    - 键为 file_fingerprint() 的内容指纹和采样率，同一文件改名或移动后仍能命中，内容变化后自动失效
+    - 每个条目是一个原始 16 位单声道 PCM 文件，读取时用 np.memmap 映射，不需要整体读入内存
+    - 缓存总大小超过 max_bytes 时按最近使用时间（命中时更新文件修改时间）删除最旧的条目
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 2 * 1024 ** 3):
+        """
+        初始化解码音频缓存
+
+        Args:
+            directory: 缓存目录（不存在时自动创建）
+            max_bytes: 缓存总大小上限（字节）
+        """
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _entry_path(self, file_path: str, sample_rate: int) -> str:
+        """缓存条目的路径"""
+        return os.path.join(self.directory, f"{file_fingerprint(file_path)}_{int(sample_rate)}{CACHE_SUFFIX}")
+
+    def lookup(self, file_path: str, sample_rate: int = 16000) -> Optional[str]:
+        """
+        查找文件的缓存条目，命中时更新其最近使用时间
+
+        Args:
+            file_path: 原始音频/视频文件
+            sample_rate: 解码采样率
+
+        Returns:
+            Optional[str]: 缓存文件路径，未命中时返回 None
+        """
+        try:
+            path = self._entry_path(file_path, sample_rate)
+        except OSError:
+            return None
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return path
+
+    def load(self, file_path: str, sample_rate: int = 16000) -> Optional[np.ndarray]:
+        """
+        以内存映射方式读取文件的解码音频
+
+        Args:
+            file_path: 原始音频/视频文件
+            sample_rate: 解码采样率
+
+        Returns:
+            Optional[np.ndarray]: 只读的 int16 数组，未命中时返回 None
+        """
+        path = self.lookup(file_path, sample_rate)
+        if path is None:
+            return None
+        if os.path.getsize(path) == 0:
+            return np.zeros(0, dtype=np.int16)
+        return np.memmap(path, dtype="<i2", mode="r")
+
+    def writer(self, file_path: str, sample_rate: int = 16000) -> Optional[CacheWriter]:
+        """
+        创建文件解码音频的缓存写入器
+
+        Args:
+            file_path: 原始音频/视频文件
+            sample_rate: 解码采样率
+
+        Returns:
+            Optional[CacheWriter]: 写入器，无法创建时返回 None
+        """
+        try:
+            return CacheWriter(self, self._entry_path(file_path, sample_rate))
+        except OSError as e:
+            print(f"创建解码音频缓存失败: {e}")
+            return None
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """所有缓存条目：(最近使用时间, 大小, 路径)"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(CACHE_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self) -> int:
+        """
+        删除最久未使用的条目，直到缓存总大小不超过上限
+
+        Returns:
+            int: 删除的条目数
+        """
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            self.evictions += removed
+            return removed
+
+    def clear(self) -> None:
+        """删除所有缓存条目"""
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计
+
+        Returns:
+            Dict[str, Any]: 统计信息
+        """
+        entries = self._entries()
+        return {
+            "entries": len(entries),
+            "size_mb": sum(size for _, size, _ in entries) / (1024 * 1024),
+            "max_size_mb": self.max_bytes / (1024 * 1024),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_decoded_audio_cache() -> Optional[DecodedAudioCache]:
+    """
+    获取全局解码音频缓存，配置来自 audio.decoded_cache
+
+    Returns:
+        Optional[DecodedAudioCache]: 缓存实例，未启用或无法创建时返回 None
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            try:
+                from src.utils.config_manager import config_manager
+                cache_config = config_manager.get_config("audio", "decoded_cache", default={}) or {}
+            except ImportError:
+                return None
+            if not cache_config.get("enabled", False):
+                return None
+            try:
+                _default_cache = DecodedAudioCache(
+                    cache_config.get("directory", "cache/decoded_audio"),
+                    int(float(cache_config.get("max_size_mb", 2048)) * 1024 * 1024),
+                )
+            except OSError as e:
+                print(f"创建解码音频缓存失败: {e}")
+                return None
+        return _default_cache
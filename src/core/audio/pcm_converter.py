@@ -0,0 +1,146 @@
+"""
+PCM 格式转换模块
+负责 float32 与 16 位整数 PCM 之间的转换，复用预分配缓冲区，避免每个音频块分配内存
+"""
+from typing import Union
+
+import numpy as np
+
+try:
+    import cffi
+    _ffi = cffi.FFI()
+except ImportError:
+    _ffi = None
+
+# 直接使用 clip ufunc，避免 np.clip 的 Python 层开销
+try:
+    from numpy._core.umath import clip as _clip  # NumPy 2.x
+except ImportError:
+    try:
+        from numpy.core.umath import clip as _clip  # NumPy 1.x
+    except ImportError:
+        _clip = np.clip
+
+# 使用 float32 标量，保证运算在 float32 下完成
+INT16_SCALE = np.float32(32767.0)  # float32 -> int16 的缩放系数（与原有实现一致）
+INT16_INV_SCALE = np.float32(1.0 / 32768.0)  # int16 -> float32 的缩放系数
+INT16_MIN = np.float32(-32768.0)
+INT16_MAX = np.float32(32767.0)
+
+
+class PCMConverter:
+    """复用缓冲区的 PCM 转换器
+
+    每个实例持有一组 float32/int16 工作缓冲区，容量不足时按两倍扩容，之后的转换
+    不再分配数组。返回值是内部缓冲区的视图，在下一次调用同一实例之前有效；
+    需要长期保存时请自行复制。
+
+    实例不是线程安全的，每个线程（如 AudioWorker、识别引擎）各自持有一个实例。
+    """
+
+    def __init__(self, capacity: int = 16000):
+        """
+        初始化转换器
+
+        Args:
+            capacity: 初始缓冲区容量（样本数）
+        """
+        self._capacity = 0
+        self._float_buffer = None
+        self._int16_buffer = None
+        self._int16_bytes = None
+        self._cbuffer_cache = (0, None)  # (样本数, cffi 缓冲区)
+        self._ensure_capacity(max(1, int(capacity)))
+
+    @property
+    def capacity(self) -> int:
+        """当前缓冲区容量（样本数）"""
+        return self._capacity
+
+    def _ensure_capacity(self, frames: int) -> None:
+        """确保缓冲区至少能容纳 frames 个样本"""
+        if frames <= self._capacity:
+            return
+        self._capacity = max(frames, self._capacity * 2)
+        self._float_buffer = np.empty(self._capacity, dtype=np.float32)
+        self._int16_buffer = np.empty(self._capacity, dtype=np.int16)
+        self._int16_bytes = memoryview(self._int16_buffer).cast('B')
+        self._cbuffer_cache = (0, None)
+
+    def float_to_int16(self, data: np.ndarray) -> np.ndarray:
+        """
+        将 [-1, 1] 范围的 float 音频转换为 int16，超出范围的样本被截断
+
+        Args:
+            data: 单声道 float 音频数据
+
+        Returns:
+            np.ndarray: 内部 int16 缓冲区的视图
+        """
+        frames = len(data)
+        self._ensure_capacity(frames)
+        scaled = self._float_buffer[:frames]
+        np.multiply(data, INT16_SCALE, out=scaled, casting='unsafe')
+        _clip(scaled, INT16_MIN, INT16_MAX, out=scaled)
+        result = self._int16_buffer[:frames]
+        # 与 astype(np.int16) 一样向零取整
+        np.copyto(result, scaled, casting='unsafe')
+        return result
+
+    def float_to_pcm16_bytes(self, data: np.ndarray) -> memoryview:
+        """
+        将 float 音频转换为 16 位 PCM 字节
+
+        Args:
+            data: 单声道 float 音频数据
+
+        Returns:
+            memoryview: 内部缓冲区的字节视图
+        """
+        frames = len(self.float_to_int16(data))
+        return self._int16_bytes[:frames * 2]
+
+    def float_to_pcm16_cbuffer(self, data: np.ndarray) -> Union[bytes, object]:
+        """
+        将 float 音频转换为可直接传给 Vosk AcceptWaveform 的 16 位 PCM 缓冲区
+
+        Vosk 的 cffi 接口只接受 bytes 或 cdata 指针，这里用 ffi.from_buffer 包装内部
+        缓冲区，不复制数据；块大小不变时复用同一个 cdata 对象。未安装 cffi 时退回 bytes。
+
+        Args:
+            data: 单声道 float 音频数据
+
+        Returns:
+            cffi char[] 缓冲区，或 bytes
+        """
+        view = self.float_to_pcm16_bytes(data)
+        if _ffi is None:
+            return view.tobytes()
+        frames = len(view) // 2
+        cached_frames, cbuffer = self._cbuffer_cache
+        if cbuffer is None or cached_frames != frames:
+            cbuffer = _ffi.from_buffer(view)
+            self._cbuffer_cache = (frames, cbuffer)
+        return cbuffer
+
+    def pcm16_to_float(self, buffer: Union[bytes, bytearray, memoryview, np.ndarray]) -> np.ndarray:
+        """
+        将 16 位 PCM 字节（或 int16 数组）转换为 [-1, 1) 范围的 float32 音频
+
+        Args:
+            buffer: 16 位小端 PCM 数据
+
+        Returns:
+            np.ndarray: 内部 float32 缓冲区的视图
+        """
+        if isinstance(buffer, np.ndarray) and buffer.dtype == np.int16:
+            samples = buffer
+        else:
+            samples = np.frombuffer(buffer, dtype=np.int16)
+        frames = len(samples)
+        self._ensure_capacity(frames)
+        result = self._float_buffer[:frames]
+        # 先直接类型转换再原地缩放，避免混合类型 ufunc 内部分配转换缓冲区
+        np.copyto(result, samples, casting='unsafe')
+        np.multiply(result, INT16_INV_SCALE, out=result)
+        return result
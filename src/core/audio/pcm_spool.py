@@ -0,0 +1,424 @@
+"""
+PCM 录音缓存模块
+负责在实时转录的同时把捕获的原始音频写入内存映射文件，并支持之后用任意识别器按时间范围重放
+"""
+import json
+import mmap
+import os
+import time
+from typing import Dict, Any, Optional, Callable, Iterator
+
+import numpy as np
+
+from src.core.audio.pcm_converter import PCMConverter, INT16_INV_SCALE
+
+# 缓存文件支持的采样格式
+SPOOL_DTYPES = {"float32": np.float32, "int16": np.int16}
+
+# 索引记录：块的起始样本序号、样本数、块最后一个样本的捕获时间（time.time）
+INDEX_DTYPE = np.dtype([("frame", "<i8"), ("frames", "<i8"), ("time", "<f8")])
+
+INDEX_SUFFIX = ".idx"
+META_SUFFIX = ".json"
+
+
+class PCMSpoolWriter:
+    """PCM 录音缓存写入器
+
+    音频写入预分配的内存映射文件（path），空间不足时按两倍扩容并重新映射。
+    每次写入在旁路索引文件（path + ".idx"）中追加一条记录，元数据（采样率、格式、
+    声道数、样本数）保存在 path + ".json"。close() 时把数据文件截断到实际长度。
+
+    写入器只应由一个线程使用。
+    """
+
+    def __init__(self, path: str, sample_rate: int, channels: int = 1, dtype: str = "float32",
+                 initial_seconds: float = 60.0):
+        """
+        创建缓存文件
+
+        Args:
+            path: 数据文件路径
+            sample_rate: 采样率
+            channels: 声道数（多设备分路识别时每个来源一个声道）
+            dtype: 采样格式，float32 或 int16
+            initial_seconds: 预分配的时长（秒）
+
+        Raises:
+            ValueError: 参数无效时
+        """
+        if dtype not in SPOOL_DTYPES:
+            raise ValueError(f"不支持的采样格式: {dtype}")
+        if channels < 1:
+            raise ValueError(f"声道数必须大于0: {channels}")
+
+        self.path = path
+        self.sample_rate = int(sample_rate)
+        self.channels = int(channels)
+        self.dtype = dtype
+        self._np_dtype = np.dtype(SPOOL_DTYPES[dtype])
+        self._frame_bytes = self._np_dtype.itemsize * self.channels
+        self._pcm_converter = PCMConverter() if dtype == "int16" else None
+
+        self.frames = 0
+        self.started_at = None  # 第一个样本的捕获时间（time.time）
+        self.closed = False
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._capacity = max(1, int(initial_seconds * self.sample_rate))
+        self._file = open(path, "w+b")
+        self._file.truncate(self._capacity * self._frame_bytes)
+        self._mmap = None
+        self._view = None
+        self._map()
+
+        self._index_file = open(path + INDEX_SUFFIX, "wb")
+        self._index_record = np.zeros(1, dtype=INDEX_DTYPE)
+        self._write_meta()
+
+    def _map(self) -> None:
+        """映射数据文件，并创建 (样本数, 声道数) 形状的视图"""
+        self._mmap = mmap.mmap(self._file.fileno(), self._capacity * self._frame_bytes)
+        self._view = np.frombuffer(self._mmap, dtype=self._np_dtype).reshape(-1, self.channels)
+
+    def _unmap(self) -> None:
+        """释放映射（必须先释放视图）"""
+        self._view = None
+        if self._mmap is not None:
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+
+    def _ensure_capacity(self, frames: int) -> None:
+        """确保文件至少能容纳 frames 个样本，不足时按两倍扩容"""
+        if frames <= self._capacity:
+            return
+        self._unmap()
+        self._capacity = max(frames, self._capacity * 2)
+        self._file.truncate(self._capacity * self._frame_bytes)
+        self._map()
+
+    def _write_meta(self) -> None:
+        """写入元数据文件"""
+        meta = {
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "dtype": self.dtype,
+            "frames": self.frames,
+            "started_at": self.started_at,
+            "closed": self.closed,
+        }
+        with open(self.path + META_SUFFIX, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+    def write(self, data: np.ndarray, timestamp: Optional[float] = None) -> int:
+        """
+        追加一块音频
+
+        Args:
+            data: float 音频，形状为 (样本数,) 或 (样本数, 声道数)
+            timestamp: 本块最后一个样本的捕获时间，默认为当前时间
+
+        Returns:
+            int: 写入的样本数
+        """
+        if self.closed:
+            raise ValueError("缓存文件已关闭")
+
+        frames = len(data)
+        if frames == 0:
+            return 0
+        timestamp = time.time() if timestamp is None else timestamp
+        if self.started_at is None:
+            self.started_at = timestamp - frames / self.sample_rate
+
+        self._ensure_capacity(self.frames + frames)
+        target = self._view[self.frames:self.frames + frames]
+        if data.ndim == 1:
+            data = data[:, np.newaxis]
+        if self._pcm_converter is not None:
+            # 按声道转换为 int16，复用转换器的缓冲区
+            for channel in range(self.channels):
+                target[:, channel] = self._pcm_converter.float_to_int16(data[:, channel])
+        else:
+            target[...] = data
+
+        self._index_record["frame"] = self.frames
+        self._index_record["frames"] = frames
+        self._index_record["time"] = timestamp
+        self._index_file.write(self._index_record.tobytes())
+
+        self.frames += frames
+        return frames
+
+    @property
+    def duration(self) -> float:
+        """已写入的时长（秒）"""
+        return self.frames / self.sample_rate
+
+    def close(self) -> None:
+        """关闭缓存：截断到实际长度并写入最终元数据"""
+        if self.closed:
+            return
+        self.closed = True
+        self._unmap()
+        self._file.truncate(self.frames * self._frame_bytes)
+        self._file.close()
+        self._index_file.close()
+        self._write_meta()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class PCMSpoolReader:
+    """PCM 录音缓存读取器
+
+    以只读方式映射数据文件，read() 返回文件的视图而不是副本，因此可以重放
+    任意长度的录音而不把整个文件读入内存。写入器异常退出（未调用 close）时，
+    根据索引文件恢复实际样本数。
+    """
+
+    def __init__(self, path: str):
+        """
+        打开缓存文件
+
+        Args:
+            path: 数据文件路径
+
+        Raises:
+            FileNotFoundError: 文件不存在时
+        """
+        self.path = path
+        with open(path + META_SUFFIX, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.sample_rate = int(meta["sample_rate"])
+        self.channels = int(meta["channels"])
+        self.dtype = meta["dtype"]
+        self.started_at = meta.get("started_at")
+        self._np_dtype = np.dtype(SPOOL_DTYPES[self.dtype])
+
+        index_path = path + INDEX_SUFFIX
+        if os.path.exists(index_path):
+            raw = np.fromfile(index_path, dtype=np.uint8)
+            usable = len(raw) - len(raw) % INDEX_DTYPE.itemsize
+            self.index = raw[:usable].view(INDEX_DTYPE)
+        else:
+            self.index = np.zeros(0, dtype=INDEX_DTYPE)
+
+        frames = int(meta.get("frames", 0))
+        if not meta.get("closed") and len(self.index):
+            last = self.index[-1]
+            frames = max(frames, int(last["frame"] + last["frames"]))
+        frame_bytes = self._np_dtype.itemsize * self.channels
+        frames = min(frames, os.path.getsize(path) // frame_bytes)
+        self.frames = frames
+
+        self._file = open(path, "rb")
+        if frames:
+            self._mmap = mmap.mmap(self._file.fileno(), frames * frame_bytes, access=mmap.ACCESS_READ)
+            self._data = np.frombuffer(self._mmap, dtype=self._np_dtype).reshape(-1, self.channels)
+        else:
+            self._mmap = None
+            self._data = np.zeros((0, self.channels), dtype=self._np_dtype)
+        self._pcm_converter = PCMConverter()  # 读取 int16 缓存
+        self._replay_converter = PCMConverter()  # 送入 Vosk 识别器
+        self._mix_buffer = np.zeros(0, dtype=np.float32)
+
+    @property
+    def duration(self) -> float:
+        """录音时长（秒）"""
+        return self.frames / self.sample_rate
+
+    def frame_at(self, seconds: float) -> int:
+        """
+        把相对录音开始的时间换算为样本序号
+
+        Args:
+            seconds: 相对时间（秒）
+
+        Returns:
+            int: 限制在 [0, frames] 内的样本序号
+        """
+        return min(self.frames, max(0, int(round(seconds * self.sample_rate))))
+
+    def frame_at_time(self, timestamp: float) -> int:
+        """
+        根据索引把捕获时间（time.time）换算为样本序号
+
+        Args:
+            timestamp: 捕获时间
+
+        Returns:
+            int: 样本序号
+        """
+        if not len(self.index):
+            return self.frame_at(timestamp - (self.started_at or timestamp))
+        ends = self.index["frame"] + self.index["frames"]
+        position = int(np.searchsorted(self.index["time"], timestamp))
+        if position >= len(self.index):
+            return int(ends[-1])
+        # 在所在块内按采样率插值
+        record = self.index[position]
+        offset = int(round((record["time"] - timestamp) * self.sample_rate))
+        return int(min(ends[position], max(record["frame"], ends[position] - offset)))
+
+    def read(self, start: float = 0.0, end: Optional[float] = None) -> np.ndarray:
+        """
+        读取时间范围内的原始采样（文件视图，不复制）
+
+        Args:
+            start: 起始时间（秒，相对录音开始）
+            end: 结束时间（秒），None 表示到录音末尾
+
+        Returns:
+            np.ndarray: 形状为 (样本数, 声道数) 的只读视图
+        """
+        first = self.frame_at(start)
+        last = self.frames if end is None else max(first, self.frame_at(end))
+        return self._data[first:last]
+
+    def iter_blocks(self, start: float = 0.0, end: Optional[float] = None, block_size: int = 4000,
+                    channel: Optional[int] = None) -> Iterator[np.ndarray]:
+        """
+        按块读取时间范围内的单声道 float32 音频
+
+        Args:
+            start: 起始时间（秒）
+            end: 结束时间（秒），None 表示到录音末尾
+            block_size: 每块样本数
+            channel: 声道序号，None 表示多声道时取平均
+
+        Yields:
+            np.ndarray: 单声道 float32 音频块（复用的缓冲区，下一块之前有效）
+        """
+        samples = self.read(start, end)
+        for offset in range(0, len(samples), block_size):
+            block = samples[offset:offset + block_size]
+            if channel is None and self.channels > 1:
+                # 多声道取平均，int16 缓存在混合后再缩放到 [-1, 1)
+                if len(self._mix_buffer) < len(block):
+                    self._mix_buffer = np.zeros(block_size, dtype=np.float32)
+                mono = np.mean(block, axis=1, dtype=np.float32, out=self._mix_buffer[:len(block)])
+                if self._np_dtype == np.int16:
+                    mono *= INT16_INV_SCALE
+                yield mono
+                continue
+
+            mono = block[:, channel or 0]
+            if self._np_dtype == np.int16:
+                yield self._pcm_converter.pcm16_to_float(np.ascontiguousarray(mono))
+            else:
+                yield mono if mono.flags.c_contiguous else np.ascontiguousarray(mono)
+
+    def replay(self, recognizer: Any, start: float = 0.0, end: Optional[float] = None, block_size: int = 4000,
+               channel: Optional[int] = None, on_result: Optional[Callable[[Dict[str, Any]], None]] = None
+               ) -> Dict[str, Any]:
+        """
+        把时间范围内的录音尽可能快地送入识别器
+
+        Args:
+            recognizer: Vosk 兼容接口的识别器（AcceptWaveform / Result / FinalResult）
+            start: 起始时间（秒）
+            end: 结束时间（秒），None 表示到录音末尾
+            block_size: 每次送入识别器的样本数
+            channel: 声道序号，None 表示多声道时取平均
+            on_result: 每得到一条完整结果时的回调，参数为 {"text", "start", "end"}
+
+        Returns:
+            Dict[str, Any]: 识别结果列表和耗时统计
+        """
+        engine_type = getattr(recognizer, 'engine_type', None) or ""
+        use_float = engine_type.startswith('sherpa')
+        results = []
+        segment_start = self.frame_at(start)
+        position = segment_start
+        decode_seconds = 0.0
+
+        def emit(raw, frame):
+            nonlocal segment_start
+            text = _parse_text(raw)
+            if text:
+                result = {
+                    "text": text,
+                    "start": segment_start / self.sample_rate,
+                    "end": frame / self.sample_rate,
+                }
+                results.append(result)
+                if on_result:
+                    on_result(result)
+            segment_start = frame
+
+        for block in self.iter_blocks(start, end, block_size, channel):
+            decode_start = time.perf_counter()
+            if use_float:
+                accepted = recognizer.AcceptWaveform(block)
+            else:
+                accepted = recognizer.AcceptWaveform(self._replay_converter.float_to_pcm16_cbuffer(block))
+            position += len(block)
+            if accepted:
+                emit(recognizer.Result(), position)
+            decode_seconds += time.perf_counter() - decode_start
+
+        if hasattr(recognizer, 'FinalResult'):
+            decode_start = time.perf_counter()
+            emit(recognizer.FinalResult(), position)
+            decode_seconds += time.perf_counter() - decode_start
+
+        audio_seconds = (position - self.frame_at(start)) / self.sample_rate
+        return {
+            "results": results,
+            "audio_seconds": audio_seconds,
+            "decode_seconds": decode_seconds,
+            "rtf": decode_seconds / audio_seconds if audio_seconds else 0.0,
+        }
+
+    def close(self) -> None:
+        """释放映射（仍被外部引用的视图会让映射延迟到回收时释放）"""
+        self._data = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _parse_text(raw: Any) -> str:
+    """从识别器返回的 JSON 字符串（或字典）中取出文本"""
+    if not raw:
+        return ""
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except json.JSONDecodeError:
+            return raw.strip()
+    if isinstance(raw, dict):
+        return str(raw.get("text", "")).strip()
+    return ""
+
+
+def make_spool_path(directory: str, prefix: str = "session") -> str:
+    """
+    生成按时间命名的缓存文件路径
+
+    Args:
+        directory: 缓存目录
+        prefix: 文件名前缀
+
+    Returns:
+        str: 数据文件路径
+    """
+    return os.path.join(directory, f"{prefix}_{time.strftime('%Y%m%d_%H%M%S')}.pcm")
@@ -0,0 +1,59 @@
+"""
+流水线性能统计模块
+负责记录音频处理各阶段的耗时，并给出平均值、分位数和最大值
+"""
+from collections import deque
+from typing import Dict, Any
+
+import numpy as np
+
+
+class LatencyStats:
+    """单个阶段的耗时统计
+
+    累计次数、总耗时和最大值，并保留最近 window 次测量用于计算分位数。
+    每个实例只应由一个线程写入。
+    """
+
+    def __init__(self, window: int = 1000):
+        """
+        初始化统计
+
+        Args:
+            window: 计算分位数时保留的最近测量次数
+        """
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        """
+        记录一次测量
+
+        Args:
+            seconds: 耗时（秒）
+        """
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self._recent.append(seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取统计结果（毫秒）
+
+        Returns:
+            Dict[str, Any]: count、mean_ms、p50_ms、p95_ms、max_ms
+        """
+        if not self.count:
+            return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        p50, p95 = np.percentile(np.fromiter(self._recent, dtype=np.float64), [50, 95])
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000,
+            "p50_ms": float(p50) * 1000,
+            "p95_ms": float(p95) * 1000,
+            "max_ms": self.max * 1000,
+        }
@@ -0,0 +1,154 @@
+"""
+音频重采样模块
+负责把设备原生采样率（如 44.1/48 kHz）的音频流式转换为模型采样率
+"""
+from math import gcd
+from typing import Dict, Any
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def design_lowpass(num_taps: int, cutoff: float, beta: float = 8.6) -> np.ndarray:
+    """
+    设计 Kaiser 窗低通 FIR 滤波器
+
+    Args:
+        num_taps: 滤波器阶数
+        cutoff: 截止频率（相对奈奎斯特频率，0-1）
+        beta: Kaiser 窗参数，越大阻带衰减越大、过渡带越宽
+
+    Returns:
+        np.ndarray: float64 滤波器系数，直流增益为 1
+    """
+    n = np.arange(num_taps) - (num_taps - 1) / 2.0
+    h = cutoff * np.sinc(cutoff * n) * np.kaiser(num_taps, beta)
+    return h / np.sum(h)
+
+
+class PolyphaseResampler:
+    """流式多相 FIR 重采样器
+
+    以 up/down 的有理数比例重采样（如 48000→16000 为 1/3，44100→16000 为 160/441）。
+    原型低通滤波器拆分为 up 个相位，每个输出样本只计算一个相位与 taps_per_phase
+    个输入样本的点积，所有输出样本在一次向量化运算中完成。
+
+    滤波器历史和输出相位在调用之间保持，因此按任意块大小送入数据得到的输出
+    与一次性处理完全一致（逐位相同）。系数只依赖采样率和构造参数，不依赖 SciPy
+    或平台上的重采样实现，结果可复现。
+    """
+
+    def __init__(self, input_rate: int, output_rate: int, taps_per_phase: int = 32,
+                 cutoff: float = 0.92, beta: float = 8.6):
+        """
+        初始化重采样器
+
+        Args:
+            input_rate: 输入采样率
+            output_rate: 输出采样率
+            taps_per_phase: 每个相位的滤波器阶数，越大过渡带越窄、计算量越大
+            cutoff: 截止频率相对输出奈奎斯特频率的比例
+            beta: Kaiser 窗参数
+
+        Raises:
+            ValueError: 参数无效时
+        """
+        if input_rate <= 0 or output_rate <= 0:
+            raise ValueError(f"采样率必须大于0: {input_rate} -> {output_rate}")
+        if taps_per_phase < 2:
+            raise ValueError(f"每个相位的阶数必须至少为2: {taps_per_phase}")
+
+        self.input_rate = int(input_rate)
+        self.output_rate = int(output_rate)
+        divisor = gcd(self.input_rate, self.output_rate)
+        self.up = self.output_rate // divisor
+        self.down = self.input_rate // divisor
+        self.taps_per_phase = int(taps_per_phase)
+
+        # 在上采样后的采样率下设计原型滤波器，并乘以 up 补偿插零带来的增益损失
+        num_taps = self.up * self.taps_per_phase
+        prototype = design_lowpass(num_taps, cutoff / max(self.up, self.down), beta) * self.up
+
+        # phases[p, t] = h[p + up * t]，按时间倒序存放，便于与滑动窗口直接做点积
+        self._phases = np.ascontiguousarray(
+            prototype.reshape(self.taps_per_phase, self.up).T[:, ::-1], dtype=np.float32
+        )
+
+        self.reset()
+
+    @property
+    def delay(self) -> float:
+        """滤波器引入的延迟（输出样本数）"""
+        return (self.up * self.taps_per_phase - 1) / 2.0 / self.down
+
+    def reset(self) -> None:
+        """重置滤波器状态"""
+        self._history = np.zeros(self.taps_per_phase - 1, dtype=np.float32)
+        self._consumed = 0  # 已送入的输入样本数
+        self._next_output = 0  # 下一个输出样本的序号
+
+    def output_length(self, num_input: int) -> int:
+        """
+        计算再送入 num_input 个输入样本后能产生的输出样本数
+
+        Args:
+            num_input: 输入样本数
+
+        Returns:
+            int: 输出样本数
+        """
+        total_input = self._consumed + num_input
+        # 输出样本 k 需要输入样本 (k * down) // up 已经到达
+        last_output = (total_input * self.up - 1) // self.down
+        return max(0, last_output + 1 - self._next_output)
+
+    def process(self, data: np.ndarray) -> np.ndarray:
+        """
+        重采样一块单声道音频
+
+        Args:
+            data: 单声道音频数据
+
+        Returns:
+            np.ndarray: float32 重采样结果
+        """
+        data = np.asarray(data, dtype=np.float32)
+        if self.up == self.down:
+            return data.copy()
+
+        num_output = self.output_length(len(data))
+        extended = np.concatenate((self._history, data))
+        # extended[0] 对应的输入样本序号
+        base = self._consumed - (self.taps_per_phase - 1)
+
+        if num_output:
+            k = np.arange(self._next_output, self._next_output + num_output, dtype=np.int64)
+            position = k * self.down
+            phase = position % self.up
+            # 每个输出样本的窗口起点：覆盖输入 [i0 - taps + 1, i0]
+            start = position // self.up - base - (self.taps_per_phase - 1)
+            windows = sliding_window_view(extended, self.taps_per_phase)[start]
+            output = np.einsum('ij,ij->i', windows, self._phases[phase])
+        else:
+            output = np.zeros(0, dtype=np.float32)
+
+        self._history = extended[len(extended) - (self.taps_per_phase - 1):].copy()
+        self._consumed += len(data)
+        self._next_output += num_output
+        return output
+
+    def get_info(self) -> Dict[str, Any]:
+        """
+        获取重采样器参数
+
+        Returns:
+            Dict[str, Any]: 参数信息
+        """
+        return {
+            "input_rate": self.input_rate,
+            "output_rate": self.output_rate,
+            "up": self.up,
+            "down": self.down,
+            "taps_per_phase": self.taps_per_phase,
+            "delay_samples": self.delay,
+        }
@@ -0,0 +1,266 @@
+"""
+音频环形缓冲区模块
+负责在音频捕获线程与识别线程之间传递 PCM 数据
+"""
+import threading
+from collections import deque
+from typing import Optional, Dict, Any
+
+import numpy as np
+
+# 保留的最近写入时间戳数（每次写入一个）
+MAX_TIMESTAMPS = 1024
+
+# 丢弃策略
+DROP_OLDEST = "drop_oldest"  # 缓冲区满时覆盖最旧的数据（实时字幕优先保证最新音频）
+DROP_NEWEST = "drop_newest"  # 缓冲区满时丢弃新写入的数据（保证已缓存数据完整）
+DROP_POLICIES = (DROP_OLDEST, DROP_NEWEST)
+
+
+class AudioRingBuffer:
+    """单生产者/单消费者的无锁 float32 环形缓冲区
+
+    设计说明：
+    - 存储区在构造时一次性分配，运行期间不再分配内存
+    - 写指针和读指针均为单调递增的整数，只由各自的一方修改，
+      生产者只写 _write_pos，消费者只写 _read_pos，数据通路上不需要加锁
+    - 生产者先发布预留位置，再写数据，最后发布写指针；消费者读完后检查
+      预留位置，若读取期间数据被覆盖（drop_oldest 策略），丢弃被覆盖的部分
+
+    丢弃策略：
+    - drop_oldest: 缓冲区满时生产者继续写入并覆盖最旧的数据，消费者读取时
+      跳过已被覆盖的部分。捕获线程永远不会等待识别线程，适合实时字幕
+    - drop_newest: 缓冲区满时丢弃本次写入中放不下的部分，已缓存的数据保持完整
+
+    两种策略都会累计溢出次数（overruns）和丢弃的样本数（dropped_frames）。
+    """
+
+    def __init__(self, capacity: int, drop_policy: str = DROP_OLDEST):
+        """
+        初始化环形缓冲区
+
+        Args:
+            capacity: 缓冲区容量（样本数）
+            drop_policy: 缓冲区满时的丢弃策略，drop_oldest 或 drop_newest
+
+        Raises:
+            ValueError: 容量或丢弃策略无效时
+        """
+        if capacity <= 0:
+            raise ValueError(f"环形缓冲区容量必须大于0: {capacity}")
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"不支持的丢弃策略: {drop_policy}")
+
+        self.capacity = int(capacity)
+        self.drop_policy = drop_policy
+        self._buffer = np.zeros(self.capacity, dtype=np.float32)
+
+        # 单调递增的读写位置（样本数）
+        self._write_pos = 0
+        self._write_reserve = 0
+        self._read_pos = 0
+
+        # 统计计数器
+        self.overruns = 0  # 发生溢出的次数
+        self.dropped_frames = 0  # 被丢弃的样本总数
+        self.total_written = 0  # 生产者提交的样本总数
+        self.total_read = 0  # 消费者取走的样本总数
+        self.high_water_mark = 0  # 缓冲区最大占用（样本数）
+
+        # 样本时钟：(写入后的写指针, 该次写入最后一个样本的捕获时间)，生产者追加、消费者弹出
+        self._timestamps = deque(maxlen=MAX_TIMESTAMPS)
+
+        # 仅用于唤醒消费者，不保护数据
+        self._data_event = threading.Event()
+
+    def available(self) -> int:
+        """
+        获取可读取的样本数
+
+        Returns:
+            int: 可读取的样本数
+        """
+        return min(self._write_pos - self._read_pos, self.capacity)
+
+    def free_space(self) -> int:
+        """
+        获取剩余可写空间
+
+        Returns:
+            int: 剩余可写的样本数
+        """
+        return self.capacity - self.available()
+
+    def write(self, data: np.ndarray, timestamp: Optional[float] = None) -> int:
+        """
+        写入音频数据（仅由生产者线程调用）
+
+        Args:
+            data: 单声道 float32 音频数据
+            timestamp: 本块最后一个样本的捕获时间，提供时记录到样本时钟
+
+        Returns:
+            int: 实际写入的样本数
+        """
+        frames = len(data)
+        if frames == 0:
+            return 0
+
+        self.total_written += frames
+
+        if self.drop_policy == DROP_NEWEST:
+            space = self.capacity - (self._write_pos - self._read_pos)
+            if frames > space:
+                self.overruns += 1
+                self.dropped_frames += frames - space
+                frames = space
+                data = data[:frames]
+                if frames <= 0:
+                    self._data_event.set()
+                    return 0
+        elif frames > self.capacity:
+            # 单次写入超过容量时只保留最新的 capacity 个样本
+            # 被跳过的样本由消费者在读取时统计
+            self.overruns += 1
+            data = data[-self.capacity:]
+            self._write_pos += frames - self.capacity
+            frames = self.capacity
+        elif self._write_pos + frames - self._read_pos > self.capacity:
+            # drop_oldest：覆盖最旧的数据，被覆盖样本的统计由消费者完成
+            self.overruns += 1
+
+        # 先发布预留位置，消费者据此判断读取期间哪些数据可能被覆盖
+        self._write_reserve = self._write_pos + frames
+
+        start = self._write_pos % self.capacity
+        first = min(frames, self.capacity - start)
+        self._buffer[start:start + first] = data[:first]
+        if first < frames:
+            self._buffer[:frames - first] = data[first:]
+
+        # 数据写完后再发布写指针
+        self._write_pos += frames
+        if timestamp is not None:
+            self._timestamps.append((self._write_pos, timestamp))
+
+        used = min(self._write_pos - self._read_pos, self.capacity)
+        if used > self.high_water_mark:
+            self.high_water_mark = used
+
+        self._data_event.set()
+        return frames
+
+    def read(self, max_frames: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        读取音频数据（仅由消费者线程调用）
+
+        Args:
+            max_frames: 最多读取的样本数，None 表示读取全部可用数据
+            out: 可选的输出缓冲区，提供时数据写入其中并返回其切片
+
+        Returns:
+            np.ndarray: 读取到的数据，可能为空数组
+        """
+        write_pos = self._write_pos
+        read_pos = self._read_pos
+
+        # drop_oldest 策略下，跳过已经被覆盖的数据
+        if write_pos - read_pos > self.capacity:
+            lost = write_pos - read_pos - self.capacity
+            self.dropped_frames += lost
+            read_pos = write_pos - self.capacity
+
+        frames = write_pos - read_pos
+        if max_frames is not None:
+            frames = min(frames, int(max_frames))
+        if out is not None:
+            frames = min(frames, len(out))
+        if frames <= 0:
+            self._read_pos = read_pos
+            return self._buffer[:0] if out is None else out[:0]
+
+        if out is None:
+            out = np.empty(frames, dtype=np.float32)
+        target = out[:frames]
+
+        start = read_pos % self.capacity
+        first = min(frames, self.capacity - start)
+        target[:first] = self._buffer[start:start + first]
+        if first < frames:
+            target[first:] = self._buffer[:frames - first]
+
+        # 读取期间生产者可能已覆盖了开头的部分数据，丢弃这部分
+        torn = self._write_reserve - self.capacity - read_pos
+        if torn > 0:
+            torn = min(torn, frames)
+            self.dropped_frames += torn
+            target = target[torn:]
+
+        self._read_pos = read_pos + frames
+        self.total_read += len(target)
+        if self._write_pos == self._read_pos:
+            self._data_event.clear()
+        return target
+
+    def read_timestamp(self, sample_rate: int) -> Optional[float]:
+        """
+        获取最近一次读取的最后一个样本的捕获时间（仅由消费者线程调用）
+
+        按包含该样本的那次写入的时间戳，减去该样本之后同一次写入的样本时长
+
+        Args:
+            sample_rate: 采样率
+
+        Returns:
+            Optional[float]: 捕获时间（与写入时的时间戳同一时钟），没有时间戳时返回 None
+        """
+        position = self._read_pos
+        timestamps = self._timestamps
+        while len(timestamps) > 1 and timestamps[0][0] < position:
+            timestamps.popleft()
+        if not timestamps:
+            return None
+        end, timestamp = timestamps[0]
+        return timestamp - (end - position) / sample_rate
+
+    def wait_for_data(self, min_frames: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        等待缓冲区中至少有 min_frames 个样本（仅由消费者线程调用）
+
+        Args:
+            min_frames: 需要的最少样本数
+            timeout: 超时时间（秒）
+
+        Returns:
+            bool: 是否已有足够的数据
+        """
+        if self.available() >= min_frames:
+            return True
+        self._data_event.clear()
+        if self.available() >= min_frames:
+            return True
+        self._data_event.wait(timeout)
+        return self.available() >= min_frames
+
+    def clear(self) -> None:
+        """丢弃所有未读取的数据（仅由消费者线程调用）"""
+        self._read_pos = self._write_pos
+        self._data_event.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓冲区统计信息
+
+        Returns:
+            Dict[str, Any]: 统计信息
+        """
+        return {
+            "capacity": self.capacity,
+            "drop_policy": self.drop_policy,
+            "available": self.available(),
+            "overruns": self.overruns,
+            "dropped_frames": self.dropped_frames,
+            "total_written": self.total_written,
+            "total_read": self.total_read,
+            "high_water_mark": self.high_water_mark,
+        }
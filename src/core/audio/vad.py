@@ -0,0 +1,257 @@
+"""
+语音活动检测模块
+负责在送入识别器之前过滤静音音频
+"""
+from dataclasses import dataclass, field
+from typing import List, Tuple, Dict, Any, Optional
+
+import numpy as np
+
+# 避免 log10(0)
+_EPS = 1e-10
+
+
+@dataclass
+class VADResult:
+    """一次 VAD 处理的结果"""
+    speech: np.ndarray  # 需要送入识别器的音频（语音及其前后填充），可能为空
+    spans: List[Tuple[int, int]] = field(default_factory=list)  # 语音区间（流内绝对样本位置，左闭右开）
+    is_speech: bool = False  # 处理结束时是否处于语音状态
+    speech_started: bool = False  # 本次处理中是否有语音开始
+    speech_ended: bool = False  # 本次处理中是否有语音结束
+
+    @property
+    def has_speech(self) -> bool:
+        """是否有需要送入识别器的音频"""
+        return len(self.speech) > 0
+
+
+class VoiceActivityDetector:
+    """基于短时能量、过零率和自适应噪声底的流式语音活动检测器
+
+    处理流程：
+    - 将输入音频切分为 frame_ms 毫秒的子帧，用一次 NumPy 运算计算所有子帧的
+      能量（dBFS）和过零率
+    - 能量高于噪声底 + energy_margin_db 且高于 min_energy_db 的子帧视为候选语音；
+      能量接近阈值但过零率很高的子帧（如嘶嘶声、风扇噪声）视为非语音
+    - 连续 onset_frames 个候选语音子帧才进入语音状态，语音状态下连续
+      hangover_frames 个非语音子帧后才退出，避免词间停顿造成断句
+    - 语音开始前额外输出 padding_ms 毫秒的音频，避免吞掉首音节
+
+    不足一个子帧的尾部样本保留到下一次调用。
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 20,
+                 energy_margin_db: float = 10.0, min_energy_db: float = -55.0,
+                 zcr_threshold: float = 0.35, zcr_margin_db: float = 6.0,
+                 onset_frames: int = 2, hangover_ms: int = 400, padding_ms: int = 200,
+                 noise_floor_db: float = -60.0, noise_rise_rate: float = 0.05):
+        """
+        初始化语音活动检测器
+
+        Args:
+            sample_rate: 采样率
+            frame_ms: 子帧长度（毫秒），建议 10-30
+            energy_margin_db: 语音能量需高于噪声底的分贝数
+            min_energy_db: 语音的最低能量（dBFS）
+            zcr_threshold: 过零率阈值，超过此值且能量接近阈值的子帧视为噪声
+            zcr_margin_db: 过零率判定生效的能量范围（高于语音阈值的分贝数）
+            onset_frames: 进入语音状态所需的连续语音子帧数
+            hangover_ms: 退出语音状态前的拖尾时长（毫秒）
+            padding_ms: 语音开始前额外输出的音频时长（毫秒）
+            noise_floor_db: 初始噪声底（dBFS）
+            noise_rise_rate: 噪声底上升的平滑系数（每次处理），下降时立即跟随
+
+        Raises:
+            ValueError: 参数无效时
+        """
+        if not 5 <= frame_ms <= 50:
+            raise ValueError(f"子帧长度必须在5-50毫秒之间: {frame_ms}")
+
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.energy_margin_db = energy_margin_db
+        self.min_energy_db = min_energy_db
+        self.zcr_threshold = zcr_threshold
+        self.zcr_margin_db = zcr_margin_db
+        self.onset_frames = max(1, int(onset_frames))
+        self.hangover_frames = max(1, int(round(hangover_ms / frame_ms)))
+        self.padding_frames = max(0, int(round(padding_ms / frame_ms)))
+        self.initial_noise_floor_db = noise_floor_db
+        self.noise_rise_rate = noise_rise_rate
+
+        self.reset()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]], sample_rate: int = 16000) -> "VoiceActivityDetector":
+        """
+        根据配置字典创建检测器，未知的配置项会被忽略
+
+        Args:
+            config: 配置字典（config.json 中的 audio.vad）
+            sample_rate: 采样率
+
+        Returns:
+            VoiceActivityDetector: 检测器实例
+        """
+        keys = (
+            "frame_ms", "energy_margin_db", "min_energy_db", "zcr_threshold", "zcr_margin_db",
+            "onset_frames", "hangover_ms", "padding_ms", "noise_floor_db", "noise_rise_rate",
+        )
+        kwargs = {key: config[key] for key in keys if config and key in config}
+        return cls(sample_rate=sample_rate, **kwargs)
+
+    def reset(self) -> None:
+        """重置检测器状态"""
+        self.noise_floor_db = self.initial_noise_floor_db
+        self.in_speech = False
+        self._onset_count = 0
+        self._hangover_count = 0
+        self._frame_index = 0  # 已处理的子帧数
+        self._remainder = np.zeros(0, dtype=np.float32)  # 不足一个子帧的尾部样本
+        self._history = np.zeros((0, self.frame_length), dtype=np.float32)  # 最近未输出的子帧，用于前填充
+
+        # 统计信息
+        self.total_frames = 0
+        self.speech_frames = 0
+
+    @property
+    def position(self) -> int:
+        """已接收的样本数，即下一次 process() 输入的第一个样本在流内的位置"""
+        return self._frame_index * self.frame_length + len(self._remainder)
+
+    def compute_features(self, frames: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        计算每个子帧的能量和过零率
+
+        Args:
+            frames: 形状为 (子帧数, 子帧长度) 的音频
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 能量（dBFS）和过零率（0-1）
+        """
+        energy = np.einsum('ij,ij->i', frames, frames) / frames.shape[1]
+        energy_db = 10.0 * np.log10(energy + _EPS)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frames.shape[1] - 1)
+        return energy_db, zcr
+
+    def _classify(self, energy_db: np.ndarray, zcr: np.ndarray) -> np.ndarray:
+        """根据能量、过零率和当前噪声底给出每个子帧的原始判定"""
+        threshold = max(self.noise_floor_db + self.energy_margin_db, self.min_energy_db)
+        raw = energy_db > threshold
+        noisy = (zcr > self.zcr_threshold) & (energy_db < threshold + self.zcr_margin_db)
+        return raw & ~noisy
+
+    def _update_noise_floor(self, energy_db: np.ndarray) -> None:
+        """用本次能量较低的子帧更新噪声底：下降立即跟随，上升缓慢平滑"""
+        candidate = float(np.percentile(energy_db, 10))
+        if candidate < self.noise_floor_db:
+            self.noise_floor_db = candidate
+        else:
+            self.noise_floor_db += self.noise_rise_rate * (candidate - self.noise_floor_db)
+
+    def _smooth(self, raw: np.ndarray) -> Tuple[np.ndarray, bool, bool]:
+        """对原始判定做起始确认和拖尾平滑，返回平滑后的判定及状态变化"""
+        smoothed = np.zeros(len(raw), dtype=bool)
+        started = ended = False
+        for i, is_voiced in enumerate(raw):
+            if self.in_speech:
+                if is_voiced:
+                    self._hangover_count = self.hangover_frames
+                else:
+                    self._hangover_count -= 1
+                    if self._hangover_count <= 0:
+                        self.in_speech = False
+                        self._onset_count = 0
+                        ended = True
+                        continue
+                smoothed[i] = True
+            else:
+                self._onset_count = self._onset_count + 1 if is_voiced else 0
+                if self._onset_count >= self.onset_frames:
+                    self.in_speech = True
+                    self._hangover_count = self.hangover_frames
+                    started = True
+                    # 确认起始前的候选子帧也属于语音
+                    smoothed[max(0, i - self.onset_frames + 1):i + 1] = True
+        return smoothed, started, ended
+
+    def process(self, data: np.ndarray) -> VADResult:
+        """
+        处理一段单声道音频
+
+        Args:
+            data: 单声道 float32 音频数据
+
+        Returns:
+            VADResult: 处理结果
+        """
+        if len(self._remainder):
+            data = np.concatenate((self._remainder, data))
+        num_frames = len(data) // self.frame_length
+        used = num_frames * self.frame_length
+        self._remainder = np.array(data[used:], dtype=np.float32)
+        if num_frames == 0:
+            return VADResult(speech=np.zeros(0, dtype=np.float32), is_speech=self.in_speech)
+
+        frames = np.asarray(data[:used], dtype=np.float32).reshape(num_frames, self.frame_length)
+        energy_db, zcr = self.compute_features(frames)
+        smoothed, started, ended = self._smooth(self._classify(energy_db, zcr))
+        self._update_noise_floor(energy_db)
+
+        # 把历史中未输出的子帧拼接在前面，用于语音起始前的填充
+        history_len = len(self._history)
+        ext_frames = np.concatenate((self._history, frames)) if history_len else frames
+        ext_mask = np.concatenate((np.zeros(history_len, dtype=bool), smoothed))
+        if self.padding_frames:
+            starts = np.flatnonzero(np.diff(ext_mask.astype(np.int8), prepend=np.int8(1)) == 1)
+            for start in starts:
+                ext_mask[max(0, start - self.padding_frames):start] = True
+
+        # 计算语音区间（流内绝对样本位置）
+        first_index = self._frame_index - history_len
+        edges = np.diff(np.concatenate(([0], ext_mask.astype(np.int8), [0])))
+        span_starts = np.flatnonzero(edges == 1)
+        span_ends = np.flatnonzero(edges == -1)
+        spans = [
+            (int((first_index + s) * self.frame_length), int((first_index + e) * self.frame_length))
+            for s, e in zip(span_starts, span_ends)
+        ]
+
+        speech = ext_frames[ext_mask].reshape(-1)
+
+        # 保留末尾未输出的子帧作为下一次的填充来源
+        emitted = np.flatnonzero(ext_mask)
+        tail_start = emitted[-1] + 1 if len(emitted) else 0
+        if self.padding_frames:
+            self._history = ext_frames[tail_start:][-self.padding_frames:].copy()
+
+        self._frame_index += num_frames
+        self.total_frames += num_frames
+        self.speech_frames += int(np.count_nonzero(smoothed))
+
+        return VADResult(
+            speech=speech,
+            spans=spans,
+            is_speech=self.in_speech,
+            speech_started=started,
+            speech_ended=ended,
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取检测统计信息
+
+        Returns:
+            Dict[str, Any]: 统计信息
+        """
+        ratio = self.speech_frames / self.total_frames if self.total_frames else 0.0
+        return {
+            "total_frames": self.total_frames,
+            "speech_frames": self.speech_frames,
+            "speech_ratio": ratio,
+            "noise_floor_db": self.noise_floor_db,
+            "in_speech": self.in_speech,
+        }
@@ -58,7 +58,12 @@ class ASRPluginAdapter(QObject):
                 raise PluginInitError(f"Failed to enable plugin {plugin_id}")
 
             self.current_plugin_id = plugin_id
-            self.model_loaded.emit(True)
+            # 插件在后台预热模型时，预热完成后才发射模型加载完成信号
+            warmup = getattr(plugin, "warmup", None)
+            if warmup is not None:
+                warmup.add_done_callback(lambda _: self.model_loaded.emit(True))
+            else:
+                self.model_loaded.emit(True)
             logger.info(f"Successfully initialized ASR plugin: {plugin_id}")
             return True
 
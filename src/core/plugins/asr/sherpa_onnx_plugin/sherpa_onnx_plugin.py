@@ -33,6 +33,9 @@ import wave
 
 # 导入基础插件类
 from src.core.plugins.base.plugin_base import PluginBase
+from src.core.asr.recognizer_pool import get_recognizer_pool
+from src.core.asr.runtime_config import resolve_runtime
+from src.core.asr.warmup import ModelWarmup, get_warmup_seconds, warm_up_online_recognizer
 
 # 设置日志记录器
 logger = logging.getLogger(__name__)
@@ -100,6 +103,8 @@ class SherpaOnnxPlugin(PluginBase):
                 - path: 模型路径，必须指向有效的sherpa-onnx模型目录
                 - type: 模型类型，'standard'或'int8'
                 - num_threads: 使用的线程数，默认为4
+                - runtime: 运行时参数 {"num_threads", "provider", "device"}，优先于 num_threads，
+                  见 src.core.asr.runtime_config
                 - sample_rate: 音频采样率，默认为16000
                 - feature_dim: 特征维度，默认为80
                 - decoding_method: 解码方法，默认为'greedy_search'
@@ -107,6 +112,8 @@ class SherpaOnnxPlugin(PluginBase):
                 - rule1_min_trailing_silence: 端点检测规则1的最小尾部静音，默认为2.4
                 - rule2_min_trailing_silence: 端点检测规则2的最小尾部静音，默认为1.2
                 - rule3_min_utterance_length: 端点检测规则3的最小语音长度，默认为20.0
+                - parallel_workers: 文件转录的并行进程数，大于1时长文件在静音处切分后并行识别，默认为0（顺序识别）
+                - warmup_seconds: 加载后用于预热的合成音频时长（秒），0 表示不预热，默认使用 asr.warmup 配置
 
         示例:
             ```python
@@ -124,6 +131,8 @@ class SherpaOnnxPlugin(PluginBase):
         self.config = config  # 为了兼容ASRPluginBase
         self.model = None
         self.recognizer = None
+        self._recognizer_kwargs = None  # 创建识别器的参数，并行转录时每个工作进程用它创建自己的识别器
+        self.warmup = None  # 识别器的后台预热（ModelWarmup）
         self.stream = None
         self.model_dir = None
         self.is_int8 = False
@@ -251,7 +260,7 @@ class SherpaOnnxPlugin(PluginBase):
                     return False
 
             # 获取配置参数
-            num_threads = self.config.get('num_threads', 4)
+            runtime = resolve_runtime(self.config, self._model_version)
             sample_rate = self.config.get('sample_rate', 16000)
             feature_dim = self.config.get('feature_dim', 80)
             decoding_method = self.config.get('decoding_method', 'greedy_search')
@@ -280,20 +289,29 @@ class SherpaOnnxPlugin(PluginBase):
                     logger.error("sherpa_onnx.OnlineRecognizer.from_transducer方法不存在")
                     return False
 
-                self.recognizer = sherpa_onnx.OnlineRecognizer.from_transducer(
+                # 从全局识别器池获取识别器：重新打开插件或与引擎使用同一模型时复用已加载的 ONNX 会话
+                self._release_recognizer()
+                self._recognizer_kwargs = dict(
                     encoder=os.path.join(model_path, encoder_file),
                     decoder=os.path.join(model_path, decoder_file),
                     joiner=os.path.join(model_path, joiner_file),
                     tokens=os.path.join(model_path, tokens_file),
-                    num_threads=num_threads,
                     sample_rate=sample_rate,
                     feature_dim=feature_dim,
                     decoding_method=decoding_method,
                     enable_endpoint_detection=self.config.get('enable_endpoint_detection', True),
                     rule1_min_trailing_silence=self.config.get('rule1_min_trailing_silence', 2.4),
                     rule2_min_trailing_silence=self.config.get('rule2_min_trailing_silence', 1.2),
-                    rule3_min_utterance_length=self.config.get('rule3_min_utterance_length', 20.0)
+                    rule3_min_utterance_length=self.config.get('rule3_min_utterance_length', 20.0),
+                    **runtime
                 )
+                self.recognizer = get_recognizer_pool().acquire(**self._recognizer_kwargs)
+
+                # 在后台线程中预热识别器，避免第一段真实音频承担 ONNX Runtime 的延迟初始化
+                warmup_seconds = float(self.config.get('warmup_seconds', get_warmup_seconds()))
+                self.warmup = None
+                if warmup_seconds > 0:
+                    self.warmup = ModelWarmup(self.engine_type, self.warm_up, warmup_seconds).start()
 
                 # 保存引擎类型（不直接设置到recognizer对象，因为sherpa_onnx.OnlineRecognizer没有engine_type属性）
                 # self.recognizer.engine_type = self.engine_type
@@ -311,12 +329,32 @@ class SherpaOnnxPlugin(PluginBase):
             logger.error(traceback.format_exc())
             return False
 
+    def warm_up(self, seconds: float = 1.0) -> float:
+        """用一个临时流和合成音频预热识别器
+
+        Args:
+            seconds: 合成音频时长（秒）
+
+        Returns:
+            float: 预热耗时（秒）
+        """
+        recognizer = self.recognizer
+        if recognizer is None:
+            return 0.0
+        return warm_up_online_recognizer(recognizer, seconds, self.config.get('sample_rate', 16000))
+
+    def _release_recognizer(self) -> None:
+        """把识别器归还给识别器池"""
+        if self.recognizer is not None:
+            get_recognizer_pool().release(self.recognizer)
+            self.recognizer = None
+
     def teardown(self) -> bool:
         """清理插件资源"""
         try:
             # 释放模型和识别器资源
             self.model = None
-            self.recognizer = None
+            self._release_recognizer()
             self.stream = None
 
             # 清理临时文件
@@ -559,6 +597,18 @@ class SherpaOnnxPlugin(PluginBase):
                     logger.error(f"ffmpeg转换失败: {e}")
                     return None
 
+            # 并行模式：长文件在静音处切分，由多个进程同时识别
+            parallel_workers = self.config.get('parallel_workers', 0)
+            if parallel_workers and parallel_workers > 1 and self._recognizer_kwargs:
+                from src.core.asr.parallel_transcriber import ParallelFileTranscriber
+                transcriber = ParallelFileTranscriber(self._recognizer_kwargs, workers=parallel_workers)
+                result = transcriber.transcribe(audio_data.astype(np.float32) / 32768.0, recognizer=self.recognizer)
+                logger.info(
+                    f"并行转录完成: {len(result['segments'])} 个片段, {result['workers']} 个进程, "
+                    f"吞吐量 {result['audio_hours_per_wall_hour']:.1f} 音频小时/小时"
+                )
+                return self.get_formatted_transcript(result["text"]) if result["text"] else None
+
             # 创建新的流
             stream = self.recognizer.create_stream()
 
@@ -36,6 +36,16 @@ class TranscriptionSignals(QObject):
         str: 部分转录文本
     """
 
+    new_segment = pyqtSignal(object)
+    """
+    带时间戳的完整识别结果信号
+
+    与 new_text 同时发出，携带句子及每个词在音频流中的起止位置，用于生成字幕和测量端到端延迟。
+
+    Args:
+        object: TranscriptSegment
+    """
+
     # 状态相关信号
     status_updated = pyqtSignal(str)
     """
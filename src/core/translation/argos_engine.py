@@ -1,9 +1,9 @@
 import os
 import time
 from typing import Optional, Tuple
-import argostranslate
-import argostranslate.package
-import argostranslate.translate
+
+# argostranslate 在第一次初始化翻译器时才导入，避免导入翻译模块时拖慢程序启动
+
 
 class ArgosEngine:
     """ArgosTranslate 翻译引擎类"""
@@ -20,10 +20,7 @@ class ArgosEngine:
             model_dir = os.path.abspath(os.path.join("models", "translation", "argos"))
         self.model_dir = model_dir
         os.makedirs(self.model_dir, exist_ok=True)
-        
-        # 设置模型目录
-        argostranslate.package.update_package_index()
-        
+
         # 初始化翻译器
         self.translator = None
         self.setup()
@@ -36,6 +33,12 @@ class ArgosEngine:
             bool: 是否初始化成功
         """
         try:
+            import argostranslate.package
+            import argostranslate.translate
+
+            # 更新语言包索引（需要联网）
+            argostranslate.package.update_package_index()
+
             # 获取可用的语言包
             available_packages = argostranslate.package.get_available_packages()
             
@@ -114,6 +117,7 @@ class ArgosEngine:
             list: 支持的语言代码列表
         """
         try:
+            import argostranslate.translate
             languages = argostranslate.translate.get_installed_languages()
             return [lang.code for lang in languages]
         except Exception:
@@ -1,12 +1,12 @@
 import os
-from typing import Dict, Optional, Tuple, Union
+from typing import Callable, Dict, Optional, Tuple, Union
 from .opus_engine import OpusMTEngine
 from .argos_engine import ArgosEngine
 
 class TranslationManager:
     """翻译引擎管理器
     
-    负责管理不同的翻译引擎，提供统一的翻译接口。
+    负责管理不同的翻译引擎，提供统一的翻译接口。引擎（及其模型）在第一次使用时才创建。
     """
     
     def __init__(self, config: Optional[Dict] = None):
@@ -17,27 +17,44 @@ class TranslationManager:
             config (Dict, optional): 配置字典，包含各个引擎的配置信息
         """
         self.config = config or {}
-        self.engines: Dict[str, Union[OpusMTEngine, ArgosEngine]] = {}
+        self.engines: Dict[str, Union[OpusMTEngine, ArgosEngine]] = {}  # 已创建的引擎
+        self.engine_factories: Dict[str, Callable[[], Union[OpusMTEngine, ArgosEngine]]] = {}
         self.current_engine: Optional[str] = None
         
-        # 初始化默认引擎
+        # 注册默认引擎
         self._init_default_engines()
     
     def _init_default_engines(self):
-        """初始化默认的翻译引擎"""
-        # 初始化 OPUS-MT 引擎
+        """注册默认的翻译引擎，引擎在第一次使用时才创建并加载模型"""
+        # OPUS-MT 引擎
         opus_config = self.config.get('opus_mt', {})
         opus_model_dir = opus_config.get('model_dir')
-        self.engines['opus_mt'] = OpusMTEngine(model_dir=opus_model_dir)
+        self.engine_factories['opus_mt'] = lambda: OpusMTEngine(model_dir=opus_model_dir)
         
-        # 初始化 ArgosTranslate 引擎
+        # ArgosTranslate 引擎
         argos_config = self.config.get('argos', {})
         argos_model_dir = argos_config.get('model_dir')
-        self.engines['argos'] = ArgosEngine(model_dir=argos_model_dir)
+        self.engine_factories['argos'] = lambda: ArgosEngine(model_dir=argos_model_dir)
         
         # 设置默认引擎
         self.current_engine = 'opus_mt'
     
+    def _get_engine(self, engine_name: str) -> Optional[Union[OpusMTEngine, ArgosEngine]]:
+        """
+        获取引擎，第一次使用时创建
+
+        Args:
+            engine_name (str): 引擎名称
+
+        Returns:
+            Optional[Union[OpusMTEngine, ArgosEngine]]: 引擎，名称未注册时返回 None
+        """
+        engine = self.engines.get(engine_name)
+        if engine is None and engine_name in self.engine_factories:
+            engine = self.engine_factories[engine_name]()
+            self.engines[engine_name] = engine
+        return engine
+
     def set_engine(self, engine_name: str) -> bool:
         """
         设置当前使用的翻译引擎
@@ -48,7 +65,7 @@ class TranslationManager:
         Returns:
             bool: 是否设置成功
         """
-        if engine_name in self.engines:
+        if engine_name in self.engine_factories:
             self.current_engine = engine_name
             return True
         return False
@@ -60,7 +77,7 @@ class TranslationManager:
         Returns:
             list: 可用引擎名称列表
         """
-        return list(self.engines.keys())
+        return list(self.engine_factories.keys())
     
     def get_current_engine(self) -> Optional[str]:
         """
@@ -88,11 +105,11 @@ class TranslationManager:
             
         # 确定使用的引擎
         engine_to_use = engine_name if engine_name else self.current_engine
-        if not engine_to_use or engine_to_use not in self.engines:
+        if not engine_to_use or engine_to_use not in self.engine_factories:
             return None, 0.0
             
         # 调用对应引擎的翻译方法
-        engine = self.engines[engine_to_use]
+        engine = self._get_engine(engine_to_use)
         return engine.translate(text, **kwargs)
     
     def get_engine_info(self, engine_name: Optional[str] = None) -> Dict:
@@ -106,10 +123,10 @@ class TranslationManager:
             Dict: 引擎信息字典
         """
         engine_to_use = engine_name if engine_name else self.current_engine
-        if not engine_to_use or engine_to_use not in self.engines:
+        if not engine_to_use or engine_to_use not in self.engine_factories:
             return {}
             
-        engine = self.engines[engine_to_use]
+        engine = self._get_engine(engine_to_use)
         info = {
             'name': engine_to_use,
             'type': type(engine).__name__,
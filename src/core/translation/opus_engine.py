@@ -1,10 +1,9 @@
 import os
 import time
-import torch
-import numpy as np
-from transformers import MarianMTModel, MarianTokenizer
-import onnxruntime as ort
-from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+# torch、transformers、onnxruntime、optimum 导入耗时数秒，在第一次加载模型时才导入，
+# 避免导入翻译模块时拖慢程序启动
+
 
 class OpusMTEngine:
     """OPUS-MT 翻译引擎类"""
@@ -34,6 +33,9 @@ class OpusMTEngine:
     def setup(self):
         """初始化模型"""
         try:
+            from transformers import MarianMTModel, MarianTokenizer
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
             # 使用缓存的分词器和 PyTorch 模型
             if OpusMTEngine._tokenizer is None:
                 OpusMTEngine._tokenizer = MarianTokenizer.from_pretrained(self.model_dir)
@@ -69,7 +71,8 @@ class OpusMTEngine:
         try:
             print("\n开始 ONNX 转换...")
             print(f"目标路径: {self.model_dir}")
-            
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
             # 使用最基本的转换配置
             self.onnx_model = ORTModelForSeq2SeqLM.from_pretrained(
                 self.model_dir,
@@ -2,6 +2,7 @@
 主窗口模块
 负责创建和管理应用程序的主窗口
 """
+import functools
 import os
 import sys
 import logging
@@ -19,6 +20,7 @@ from src.ui.dialogs.plugin_manager_dialog import PluginManagerDialog
 from src.ui.dialogs.model_manager_dialog import ModelManagerDialog  # type: ignore
 from src.core.signals import TranscriptionSignals
 from src.core.asr.model_manager import ASRModelManager
+from src.core.asr.transcript_segment import TranscriptSegment, format_srt_time, write_srt
 from src.core.audio.audio_processor import AudioProcessor
 from src.utils.config_manager import config_manager  # type: ignore
 from src.utils.com_handler import com_handler  # type: ignore
@@ -74,6 +76,8 @@ class MainWindow(QMainWindow):
 
         # 转录模式标志
         self.is_file_mode = False
+        self._stop_pending = False  # 已停止捕获，等待工作线程处理完剩余音频
+        self._start_pending = False  # 已点击开始，等待模型就绪后开始转录
         self.file_path = None
 
         # 初始化UI
@@ -169,6 +173,10 @@ class MainWindow(QMainWindow):
             else:
                 self.logger.warning("未找到 new_text 信号")
 
+            if hasattr(self.signals, 'new_segment'):
+                self.logger.debug("连接 new_segment 信号")
+                self.signals.new_segment.connect(self.subtitle_widget.add_segment)
+
             if hasattr(self.signals, 'progress_updated'):
                 self.logger.debug("连接 progress_updated 信号")
                 self.signals.progress_updated.connect(self.control_panel.update_progress)
@@ -215,6 +223,15 @@ class MainWindow(QMainWindow):
         self.control_panel.start_clicked.connect(self._on_start_clicked)
         self.control_panel.stop_clicked.connect(self._on_stop_clicked)
 
+        # 工作线程处理完剩余音频后再保存转录文本
+        self.audio_processor.capture_stopped.connect(self._on_capture_stopped)
+
+        # 连接后台模型加载信号（在后台线程中发射，槽函数在界面线程中执行）
+        self.model_manager.model_load_progress.connect(self._on_model_load_progress)
+        self.model_manager.model_load_finished.connect(self._on_model_load_finished)
+        # 模型就绪（包括预热结束）后开始等待中的转录
+        self.model_manager.model_loaded.connect(self._on_model_ready)
+
         # 模型管理菜单信号已在 MainMenu.connect_signals 中连接
 
     def _load_default_model(self):
@@ -244,36 +261,15 @@ class MainWindow(QMainWindow):
             self.logger.error(f"更新菜单选中状态时出错: {str(e)}")
             self.logger.error(traceback.format_exc())
 
-        # 加载模型
-        if self.model_manager.load_model(default_model):
-            # 获取模型显示名称
-            model_display_name = self._get_model_display_name(default_model)
-            self.logger.debug(f"模型显示名称: {model_display_name}")
-
-            # 获取引擎类型
-            engine_type = self.model_manager.get_current_engine_type()
-            self.logger.info(f"默认引擎类型: {engine_type}")
-
-            # 更新字幕窗口的引擎类型
-            self.subtitle_widget.current_engine_type = engine_type
-            self.logger.info(f"更新字幕窗口的引擎类型: {engine_type}")
-
-            # 更新状态栏
-            self.signals.status_updated.emit(f"已加载ASR模型: {model_display_name}")
-
-            # 在字幕窗口显示初始信息
-            model_info = f"已加载ASR模型: {model_display_name}"
-            info_text = f"{model_info}\n准备就绪，点击'开始转录'按钮开始捕获系统音频"
-
-            # 设置字幕窗口文本
-            self.subtitle_widget.transcript_text = []
-            self.subtitle_widget.subtitle_label.setText(info_text)
-
-            self.logger.info(f"成功加载默认模型: {default_model}")
-        else:
-            error_msg = f"加载默认模型 {default_model} 失败"
-            self.logger.error(error_msg)
-            self.signals.error_occurred.emit(error_msg)
+        # 在后台线程中加载模型，窗口先显示出来；加载结束后由 _on_model_load_finished 更新界面。
+        # 启动时还没有可用的模型，加载结束前不允许开始转录
+        model_display_name = self._get_model_display_name(default_model)
+        self.control_panel.start_button.setEnabled(False)
+        self.model_manager.load_model_async(default_model)
+        loading_text = f"正在加载ASR模型: {model_display_name}..."
+        self.signals.status_updated.emit(loading_text)
+        self.subtitle_widget.transcript_text = []
+        self.subtitle_widget.subtitle_label.setText(loading_text)
 
     def _load_audio_devices(self):
         """加载音频设备"""
@@ -303,6 +299,35 @@ class MainWindow(QMainWindow):
                     self.control_panel.device_combo.setCurrentIndex(i)
                     break
 
+        # 之后由后台线程刷新设备列表，只把变化的设备更新到界面
+        registry = self.audio_processor.device_registry
+        registry.devices_changed.connect(self._on_audio_devices_changed)
+        registry.start()
+
+    @pyqtSlot(list, list, list)
+    def _on_audio_devices_changed(self, added, removed, changed):
+        """
+        音频设备变化处理（设备插拔、重命名）
+
+        Args:
+            added: 新增的设备
+            removed: 移除的设备
+            changed: 名称变更的设备
+        """
+        self.logger.info(f"音频设备变化: 新增 {len(added)}，移除 {len(removed)}，变更 {len(changed)}")
+        self.control_panel.update_devices(added, removed, changed)
+
+        # 当前设备被移除时，选择列表中的第一个设备
+        current = self.audio_processor.current_device
+        if current is not None and current in removed:
+            self.signals.status_updated.emit(f"音频设备已断开: {current.name}")
+            devices = self.audio_processor.get_audio_devices()
+            if devices and not self.control_panel.is_transcribing:
+                self.audio_processor.set_current_device(devices[0])
+                index = self.control_panel.find_device_index(devices[0])
+                if index >= 0:
+                    self.control_panel.device_combo.setCurrentIndex(index)
+
     @pyqtSlot()
     def _on_start_clicked(self):
         """开始按钮点击处理"""
@@ -320,6 +345,10 @@ class MainWindow(QMainWindow):
 
         sherpa_logger.info("开始按钮被点击")
 
+        # 模型尚未就绪时不在界面线程中等待，模型就绪后由 _on_model_ready 开始转录
+        if self._defer_start_until_model_ready(sherpa_logger):
+            return
+
         # 强制使用vosk_small模型
         model_type = "vosk_small"
         self.model_manager.model_type = "vosk_small"
@@ -337,6 +366,9 @@ class MainWindow(QMainWindow):
             self.subtitle_widget.transcript_text = []
         if hasattr(self.subtitle_widget, 'output_file'):
             self.subtitle_widget.output_file = None
+        # 分段时间戳以本次转录的音频开头为零点
+        if hasattr(self.subtitle_widget, 'segments'):
+            self.subtitle_widget.segments = []
 
         # 重置保存标志
         MainWindow._has_saved_transcript = False
@@ -429,18 +461,9 @@ class MainWindow(QMainWindow):
                     sherpa_logger.warning(f"模型类型 {model_type} 与引擎类型 {current_engine_type} 不一致")
                     sherpa_logger.warning("这可能导致功能异常，请确保选择正确的模型类型")
 
-                    # 尝试重新加载正确的模型
-                    sherpa_logger.info(f"尝试重新加载模型: {model_type}")
-                    if not self.model_manager.load_model(model_type):
-                        sherpa_logger.error(f"重新加载模型 {model_type} 失败")
-                        error_msg = f"无法使用请求的模型类型: {model_type}"
-                        self.signals.error_occurred.emit(error_msg)
-                        self.control_panel.reset()
-                        return
-
-                    # 更新引擎类型
-                    current_engine_type = self.model_manager.get_current_engine_type()
-                    sherpa_logger.info(f"重新加载后的引擎类型: {current_engine_type}")
+                    # 在后台重新加载正确的模型，加载完成后再开始转录
+                    self._reload_model_before_start(model_type, sherpa_logger)
+                    return
 
                 # 使用 model_manager 实例作为 recognizer
                 recognizer = self.model_manager
@@ -502,18 +525,9 @@ class MainWindow(QMainWindow):
                 sherpa_logger.warning(f"模型类型 {model_type} 与引擎类型 {current_engine_type} 不一致")
                 sherpa_logger.warning("这可能导致功能异常，请确保选择正确的模型类型")
 
-                # 尝试重新加载正确的模型
-                sherpa_logger.info(f"尝试重新加载模型: {model_type}")
-                if not self.model_manager.load_model(model_type):
-                    sherpa_logger.error(f"重新加载模型 {model_type} 失败")
-                    error_msg = f"无法使用请求的模型类型: {model_type}"
-                    self.signals.error_occurred.emit(error_msg)
-                    self.control_panel.reset()
-                    return
-
-                # 更新引擎类型
-                current_engine_type = self.model_manager.get_current_engine_type()
-                sherpa_logger.info(f"重新加载后的引擎类型: {current_engine_type}")
+                # 在后台重新加载正确的模型，加载完成后再开始转录
+                self._reload_model_before_start(model_type, sherpa_logger)
+                return
 
             # 创建识别器
             sherpa_logger.info("创建识别器")
@@ -536,9 +550,16 @@ class MainWindow(QMainWindow):
                 sherpa_logger.warning(f"识别器引擎类型 ({recognizer_engine_type}) 与模型类型 ({model_type}) 不一致")
                 sherpa_logger.warning("这可能导致功能异常，请确保选择正确的模型类型")
 
+            # 识别跟不上实时时切换的备用模型（在捕获线程需要时才加载）
+            fallback_factory = None
+            fallback_model = self.audio_processor.get_fallback_model(model_type)
+            if fallback_model:
+                sherpa_logger.info(f"备用模型: {fallback_model}")
+                fallback_factory = functools.partial(self.model_manager.create_model_recognizer, fallback_model)
+
             # 开始系统音频捕获
             sherpa_logger.info("开始系统音频捕获")
-            if not self.audio_processor.start_capture(recognizer):
+            if not self.audio_processor.start_capture(recognizer, fallback_recognizer_factory=fallback_factory):
                 error_msg = "开始音频捕获失败"
                 sherpa_logger.error(error_msg)
                 self.signals.error_occurred.emit(error_msg)
@@ -568,12 +589,70 @@ class MainWindow(QMainWindow):
             # 禁用相关菜单项
             self.menu_bar.update_menu_state(is_recording=True)
 
+    def _defer_start_until_model_ready(self, sherpa_logger):
+        """
+        模型正在后台加载或预热时推迟开始转录，模型就绪（model_loaded）后由 _on_model_ready 重新开始
+
+        不会再同步加载一次正在加载的模型，也不会让正在进行的加载在开始转录后替换引擎
+
+        Args:
+            sherpa_logger: 日志记录器
+
+        Returns:
+            bool: 是否已推迟
+        """
+        if self.model_manager.is_loading():
+            status_msg = "正在加载模型，完成后开始转录..."
+        elif self.model_manager.is_warming_up():
+            status_msg = "正在预热模型，完成后开始转录..."
+        else:
+            return False
+        self._start_pending = True
+        sherpa_logger.info(status_msg)
+        self.signals.status_updated.emit(status_msg)
+        return True
+
+    def _reload_model_before_start(self, model_type, sherpa_logger):
+        """
+        在后台加载开始转录所需的模型，加载完成后由 _on_model_ready 重新开始
+
+        Args:
+            model_type: 模型类型
+            sherpa_logger: 日志记录器
+        """
+        sherpa_logger.info(f"尝试重新加载模型: {model_type}")
+        self._start_pending = True
+        self.model_manager.load_model_async(model_type)
+        self.signals.status_updated.emit(f"正在加载ASR模型: {self._get_model_display_name(model_type)}，完成后开始转录...")
+
+    def _on_model_ready(self, success):
+        """
+        模型就绪处理：开始等待中的转录
+
+        Args:
+            success: 模型是否加载成功
+        """
+        if not self._start_pending or self.model_manager.is_loading() or self.model_manager.is_warming_up():
+            return
+        self._start_pending = False
+        if not success:
+            self.signals.status_updated.emit("模型加载失败，未开始转录")
+            self.control_panel.reset()
+            return
+        self._on_start_clicked()
+
     # 用于跟踪是否已保存文件
     _has_saved_transcript = False
 
     @pyqtSlot()
     def _on_stop_clicked(self):
         """停止按钮点击处理"""
+        # 还在等待模型就绪，尚未开始转录
+        if self._start_pending:
+            self._start_pending = False
+            self.signals.status_updated.emit("已取消开始转录")
+            return
+
         # 重置保存标志
         MainWindow._has_saved_transcript = False
 
@@ -600,8 +679,11 @@ class MainWindow(QMainWindow):
             # 系统音频模式
             sherpa_logger.info("停止系统音频捕获")
 
-            # 停止音频捕获 - 先停止捕获，防止在处理最终结果时继续接收新的部分结果
+            # 停止音频捕获 - 先停止捕获，防止在处理最终结果时继续接收新的部分结果。
+            # 工作线程在后台处理完剩余音频后发射 capture_stopped，届时再保存转录文本
+            self._stop_pending = True
             if not self.audio_processor.stop_capture():
+                self._stop_pending = False
                 self.signals.error_occurred.emit("停止音频捕获失败")
                 return
 
@@ -630,6 +712,21 @@ class MainWindow(QMainWindow):
                 sherpa_logger.error(traceback.format_exc())
 
             # 音频捕获已经在前面停止了
+            # capture_stopped 可能已在 stop_capture 中发射（工作线程未在运行），此时已经保存
+            if self._stop_pending:
+                self.signals.status_updated.emit("正在处理剩余音频...")
+            return
+
+        self._finish_stop()
+
+    def _on_capture_stopped(self):
+        """音频捕获完全停止（剩余音频已识别）后保存转录文本"""
+        if self._stop_pending:
+            self._finish_stop()
+
+    def _finish_stop(self):
+        """停止完成：恢复菜单状态并保存转录文本"""
+        self._stop_pending = False
 
         # 重新启用相关菜单项
         self.menu_bar.update_menu_state(is_recording=False)
@@ -690,37 +787,22 @@ class MainWindow(QMainWindow):
                     f.write('\n'.join(all_data['partial_results']))
                     f.write("\n\n")
 
+                    # 写入分段的音频时间和端到端延迟
+                    f.write("=== 分段时间戳 ===\n")
+                    for segment in all_data.get('segments', []):
+                        latency = f" (延迟 {segment.latency * 1000:.0f} ms)" if segment.latency is not None else ""
+                        f.write(f"[{format_srt_time(segment.start)} --> {format_srt_time(segment.end)}]{latency} "
+                                f"{segment.text}\n")
+                    f.write("\n")
+
                     # 写入当前显示内容
                     f.write("=== 当前显示内容 ===\n")
                     f.write(all_data['current_display'])
 
-                # 保存SRT格式的字幕文件
+                # 保存SRT格式的字幕文件（时间取自音频时间戳）
                 srt_path = save_path.replace('.txt', '.srt')
                 try:
-                    with open(srt_path, 'w', encoding='utf-8') as f:
-                        # 获取所有转录数据
-                        all_data = self.subtitle_widget.get_all_transcript_data()
-
-                        # 生成SRT格式的字幕
-                        for i, (text, timestamp) in enumerate(all_data['timestamped_transcript'], 1):
-                            # 解析时间戳
-                            h, m, s = timestamp.split(':')
-                            start_time = f"00:{h}:{m},{s}00"
-
-                            # 计算结束时间（假设每段字幕持续5秒）
-                            h_end, m_end, s_end = int(h), int(m), int(s) + 5
-                            if s_end >= 60:
-                                s_end -= 60
-                                m_end += 1
-                            if m_end >= 60:
-                                m_end -= 60
-                                h_end += 1
-                            end_time = f"00:{h_end:02d}:{m_end:02d},{s_end:02d}00"
-
-                            # 写入SRT格式
-                            f.write(f"{i}\n")
-                            f.write(f"{start_time} --> {end_time}\n")
-                            f.write(f"{text}\n\n")
+                    self._write_srt_file(srt_path)
                 except Exception as e:
                     print(f"保存SRT文件错误: {e}")
                     import traceback
@@ -962,37 +1044,22 @@ class MainWindow(QMainWindow):
                     f.write('\n'.join(all_data['partial_results']))
                     f.write("\n\n")
 
+                    # 写入分段的音频时间和端到端延迟
+                    f.write("=== 分段时间戳 ===\n")
+                    for segment in all_data.get('segments', []):
+                        latency = f" (延迟 {segment.latency * 1000:.0f} ms)" if segment.latency is not None else ""
+                        f.write(f"[{format_srt_time(segment.start)} --> {format_srt_time(segment.end)}]{latency} "
+                                f"{segment.text}\n")
+                    f.write("\n")
+
                     # 写入当前显示内容
                     f.write("=== 当前显示内容 ===\n")
                     f.write(all_data['current_display'])
 
-                # 保存SRT格式的字幕文件
+                # 保存SRT格式的字幕文件（时间取自音频时间戳）
                 srt_path = save_path.replace('.txt', '.srt')
                 try:
-                    with open(srt_path, 'w', encoding='utf-8') as f:
-                        # 获取所有转录数据
-                        all_data = self.subtitle_widget.get_all_transcript_data()
-
-                        # 生成SRT格式的字幕
-                        for i, (text, timestamp) in enumerate(all_data['timestamped_transcript'], 1):
-                            # 解析时间戳
-                            h, m, s = timestamp.split(':')
-                            start_time = f"00:{h}:{m},{s}00"
-
-                            # 计算结束时间（假设每段字幕持续5秒）
-                            h_end, m_end, s_end = int(h), int(m), int(s) + 5
-                            if s_end >= 60:
-                                s_end -= 60
-                                m_end += 1
-                            if m_end >= 60:
-                                m_end -= 60
-                                h_end += 1
-                            end_time = f"00:{h_end:02d}:{m_end:02d},{s_end:02d}00"
-
-                            # 写入SRT格式
-                            f.write(f"{i}\n")
-                            f.write(f"{start_time} --> {end_time}\n")
-                            f.write(f"{text}\n\n")
+                    self._write_srt_file(srt_path)
                 except Exception as e:
                     print(f"保存SRT文件错误: {e}")
                     import traceback
@@ -1057,6 +1124,34 @@ class MainWindow(QMainWindow):
             except:
                 pass
 
+    def _write_srt_file(self, srt_path):
+        """
+        保存SRT格式的字幕文件
+
+        字幕时间取自识别器给出的音频时间戳（TranscriptSegment）；识别器不提供时间戳时，
+        按结果到达字幕窗口的时间（以第一条为零点）估计，每条字幕持续到下一条开始，最长5秒。
+
+        Args:
+            srt_path: 字幕文件路径
+
+        Returns:
+            bool: 是否保存成功
+        """
+        segments = self.subtitle_widget.get_segments() if hasattr(self.subtitle_widget, 'get_segments') else []
+        if not segments:
+            history = self.subtitle_widget.get_all_transcript_data()['timestamped_transcript']
+            times = []
+            for _, timestamp in history:
+                h, m, s = (int(part) for part in timestamp.split(':'))
+                times.append(h * 3600 + m * 60 + s)
+            for i, (text, _) in enumerate(history):
+                start = (times[i] - times[0]) % 86400
+                end = start + 5
+                if i + 1 < len(history):
+                    end = min(end, max(start + 1, (times[i + 1] - times[0]) % 86400))
+                segments.append(TranscriptSegment.from_dict({"start": start, "end": end, "text": text}))
+        return write_srt(srt_path, segments)
+
     @pyqtSlot()
     def save_transcript(self):
         """保存转录文本"""
@@ -1129,6 +1224,14 @@ class MainWindow(QMainWindow):
                     f.write('\n'.join(all_data['partial_results']))
                     f.write("\n\n")
 
+                    # 写入分段的音频时间和端到端延迟
+                    f.write("=== 分段时间戳 ===\n")
+                    for segment in all_data.get('segments', []):
+                        latency = f" (延迟 {segment.latency * 1000:.0f} ms)" if segment.latency is not None else ""
+                        f.write(f"[{format_srt_time(segment.start)} --> {format_srt_time(segment.end)}]{latency} "
+                                f"{segment.text}\n")
+                    f.write("\n")
+
                     # 写入当前显示内容
                     f.write("=== 当前显示内容 ===\n")
                     f.write(all_data['current_display'])
@@ -1139,33 +1242,10 @@ class MainWindow(QMainWindow):
                     f.write(f"引擎类型: {self.model_manager.get_current_engine_type()}\n")
                     f.write(f"保存时间: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
 
-                # 保存SRT格式的字幕文件
+                # 保存SRT格式的字幕文件（时间取自音频时间戳）
                 srt_path = save_path.replace('.txt', '.srt')
                 try:
-                    with open(srt_path, 'w', encoding='utf-8') as f:
-                        # 获取所有转录数据
-                        all_data = self.subtitle_widget.get_all_transcript_data()
-
-                        # 生成SRT格式的字幕
-                        for i, (text, timestamp) in enumerate(all_data['timestamped_transcript'], 1):
-                            # 解析时间戳
-                            h, m, s = timestamp.split(':')
-                            start_time = f"00:{h}:{m},{s}00"
-
-                            # 计算结束时间（假设每段字幕持续5秒）
-                            h_end, m_end, s_end = int(h), int(m), int(s) + 5
-                            if s_end >= 60:
-                                s_end -= 60
-                                m_end += 1
-                            if m_end >= 60:
-                                m_end -= 60
-                                h_end += 1
-                            end_time = f"00:{h_end:02d}:{m_end:02d},{s_end:02d}00"
-
-                            # 写入SRT格式
-                            f.write(f"{i}\n")
-                            f.write(f"{start_time} --> {end_time}\n")
-                            f.write(f"{text}\n\n")
+                    self._write_srt_file(srt_path)
                 except Exception as e:
                     sherpa_logger.error(f"保存SRT文件错误: {e}")
                     import traceback
@@ -1278,68 +1358,120 @@ class MainWindow(QMainWindow):
             if key in ['vosk_small', 'sherpa_onnx_int8', 'sherpa_onnx_std', 'sherpa_0626_int8', 'sherpa_0626_std']:
                 action.setChecked(key == model_name)
 
-        # 加载模型
-        if self.model_manager.load_model(model_name):
-            # 获取更新后的引擎信息
-            new_engine_type = self.model_manager.get_current_engine_type()
-            new_engine = type(self.model_manager.current_engine).__name__ if self.model_manager.current_engine else "None"
-            sherpa_logger.info(f"新引擎类型: {new_engine_type}")
-            sherpa_logger.info(f"新引擎: {new_engine}")
-
-            # 检查加载后的引擎类型是否与请求的模型类型一致
-            if new_engine_type != model_name:
-                sherpa_logger.warning(f"加载后的引擎类型 {new_engine_type} 与请求的模型类型 {model_name} 不一致")
-                sherpa_logger.warning(f"这可能导致功能异常，请检查模型配置和文件是否正确")
-
-                # 尝试再次加载，确保使用正确的模型类型
-                sherpa_logger.info(f"尝试再次加载模型: {model_name}")
-                if not self.model_manager.load_model(model_name):
-                    sherpa_logger.error(f"再次加载模型 {model_name} 失败")
-                    error_msg = f"无法加载请求的模型类型: {model_name}"
-                    self.signals.error_occurred.emit(error_msg)
-                    return
+        # 在后台线程中加载模型，界面保持响应，加载完成前继续使用原来的模型
+        self.model_manager.load_model_async(model_name)
+        self.signals.status_updated.emit(f"正在加载ASR模型: {model_display_name}...")
 
-                # 再次获取引擎信息
-                new_engine_type = self.model_manager.get_current_engine_type()
-                new_engine = type(self.model_manager.current_engine).__name__ if self.model_manager.current_engine else "None"
-                sherpa_logger.info(f"再次加载后的引擎类型: {new_engine_type}")
-                sherpa_logger.info(f"再次加载后的引擎: {new_engine}")
+    def _on_model_load_progress(self, model_name, stage, progress):
+        """
+        后台模型加载进度处理
 
-            # 更新状态栏
-            status_msg = f"已加载ASR模型: {model_display_name} (引擎: {new_engine_type})"
-            sherpa_logger.info(status_msg)
-            self.signals.status_updated.emit(status_msg)
+        Args:
+            model_name: 模型名称
+            stage: 加载阶段
+            progress: 进度百分比
+        """
+        stage_names = {
+            'validate': '检查模型文件',
+            'create_session': '创建识别器',
+            'warm_up': '预热模型',
+            'ready': '已就绪'
+        }
+        model_display_name = self._get_model_display_name(model_name)
+        self.signals.status_updated.emit(
+            f"正在加载ASR模型: {model_display_name} - {stage_names.get(stage, stage)} ({progress}%)"
+        )
 
-            # 在字幕窗口显示模型设置信息
-            model_info = f"已设置ASR模型: {model_display_name}\n引擎类型: {new_engine_type}\n引擎实例: {new_engine}"
+    def _on_model_load_finished(self, model_name, success, error):
+        """
+        后台模型加载结束处理
 
-            # 更新字幕窗口的引擎类型
-            try:
-                setattr(self.subtitle_widget, 'current_engine_type', new_engine_type)
-            except Exception:
-                pass
-            sherpa_logger.info(f"更新字幕窗口的引擎类型: {new_engine_type}")
+        Args:
+            model_name: 模型名称
+            success: 是否成功
+            error: 失败原因
+        """
+        # 导入 Sherpa-ONNX 日志工具
+        try:
+            from src.utils.sherpa_logger import sherpa_logger
+        except ImportError:
+            # 如果导入失败，创建一个简单的日志记录器
+            class DummyLogger:
+                def debug(self, msg): print(f"DEBUG: {msg}")
+                def info(self, msg): print(f"INFO: {msg}")
+                def warning(self, msg): print(f"WARNING: {msg}")
+                def error(self, msg): print(f"ERROR: {msg}")
+            sherpa_logger = DummyLogger()
 
-            # 只有在没有进行转录时才更新字幕窗口
-            if not self.control_panel.is_transcribing:
-                # 保留现有文本，如果有的话
-                current_text = self.subtitle_widget.subtitle_label.text()
+        # 启动时的默认模型加载结束后允许开始转录；被新的加载取消时等新的加载结束
+        if not self.model_manager.is_loading():
+            self.control_panel.start_button.setEnabled(True)
 
-                # 如果当前文本为空或只包含准备就绪信息，则设置新文本
-                if not current_text or "准备就绪" in current_text:
-                    self.subtitle_widget.transcript_text = []
-                    info_text = f"{model_info}\n准备就绪，点击'开始转录'按钮开始捕获系统音频"
-                    self.subtitle_widget.subtitle_label.setText(info_text)
-                else:
-                    # 否则，将模型信息添加到当前文本的最下方
-                    self.subtitle_widget.subtitle_label.setText(current_text + "\n\n" + model_info)
-
-                # 滚动到底部，确保最新信息可见
-                QTimer.singleShot(100, lambda: self._safe_scroll_to_bottom())
-        else:
-            error_msg = f"加载ASR模型 {model_display_name} 失败"
+        model_display_name = self._get_model_display_name(model_name)
+        if not success:
+            if error == "已取消":
+                sherpa_logger.info(f"已取消加载ASR模型 {model_display_name}")
+                return
+            error_msg = f"加载ASR模型 {model_display_name} 失败: {error}"
             sherpa_logger.error(error_msg)
             self.signals.error_occurred.emit(error_msg)
+            # 恢复菜单选中状态为仍在使用的模型
+            current_engine_type = self.model_manager.get_current_engine_type()
+            for key, action in self.menu_bar.model_menu.actions.items():
+                if key in ['vosk_small', 'sherpa_onnx_int8', 'sherpa_onnx_std', 'sherpa_0626_int8', 'sherpa_0626_std']:
+                    action.setChecked(key == current_engine_type)
+            return
+
+        # 获取更新后的引擎信息
+        new_engine_type = self.model_manager.get_current_engine_type()
+        new_engine = type(self.model_manager.current_engine).__name__ if self.model_manager.current_engine else "None"
+        sherpa_logger.info(f"新引擎类型: {new_engine_type}")
+        sherpa_logger.info(f"新引擎: {new_engine}")
+
+        # 更新状态栏
+        status_msg = f"已加载ASR模型: {model_display_name} (引擎: {new_engine_type})"
+
+        # 正在转录时热切换识别器，不停止捕获；新识别器在下一个句子结束处接替
+        if self.audio_processor.is_capturing:
+            fallback_factory = None
+            fallback_model = self.audio_processor.get_fallback_model(new_engine_type)
+            if fallback_model:
+                fallback_factory = functools.partial(self.model_manager.create_model_recognizer, fallback_model)
+            if self.audio_processor.swap_recognizer(self.model_manager.create_recognizer, model_display_name,
+                                                    fallback_factory):
+                status_msg += "，将在当前句子结束时切换"
+            else:
+                status_msg += "，重新开始转录后生效"
+
+        sherpa_logger.info(status_msg)
+        self.signals.status_updated.emit(status_msg)
+
+        # 在字幕窗口显示模型设置信息
+        model_info = f"已设置ASR模型: {model_display_name}\n引擎类型: {new_engine_type}\n引擎实例: {new_engine}"
+
+        # 更新字幕窗口的引擎类型
+        try:
+            setattr(self.subtitle_widget, 'current_engine_type', new_engine_type)
+        except Exception:
+            pass
+        sherpa_logger.info(f"更新字幕窗口的引擎类型: {new_engine_type}")
+
+        # 只有在没有进行转录时才更新字幕窗口
+        if not self.control_panel.is_transcribing:
+            # 保留现有文本，如果有的话
+            current_text = self.subtitle_widget.subtitle_label.text()
+
+            # 如果当前文本为空或只包含准备就绪信息，则设置新文本
+            if not current_text or "准备就绪" in current_text or current_text.startswith("正在加载ASR模型"):
+                self.subtitle_widget.transcript_text = []
+                info_text = f"{model_info}\n准备就绪，点击'开始转录'按钮开始捕获系统音频"
+                self.subtitle_widget.subtitle_label.setText(info_text)
+            else:
+                # 否则，将模型信息添加到当前文本的最下方
+                self.subtitle_widget.subtitle_label.setText(current_text + "\n\n" + model_info)
+
+            # 滚动到底部，确保最新信息可见
+            QTimer.singleShot(100, lambda: self._safe_scroll_to_bottom())
 
     def _get_model_display_name(self, model_name):
         """
@@ -1673,6 +1805,9 @@ class MainWindow(QMainWindow):
             # 保存窗口状态
             self.save_window_state()
 
+            # 停止设备列表的后台刷新
+            self.audio_processor.device_registry.stop()
+
             # 停止所有转录活动
             if self.is_file_mode and HAS_FILE_TRANSCRIBER and self.file_transcriber:
                 sherpa_logger.info("关闭窗口时停止文件转录")
@@ -2122,9 +2257,10 @@ class MainWindow(QMainWindow):
             # 重新加载模型列表
             # 由于ASRModelManager没有refresh_models方法，我们使用其他方式刷新
             # 例如，重新加载默认模型
+            # 在后台重新加载，正在进行的加载会被取消，不会与之同时加载
             default_model = self.config_manager.get_default_model()
-            if self.model_manager.load_model(default_model):
-                self.logger.info(f"已重新加载默认模型: {default_model}")
+            self.model_manager.load_model_async(default_model)
+            self.logger.info(f"正在后台重新加载默认模型: {default_model}")
 
             # 如果菜单有更新模型的方法，调用它
             if hasattr(self.menu_bar, 'model_menu') and hasattr(self.menu_bar.model_menu, 'update_models'):
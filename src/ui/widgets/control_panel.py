@@ -261,6 +261,33 @@ class ControlPanel(QWidget):
         for device in devices:
             self.device_combo.addItem(device.name, device)
 
+    def update_devices(self, added, removed, changed):
+        """
+        按设备变化增量更新设备列表，保留当前选择
+
+        Args:
+            added: 新增的设备
+            removed: 移除的设备
+            changed: 名称变更的设备
+        """
+        for device in removed:
+            index = self.find_device_index(device)
+            if index >= 0:
+                self.device_combo.removeItem(index)
+        for device in changed:
+            index = self.find_device_index(device)
+            if index >= 0:
+                self.device_combo.setItemText(index, device.name)
+        for device in added:
+            self.device_combo.addItem(device.name, device)
+
+    def find_device_index(self, device):
+        """查找设备在下拉列表中的位置，不存在时返回 -1"""
+        for index in range(self.device_combo.count()):
+            if self.device_combo.itemData(index) is device:
+                return index
+        return -1
+
     @pyqtSlot(int, str)
     def update_progress(self, value, text=None):
         """
@@ -3,6 +3,7 @@
 负责字幕的显示和样式管理
 """
 import difflib
+import logging
 import traceback
 from PyQt5.QtWidgets import (QLabel, QVBoxLayout, QWidget, QGraphicsOpacityEffect,
                              QScrollArea, QSizePolicy)
@@ -11,6 +12,7 @@ from PyQt5.QtCore import Qt, pyqtSlot, QTimer
 
 from src.utils.config_manager import config_manager
 from src.utils.logger import get_logger
+from src.utils.async_logging import is_enabled_for
 
 # 获取日志记录器
 logger = get_logger(__name__)
@@ -132,6 +134,9 @@ class SubtitleWidget(QScrollArea):
         # 初始化带时间戳的转录历史记录
         self.timestamped_transcript_history = []
 
+        # 带音频时间戳的完整结果（TranscriptSegment），用于生成字幕
+        self.segments = []
+
         # 初始化引擎类型（用于区分不同的ASR引擎）
         # 这个属性由MainWindow类在set_asr_model和_load_default_model方法中设置
         # 可能的值：'vosk_small', 'sherpa_onnx_int8', 'sherpa_onnx_std', 'sherpa_0626_int8', 'sherpa_0626_std'
@@ -279,17 +284,21 @@ class SubtitleWidget(QScrollArea):
                         def warning(self, msg): print(f"WARNING: {msg}")
                         def error(self, msg): print(f"ERROR: {msg}")
                     sherpa_logger = DummyLogger()
+                # 每个部分结果都会执行，调试日志在级别关闭时不格式化
+                debug = is_enabled_for(sherpa_logger, logging.DEBUG)
 
                 # 检查是否与最后一个完整结果相似
                 if self.transcript_text and self._is_similar(partial_text, self.transcript_text[-1]):
-                    sherpa_logger.debug(f"部分结果与最后一个完整结果相似，不更新: {partial_text}")
+                    if debug:
+                        sherpa_logger.debug(f"部分结果与最后一个完整结果相似，不更新: {partial_text}")
                     return
 
                 # 如果部分文本不是当前部分段落的一部分，更新当前部分段落
                 if not self.current_partial_paragraph or partial_text not in self.current_partial_paragraph:
                     # 如果当前部分段落为空，直接设置
                     if not self.current_partial_paragraph:
-                        sherpa_logger.debug(f"设置首次部分结果: {partial_text}")
+                        if debug:
+                            sherpa_logger.debug(f"设置首次部分结果: {partial_text}")
                         self.current_partial_paragraph = partial_text
                     else:
                         # 检查部分文本是否是当前部分段落的一部分
@@ -297,11 +306,15 @@ class SubtitleWidget(QScrollArea):
                         # 如果不是，使用新的部分文本
                         if self.current_partial_paragraph in partial_text:
                             # 新的部分文本包含当前部分段落，使用新的部分文本
-                            sherpa_logger.debug(f"部分结果更新 (包含旧结果): 旧={self.current_partial_paragraph}, 新={partial_text}")
+                            if debug:
+                                sherpa_logger.debug(f"部分结果更新 (包含旧结果): 旧={self.current_partial_paragraph}, "
+                                                    f"新={partial_text}")
                             self.current_partial_paragraph = partial_text
                         elif partial_text in self.current_partial_paragraph:
                             # 当前部分段落包含新的部分文本，保留当前部分段落
-                            sherpa_logger.debug(f"保留当前部分结果 (包含新结果): 当前={self.current_partial_paragraph}, 新={partial_text}")
+                            if debug:
+                                sherpa_logger.debug(f"保留当前部分结果 (包含新结果): 当前={self.current_partial_paragraph}, "
+                                                    f"新={partial_text}")
                             # 不更新，保留当前部分段落
                             pass
                         else:
@@ -309,15 +322,21 @@ class SubtitleWidget(QScrollArea):
                             if self._is_similar(partial_text, self.current_partial_paragraph):
                                 # 如果相似度高，使用较长的文本
                                 if len(partial_text) > len(self.current_partial_paragraph):
-                                    sherpa_logger.debug(f"部分结果更新 (相似且更长): 旧={self.current_partial_paragraph}, 新={partial_text}")
+                                    if debug:
+                                        sherpa_logger.debug(f"部分结果更新 (相似且更长): 旧={self.current_partial_paragraph}, "
+                                                            f"新={partial_text}")
                                     self.current_partial_paragraph = partial_text
                                 else:
-                                    sherpa_logger.debug(f"保留当前部分结果 (相似但更短): 当前={self.current_partial_paragraph}, 新={partial_text}")
+                                    if debug:
+                                        sherpa_logger.debug(f"保留当前部分结果 (相似但更短): 当前={self.current_partial_paragraph}, "
+                                                            f"新={partial_text}")
                                     # 不更新，保留当前部分段落
                                     pass
                             else:
                                 # 新的部分文本与当前部分段落无关，使用新的部分文本
-                                sherpa_logger.debug(f"部分结果更新 (全新结果): 旧={self.current_partial_paragraph}, 新={partial_text}")
+                                if debug:
+                                    sherpa_logger.debug(f"部分结果更新 (全新结果): 旧={self.current_partial_paragraph}, "
+                                                        f"新={partial_text}")
                                 self.current_partial_paragraph = partial_text
 
                 # 保存最新的部分结果，用于后续处理
@@ -327,7 +346,8 @@ class SubtitleWidget(QScrollArea):
                     if hasattr(self, 'audio_worker') and self.audio_worker:
                         if hasattr(self.audio_worker, '_last_partial_result'):
                             self.audio_worker._last_partial_result = self.current_partial_paragraph
-                            sherpa_logger.debug(f"保存最新部分结果到AudioWorker: {self.current_partial_paragraph}")
+                            if debug:
+                                sherpa_logger.debug(f"保存最新部分结果到AudioWorker: {self.current_partial_paragraph}")
                 except Exception as e:
                     sherpa_logger.error(f"保存最新部分结果错误: {e}")
                     import traceback
@@ -341,18 +361,11 @@ class SubtitleWidget(QScrollArea):
                 if self.current_partial_paragraph:
                     # 将部分结果添加到显示列表中，但不添加到transcript_text列表中
                     display_text.append(self.current_partial_paragraph)
-                    print(f"显示部分结果: {self.current_partial_paragraph}")
 
                 # 更新字幕标签
-                print(f"[DEBUG] 更新部分结果: {self.current_partial_paragraph}")
-                print(f"[DEBUG] 显示文本列表: {display_text}")
-                try:
-                    # 导入 Sherpa-ONNX 日志工具
-                    from src.utils.sherpa_logger import sherpa_logger
-                    sherpa_logger.info(f"更新部分结果: {self.current_partial_paragraph}")
+                if debug:
+                    sherpa_logger.debug(f"更新部分结果: {self.current_partial_paragraph}")
                     sherpa_logger.debug(f"显示文本列表: {display_text}")
-                except ImportError:
-                    pass
 
                 # 设置字幕文本
                 try:
@@ -386,11 +399,11 @@ class SubtitleWidget(QScrollArea):
                         def warning(self, msg): print(f"WARNING: {msg}")
                         def error(self, msg): print(f"ERROR: {msg}")
                     sherpa_logger = DummyLogger()
+                debug = is_enabled_for(sherpa_logger, logging.DEBUG)
 
                 # 检查是否与最后一个结果相同或相似
                 if self.transcript_text and (text == self.transcript_text[-1] or self._is_similar(text, self.transcript_text[-1])):
                     # 如果是重复或非常相似的文本，不添加到列表
-                    print(f"跳过重复文本: {text}")
                     sherpa_logger.info(f"跳过重复文本: {text}")
 
                     # 检查是否是最终结果（通常比部分结果更完整）
@@ -420,7 +433,6 @@ class SubtitleWidget(QScrollArea):
                         sherpa_logger.info(f"[{timestamp}] 更新最终结果: {text}")
                 else:
                     # 添加新的完整结果到转录文本列表
-                    print(f"添加新文本: {text}")
                     sherpa_logger.info(f"添加新文本: {text}")
 
                     # 直接添加到转录文本列表
@@ -442,10 +454,9 @@ class SubtitleWidget(QScrollArea):
                 # 显示所有完整结果，但限制最大数量以避免性能问题
                 try:
                     self.subtitle_label.setText('\n'.join(self.transcript_text[-500:]))
-                    print(f"[DEBUG] 更新完整结果，显示 {len(self.transcript_text[-500:])} 行文本")
-                    print(f"[DEBUG] 完整文本列表: {self.transcript_text}")
-                    sherpa_logger.debug(f"更新字幕窗口，显示 {len(self.transcript_text[-500:])} 行文本")
-                    sherpa_logger.debug(f"完整文本列表: {self.transcript_text}")
+                    if debug:
+                        sherpa_logger.debug(f"更新字幕窗口，显示 {len(self.transcript_text[-500:])} 行文本")
+                        sherpa_logger.debug(f"完整文本列表: {self.transcript_text}")
                 except Exception as e:
                     error_msg = f"设置完整结果文本错误: {e}"
                     print(error_msg)
@@ -581,9 +592,29 @@ class SubtitleWidget(QScrollArea):
             'timestamped_transcript': self.timestamped_transcript_history,
             'full_transcript': self.full_transcript_history,
             'partial_results': self.partial_results_history,
+            'segments': self.segments,
             'current_display': current_display
         }
 
+    @pyqtSlot(object)
+    def add_segment(self, segment):
+        """
+        记录带音频时间戳的完整结果
+
+        Args:
+            segment (TranscriptSegment): 完整结果及其在音频流中的起止位置
+        """
+        self.segments.append(segment)
+
+    def get_segments(self):
+        """
+        获取带音频时间戳的完整结果
+
+        Returns:
+            list: TranscriptSegment 列表
+        """
+        return list(self.segments)
+
     def _find_matching_complete_text(self, text):
         """查找与给定文本匹配的完整句子
 
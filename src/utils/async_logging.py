@@ -0,0 +1,301 @@
+"""
+异步日志模块
+记录日志时只把记录放入有界队列，由一个后台线程写入控制台和文件，音频处理等热路径中
+不进行同步的磁盘和控制台 I/O；队列满时丢弃记录并计数，不阻塞调用方。
+还提供日志级别检查（级别关闭时不格式化消息）和按键限频的日志记录。
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# 日志队列的最大记录数
+DEFAULT_QUEUE_SIZE = 10000
+
+# 每块音频都会产生的日志，默认每个键每隔多少秒最多记录一次
+DEFAULT_RATE_LIMIT_SECONDS = 5.0
+
+
+class BoundedQueueHandler(QueueHandler):
+    """把日志记录放入有界队列的处理器，队列满时丢弃记录，不阻塞调用方"""
+
+    def __init__(self, log_queue: queue.Queue, route: str, dispatcher: "LogDispatcher"):
+        """
+        初始化处理器
+
+        Args:
+            log_queue: 日志队列
+            route: 路由名称，后台线程据此选择写入的处理器
+            dispatcher: 所属的日志分发器
+        """
+        super().__init__(log_queue)
+        self.route = route
+        self.dispatcher = dispatcher
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """合并消息参数并标记路由（记录已被复制，不影响其他处理器）"""
+        record = super().prepare(record)
+        record.log_route = self.route
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """放入队列，队列满时丢弃"""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dispatcher.dropped += 1
+
+
+class _DispatchHandler(logging.Handler):
+    """后台线程中把记录交给分发器"""
+
+    def __init__(self, dispatcher: "LogDispatcher"):
+        super().__init__()
+        self.dispatcher = dispatcher
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.dispatcher._dispatch(record)
+
+
+class _BlockingStopListener(QueueListener):
+    """队列满时停止也能放入结束标记的 QueueListener"""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class LogDispatcher:
+    """日志分发器
+
+    所有异步日志记录器共用一个有界队列和一个后台写入线程。每个记录器（路由）登记自己的
+    控制台、文件处理器，记录器本身只挂一个 BoundedQueueHandler。
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_QUEUE_SIZE):
+        """
+        初始化分发器
+
+        Args:
+            maxsize: 队列的最大记录数
+        """
+        self.queue = queue.Queue(maxsize=max(1, int(maxsize)))
+        self.dropped = 0  # 队列满时丢弃的记录数
+        self._reported_dropped = 0
+        self._routes: Dict[str, List[logging.Handler]] = {}
+        self._lock = threading.Lock()
+        self._listener = None
+
+    def attach(self, logger: logging.Logger, handlers: Sequence[logging.Handler],
+               route: Optional[str] = None) -> BoundedQueueHandler:
+        """
+        让记录器通过队列写入指定的处理器，替换该路由之前登记的处理器
+
+        Args:
+            logger: 日志记录器
+            handlers: 在后台线程中写入的处理器
+            route: 路由名称，默认为记录器名称
+
+        Returns:
+            BoundedQueueHandler: 挂在记录器上的队列处理器
+        """
+        route = route or logger.name
+        handlers = list(handlers)
+        with self._lock:
+            replaced = self._routes.get(route, [])
+            self._routes[route] = handlers
+        for handler in logger.handlers[:]:
+            if isinstance(handler, BoundedQueueHandler) and handler.route == route:
+                logger.removeHandler(handler)
+        for handler in replaced:
+            if handler not in handlers:
+                handler.close()
+
+        queue_handler = BoundedQueueHandler(self.queue, route, self)
+        # 所有处理器都不需要的级别在调用方就被过滤掉，不进入队列
+        queue_handler.setLevel(min((handler.level for handler in handlers), default=logging.NOTSET))
+        logger.addHandler(queue_handler)
+        self.start()
+        return queue_handler
+
+    def detach(self, route: str) -> List[logging.Handler]:
+        """
+        取消路由登记
+
+        Args:
+            route: 路由名称
+
+        Returns:
+            List[logging.Handler]: 该路由登记的处理器（由调用方关闭）
+        """
+        with self._lock:
+            return self._routes.pop(route, [])
+
+    def get_handlers(self, route: str) -> List[logging.Handler]:
+        """
+        获取路由登记的处理器
+
+        Args:
+            route: 路由名称
+
+        Returns:
+            List[logging.Handler]: 处理器列表
+        """
+        with self._lock:
+            return list(self._routes.get(route, []))
+
+    def start(self) -> None:
+        """启动后台写入线程（已启动时不做任何事）"""
+        with self._lock:
+            if self._listener is not None:
+                return
+            self._listener = _BlockingStopListener(self.queue, _DispatchHandler(self))
+            self._listener.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """写完队列中剩余的记录并停止后台线程"""
+        with self._lock:
+            listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """
+        等待队列中的记录全部写入
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 是否在超时前写完
+        """
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks:
+            if self._listener is None or time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        for handlers in list(self._routes.values()):
+            for handler in handlers:
+                handler.flush()
+        return True
+
+    def _dispatch(self, record: logging.LogRecord) -> None:
+        """后台线程：把记录写入所属路由的处理器"""
+        with self._lock:
+            handlers = self._routes.get(getattr(record, "log_route", None), [])
+        dropped = self.dropped
+        if dropped != self._reported_dropped:
+            notice = logging.makeLogRecord({
+                "name": record.name, "levelno": logging.WARNING, "levelname": "WARNING",
+                "msg": f"日志队列已满，丢弃了 {dropped - self._reported_dropped} 条日志",
+            })
+            self._reported_dropped = dropped
+            self._emit(handlers, notice)
+        self._emit(handlers, record)
+
+    @staticmethod
+    def _emit(handlers: Sequence[logging.Handler], record: logging.LogRecord) -> None:
+        for handler in handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_log_dispatcher() -> LogDispatcher:
+    """
+    获取全局日志分发器
+
+    Returns:
+        LogDispatcher: 日志分发器
+    """
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = LogDispatcher()
+        return _dispatcher
+
+
+def is_enabled_for(logger: Any, level: int) -> bool:
+    """
+    日志记录器是否会记录该级别的日志，用于在格式化消息之前跳过关闭的级别
+
+    Args:
+        logger: logging.Logger、SherpaLogger 或只有 debug()/info() 等方法的简单记录器
+        level: 日志级别
+
+    Returns:
+        bool: 是否记录，记录器不提供 isEnabledFor() 时返回 True
+    """
+    checker = getattr(logger, "isEnabledFor", None)
+    return True if checker is None else checker(level)
+
+
+class LogRateLimiter:
+    """按键限制日志频率
+
+    每个键在 interval 秒内最多记录一次，下一次记录时附上期间被省略的条数。
+    用于每块音频都会产生的日志。
+    """
+
+    def __init__(self, interval: float = DEFAULT_RATE_LIMIT_SECONDS, clock: Callable[[], float] = time.monotonic):
+        """
+        初始化限频器
+
+        Args:
+            interval: 同一个键两次记录的最小间隔（秒）
+            clock: 时钟函数
+        """
+        self.interval = interval
+        self.clock = clock
+        self._last = {}
+        self._suppressed = {}
+
+    def allow(self, key: str) -> Optional[int]:
+        """
+        判断该键现在是否可以记录
+
+        Args:
+            key: 日志的键
+
+        Returns:
+            Optional[int]: 可以记录时返回上次记录以来被省略的条数，不能记录时返回 None
+        """
+        now = self.clock()
+        last = self._last.get(key)
+        if last is not None and now - last < self.interval:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return None
+        self._last[key] = now
+        return self._suppressed.pop(key, 0)
+
+    def log(self, logger: Any, level: int, key: str, message: str, *args: Any) -> bool:
+        """
+        限频记录日志；级别关闭或被限频时不格式化消息
+
+        Args:
+            logger: 日志记录器（需要有 debug()/info()/warning()/error() 方法）
+            level: 日志级别
+            key: 日志的键
+            message: 消息，有 args 时按 % 格式化
+            *args: 消息参数
+
+        Returns:
+            bool: 是否记录了
+        """
+        if not is_enabled_for(logger, level):
+            return False
+        suppressed = self.allow(key)
+        if suppressed is None:
+            return False
+        if args:
+            message = message % args
+        if suppressed:
+            message += f"（{self.interval:g} 秒内省略了 {suppressed} 条）"
+        getattr(logger, logging.getLevelName(level).lower())(message)
+        return True
@@ -1,6 +1,6 @@
 """
 日志模块
-提供统一的日志配置和访问
+提供统一的日志配置和访问，日志通过有界队列由后台线程写入控制台和文件（见 async_logging）
 """
 import os
 import sys
@@ -9,6 +9,8 @@ from datetime import datetime
 from logging.handlers import RotatingFileHandler
 from typing import Dict, Any, Optional, Union, List
 
+from src.utils.async_logging import get_log_dispatcher
+
 # 日志级别映射
 LOG_LEVELS = {
     "DEBUG": logging.DEBUG,
@@ -33,6 +35,7 @@ class LogManager:
             return
 
         self.loggers = {}
+        self._handlers = {}  # 记录器名称 -> 后台线程中写入的处理器
         self._log_dir = "logs"
         self._default_level = logging.INFO
         self._max_file_size = 10 * 1024 * 1024  # 10MB
@@ -124,9 +127,9 @@ class LogManager:
         console_handler.setFormatter(formatter)
         file_handler.setFormatter(formatter)
 
-        # 添加处理器
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+        # 记录器只挂队列处理器，控制台和文件由后台线程写入
+        get_log_dispatcher().attach(logger, [console_handler, file_handler])
+        self._handlers[name] = [console_handler, file_handler]
 
         # 缓存日志记录器
         self.loggers[name] = logger
@@ -159,13 +162,18 @@ class LogManager:
         logger.info("=" * 50)
 
     def shutdown(self):
-        """关闭所有日志处理器"""
+        """写完队列中剩余的日志，关闭所有日志处理器"""
+        dispatcher = get_log_dispatcher()
+        dispatcher.stop()
         for name, logger in self.loggers.items():
             for handler in logger.handlers[:]:
                 handler.close()
                 logger.removeHandler(handler)
+            for handler in dispatcher.detach(name):
+                handler.close()
 
         self.loggers.clear()
+        self._handlers.clear()
         logging.shutdown()
 
     def get_log_files(self) -> List[str]:
@@ -175,8 +183,8 @@ class LogManager:
             List[str]: 日志文件路径列表
         """
         log_files = []
-        for name, logger in self.loggers.items():
-            for handler in logger.handlers:
+        for name, handlers in self._handlers.items():
+            for handler in handlers:
                 if isinstance(handler, (logging.FileHandler, RotatingFileHandler)):
                     log_files.append(handler.baseFilename)
         return log_files
@@ -258,7 +266,7 @@ class Logger:
 
     def get_log_file(self) -> Optional[str]:
         """获取当前日志文件路径"""
-        for handler in self.logger.handlers:
+        for handler in log_manager._handlers.get(self.name, []):
             if isinstance(handler, (logging.FileHandler, RotatingFileHandler)):
                 return handler.baseFilename
         return None
@@ -1,13 +1,16 @@
 """
 Sherpa-ONNX 日志工具模块
-负责记录 Sherpa-ONNX 相关日志
+负责记录 Sherpa-ONNX 相关日志，日志通过有界队列由后台线程写入控制台和文件
 """
 import os
 import sys
 import time  # 添加 time 模块导入
 import logging
 import datetime
-from typing import Optional
+from typing import Any, Optional
+
+from src.utils.async_logging import get_log_dispatcher
+
 
 class SherpaLogger:
     """Sherpa-ONNX 日志工具类"""
@@ -38,7 +41,6 @@ class SherpaLogger:
         self.console_handler.setLevel(logging.INFO)  # 控制台始终显示INFO级别
         console_formatter = logging.Formatter("%(message)s")
         self.console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(self.console_handler)
         
         # 创建文件处理器
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -49,7 +51,9 @@ class SherpaLogger:
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         )
         self.file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(self.file_handler)
+
+        # 记录器只挂队列处理器，控制台和文件由后台线程写入，记录日志时不进行磁盘和控制台 I/O
+        get_log_dispatcher().attach(self.logger, [self.console_handler, self.file_handler])
         
         # 记录初始化信息
         self.logger.info(f"Sherpa-ONNX 日志文件: {self.log_file}")
@@ -64,55 +68,81 @@ class SherpaLogger:
         """
         return self.log_file
 
-    def debug(self, message: str) -> None:
+    def isEnabledFor(self, level: int) -> bool:
+        """
+        是否会记录该级别的日志，热路径中用于在格式化消息之前跳过关闭的级别
+
+        Args:
+            level: 日志级别
+
+        Returns:
+            bool: 是否记录
+        """
+        return self.logger.isEnabledFor(level)
+
+    def flush(self) -> bool:
+        """
+        等待队列中的日志全部写入
+
+        Returns:
+            bool: 是否在超时前写完
+        """
+        return get_log_dispatcher().flush()
+
+    def debug(self, message: str, *args: Any) -> None:
         """
         记录调试日志
 
         Args:
-            message: 日志消息
+            message: 日志消息，有 args 时按 % 格式化（级别关闭时不格式化）
+            *args: 消息参数
         """
         if self.logger:
-            self.logger.debug(message)
+            self.logger.debug(message, *args)
 
-    def info(self, message: str) -> None:
+    def info(self, message: str, *args: Any) -> None:
         """
         记录信息日志
 
         Args:
-            message: 日志消息
+            message: 日志消息，有 args 时按 % 格式化（级别关闭时不格式化）
+            *args: 消息参数
         """
         if self.logger:
-            self.logger.info(message)
+            self.logger.info(message, *args)
 
-    def warning(self, message: str) -> None:
+    def warning(self, message: str, *args: Any) -> None:
         """
         记录警告日志
 
         Args:
-            message: 日志消息
+            message: 日志消息，有 args 时按 % 格式化（级别关闭时不格式化）
+            *args: 消息参数
         """
         if self.logger:
-            self.logger.warning(message)
+            self.logger.warning(message, *args)
 
-    def error(self, message: str) -> None:
+    def error(self, message: str, *args: Any) -> None:
         """
         记录错误日志
 
         Args:
-            message: 日志消息
+            message: 日志消息，有 args 时按 % 格式化（级别关闭时不格式化）
+            *args: 消息参数
         """
         if self.logger:
-            self.logger.error(message)
+            self.logger.error(message, *args)
 
-    def critical(self, message: str) -> None:
+    def critical(self, message: str, *args: Any) -> None:
         """
         记录严重错误日志
 
         Args:
-            message: 日志消息
+            message: 日志消息，有 args 时按 % 格式化（级别关闭时不格式化）
+            *args: 消息参数
         """
         if self.logger:
-            self.logger.critical(message)
+            self.logger.critical(message, *args)
 
 # 创建全局 Sherpa-ONNX 日志工具实例
 sherpa_logger = SherpaLogger()
@@ -0,0 +1,248 @@
+"""
+启动性能分析模块
+在子进程中用 python -X importtime 导入启动时用到的模块，统计导入耗时、最慢的模块和是否
+导入了重量级依赖（torch、transformers 等），并可测量主窗口显示出来所需的时间；
+结果可与基线比较，找出启动回退
+"""
+import os
+import re
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+# 启动时导入的模块
+DEFAULT_MODULES = [
+    "src.utils.config_manager",
+    "src.core.plugins",
+    "src.core.asr",
+    "src.core.audio.audio_processor",
+    "src.core.translation",
+    "src.ui.main_window",
+]
+
+# 启动时不应导入的重量级依赖（只在第一次翻译或加载对应模型时才导入）
+HEAVY_MODULES = ("torch", "transformers", "onnxruntime", "optimum", "argostranslate")
+
+# 允许的增加比例
+DEFAULT_THRESHOLD = 0.25
+
+# 低于这个增加量（毫秒）的差异视为测量噪声，不算回退
+MIN_REGRESSION_MS = 50.0
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+# 子进程中执行的代码：导入模块并输出耗时（秒）
+_IMPORT_CODE = (
+    "import time, importlib\n"
+    "begin = time.perf_counter()\n"
+    "importlib.import_module({module!r})\n"
+    "print('STARTUP_PROFILE', time.perf_counter() - begin)\n"
+)
+
+# 子进程中执行的代码：创建并显示主窗口（默认模型在后台加载，不计入），输出耗时（秒）
+_WINDOW_CODE = (
+    "import time\n"
+    "begin = time.perf_counter()\n"
+    "import sys\n"
+    "from PyQt5.QtWidgets import QApplication\n"
+    "app = QApplication(sys.argv)\n"
+    "from src.utils.config_manager import config_manager\n"
+    "config_manager.load_config()\n"
+    "from src.core.asr import ASRModelManager\n"
+    "from src.ui.main_window import MainWindow\n"
+    "window = MainWindow(model_manager=ASRModelManager(), config_manager=config_manager)\n"
+    "window.show()\n"
+    "app.processEvents()\n"
+    "print('STARTUP_PROFILE', time.perf_counter() - begin)\n"
+    "window.model_manager.cancel_model_load()\n"
+)
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """
+    解析 -X importtime 输出
+
+    Args:
+        output: 子进程的标准错误输出
+
+    Returns:
+        List[Dict[str, Any]]: 每个模块 {"module", "self_ms", "cumulative_ms", "depth"}，按导入完成的顺序
+    """
+    entries = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        entries.append({
+            "module": match.group(4),
+            "self_ms": int(match.group(1)) / 1000.0,
+            "cumulative_ms": int(match.group(2)) / 1000.0,
+            "depth": (len(match.group(3)) - 1) // 2,
+        })
+    return entries
+
+
+def heavy_imports(entries: List[Dict[str, Any]], heavy_modules=HEAVY_MODULES) -> List[str]:
+    """
+    找出导入了的重量级依赖
+
+    Args:
+        entries: parse_importtime() 的结果
+        heavy_modules: 重量级依赖的顶层包名
+
+    Returns:
+        List[str]: 导入了的重量级依赖（顶层包名，已排序）
+    """
+    return sorted({entry["module"].split(".")[0] for entry in entries
+                   if entry["module"].split(".")[0] in heavy_modules})
+
+
+def _run_profile_code(code: str, cwd: Optional[str], timeout: float,
+                      extra_args: Optional[List[str]] = None,
+                      env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    在子进程中执行代码，取出输出的耗时
+
+    Returns:
+        Dict[str, Any]: {"seconds", "stderr"}，失败时为 {"error"}
+    """
+    command = [sys.executable] + (extra_args or []) + ["-c", code]
+    try:
+        completed = subprocess.run(command, cwd=cwd, env=env, capture_output=True, text=True,
+                                   encoding="utf-8", errors="replace", timeout=timeout, check=False)
+    except subprocess.TimeoutExpired:
+        return {"error": f"超过 {timeout} 秒未完成"}
+    except OSError as e:
+        return {"error": str(e)}
+    for line in completed.stdout.splitlines():
+        if line.startswith("STARTUP_PROFILE "):
+            return {"seconds": float(line.split()[1]), "stderr": completed.stderr}
+    lines = completed.stderr.strip().splitlines()
+    return {"error": lines[-1] if lines else f"子进程退出码 {completed.returncode}"}
+
+
+def profile_import(module: str, cwd: Optional[str] = None, repeats: int = 3, top: int = 10,
+                   timeout: float = 120.0) -> Dict[str, Any]:
+    """
+    在新的子进程中导入模块，测量导入耗时
+
+    每次都在新进程中导入（没有已导入的模块），取 repeats 次中最快的一次，
+    第一次运行时编译字节码的时间不计入。
+
+    Args:
+        module: 模块名称
+        cwd: 子进程的工作目录（项目根目录）
+        repeats: 测量次数
+        top: 输出自身耗时最长的模块数
+        timeout: 每次的超时时间（秒）
+
+    Returns:
+        Dict[str, Any]: {"module", "total_ms", "modules", "heavy", "slowest": [{"module", "self_ms",
+            "cumulative_ms"}]}；导入失败时为 {"module", "error"}
+    """
+    best = None
+    for _ in range(max(1, repeats)):
+        run = _run_profile_code(_IMPORT_CODE.format(module=module), cwd, timeout, ["-X", "importtime"])
+        if "error" in run:
+            return {"module": module, "error": run["error"]}
+        if best is None or run["seconds"] < best["seconds"]:
+            best = run
+
+    entries = parse_importtime(best["stderr"])
+    slowest = sorted(entries, key=lambda entry: entry["self_ms"], reverse=True)[:top]
+    return {
+        "module": module,
+        "total_ms": round(best["seconds"] * 1000.0, 1),
+        "modules": len(entries),
+        "heavy": heavy_imports(entries),
+        "slowest": [{"module": entry["module"], "self_ms": entry["self_ms"],
+                     "cumulative_ms": entry["cumulative_ms"]} for entry in slowest],
+    }
+
+
+def profile_window(cwd: Optional[str] = None, timeout: float = 120.0) -> Dict[str, Any]:
+    """
+    在子进程中创建并显示主窗口，测量启动到窗口显示的时间（使用 offscreen 平台，不需要显示器）
+
+    Args:
+        cwd: 子进程的工作目录（项目根目录）
+        timeout: 超时时间（秒）
+
+    Returns:
+        Dict[str, Any]: {"window_ms"}，失败时为 {"error"}
+    """
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    run = _run_profile_code(_WINDOW_CODE, cwd, timeout, env=env)
+    if "error" in run:
+        return {"error": run["error"]}
+    return {"window_ms": round(run["seconds"] * 1000.0, 1)}
+
+
+def profile_startup(modules: Optional[List[str]] = None, cwd: Optional[str] = None, repeats: int = 3,
+                    top: int = 10, window: bool = False, timeout: float = 120.0) -> Dict[str, Any]:
+    """
+    测量各启动模块的导入耗时（以及主窗口显示时间）
+
+    Args:
+        modules: 模块列表，默认为 DEFAULT_MODULES
+        cwd: 子进程的工作目录（项目根目录）
+        repeats: 每个模块的测量次数
+        top: 每个模块输出自身耗时最长的模块数
+        window: 是否测量主窗口显示时间
+        timeout: 每次的超时时间（秒）
+
+    Returns:
+        Dict[str, Any]: {"imports": {模块名称: profile_import() 的结果}, "window": profile_window() 的结果}
+    """
+    results = {"imports": {}}
+    for module in modules or DEFAULT_MODULES:
+        results["imports"][module] = profile_import(module, cwd, repeats, top, timeout)
+    if window:
+        results["window"] = profile_window(cwd, timeout)
+    return results
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any],
+                        threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    与基线结果比较，找出超过阈值的回退
+
+    耗时超过基线的 (1 + threshold) 倍且增加量超过 MIN_REGRESSION_MS 时算回退；
+    基线中没有导入的重量级依赖被导入了，或基线中成功的模块导入失败，也算回退。
+
+    Args:
+        results: 本次结果（profile_startup() 的格式）
+        baseline: 基线结果，格式相同
+        threshold: 允许的增加比例
+
+    Returns:
+        List[Dict[str, Any]]: 回退列表 [{"module", "metric", "baseline", "current", "limit"}]
+    """
+    regressions = []
+
+    def check_time(name, metric, base_value, current_value):
+        if base_value is None or current_value is None:
+            return
+        limit = max(base_value * (1 + threshold), base_value + MIN_REGRESSION_MS)
+        if current_value > limit:
+            regressions.append({"module": name, "metric": metric, "baseline": base_value,
+                                "current": current_value, "limit": limit})
+
+    for module, base in (baseline.get("imports") or {}).items():
+        current = (results.get("imports") or {}).get(module)
+        if current is None:
+            continue
+        if current.get("error") and not base.get("error"):
+            regressions.append({"module": module, "metric": "error", "baseline": None,
+                                "current": current["error"], "limit": None})
+            continue
+        check_time(module, "total_ms", base.get("total_ms"), current.get("total_ms"))
+        if set(current.get("heavy") or []) - set(base.get("heavy") or []):
+            regressions.append({"module": module, "metric": "heavy", "baseline": base.get("heavy") or [],
+                                "current": current.get("heavy"), "limit": None})
+
+    base_window = baseline.get("window") or {}
+    current_window = results.get("window") or {}
+    check_time("window", "window_ms", base_window.get("window_ms"), current_window.get("window_ms"))
+    return regressions
@@ -3,6 +3,9 @@
 """
 import os
 import sys
+from collections import deque
+
+import numpy as np
 import pytest
 from pathlib import Path
 
@@ -88,4 +91,99 @@ def test_data_dir():
     """测试数据目录"""
     data_dir = Path(__file__).parent / "data"
     data_dir.mkdir(exist_ok=True)
-    return data_dir
\ No newline at end of file
+    return data_dir
+
+
+# 模拟 sherpa-onnx 流的帧长（样本数），每帧解码一次
+FAKE_FRAME_SAMPLES = 1600
+
+
+class FakeStream:
+    """模拟 sherpa-onnx 流：记录送入的音频，每 1600 个样本为一帧，全零的帧为静音"""
+
+    def __init__(self):
+        self.chunks = []
+        self.samples = 0
+        self.frames = deque()  # 待解码的帧，True 表示语音
+        self.decoded = 0  # 已解码的帧数
+        self.words = 0  # 上次 reset 以来解码出的词数
+        self.silent = False  # 最近解码的帧是否为静音
+        self.finished = False
+        self._tail = np.zeros(0, dtype=np.float32)
+
+    def accept_waveform(self, sample_rate, samples):
+        samples = np.asarray(samples)
+        self.chunks.append(samples)
+        self.samples += len(samples)
+        pending = np.concatenate([self._tail, samples])
+        complete = len(pending) - len(pending) % FAKE_FRAME_SAMPLES
+        for start in range(0, complete, FAKE_FRAME_SAMPLES):
+            self.frames.append(bool(np.any(pending[start:start + FAKE_FRAME_SAMPLES])))
+        self._tail = pending[complete:]
+
+    def input_finished(self):
+        self.finished = True
+
+
+class FakeRecognizer:
+    """模拟 sherpa-onnx OnlineRecognizer
+
+    每帧解码一次，语音帧解码出一个词，语音之后的静音帧为端点。给出 words 时按顺序输出这些词
+    （端点 reset 后从下一个词继续，所有流共用），否则每个流输出 w0 w1 ...
+    """
+
+    def __init__(self, num_threads=1, words=None):
+        self.num_threads = num_threads
+        self.words = words
+        self.offset = 0  # 已经在端点处输出的词数（words 给出时）
+        self.streams = []
+        self.decodes = 0
+        self.batch_sizes = []
+        self.result_calls = 0
+
+    def create_stream(self):
+        stream = FakeStream()
+        self.streams.append(stream)
+        return stream
+
+    def is_ready(self, stream):
+        return bool(stream.frames)
+
+    def decode_stream(self, stream):
+        speech = stream.frames.popleft()
+        stream.decoded += 1
+        stream.silent = not speech
+        stream.words += speech
+        self.decodes += 1
+
+    def decode_streams(self, streams):
+        self.batch_sizes.append(len(streams))
+        for stream in streams:
+            self.decode_stream(stream)
+
+    def result_words(self, stream):
+        """当前句子的词"""
+        if self.words is None:
+            return [f"w{i}" for i in range(stream.words)]
+        return self.words[self.offset:self.offset + stream.words]
+
+    def get_result(self, stream):
+        self.result_calls += 1
+        return " ".join(self.result_words(stream))
+
+    def is_endpoint(self, stream):
+        return stream.silent and stream.words > 0 and not stream.finished
+
+    def reset(self, stream):
+        if self.words is not None:
+            self.offset += stream.words
+        stream.words = 0
+
+
+@pytest.fixture
+def fake_recognizer(request):
+    """模拟的 OnlineRecognizer；unittest 测试类用 usefixtures 时设置为 self.recognizer"""
+    recognizer = FakeRecognizer()
+    if request.instance is not None:
+        request.instance.recognizer = recognizer
+    return recognizer
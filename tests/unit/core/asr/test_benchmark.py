@@ -0,0 +1,156 @@
+"""
+ASR 模型基准测试单元测试
+测试词错误率、测试集读取、流式识别测量和基线比较的功能
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.core.asr.benchmark import (compare_to_baseline, load_fixtures, measure_streaming, summarize,
+                                    word_error_rate)
+
+
+class ScriptedRecognizer:
+    """模拟 Vosk 识别器：第 3 块给出部分结果，第 5 块检测到端点"""
+
+    engine_type = "vosk_small"
+
+    def __init__(self):
+        self.blocks = 0
+        self.data_types = set()
+
+    def AcceptWaveform(self, data):
+        self.blocks += 1
+        self.data_types.add(type(data))
+        return self.blocks == 5
+
+    def PartialResult(self):
+        return json.dumps({"partial": "hello" if self.blocks >= 3 else ""})
+
+    def Result(self):
+        return json.dumps({"text": "hello world"})
+
+    def FinalResult(self):
+        return json.dumps({"text": "again"})
+
+
+class TestWordErrorRate(unittest.TestCase):
+    """word_error_rate函数的测试用例"""
+
+    def test_identical_ignores_case_and_punctuation(self):
+        """测试大小写和标点不影响结果"""
+        result = word_error_rate("After early nightfall.", "AFTER EARLY NIGHTFALL")
+        self.assertEqual(result["wer"], 0.0)
+        self.assertEqual(result["words"], 3)
+
+    def test_edit_operations(self):
+        """测试替换、删除和插入分别计数"""
+        cases = [
+            ("the yellow lamps", "the yellow lambs", (1, 0, 0)),
+            ("the yellow lamps", "the lamps", (0, 1, 0)),
+            ("the yellow lamps", "the yellow lamps would", (0, 0, 1)),
+        ]
+        for reference, hypothesis, expected in cases:
+            result = word_error_rate(reference, hypothesis)
+            self.assertEqual((result["substitutions"], result["deletions"], result["insertions"]), expected)
+            self.assertAlmostEqual(result["wer"], 1 / 3)
+
+    def test_empty_reference(self):
+        """测试参考文本为空"""
+        self.assertEqual(word_error_rate("", "")["wer"], 0.0)
+        self.assertEqual(word_error_rate("", "noise")["wer"], 1.0)
+
+
+class TestFixtures(unittest.TestCase):
+    """load_fixtures函数的测试用例"""
+
+    def setUp(self):
+        """创建临时测试集目录"""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """删除临时目录"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def touch(self, name, content=""):
+        """创建一个文件"""
+        with open(os.path.join(self.directory, name), "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_references(self):
+        """测试从 references.json 和同名 .txt 文件读取参考文本"""
+        self.touch("b.wav")
+        self.touch("a.wav")
+        self.touch("c.wav")
+        self.touch("a.txt", "text a\n")
+        self.touch("notes.md")
+        self.touch("references.json", json.dumps({"b.wav": "text b"}))
+        fixtures = load_fixtures(self.directory)
+        self.assertEqual([(f["name"], f["reference"]) for f in fixtures],
+                         [("a.wav", "text a"), ("b.wav", "text b"), ("c.wav", None)])
+
+    def test_missing_directory(self):
+        """测试目录不存在时抛出 FileNotFoundError"""
+        with self.assertRaises(FileNotFoundError):
+            load_fixtures(os.path.join(self.directory, "missing"))
+
+
+class TestMeasureStreaming(unittest.TestCase):
+    """measure_streaming和summarize函数的测试用例"""
+
+    def test_streaming(self):
+        """测试收集端点和最终结果，延迟按模拟的实时回放计算"""
+        recognizer = ScriptedRecognizer()
+        result = measure_streaming(recognizer, np.zeros(8000, dtype=np.float32), 16000, 1600)
+        self.assertEqual(recognizer.blocks, 5)
+        self.assertNotIn(np.ndarray, recognizer.data_types)  # Vosk 收到 16 位 PCM
+        self.assertEqual(result["text"], "hello world again")
+        self.assertEqual(result["audio_seconds"], 0.5)
+        # 第 3 块在 0.3 秒到达
+        self.assertGreaterEqual(result["first_partial_latency"], 0.3)
+        self.assertLess(result["first_partial_latency"], 0.4)
+        self.assertGreaterEqual(result["final_latency"], 0.0)
+        self.assertGreaterEqual(result["endpoint_lag"], 0.0)
+
+    def test_summarize(self):
+        """测试实时率按总时长、词错误率按总词数汇总，失败的文件不计入"""
+        summary = summarize([
+            {"audio_seconds": 1.0, "decode_seconds": 0.1, "errors": 1, "words": 10, "final_latency": 0.1},
+            {"audio_seconds": 3.0, "decode_seconds": 0.5, "errors": 0, "words": 30, "final_latency": 0.3},
+            {"error": "boom"},
+        ])
+        self.assertAlmostEqual(summary["rtf"], 0.15)
+        self.assertAlmostEqual(summary["wer"], 1 / 40)
+        self.assertAlmostEqual(summary["final_latency"], 0.2)
+        self.assertAlmostEqual(summary["final_latency_max"], 0.3)
+        self.assertNotIn("first_partial_latency", summary)
+
+
+class TestCompareToBaseline(unittest.TestCase):
+    """compare_to_baseline函数的测试用例"""
+
+    def test_regressions(self):
+        """测试相对阈值、词错误率的绝对阈值、噪声下限和失败的模型"""
+        baseline = {"models": {
+            "sherpa_0626_std": {"streaming": {"rtf": 0.1, "wer": 0.05, "final_latency": 0.01}, "peak_rss_mb": 500},
+            "vosk_small": {"streaming": {"rtf": 0.1}},
+        }}
+        results = {"models": {
+            "sherpa_0626_std": {"streaming": {"rtf": 0.2, "wer": 0.055, "final_latency": 0.03}, "peak_rss_mb": 505},
+            "vosk_small": {"error": "加载模型失败"},
+        }}
+        regressions = compare_to_baseline(results, baseline)
+        self.assertEqual(sorted((r["model"], r["metric"]) for r in regressions),
+                         [("sherpa_0626_std", "streaming.rtf"), ("vosk_small", "error")])
+
+        results["models"]["sherpa_0626_std"]["streaming"]["wer"] = 0.07
+        metrics = [r["metric"] for r in compare_to_baseline(results, baseline, {"streaming.wer": 0.01})]
+        self.assertEqual(metrics, ["streaming.wer", "error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -326,5 +326,233 @@ class TestASRModelManager(unittest.TestCase):
         self.assertEqual(result, {'vosk': True, 'sherpa': False})
         self.assertEqual(self.mock_config_manager.get_config.call_count, 2)
 
+
+class TestAsyncModelLoading(unittest.TestCase):
+    """ASRModelManager 后台模型加载的测试用例"""
+
+    @classmethod
+    def setUpClass(cls):
+        """后台线程发射的信号排队到主线程，需要事件循环来分发"""
+        from PyQt5.QtCore import QCoreApplication
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def wait_task(self, task):
+        """等待加载结束并分发排队的信号"""
+        self.assertTrue(task.wait(5))
+        task.thread.join(5)
+        self.app.processEvents()
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        self.config_patcher = patch('src.core.asr.model_manager.config_manager', MagicMock())
+        self.config_patcher.start()
+        self.warmup_patcher = patch('src.core.asr.warmup.get_warmup_seconds', return_value=0.0)
+        self.warmup_patcher.start()
+
+        self.manager = ASRModelManager()
+        self.manager.models_config = {'new_model': {'path': os.path.dirname(__file__), 'enabled': True}}
+        self.manager.validate_model_files = MagicMock(return_value=True)
+        self.old_engine = MagicMock()
+        self.manager.current_engine = self.old_engine
+
+        self.progress = []
+        self.finished = []
+        self.manager.model_load_progress.connect(lambda *args: self.progress.append(args))
+        self.manager.model_load_finished.connect(lambda *args: self.finished.append(args))
+
+    def tearDown(self):
+        """每个测试方法执行后的清理"""
+        self.warmup_patcher.stop()
+        self.config_patcher.stop()
+
+    def test_swaps_engine_when_ready(self):
+        """测试后台加载完成后才替换当前引擎，并按阶段报告进度"""
+        new_engine = MagicMock()
+        self.manager._create_engine = MagicMock(return_value=new_engine)
+
+        task = self.manager.load_model_async('new_model')
+        self.wait_task(task)
+        self.assertTrue(task.success)
+        self.assertIs(self.manager.current_engine, new_engine)
+        self.assertEqual(self.manager.model_type, 'new_model')
+        self.assertEqual([stage for _, stage, _ in self.progress],
+                         ['validate', 'create_session', 'warm_up', 'ready'])
+        self.assertEqual(self.finished, [('new_model', True, '')])
+
+    def test_cancel_keeps_previous_engine(self):
+        """测试取消加载时丢弃新引擎，继续使用原来的引擎"""
+        import threading
+        creating = threading.Event()
+        release = threading.Event()
+        new_engine = MagicMock()
+
+        def create_engine(*args):
+            creating.set()
+            release.wait(5)
+            return new_engine
+
+        self.manager._create_engine = create_engine
+        task = self.manager.load_model_async('new_model')
+        self.assertTrue(creating.wait(5))
+        # 加载期间原来的引擎继续工作
+        self.assertIs(self.manager.current_engine, self.old_engine)
+        self.assertTrue(self.manager.cancel_model_load())
+        release.set()
+
+        self.wait_task(task)
+        self.assertFalse(task.success)
+        self.assertIs(self.manager.current_engine, self.old_engine)
+        new_engine._release_recognizer.assert_called_once()
+        self.assertEqual(self.finished, [('new_model', False, '已取消')])
+
+    def test_is_loading(self):
+        """测试加载进行中 is_loading 返回 True，加载结束（发射 model_load_finished 前）返回 False"""
+        import threading
+        release = threading.Event()
+        loading = []
+        self.manager.model_load_finished.connect(lambda *args: loading.append(self.manager.is_loading()))
+
+        def create_engine(*args):
+            release.wait(5)
+            return MagicMock()
+
+        self.assertFalse(self.manager.is_loading())
+        self.manager._create_engine = create_engine
+        task = self.manager.load_model_async('new_model')
+        self.assertTrue(self.manager.is_loading())
+        release.set()
+
+        self.wait_task(task)
+        self.assertFalse(self.manager.is_loading())
+        self.assertEqual(loading, [False])
+
+    def test_failure_reports_error(self):
+        """测试创建引擎失败时报告原因并保留原来的引擎"""
+        self.manager._create_engine = MagicMock(return_value=None)
+        task = self.manager.load_model_async('new_model')
+        self.wait_task(task)
+        self.assertFalse(task.success)
+        self.assertIs(self.manager.current_engine, self.old_engine)
+        self.assertEqual(self.finished[0][:2], ('new_model', False))
+
+        task = self.manager.load_model_async('missing_model')
+        self.wait_task(task)
+        self.assertIn('missing_model', task.error)
+
+
+class FakeFileTranscriber:
+    """模拟文件转录器：同步发送脚本中的结果，可模拟被停止"""
+
+    stop = False
+
+    def __init__(self, signals):
+        self.signals = signals
+        self.is_transcribing = False
+        self.stopped = False
+
+    def start_transcription(self, file_path, recognizer):
+        from src.core.asr.transcript_segment import TranscriptSegment
+        self.signals.new_text.emit("Hello world.")
+        self.signals.new_segment.emit(TranscriptSegment("Hello world.", 0, 16000))
+        self.stopped = self.stop
+        return True
+
+    def stop_transcription(self):
+        return True
+
+
+class TestTranscribeFileCache(unittest.TestCase):
+    """ASRModelManager 文件转录结果缓存的测试用例"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        import tempfile
+        self.config_patcher = patch('src.core.asr.model_manager.config_manager', MagicMock())
+        self.config_patcher.start()
+        self.cache = MagicMock()
+        self.cache.get.return_value = None
+        self.cache_patcher = patch('src.core.asr.transcript_cache.get_transcript_cache', return_value=self.cache)
+        self.cache_patcher.start()
+        self.transcriber_patcher = patch('src.core.audio.file_transcriber.FileTranscriber', FakeFileTranscriber)
+        self.transcriber_patcher.start()
+        FakeFileTranscriber.stop = False
+
+        self.manager = ASRModelManager()
+        self.manager.model_type = 'vosk_small'
+        self.manager.current_engine = MagicMock()
+        # 上一个文件转录留下的分段，不属于本次转录
+        self.manager.current_engine.last_segments = [{"start": 5.0, "end": 6.0, "text": "stale"}]
+        self.manager.get_current_engine_type = MagicMock(return_value='vosk_small')
+        self.manager._get_transcript_cache_key = MagicMock(return_value=('vosk_small', '/model', {}))
+
+        handle, self.file_path = tempfile.mkstemp(suffix='.mp3')
+        os.close(handle)
+
+    def tearDown(self):
+        """每个测试方法执行后的清理"""
+        os.remove(self.file_path)
+        self.transcriber_patcher.stop()
+        self.cache_patcher.stop()
+        self.config_patcher.stop()
+
+    def test_caches_segments_of_this_run(self):
+        """测试非 WAV 文件经文件转录器转录时，缓存本次转录的分段而不是引擎留下的分段"""
+        result = self.manager.transcribe_file(self.file_path)
+
+        self.assertEqual(result, "Hello world.")
+        self.assertEqual([segment["text"] for segment in self.manager.last_segments], ["Hello world."])
+        self.assertEqual(self.manager.last_segments[0]["end"], 1.0)
+        self.cache.put.assert_called_once_with(self.file_path, 'vosk_small', '/model', {}, "Hello world.",
+                                               self.manager.last_segments)
+
+    def test_stopped_run_not_cached(self):
+        """测试转录被停止时不写入缓存"""
+        FakeFileTranscriber.stop = True
+        self.assertEqual(self.manager.transcribe_file(self.file_path), "Hello world.")
+        self.cache.put.assert_not_called()
+
+
+class TestWaitForWarmup(unittest.TestCase):
+    """ASRModelManager 等待模型预热的测试用例"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        self.config_patcher = patch('src.core.asr.model_manager.config_manager', MagicMock())
+        self.config_patcher.start()
+        self.manager = ASRModelManager()
+
+    def tearDown(self):
+        """每个测试方法执行后的清理"""
+        self.config_patcher.stop()
+
+    def test_no_warmup(self):
+        """测试没有预热时直接返回"""
+        self.assertTrue(self.manager.wait_for_warmup())
+
+    def test_waits_until_warmup_done(self):
+        """测试预热结束前等待超时返回 False，结束后返回 True"""
+        import threading
+        from src.core.asr.warmup import ModelWarmup
+        release = threading.Event()
+        self.manager.warmup = ModelWarmup('new_model', lambda seconds: release.wait(5), 0.1).start()
+
+        self.assertFalse(self.manager.wait_for_warmup(timeout=0.05))
+        release.set()
+        self.assertTrue(self.manager.wait_for_warmup(timeout=5))
+
+    def test_is_warming_up(self):
+        """测试预热进行中返回 True，结束后返回 False"""
+        import threading
+        from src.core.asr.warmup import ModelWarmup
+        self.assertFalse(self.manager.is_warming_up())
+        release = threading.Event()
+        self.manager.warmup = ModelWarmup('new_model', lambda seconds: release.wait(5), 0.1).start()
+
+        self.assertTrue(self.manager.is_warming_up())
+        release.set()
+        self.manager.wait_for_warmup(timeout=5)
+        self.assertFalse(self.manager.is_warming_up())
+
+
 if __name__ == '__main__':
     unittest.main()
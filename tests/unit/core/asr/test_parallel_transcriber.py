@@ -0,0 +1,154 @@
+"""
+并行文件转录单元测试
+测试静音切分和ParallelFileTranscriber类的功能
+"""
+import unittest
+
+import numpy as np
+
+from src.core.asr.parallel_transcriber import ParallelFileTranscriber, find_segments, decode_samples, decode_blocks
+from tests.conftest import FakeRecognizer
+
+SAMPLE_RATE = 16000
+
+
+class AmplitudeRecognizer(FakeRecognizer):
+    """模拟 OnlineRecognizer：把每段非零音频的幅值（乘以100取整）作为一个词，不检测端点"""
+
+    def is_endpoint(self, stream):
+        return False
+
+    def get_result(self, stream):
+        samples = np.concatenate(stream.chunks)
+        values = np.round(np.abs(samples[samples != 0]) * 100).astype(int)
+        words = [int(v) for i, v in enumerate(values) if i == 0 or v != values[i - 1]]
+        return " ".join(f"w{v}" for v in words)
+
+    def reset(self, stream):
+        pass
+
+
+class EndpointRecognizer(AmplitudeRecognizer):
+    """模拟 OnlineRecognizer：每块都解码，送入静音块后检测到端点"""
+
+    def is_ready(self, stream):
+        return len(stream.chunks) > getattr(stream, "ready_at", 0)
+
+    def decode_stream(self, stream):
+        stream.ready_at = len(stream.chunks)
+
+    def is_endpoint(self, stream):
+        return bool(stream.chunks) and not stream.chunks[-1].any()
+
+    def get_result(self, stream):
+        return super().get_result(stream) if stream.chunks else ""
+
+    def reset(self, stream):
+        stream.chunks = []
+        stream.ready_at = 0
+
+
+def fake_factory(**kwargs):
+    """可以被 pickle 的识别器工厂"""
+    return AmplitudeRecognizer()
+
+
+def make_audio(word_values, word_seconds=8.0, pause_seconds=1.0):
+    """生成由若干“词”（固定幅值的音频）和停顿组成的音频"""
+    parts = []
+    for value in word_values:
+        parts.append(np.full(int(word_seconds * SAMPLE_RATE), value / 100.0, dtype=np.float32))
+        parts.append(np.zeros(int(pause_seconds * SAMPLE_RATE), dtype=np.float32))
+    return np.concatenate(parts)
+
+
+class TestFindSegments(unittest.TestCase):
+    """find_segments函数的测试用例"""
+
+    def test_short_audio_is_one_segment(self):
+        """测试不超过最大时长的音频不切分"""
+        audio = make_audio([10, 20])
+        self.assertEqual(find_segments(audio, SAMPLE_RATE), [(0, len(audio))])
+        self.assertEqual(find_segments(np.zeros(0, dtype=np.float32)), [])
+
+    def test_cuts_inside_pauses(self):
+        """测试切点落在停顿中，片段连续覆盖整段音频且不超过最大时长"""
+        audio = make_audio(range(10, 30))
+        segments = find_segments(audio, SAMPLE_RATE, target_seconds=20.0, max_seconds=30.0)
+        self.assertGreater(len(segments), 1)
+        self.assertEqual(segments[0][0], 0)
+        self.assertEqual(segments[-1][1], len(audio))
+        for (_, end), (start, _) in zip(segments, segments[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(audio[end], 0.0)
+        for start, end in segments:
+            self.assertLessEqual(end - start, 30 * SAMPLE_RATE)
+
+    def test_invalid_arguments(self):
+        """测试参数无效时抛出异常"""
+        with self.assertRaises(ValueError):
+            find_segments(np.zeros(10, dtype=np.float32), target_seconds=90.0, max_seconds=60.0)
+
+
+class TestParallelFileTranscriber(unittest.TestCase):
+    """ParallelFileTranscriber类的测试用例"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        self.values = list(range(10, 40))
+        self.audio = make_audio(self.values)
+        self.expected = " ".join(f"w{v}" for v in self.values)
+
+    def test_process_pool_keeps_order(self):
+        """测试进程池并行识别后按原始顺序拼接并保留时间偏移"""
+        transcriber = ParallelFileTranscriber({}, workers=2, target_segment_seconds=20.0,
+                                              max_segment_seconds=30.0, factory=fake_factory)
+        result = transcriber.transcribe(self.audio)
+        self.assertEqual(result["text"], self.expected)
+        self.assertEqual(result["workers"], 2)
+        self.assertEqual(result["segments"][0]["start"], 0.0)
+        self.assertAlmostEqual(result["segments"][-1]["end"], len(self.audio) / SAMPLE_RATE)
+        self.assertAlmostEqual(result["audio_seconds"], len(self.audio) / SAMPLE_RATE)
+        self.assertGreater(result["audio_hours_per_wall_hour"], 0.0)
+
+    def test_single_worker_uses_given_recognizer(self):
+        """测试单进程模式使用传入的识别器"""
+        transcriber = ParallelFileTranscriber({}, workers=1, target_segment_seconds=20.0,
+                                              max_segment_seconds=30.0, factory=None)
+        result = transcriber.transcribe(self.audio, recognizer=AmplitudeRecognizer())
+        self.assertEqual(result["text"], self.expected)
+        self.assertEqual(result["workers"], 1)
+
+    def test_transcribe_blocks_streaming(self):
+        """测试按块输入时边读边切分，结果与整段输入相同"""
+        transcriber = ParallelFileTranscriber({}, workers=2, target_segment_seconds=20.0,
+                                              max_segment_seconds=30.0, factory=fake_factory)
+        blocks = (self.audio[i:i + SAMPLE_RATE] for i in range(0, len(self.audio), SAMPLE_RATE))
+        result = transcriber.transcribe_blocks(blocks)
+        self.assertEqual(result["text"], self.expected)
+        self.assertEqual(result["segments"], transcriber.transcribe(self.audio)["segments"])
+
+    def test_short_audio_stays_in_process(self):
+        """测试不足两个片段时不创建进程池"""
+        transcriber = ParallelFileTranscriber({}, workers=4, factory=fake_factory)
+        result = transcriber.transcribe_blocks([make_audio([10, 20])])
+        self.assertEqual(result["text"], "w10 w20")
+        self.assertEqual(result["workers"], 1)
+
+    def test_decode_samples(self):
+        """测试用新流解码一段完整音频"""
+        self.assertEqual(decode_samples(AmplitudeRecognizer(), make_audio([5, 6])), "w5 w6")
+
+    def test_decode_blocks_segments(self):
+        """测试解码时记录每个句子的时间范围"""
+        recognizer = EndpointRecognizer()
+        blocks = [np.full(SAMPLE_RATE, 0.05, dtype=np.float32), np.zeros(SAMPLE_RATE, dtype=np.float32),
+                  np.full(SAMPLE_RATE, 0.07, dtype=np.float32)]
+        segments = []
+        self.assertEqual(decode_blocks(recognizer, blocks, SAMPLE_RATE, segments), "w5 w7")
+        self.assertEqual([(s["start"], s["end"], s["text"]) for s in segments],
+                         [(0.0, 2.0, "w5"), (2.0, 3.0, "w7")])
+
+
+if __name__ == '__main__':
+    unittest.main()
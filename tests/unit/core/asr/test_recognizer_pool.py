@@ -0,0 +1,167 @@
+"""
+识别器池单元测试
+测试RecognizerPool类的共享、引用计数和LRU淘汰功能
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from src.core.asr.recognizer_pool import RecognizerPool, make_pool_key
+
+
+class FakeRecognizer:
+    """模拟 OnlineRecognizer，记录创建参数"""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+class TestRecognizerPool(unittest.TestCase):
+    """RecognizerPool类的测试用例"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置：创建两组各 3MB 的模型文件"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.created = []
+        self.models = {}
+        for name in ("a", "b"):
+            files = {}
+            for part in ("encoder", "decoder", "joiner", "tokens"):
+                path = os.path.join(self.temp_dir, f"{name}-{part}.onnx")
+                with open(path, "wb") as f:
+                    f.write(b"\0" * (1024 * 1024 if part != "tokens" else 10))
+                files[part] = path
+            self.models[name] = files
+
+    def tearDown(self):
+        """每个测试方法执行后的清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def factory(self, **kwargs):
+        """记录创建次数的识别器工厂"""
+        recognizer = FakeRecognizer(**kwargs)
+        self.created.append(recognizer)
+        return recognizer
+
+    def test_shares_recognizer_for_same_key(self):
+        """测试相同模型文件和参数共享同一个识别器"""
+        pool = RecognizerPool(memory_budget_mb=100, factory=self.factory)
+        first = pool.acquire(**self.models["a"], num_threads=2)
+        second = pool.acquire(**self.models["a"], num_threads=2)
+        self.assertIs(first, second)
+        self.assertEqual(len(self.created), 1)
+
+        other = pool.acquire(**self.models["a"], num_threads=4)
+        self.assertIsNot(first, other)
+        self.assertEqual(len(self.created), 2)
+
+        stats = pool.get_stats()
+        self.assertEqual(stats["recognizers"], 2)
+        self.assertAlmostEqual(stats["loaded_mb"], 6.0)
+
+    def test_idle_recognizer_is_reused(self):
+        """测试引用计数归零后识别器仍保留，再次获取时不重新加载"""
+        pool = RecognizerPool(memory_budget_mb=100, factory=self.factory)
+        recognizer = pool.acquire(**self.models["a"])
+        self.assertTrue(pool.release(recognizer))
+        self.assertIs(pool.acquire(**self.models["a"]), recognizer)
+        self.assertEqual(len(self.created), 1)
+        self.assertFalse(pool.release(FakeRecognizer()))
+
+    def test_lru_eviction_under_budget(self):
+        """测试超出内存预算时淘汰空闲识别器，正在使用的识别器不被淘汰"""
+        pool = RecognizerPool(memory_budget_mb=4, factory=self.factory)
+        first = pool.acquire(**self.models["a"])
+        second = pool.acquire(**self.models["b"])
+        # 两个都在使用中，暂时超出预算
+        self.assertEqual(pool.get_stats()["recognizers"], 2)
+
+        pool.release(first)
+        self.assertEqual(pool.get_stats()["recognizers"], 1)
+        self.assertEqual(pool.evictions, 1)
+        self.assertIsNot(pool.acquire(**self.models["a"]), first)
+        self.assertIs(pool.acquire(**self.models["b"]), second)
+
+    def test_failed_build_is_not_cached(self):
+        """测试创建失败时异常抛出且不留下条目"""
+        def failing_factory(**kwargs):
+            raise RuntimeError("load failed")
+
+        pool = RecognizerPool(factory=failing_factory)
+        with self.assertRaises(RuntimeError):
+            pool.acquire(**self.models["a"])
+        self.assertEqual(pool.get_stats()["recognizers"], 0)
+        pool.factory = self.factory
+        self.assertIsNotNone(pool.acquire(**self.models["a"]))
+
+    def test_failed_build_raises_to_waiters(self):
+        """测试创建失败时等待中的调用方收到同一个异常，全部离开后才移除条目"""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def failing_factory(**kwargs):
+            calls.append(kwargs)
+            started.set()
+            release.wait(5)
+            raise RuntimeError("load failed")
+
+        pool = RecognizerPool(factory=failing_factory)
+        errors = []
+
+        def acquire():
+            try:
+                pool.acquire(**self.models["a"])
+            except RuntimeError as e:
+                errors.append(e)
+
+        first = threading.Thread(target=acquire)
+        first.start()
+        self.assertTrue(started.wait(5))
+        waiter = threading.Thread(target=acquire)
+        waiter.start()
+        # 等待第二个调用方登记引用计数并开始等待
+        while pool._entries[make_pool_key(**self.models["a"])].refcount < 2:
+            time.sleep(0.001)
+        release.set()
+        first.join(5)
+        waiter.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(errors), 2)
+        self.assertIs(errors[0], errors[1])
+        self.assertEqual(len(pool._entries), 0)
+        pool.factory = self.factory
+        self.assertIsNotNone(pool.acquire(**self.models["a"]))
+
+    def test_concurrent_acquire_builds_once(self):
+        """测试并发获取同一个识别器时只创建一次"""
+        def slow_factory(**kwargs):
+            time.sleep(0.05)
+            return self.factory(**kwargs)
+
+        pool = RecognizerPool(factory=slow_factory)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(pool.acquire(**self.models["a"])))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.created), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_make_pool_key(self):
+        """测试键使用规范化的绝对路径并包含识别器参数"""
+        files = self.models["a"]
+        relative = {part: os.path.relpath(path) for part, path in files.items()}
+        self.assertEqual(make_pool_key(**files), make_pool_key(**relative))
+        self.assertNotEqual(make_pool_key(**files, rule1_min_trailing_silence=2.4),
+                            make_pool_key(**files, rule1_min_trailing_silence=3.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
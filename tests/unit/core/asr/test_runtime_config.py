@@ -0,0 +1,91 @@
+"""
+模型运行时配置单元测试
+测试validate_runtime_config、resolve_runtime和tune_num_threads函数的功能
+"""
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from src.core.asr.runtime_config import (default_thread_counts, resolve_runtime, tune_num_threads,
+                                         validate_runtime_config)
+from tests.conftest import FakeRecognizer
+
+
+class TestRuntimeConfig(unittest.TestCase):
+    """运行时配置校验的测试用例"""
+
+    def test_valid(self):
+        """测试有效配置原样保留"""
+        runtime, problems = validate_runtime_config({"num_threads": 2, "provider": "CUDA", "device": 1})
+        self.assertEqual(runtime, {"num_threads": 2, "provider": "cuda", "device": 1})
+        self.assertEqual(problems, [])
+
+    def test_invalid_values_use_defaults(self):
+        """测试无效的值使用默认值并给出说明"""
+        runtime, problems = validate_runtime_config({"num_threads": 0, "provider": "tpu", "device": -1})
+        self.assertEqual(runtime, {"num_threads": 4, "provider": "cpu"})
+        self.assertEqual(len(problems), 3)
+
+    def test_unsupported_options_ignored(self):
+        """测试 sherpa-onnx 无法传入的会话选项和未知选项被忽略，调优记录不算问题"""
+        runtime, problems = validate_runtime_config({
+            "num_threads": 2, "allow_spinning": False, "graph_optimization_level": 99, "foo": 1,
+            "tuned": {"rtf": 0.1}
+        })
+        self.assertEqual(runtime, {"num_threads": 2, "provider": "cpu"})
+        self.assertEqual(len(problems), 3)
+
+    def test_resolve_legacy_num_threads(self):
+        """测试 runtime 中没有线程数时使用旧配置中的 num_threads，runtime 优先"""
+        self.assertEqual(resolve_runtime({"num_threads": 1})["num_threads"], 1)
+        self.assertEqual(resolve_runtime({"num_threads": 1, "runtime": {"num_threads": 3}})["num_threads"], 3)
+        self.assertEqual(resolve_runtime({"num_threads": 1, "runtime": {"provider": "cuda"}}),
+                         {"num_threads": 1, "provider": "cuda"})
+        self.assertEqual(resolve_runtime(None), {"num_threads": 4, "provider": "cpu"})
+
+
+class TestTuneNumThreads(unittest.TestCase):
+    """线程数自动调优的测试用例"""
+
+    def test_default_thread_counts(self):
+        """测试默认尝试的线程数"""
+        self.assertEqual(default_thread_counts(1), [1])
+        self.assertEqual(default_thread_counts(6), [1, 2, 4, 6])
+        self.assertEqual(default_thread_counts(8), [1, 2, 4, 8])
+
+    def test_picks_fewest_threads_within_tolerance(self):
+        """测试在最快结果的容差范围内选择线程数最少的一个"""
+        built = []
+
+        def build(num_threads):
+            recognizer = FakeRecognizer(num_threads)
+            built.append(recognizer)
+            return recognizer
+
+        audio = np.zeros(16000, dtype=np.float32)
+        rtfs = {1: 0.4, 2: 0.21, 4: 0.2}
+        with patch("src.core.asr.runtime_config.measure_decode_rtf",
+                   side_effect=lambda recognizer, *args: rtfs[recognizer.num_threads]):
+            result = tune_num_threads(build, audio, [1, 2, 4], repeats=2, tolerance=0.1, warmup_seconds=0.5)
+        self.assertEqual(result["best"], 2)
+        self.assertEqual([item["num_threads"] for item in result["results"]], [1, 2, 4])
+        self.assertEqual(result["results"][0]["runs"], [0.4, 0.4])
+        # 每个识别器都先预热
+        self.assertTrue(all(recognizer.decodes >= 5 for recognizer in built))
+
+    def test_measures_real_decode(self):
+        """测试实际解码一遍音频并返回实时率"""
+        result = tune_num_threads(FakeRecognizer, np.zeros(8000, dtype=np.float32), [1], repeats=1,
+                                  warmup_seconds=0)
+        self.assertEqual(result["best"], 1)
+        self.assertGreater(result["results"][0]["rtf"], 0.0)
+
+    def test_empty_audio(self):
+        """测试音频为空时抛出 ValueError"""
+        with self.assertRaises(ValueError):
+            tune_num_threads(FakeRecognizer, np.zeros(0, dtype=np.float32), [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Sherpa-ONNX ASR 引擎单元测试
+测试 SherpaOnnxASR 类的流式识别接口（端点驱动的完整结果和部分结果增量）
+"""
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+from src.core.asr.sherpa_engine import SherpaOnnxASR
+from tests.conftest import FakeRecognizer
+
+
+class TimestampedFakeRecognizer(FakeRecognizer):
+    """模拟提供 token 时间戳的 OnlineRecognizer：每个词一个 token，间隔 0.1 秒"""
+
+    def get_result_all(self, stream):
+        tokens = ["▁" + word for word in self.result_words(stream)]
+        return SimpleNamespace(tokens=tokens, timestamps=[0.1 * index for index in range(len(tokens))])
+
+
+class TestSherpaOnnxASRStreaming(unittest.TestCase):
+    """SherpaOnnxASR 流式识别接口的测试用例"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        self.asr = SherpaOnnxASR("test_model_dir", {"type": "int8"})
+        self.fake = FakeRecognizer(words=["hello", "world", "good", "morning"])
+        self.asr.recognizer = self.fake
+        self.speech = np.full(1600, 0.1, dtype=np.float32)
+        self.silence = np.zeros(1600, dtype=np.float32)
+
+    def test_final_only_on_endpoint(self):
+        """测试只有端点处才产生完整结果，且每个块只取一次结果"""
+        self.assertFalse(self.asr.AcceptWaveform(self.speech))
+        self.assertFalse(self.asr.AcceptWaveform(self.speech))
+        self.assertEqual(self.asr.PartialResult(), "hello world")
+        self.assertEqual(self.fake.result_calls, 2)
+
+        self.assertTrue(self.asr.AcceptWaveform(self.silence))
+        self.assertEqual(self.asr.Result(), "hello world.")
+        self.assertEqual(self.asr.Result(), "")
+        self.assertEqual(self.asr.PartialResult(), "")
+        self.assertEqual(self.fake.result_calls, 3)
+
+        # 端点后复用同一个流
+        self.assertFalse(self.asr.AcceptWaveform(self.speech))
+        self.assertEqual(self.asr.PartialResult(), "good")
+        self.assertEqual(len(self.fake.streams), 1)
+
+    def test_silence_without_text_is_not_final(self):
+        """测试没有文本时不产生完整结果"""
+        self.assertFalse(self.asr.AcceptWaveform(self.silence))
+        self.assertEqual(self.asr.Result(), "")
+
+    def test_partial_delta(self):
+        """测试部分结果增量"""
+        self.asr.AcceptWaveform(self.speech)
+        self.assertEqual(self.asr.PartialDelta(), {"text": "hello", "delta": "hello", "replaced": False})
+        self.assertEqual(self.asr.PartialDelta()["delta"], "")
+        self.asr.AcceptWaveform(self.speech)
+        self.assertEqual(self.asr.PartialDelta()["delta"], " world")
+
+        # 假设被改写时返回完整文本
+        self.asr._partial_text = "hello word"
+        self.assertEqual(self.asr.PartialDelta(), {"text": "hello word", "delta": "hello word", "replaced": True})
+
+    def test_final_result_flushes_current_sentence(self):
+        """测试 FinalResult 取出未到端点的句子并重新开始"""
+        self.asr.AcceptWaveform(self.speech)
+        self.assertEqual(self.asr.FinalResult(), "hello.")
+        self.assertIsNone(self.asr.current_stream)
+        self.assertEqual(self.asr.PartialResult(), "")
+
+    def test_result_timing(self):
+        """测试端点处记录句子和每个词的位置（以引擎接收的样本数计），下一句从端点开始"""
+        self.asr.recognizer = TimestampedFakeRecognizer(words=["hello", "world", "good"])
+        self.asr.AcceptWaveform(self.speech)
+        self.asr.AcceptWaveform(self.speech)
+        self.assertTrue(self.asr.AcceptWaveform(self.silence))
+        self.asr.Result()
+        timing = self.asr.LastResultTiming()
+        self.assertEqual([(word.text, word.start_sample) for word in timing["words"]], [("hello", 0), ("world", 1600)])
+        self.assertEqual((timing["start_sample"], timing["end_sample"]), (0, 4800))
+
+        self.asr.AcceptWaveform(self.speech)
+        self.asr.FinalResult()
+        timing = self.asr.LastResultTiming()
+        self.assertEqual(timing["start_sample"], 4800)
+        self.assertEqual(self.asr.accepted_samples, 6400)
+
+    def test_bytes_input(self):
+        """测试16位PCM字节输入"""
+        pcm = (self.speech * 32767).astype(np.int16).tobytes()
+        self.assertFalse(self.asr.AcceptWaveform(pcm))
+        self.assertEqual(self.asr.PartialResult(), "hello")
+
+
+class FakePCMReader:
+    """模拟 FFmpegPCMReader：输出两块语音和一块静音，记录打开次数"""
+
+    opened = 0
+
+    def __init__(self, file_path, **kwargs):
+        self.cache_hit = True
+        self.seconds_read = 0.3
+
+    def open(self):
+        FakePCMReader.opened += 1
+        return self
+
+    def __iter__(self):
+        speech = np.full(1600, 0.1, dtype=np.float32)
+        return iter([speech, speech, np.zeros(1600, dtype=np.float32)])
+
+    def close(self):
+        pass
+
+
+class TestSherpaOnnxASRTranscribeFile(unittest.TestCase):
+    """SherpaOnnxASR 文件转录的测试用例"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        self.asr = SherpaOnnxASR("test_model_dir", {"type": "int8"})
+        self.asr.recognizer = FakeRecognizer(words=["hello", "world"])
+        FakePCMReader.opened = 0
+
+    def test_parallel_failure_falls_back_to_serial(self):
+        """测试并行转录失败时重新解码文件并串行转录"""
+        with patch("src.core.audio.ffmpeg_reader.FFmpegPCMReader", FakePCMReader), \
+                patch("src.core.audio.pcm_cache.get_decoded_audio_cache", return_value=None), \
+                patch.object(SherpaOnnxASR, "_get_parallel_config", return_value={"enabled": True}), \
+                patch.object(SherpaOnnxASR, "_transcribe_parallel", side_effect=RuntimeError("进程池已损坏")):
+            result = self.asr.transcribe_file("in.mp4")
+        self.assertEqual(result, "hello world")
+        self.assertEqual(FakePCMReader.opened, 2)
+        self.assertEqual([segment["text"] for segment in self.asr.last_segments], ["hello world"])
+
+
+if __name__ == '__main__':
+    unittest.main()
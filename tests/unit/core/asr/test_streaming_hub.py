@@ -0,0 +1,104 @@
+"""
+流式识别中心单元测试
+测试StreamingDecoderHub类的功能
+"""
+import time
+import unittest
+
+import numpy as np
+import pytest
+
+from src.core.asr.streaming_hub import StreamingDecoderHub
+
+
+@pytest.mark.usefixtures("fake_recognizer")
+class TestStreamingDecoderHub(unittest.TestCase):
+    """StreamingDecoderHub类的测试用例"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        self.hub = StreamingDecoderHub(self.recognizer, max_batch=2)
+        self.results = []
+        self.speech = np.full(1600, 0.1, dtype=np.float32)
+        self.silence = np.zeros(1600, dtype=np.float32)
+
+    def open(self, name, **kwargs):
+        """打开一个记录结果的会话"""
+        return self.hub.open_session(
+            name, on_result=lambda sid, text, final: self.results.append((sid, text, final)), **kwargs
+        )
+
+    def drain(self):
+        """执行调度直到没有可解码的流"""
+        while self.hub.tick():
+            pass
+
+    def test_batches_ready_streams(self):
+        """测试多个会话的就绪流合并为一次批量解码"""
+        first, second = self.open("a"), self.open("b")
+        self.hub.accept_waveform(first, self.speech)
+        self.hub.accept_waveform(second, self.speech)
+        self.assertEqual(self.hub.tick(), 2)
+        self.assertEqual(self.recognizer.batch_sizes, [2])
+        self.assertIn((first, "w0", False), self.results)
+        self.assertIn((second, "w0", False), self.results)
+
+    def test_final_on_endpoint(self):
+        """测试端点处发送完整结果并重置流"""
+        session = self.open("a")
+        for block in (self.speech, self.speech, self.silence):
+            self.hub.accept_waveform(session, block)
+            self.drain()
+        self.assertEqual(self.results[-1], (session, "w0 w1", True))
+        self.assertEqual(self.hub.get_stats()["session_stats"][session]["finals"], 1)
+
+    def test_earliest_deadline_first(self):
+        """测试批次已满时积压最久（截止时间最早）的会话优先"""
+        sessions = [self.open(name) for name in "abc"]
+        for session in reversed(sessions):
+            self.hub.accept_waveform(session, self.speech)
+            time.sleep(0.002)
+        self.hub.tick()
+        served = {sid for sid, _, _ in self.results}
+        self.assertEqual(served, {sessions[2], sessions[1]})
+        self.hub.tick()
+        self.assertIn(sessions[0], {sid for sid, _, _ in self.results})
+
+    def test_close_session_flushes(self):
+        """测试关闭会话时发送剩余结果并移除会话"""
+        session = self.open("a")
+        self.hub.accept_waveform(session, self.speech)
+        self.drain()
+        self.assertTrue(self.hub.close_session(session))
+        self.assertFalse(self.hub.accept_waveform(session, self.speech))
+        self.drain()
+        self.assertEqual(self.results[-1], (session, "w0", True))
+        self.assertEqual(self.hub.session_count, 0)
+
+    def test_latency_slo(self):
+        """测试延迟统计和违约计数"""
+        session = self.open("a", latency_slo_ms=1)
+        self.hub.accept_waveform(session, self.speech)
+        time.sleep(0.005)
+        self.hub.tick()
+        stats = self.hub.get_stats()["session_stats"][session]
+        self.assertEqual(stats["latency"]["count"], 1)
+        self.assertEqual(stats["slo_violations"], 1)
+
+    def test_background_thread(self):
+        """测试后台线程驱动解码"""
+        session = self.open("a")
+        self.hub.start()
+        try:
+            self.hub.accept_waveform(session, self.speech)
+            self.hub.close_session(session)
+            deadline = time.time() + 2.0
+            while self.hub.session_count and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            self.hub.stop()
+        self.assertEqual(self.results[-1], (session, "w0", True))
+
+
+if __name__ == '__main__':
+    unittest.main()
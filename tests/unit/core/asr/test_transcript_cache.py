@@ -0,0 +1,100 @@
+"""
+转录结果缓存单元测试
+测试model_checksum函数和TranscriptCache类的功能
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.core.asr.transcript_cache import TranscriptCache, model_checksum
+
+SEGMENTS = [{"start": 0.0, "end": 1.5, "text": "hello"}, {"start": 1.5, "end": 3.0, "text": "world"}]
+
+
+class TestTranscriptCache(unittest.TestCase):
+    """TranscriptCache类的测试用例"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = TranscriptCache(os.path.join(self.temp_dir, "db", "transcripts.sqlite3"))
+        self.media = self.make_file("a.mp4", b"media")
+        self.model = os.path.join(self.temp_dir, "model")
+        os.makedirs(self.model)
+        self.make_file("model/encoder.onnx", b"encoder")
+        self.make_file("model/tokens.txt", b"a b c")
+
+    def tearDown(self):
+        """每个测试方法执行后的清理"""
+        self.cache.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_file(self, name, content):
+        """创建一个文件"""
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_store_and_get(self):
+        """测试保存后能取回文本和分段时间戳，并统计命中率"""
+        self.assertIsNone(self.cache.get(self.media, "sherpa_0626_std", self.model, {"beam": 4}))
+        self.assertTrue(self.cache.put(self.media, "sherpa_0626_std", self.model, {"beam": 4},
+                                       "hello world", SEGMENTS))
+        cached = self.cache.get(self.media, "sherpa_0626_std", self.model, {"beam": 4})
+        self.assertEqual(cached["text"], "hello world")
+        self.assertEqual(cached["segments"], SEGMENTS)
+
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["entries"], stats["hits"], stats["misses"]), (1, 1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_persistent(self):
+        """测试重新打开数据库后结果仍然存在"""
+        self.cache.put(self.media, "vosk_small", self.model, {}, "text")
+        self.cache.close()
+        self.cache = TranscriptCache(self.cache.db_path)
+        self.assertEqual(self.cache.get(self.media, "vosk_small", self.model)["text"], "text")
+
+    def test_key_components(self):
+        """测试模型 ID 或解码参数不同时不命中"""
+        self.cache.put(self.media, "sherpa_0626_std", self.model, {"beam": 4, "rule": 1.5}, "text")
+        self.assertIsNotNone(self.cache.get(self.media, "sherpa_0626_std", self.model, {"rule": 1.5, "beam": 4}))
+        self.assertIsNone(self.cache.get(self.media, "sherpa_0626_int8", self.model, {"beam": 4, "rule": 1.5}))
+        self.assertIsNone(self.cache.get(self.media, "sherpa_0626_std", self.model, {"beam": 8, "rule": 1.5}))
+
+    def test_model_change_invalidates(self):
+        """测试模型文件变化后不再命中，写入新结果时删除旧条目"""
+        checksum = model_checksum(self.model)
+        self.cache.put(self.media, "vosk_small", self.model, {}, "old")
+        self.make_file("model/encoder.onnx", b"retrained encoder")
+        self.assertNotEqual(model_checksum(self.model), checksum)
+        self.assertIsNone(self.cache.get(self.media, "vosk_small", self.model))
+
+        self.cache.put(self.media, "vosk_small", self.model, {}, "new")
+        self.assertEqual(self.cache.get_stats()["entries"], 1)
+        self.assertEqual(self.cache.get_stats()["invalidations"], 1)
+        self.assertEqual(self.cache.get(self.media, "vosk_small", self.model)["text"], "new")
+
+    def test_explicit_invalidation(self):
+        """测试按模型和按文件删除条目"""
+        other = self.make_file("b.mp4", b"other media")
+        self.cache.put(self.media, "vosk_small", self.model, {}, "a")
+        self.cache.put(other, "vosk_small", self.model, {}, "b")
+        self.cache.put(self.media, "sherpa_0626_std", self.model, {}, "c")
+
+        self.assertEqual(self.cache.invalidate_model("vosk_small", self.model), 0)
+        self.assertEqual(self.cache.invalidate_file(other), 1)
+        self.assertEqual(self.cache.invalidate_model("vosk_small"), 1)
+        self.assertEqual(self.cache.get_stats()["entries"], 1)
+
+    def test_missing_file(self):
+        """测试文件不存在时不命中也不写入"""
+        missing = os.path.join(self.temp_dir, "missing.mp4")
+        self.assertIsNone(self.cache.get(missing, "vosk_small", self.model))
+        self.assertFalse(self.cache.put(missing, "vosk_small", self.model, {}, "text"))
+
+
+if __name__ == '__main__':
+    unittest.main()
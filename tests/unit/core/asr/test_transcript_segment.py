@@ -0,0 +1,136 @@
+"""
+转录分段单元测试
+测试词/token 时间的解析、送入识别器的音频与音频流位置的换算，以及 SRT 字幕的生成
+"""
+import json
+import os
+import tempfile
+import unittest
+
+from src.core.asr.transcript_segment import (
+    SampleMap, TranscriptSegment, WordTiming, format_srt_time, parse_result_timing, segments_to_srt,
+    words_from_tokens, words_from_vosk_result, write_srt
+)
+
+
+class TestWordTimings(unittest.TestCase):
+    """词时间解析的测试用例"""
+
+    def test_vosk_words(self):
+        """测试 Vosk 结果中的词时间换算为样本位置"""
+        result = {"text": "hello world", "result": [
+            {"word": "hello", "start": 0.5, "end": 0.8, "conf": 1.0},
+            {"word": "world", "start": 0.9, "end": 1.25, "conf": 1.0},
+        ]}
+        words = words_from_vosk_result(result, 16000)
+        self.assertEqual(words, [WordTiming("hello", 8000, 12800), WordTiming("world", 14400, 20000)])
+        self.assertEqual(words_from_vosk_result({"text": ""}), [])
+
+    def test_tokens_merged_into_words(self):
+        """测试 BPE token 按词首标记合并为词，最后一个词的时长按估计值截断到端点"""
+        words = words_from_tokens(["▁HE", "LLO", "▁WORLD"], [0.0, 0.1, 0.4], 1600, 16000, 16000)
+        self.assertEqual([word.text for word in words], ["HELLO", "WORLD"])
+        self.assertEqual((words[0].start_sample, words[0].end_sample), (1600, 8000))
+        self.assertEqual((words[1].start_sample, words[1].end_sample), (8000, 14400))
+
+        words = words_from_tokens(["▁HI"], [0.0], 0, 3200, 16000)
+        self.assertEqual(words[0].end_sample, 3200)
+
+    def test_cjk_tokens(self):
+        """测试中文每个字是一个词"""
+        words = words_from_tokens(["你", "好", "▁OK"], [0.0, 0.2, 0.4], 0, 16000, 16000)
+        self.assertEqual([word.text for word in words], ["你", "好", "OK"])
+        self.assertEqual(words[0].end_sample, 3200)
+
+    def test_parse_result_timing(self):
+        """测试从 Vosk JSON 和 LastResultTiming() 取得时间信息"""
+        result = json.dumps({"text": "hi", "result": [{"word": "hi", "start": 0.1, "end": 0.2}]})
+        timing = parse_result_timing(None, result, 16000)
+        self.assertEqual((timing["start_sample"], timing["end_sample"]), (1600, 3200))
+
+        class Recognizer:
+            def LastResultTiming(self):
+                return {"start_sample": 10, "end_sample": 20, "words": []}
+
+        self.assertEqual(parse_result_timing(Recognizer(), "Hi.", 16000)["end_sample"], 20)
+        self.assertIsNone(parse_result_timing(object(), "Hi.", 16000))
+        self.assertIsNone(parse_result_timing(None, json.dumps({"text": "hi"}), 16000))
+
+
+class TestSampleMap(unittest.TestCase):
+    """送入识别器的音频与音频流位置换算的测试用例"""
+
+    def test_gaps_between_pieces(self):
+        """测试跳过的静音不计入识别器时间，句子边界分别落在前后两段"""
+        sample_map = SampleMap()
+        self.assertIsNone(sample_map.to_stream(0))
+        sample_map.add(1000, 500)
+        sample_map.add(1500, 500)  # 连续，合并为一段
+        sample_map.add(5000, 1000)
+        self.assertEqual(sample_map.fed, 2000)
+
+        self.assertEqual(sample_map.to_stream(0), 1000)
+        self.assertEqual(sample_map.to_stream(700), 1700)
+        self.assertEqual(sample_map.to_stream(1000), 5000)
+        self.assertEqual(sample_map.to_stream_end(1000), 2000)
+        self.assertEqual(sample_map.to_stream_end(2000), 6000)
+        self.assertEqual(sample_map.to_stream_end(9999), 6000)
+
+    def test_old_pieces_dropped(self):
+        """测试只保留最近的片段"""
+        sample_map = SampleMap(max_pieces=4)
+        for index in range(10):
+            sample_map.add(index * 100, 10)
+        self.assertLessEqual(len(sample_map._lengths), 4)
+        self.assertEqual(sample_map.to_stream(95), 900 + 5)
+
+
+class TestSrt(unittest.TestCase):
+    """SRT 字幕生成的测试用例"""
+
+    def test_format_srt_time(self):
+        """测试 SRT 时间格式"""
+        self.assertEqual(format_srt_time(0), "00:00:00,000")
+        self.assertEqual(format_srt_time(3723.4567), "01:02:03,457")
+
+    def test_segments_to_srt(self):
+        """测试字幕时间取自分段的音频位置，空文本跳过"""
+        segments = [
+            TranscriptSegment("Hello world.", 8000, 20000),
+            TranscriptSegment("", 20000, 24000),
+            TranscriptSegment("Good morning.", 40000, 56000),
+        ]
+        self.assertEqual(
+            segments_to_srt(segments),
+            "1\n00:00:00,500 --> 00:00:01,250\nHello world.\n\n"
+            "2\n00:00:02,500 --> 00:00:03,500\nGood morning.\n"
+        )
+
+        fd, path = tempfile.mkstemp(suffix=".srt")
+        os.close(fd)
+        try:
+            self.assertTrue(write_srt(path, segments))
+            with open(path, encoding="utf-8") as f:
+                self.assertTrue(f.read().startswith("1\n00:00:00,500"))
+        finally:
+            os.remove(path)
+
+    def test_dict_round_trip(self):
+        """测试与文件转录分段格式的相互转换"""
+        segment = TranscriptSegment("hi", 1600, 3200, words=[WordTiming("hi", 1600, 3200)])
+        data = segment.to_dict()
+        self.assertEqual(data["start"], 0.1)
+        self.assertEqual(data["words"], [{"text": "hi", "start": 0.1, "end": 0.2}])
+        self.assertEqual(TranscriptSegment.from_dict(data), segment)
+
+    def test_latency(self):
+        """测试端到端延迟"""
+        segment = TranscriptSegment("hi", 0, 1600)
+        self.assertIsNone(segment.latency)
+        segment.captured_at = 100.0
+        segment.emitted_at = 100.25
+        self.assertAlmostEqual(segment.latency, 0.25)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+模型预热单元测试
+测试warm_up_online_recognizer函数和ModelWarmup类的功能
+"""
+import threading
+import unittest
+
+import numpy as np
+
+from src.core.asr.warmup import ModelWarmup, get_warmup_stats, synthetic_audio, warm_up_online_recognizer
+from tests.conftest import FakeRecognizer
+
+
+class TestWarmUp(unittest.TestCase):
+    """预热函数的测试用例"""
+
+    def test_synthetic_audio(self):
+        """测试合成音频长度正确、幅度很低且每次相同"""
+        audio = synthetic_audio(0.5)
+        self.assertEqual(len(audio), 8000)
+        self.assertEqual(audio.dtype, np.float32)
+        self.assertLess(np.abs(audio).max(), 0.1)
+        np.testing.assert_array_equal(audio, synthetic_audio(0.5))
+
+    def test_online_recognizer_uses_throwaway_stream(self):
+        """测试用一个新流送入全部合成音频并解码"""
+        recognizer = FakeRecognizer()
+        duration = warm_up_online_recognizer(recognizer, seconds=1.0)
+        self.assertGreaterEqual(duration, 0.0)
+        self.assertEqual(len(recognizer.streams), 1)
+        stream = recognizer.streams[0]
+        self.assertEqual(stream.samples, 16000)
+        self.assertEqual(stream.decoded, 10)
+        self.assertTrue(stream.finished)
+
+
+class TestModelWarmup(unittest.TestCase):
+    """ModelWarmup类的测试用例"""
+
+    def test_runs_in_background_and_calls_back(self):
+        """测试在后台线程中预热，完成后调用回调并记录耗时"""
+        release = threading.Event()
+        threads = []
+
+        def warm_up(seconds):
+            threads.append((threading.current_thread(), seconds))
+            release.wait(5)
+
+        done = []
+        warmup = ModelWarmup("test_model", warm_up, 0.5)
+        warmup.add_done_callback(done.append)
+        warmup.start()
+        self.assertFalse(warmup.wait(0.05))
+        self.assertEqual(done, [])
+
+        release.set()
+        self.assertTrue(warmup.wait(5))
+        warmup._thread.join(5)
+        self.assertEqual(done, [warmup])
+        self.assertIsNot(threads[0][0], threading.current_thread())
+        self.assertEqual(threads[0][1], 0.5)
+        self.assertGreaterEqual(warmup.duration, 0.0)
+
+        stats = get_warmup_stats()["test_model"]
+        self.assertTrue(stats["success"])
+        self.assertEqual(stats["audio_seconds"], 0.5)
+
+        # 预热结束后添加的回调立即调用
+        warmup.add_done_callback(done.append)
+        self.assertEqual(len(done), 2)
+
+    def test_failure_still_completes(self):
+        """测试预热失败时仍然结束并调用回调"""
+        def warm_up(seconds):
+            raise RuntimeError("boom")
+
+        done = []
+        warmup = ModelWarmup("failing_model", warm_up)
+        warmup.add_done_callback(done.append)
+        warmup.start()
+        self.assertTrue(warmup.wait(5))
+        warmup._thread.join(5)
+        self.assertEqual(done, [warmup])
+        self.assertIsInstance(warmup.error, RuntimeError)
+        self.assertFalse(get_warmup_stats()["failing_model"]["success"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,11 +2,16 @@
 音频处理器单元测试
 测试AudioProcessor类的功能
 """
+import json
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 import numpy as np
 
-from src.core.audio.audio_processor import AudioProcessor, AudioDevice
+from src.core.audio.vad import VADResult
+from src.core.audio.backpressure import LEVEL_NORMAL, LEVEL_FALLBACK_MODEL
+from src.core.audio.audio_processor import AudioProcessor, AudioDevice, AudioWorker
+from src.core.audio.ring_buffer import AudioRingBuffer
 from src.core.signals import TranscriptionSignals
 
 class TestAudioDevice(unittest.TestCase):
@@ -148,5 +153,357 @@ class TestAudioProcessor(unittest.TestCase):
         self.processor.capture_thread.join.assert_called_once()
         self.assertIsNone(self.processor.capture_thread)
 
+    def test_stop_capture_does_not_wait_for_worker(self):
+        """测试停止捕获时不在调用线程中等待工作线程，线程处理完剩余音频退出后发射 capture_stopped"""
+        recognizer = MagicMock()
+        recognizer.engine_type = "vosk"
+        stopped = []
+        self.processor.capture_stopped.connect(lambda: stopped.append(True))
+        self.processor.is_capturing = True
+        self.processor.worker = MagicMock(recognizer=recognizer, spool_path=None)
+        thread = self.processor.worker_thread = MagicMock()
+        thread.isRunning.return_value = True
+
+        self.assertTrue(self.processor.stop_capture())
+
+        self.assertFalse(self.processor.worker.running)
+        thread.quit.assert_called_once()
+        thread.wait.assert_not_called()
+        recognizer.FinalResult.assert_not_called()
+        self.signals.new_text.emit.assert_not_called()
+        self.assertFalse(self.processor.is_capturing)
+        self.assertEqual(len(self.processor._stopping), 1)
+        self.assertEqual(stopped, [])
+
+        self.processor._on_worker_thread_finished(thread)
+        self.assertEqual(self.processor._stopping, [])
+        self.assertEqual(stopped, [True])
+
+class ScriptedRecognizer:
+    """模拟识别器：记录送入的音频，在指定的块给出完整结果"""
+
+    engine_type = "sherpa_0626_std"
+
+    def __init__(self, name, endpoint_blocks=()):
+        self.name = name
+        self.endpoint_blocks = set(endpoint_blocks)
+        self.blocks = []
+
+    def AcceptWaveform(self, data):
+        self.blocks.append(np.array(data))
+        return len(self.blocks) in self.endpoint_blocks
+
+    def Result(self):
+        return f"{self.name} {len(self.blocks)}"
+
+    def FinalResult(self):
+        return f"{self.name} final"
+
+    def PartialResult(self):
+        return f"{self.name} partial"
+
+
+class TimedScriptedRecognizer(ScriptedRecognizer):
+    """模拟提供时间信息的识别器：完整结果结束于指定的样本位置（以识别器接收的音频计）"""
+
+    def __init__(self, name, endpoint_blocks=(), end_sample=0):
+        super().__init__(name, endpoint_blocks)
+        self.end_sample = end_sample
+
+    def LastResultTiming(self):
+        return {"start_sample": 0, "end_sample": self.end_sample, "words": []}
+
+
+class TestAudioWorkerHotSwap(unittest.TestCase):
+    """AudioWorker热切换识别器的测试用例"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        self.old = ScriptedRecognizer("old", endpoint_blocks=[2])
+        self.new = ScriptedRecognizer("new")
+        self.worker = AudioWorker(AudioDevice("test_id", "Test Device"), 16000, 1600, self.old,
+                                  vad_config={"enabled": False})
+        self.texts = []
+        self.worker.new_text.connect(self.texts.append)
+        self.logger = MagicMock()
+
+    def wait_ready(self):
+        """等待后台线程创建好新识别器"""
+        deadline = time.time() + 5
+        while self.worker._pending_swap is None and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertIsNotNone(self.worker._pending_swap)
+
+    def block(self, value):
+        """一个块的音频"""
+        return np.full(1600, value, dtype=np.float32)
+
+    def test_swap_at_endpoint_replays_tail(self):
+        """测试在句子结束处切换，只把端点所在块中完整结果之后的音频重放给新识别器"""
+        self.old = TimedScriptedRecognizer("old", endpoint_blocks=[2], end_sample=2600)
+        self.worker.recognizer = self.worker._primary_recognizer = self.old
+        self.worker._process_block(self.block(0.1), self.logger)
+        self.assertTrue(self.worker.request_recognizer_swap(lambda: self.new, "new"))
+        self.wait_ready()
+
+        # 句子进行中等待，端点处切换
+        self.worker._process_block(self.block(0.2), self.logger)
+        self.assertIs(self.worker.recognizer, self.new)
+        self.assertEqual(len(self.old.blocks), 2)
+        np.testing.assert_array_equal(self.new.blocks[0], self.block(0.2)[1000:])
+        self.assertIn("Old 2.", self.texts)
+
+        self.worker._process_block(self.block(0.3), self.logger)
+        self.assertEqual(len(self.old.blocks), 2)
+        self.assertEqual(len(self.new.blocks), 2)
+        self.assertEqual(self.worker.swap_stats["swaps"], 1)
+        self.assertAlmostEqual(self.worker.swap_stats["replayed_seconds"], 600 / 16000)
+        self.assertIs(self.worker._primary_recognizer, self.new)
+
+    def test_swap_at_endpoint_without_timing(self):
+        """测试识别器不提供时间信息时，切换后不重放端点所在的块（避免重复识别这一句）"""
+        self.worker._process_block(self.block(0.1), self.logger)
+        self.worker.request_recognizer_swap(lambda: self.new, "new")
+        self.wait_ready()
+
+        self.worker._process_block(self.block(0.2), self.logger)
+        self.assertIs(self.worker.recognizer, self.new)
+        self.assertEqual(self.new.blocks, [])
+        self.assertEqual(self.worker.swap_stats["replayed_seconds"], 0.0)
+
+    def test_superseded_request_is_dropped(self):
+        """测试新的切换请求使之前就绪的识别器失效"""
+        self.worker.request_recognizer_swap(lambda: self.new, "new")
+        self.wait_ready()
+        self.worker.request_recognizer_swap(lambda: None, "newer")
+        self.assertIsNone(self.worker._pending_swap)
+        self.worker._complete_swap(None, self.logger)
+        self.assertIs(self.worker.recognizer, self.old)
+
+    def test_forced_swap_after_max_wait(self):
+        """测试句子一直没有结束时，超过等待时间后取出旧识别器的结果并强制切换"""
+        self.old.endpoint_blocks = set()
+        self.worker.hot_swap_max_wait = 0.0
+        self.worker._process_block(self.block(0.1), self.logger)
+        self.worker.request_recognizer_swap(lambda: self.new, "new")
+        self.wait_ready()
+        time.sleep(0.01)
+
+        self.worker._process_block(self.block(0.2), self.logger)
+        self.assertIs(self.worker.recognizer, self.new)
+        self.assertIn("Old final.", self.texts)
+        self.assertEqual(len(self.old.blocks), 1)
+        self.assertEqual(len(self.new.blocks), 1)
+        self.assertEqual(self.worker.swap_stats["forced"], 1)
+
+    def test_failed_build_keeps_recognizer(self):
+        """测试创建新识别器失败时继续使用当前识别器"""
+        self.worker.request_recognizer_swap(lambda: None, "new")
+        deadline = time.time() + 5
+        while not self.worker.swap_stats["failures"] and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.worker.swap_stats["failures"], 1)
+        self.worker._process_block(self.block(0.1), self.logger)
+        self.assertIs(self.worker.recognizer, self.old)
+        self.assertIsNone(self.worker._pending_swap)
+
+
+class TestAudioWorkerBackpressure(unittest.TestCase):
+    """AudioWorker背压积压计算的测试用例"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        self.worker = AudioWorker(AudioDevice("test_id", "Test Device"), 16000, 16000,
+                                  ScriptedRecognizer("old"), vad_config={"enabled": False},
+                                  backpressure_config={"enabled": True})
+        self.logger = MagicMock()
+
+    def test_large_block_without_backlog(self):
+        """测试1秒的块没有积压时不降级（即将识别的块不算积压）"""
+        for _ in range(5):
+            self.worker._update_backpressure(self.worker._backlog_seconds(16000, 16000), self.logger)
+        self.assertEqual(self.worker._shed_level, LEVEL_NORMAL)
+        self.assertEqual(self.worker.backpressure.level, LEVEL_NORMAL)
+
+    def test_backlog_excludes_current_block(self):
+        """测试积压只计算即将识别的块之外的音频"""
+        self.assertEqual(self.worker._backlog_seconds(16000, 16000), 0.0)
+        self.assertEqual(self.worker._backlog_seconds(24000, 16000), 0.5)
+        self.assertEqual(self.worker._backlog_seconds(8000, 16000), 0.0)
+        self.worker._update_backpressure(self.worker._backlog_seconds(48000, 16000), self.logger)
+        self.assertEqual(self.worker._shed_level, LEVEL_FALLBACK_MODEL)
+
+
+class TestAudioWorkerSpool(unittest.TestCase):
+    """AudioWorker写入录音缓存的测试用例"""
+
+    def test_spool_uses_capture_time(self):
+        """测试录音缓存使用样本时钟记录的捕获时间（换算为墙上时间），而不是写入时的时间"""
+        worker = AudioWorker(AudioDevice("test_id", "Test Device"), 16000, 1600, ScriptedRecognizer("old"),
+                             vad_config={"enabled": False})
+        worker.spool = MagicMock()
+        data = np.zeros(1600, dtype=np.float32)
+
+        worker._write_spool(data, MagicMock(), time.monotonic() - 2.0)
+        timestamp = worker.spool.write.call_args[0][1]
+        self.assertAlmostEqual(timestamp, time.time() - 2.0, delta=0.1)
+
+        worker._write_spool(data, MagicMock())
+        self.assertIsNone(worker.spool.write.call_args[0][1])
+
+
+class TestAudioWorkerTail(unittest.TestCase):
+    """AudioWorker停止时处理剩余音频的测试用例"""
+
+    def test_tail_shorter_than_block(self):
+        """测试不足一个块的剩余音频在停止时送入识别器"""
+        recognizer = ScriptedRecognizer("old")
+        worker = AudioWorker(AudioDevice("test_id", "Test Device"), 16000, 1600, recognizer,
+                             vad_config={"enabled": False})
+        worker.ring_buffer = AudioRingBuffer(16000)
+        worker.ring_buffer.write(np.full(1000, 0.1, dtype=np.float32))
+
+        worker._process_tail(MagicMock())
+
+        self.assertEqual(sum(len(block) for block in recognizer.blocks), 1000)
+        self.assertEqual(worker.ring_buffer.available(), 0)
+
+
+class ScriptedVAD:
+    """模拟语音活动检测器：按顺序给出每次处理的结果"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.position = 0
+
+    def process(self, data):
+        speech_ended, keep = self.results.pop(0)
+        start = self.position
+        self.position += len(data)
+        speech = data if keep else np.zeros(0, dtype=np.float32)
+        spans = [(start, self.position)] if keep else []
+        return VADResult(speech=speech, spans=spans, is_speech=keep and not speech_ended,
+                         speech_ended=speech_ended)
+
+
+class TestAudioWorkerUtteranceEnd(unittest.TestCase):
+    """AudioWorker在VAD检测到语音结束时结束句子的测试用例"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        self.recognizer = ScriptedRecognizer("old")
+        self.worker = AudioWorker(AudioDevice("test_id", "Test Device"), 16000, 1600, self.recognizer,
+                                  vad_config={"enabled": False})
+        self.texts = []
+        self.worker.new_text.connect(self.texts.append)
+        self.logger = MagicMock()
+
+    def block(self, value=0.1):
+        """一个块的音频"""
+        return np.full(1600, value, dtype=np.float32)
+
+    def test_final_on_speech_end(self):
+        """测试语音结束（拖尾送入识别器）时立即取出最终结果，不等待静音计数"""
+        self.worker.vad = ScriptedVAD([(False, True), (True, True), (False, False)])
+        for _ in range(3):
+            self.worker._process_block(self.block(), self.logger)
+
+        self.assertEqual(self.texts, ["PARTIAL:Old partial", "PARTIAL:Old partial", "Old final."])
+        self.assertFalse(self.worker.sentence_in_progress)
+        self.assertEqual(self.worker._last_partial_result, "")
+
+    def test_final_on_speech_end_in_silent_block(self):
+        """测试语音在没有输出音频的块中结束时也取出最终结果"""
+        self.worker.vad = ScriptedVAD([(False, True), (True, False), (False, False)])
+        for _ in range(3):
+            self.worker._process_block(self.block(), self.logger)
+
+        self.assertEqual(self.texts, ["PARTIAL:Old partial", "Old final."])
+        self.assertEqual(len(self.recognizer.blocks), 1)
+
+    def test_no_final_without_speech_end(self):
+        """测试语音没有结束时不取出最终结果"""
+        self.worker.vad = ScriptedVAD([(False, True), (False, True)])
+        for _ in range(2):
+            self.worker._process_block(self.block(), self.logger)
+
+        self.assertNotIn("Old final.", self.texts)
+        self.assertTrue(self.worker.sentence_in_progress)
+
+
+class VoskScriptedRecognizer(ScriptedRecognizer):
+    """模拟 Vosk 识别器：完整结果是带词时间（以识别器接收的音频计）的 JSON"""
+
+    engine_type = "vosk_small"
+
+    def __init__(self, endpoint_blocks, words):
+        super().__init__("vosk", endpoint_blocks)
+        self.words = words
+
+    def Result(self):
+        return json.dumps({"text": " ".join(word["word"] for word in self.words), "result": self.words})
+
+
+class TestAudioWorkerSegments(unittest.TestCase):
+    """AudioWorker带时间戳完整结果的测试用例"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        self.segments = []
+        self.logger = MagicMock()
+
+    def make_worker(self, recognizer):
+        """创建关闭 VAD 的工作线程"""
+        worker = AudioWorker(AudioDevice("test_id", "Test Device"), 16000, 1600, recognizer,
+                             vad_config={"enabled": False})
+        worker.new_segment.connect(self.segments.append)
+        return worker
+
+    def block(self, value=0.1):
+        """一个块的音频"""
+        return np.full(1600, value, dtype=np.float32)
+
+    def test_vosk_word_times(self):
+        """测试按 Vosk 词时间计算句子和每个词的位置，并记录端到端延迟"""
+        recognizer = VoskScriptedRecognizer([3], [
+            {"word": "hello", "start": 0.15, "end": 0.2},
+            {"word": "world", "start": 0.2, "end": 0.25},
+        ])
+        worker = self.make_worker(recognizer)
+        worker._capture_started_at = time.time() - 0.3
+        for _ in range(3):
+            worker._process_block(self.block(), self.logger)
+
+        self.assertEqual(len(self.segments), 1)
+        segment = self.segments[0]
+        self.assertEqual(segment.text, "Hello world.")
+        self.assertEqual((segment.start_sample, segment.end_sample), (2400, 4000))
+        self.assertEqual([(word.text, word.start_sample) for word in segment.words], [("hello", 2400), ("world", 3200)])
+        self.assertIsNotNone(segment.latency)
+        self.assertEqual(worker.stage_stats["end_to_end"].count, 1)
+
+    def test_fallback_to_fed_audio(self):
+        """测试识别器不提供时间戳时，句子取上一句结束以来送入识别器的音频"""
+        worker = self.make_worker(ScriptedRecognizer("old", endpoint_blocks=[2, 4]))
+        for _ in range(4):
+            worker._process_block(self.block(), self.logger)
+
+        self.assertEqual([(segment.start_sample, segment.end_sample) for segment in self.segments],
+                         [(0, 3200), (3200, 6400)])
+        self.assertIsNone(self.segments[0].latency)
+
+    def test_swapped_recognizer_clock(self):
+        """测试热切换后新识别器的时间以重放的音频开头为零点"""
+        old = TimedScriptedRecognizer("old", endpoint_blocks=[2], end_sample=2400)
+        new = VoskScriptedRecognizer([2], [{"word": "new", "start": 0.05, "end": 0.15}])
+        worker = self.make_worker(old)
+        worker._process_block(self.block(), self.logger)
+        worker._pending_swap = (new, "new", None, time.time())
+        worker._process_block(self.block(), self.logger)  # 端点：切换并重放完整结果之后的 800 个样本
+        worker._process_block(self.block(), self.logger)
+
+        self.assertIs(worker.recognizer, new)
+        self.assertEqual((self.segments[-1].start_sample, self.segments[-1].end_sample), (2400 + 800, 2400 + 2400))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,152 @@
+"""
+音频源单元测试
+测试合成音频源和文件音频源的功能
+"""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import wave
+
+import numpy as np
+
+from src.core.audio.audio_source import (
+    FileAudioSource, SyntheticAudioSource, SoundcardSource, open_audio_source, read_source_audio
+)
+from src.core.audio.pcm_spool import PCMSpoolWriter
+
+
+def read_all(recorder, block=100):
+    """读取录音会话直到结束"""
+    blocks = []
+    while True:
+        data = recorder.record(block)
+        if len(data) == 0:
+            return np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.float32)
+        blocks.append(data)
+
+
+class TestSyntheticAudioSource(unittest.TestCase):
+    """SyntheticAudioSource类的测试用例"""
+
+    def test_segments(self):
+        """测试按顺序生成正弦音、静音和噪声"""
+        source = SyntheticAudioSource([
+            {"type": "tone", "frequency": 250, "amplitude": 0.5, "seconds": 0.25},
+            {"type": "silence", "seconds": 0.5},
+            {"type": "noise", "amplitude": 0.1, "seconds": 0.25},
+        ], speed=None)
+        self.assertEqual(source.duration, 1.0)
+        self.assertFalse(source.realtime)
+
+        with source.recorder(1000) as recorder:
+            audio = read_all(recorder, block=300)
+        self.assertEqual(len(audio), 1000)
+        self.assertEqual(audio.dtype, np.float32)
+        self.assertAlmostEqual(float(np.max(audio[:250])), 0.5, places=3)
+        np.testing.assert_array_equal(audio[250:750], 0.0)
+        self.assertGreater(float(np.std(audio[750:])), 0.05)
+
+    def test_loop(self):
+        """测试循环生成"""
+        source = SyntheticAudioSource([{"type": "silence", "seconds": 0.1}], speed=None, loop=True)
+        with source.recorder(1000) as recorder:
+            self.assertEqual(len(recorder.record(450)), 450)
+
+    def test_unknown_segment_type(self):
+        """测试未知的音频段类型"""
+        source = SyntheticAudioSource([{"type": "chirp", "seconds": 0.1}], speed=None)
+        with source.recorder(1000) as recorder:
+            with self.assertRaises(ValueError):
+                recorder.record(10)
+
+    def test_speed_limit(self):
+        """测试按倍速限速"""
+        source = SyntheticAudioSource([{"type": "silence", "seconds": 1.0}], speed=10)
+        self.assertTrue(source.realtime)
+        start = time.perf_counter()
+        with source.recorder(1000) as recorder:
+            read_all(recorder, block=100)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.09)
+
+
+class TestFileAudioSource(unittest.TestCase):
+    """FileAudioSource类的测试用例"""
+
+    def setUp(self):
+        """创建临时目录"""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """删除临时目录"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def write_wav(self, samples, rate, channels=1):
+        """写入 16 位 WAV 文件"""
+        path = os.path.join(self.directory, "test.wav")
+        with wave.open(path, "wb") as f:
+            f.setnchannels(channels)
+            f.setsampwidth(2)
+            f.setframerate(rate)
+            f.writeframes((samples * 32767).astype("<i2").tobytes())
+        return path
+
+    def test_missing_file(self):
+        """测试文件不存在"""
+        with self.assertRaises(FileNotFoundError):
+            FileAudioSource(os.path.join(self.directory, "missing.wav"))
+
+    def test_stereo_wav(self):
+        """测试立体声 WAV 文件转换为单声道"""
+        stereo = np.tile(np.array([[0.5, 0.25]], dtype=np.float32), (800, 1))
+        path = self.write_wav(stereo.reshape(-1), 1000, channels=2)
+        with FileAudioSource(path, speed=None).recorder(1000) as recorder:
+            audio = read_all(recorder, block=300)
+        self.assertEqual(len(audio), 800)
+        np.testing.assert_allclose(audio, 0.375, atol=1e-4)
+
+    def test_resample(self):
+        """测试文件采样率与请求的采样率不同时重采样"""
+        path = self.write_wav(np.full(800, 0.5, dtype=np.float32), 8000)
+        with FileAudioSource(path, speed=None).recorder(16000) as recorder:
+            audio = read_all(recorder, block=256)
+        self.assertGreater(len(audio), 1500)
+        np.testing.assert_allclose(audio[200:1400], 0.5, atol=1e-2)
+
+    def test_spool_file(self):
+        """测试回放录音缓存"""
+        path = os.path.join(self.directory, "session.pcm")
+        audio = np.linspace(-0.5, 0.5, 1000, dtype=np.float32)
+        with PCMSpoolWriter(path, 1000) as writer:
+            writer.write(audio)
+        with FileAudioSource(path, speed=None).recorder(1000) as recorder:
+            np.testing.assert_array_equal(read_all(recorder, block=300), audio)
+
+    def test_read_source_audio(self):
+        """测试一次读出文件的全部音频"""
+        path = self.write_wav(np.full(2500, 0.5, dtype=np.float32), 1000)
+        audio = read_source_audio(FileAudioSource(path, speed=None), 1000, block_size=1000)
+        self.assertEqual(len(audio), 2500)
+        self.assertEqual(audio.dtype, np.float32)
+
+
+class TestOpenAudioSource(unittest.TestCase):
+    """open_audio_source函数的测试用例"""
+
+    def test_passthrough_and_wrap(self):
+        """测试音频源直接返回，设备包装为声卡音频源"""
+        source = SyntheticAudioSource()
+        self.assertIs(open_audio_source(source), source)
+
+        class Device:
+            id = 3
+            name = "Speakers"
+
+        wrapped = open_audio_source(Device())
+        self.assertIsInstance(wrapped, SoundcardSource)
+        self.assertEqual((wrapped.id, wrapped.name), ("3", "Speakers"))
+
+
+if __name__ == "__main__":
+    unittest.main()
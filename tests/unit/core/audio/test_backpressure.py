@@ -0,0 +1,83 @@
+"""
+背压降级控制单元测试
+测试BackpressureController类和备用模型查找的功能
+"""
+import unittest
+
+from src.core.audio.backpressure import (
+    BackpressureController, resolve_fallback_model, LEVEL_NORMAL, LEVEL_DROP_SILENCE,
+    LEVEL_SKIP_PARTIALS, LEVEL_FALLBACK_MODEL, ACTION_PARTIALS_SKIPPED
+)
+
+
+class TestBackpressureController(unittest.TestCase):
+    """BackpressureController类的测试用例"""
+
+    def make_controller(self, **kwargs):
+        """创建默认参数的控制器"""
+        params = dict(drop_silence_seconds=0.5, skip_partials_seconds=1.0, fallback_seconds=1.5,
+                      recover_ratio=0.5, min_hold_seconds=2.0)
+        params.update(kwargs)
+        return BackpressureController(**params)
+
+    def test_escalates_by_queue_depth(self):
+        """测试积压达到阈值时逐级升级"""
+        controller = self.make_controller()
+        self.assertIsNone(controller.update(0.2, now=0.0))
+        self.assertEqual(controller.update(0.6, now=1.0), (LEVEL_NORMAL, LEVEL_DROP_SILENCE))
+        self.assertEqual(controller.update(1.2, now=2.0), (LEVEL_DROP_SILENCE, LEVEL_SKIP_PARTIALS))
+        self.assertEqual(controller.level_name, "skip_partials")
+
+    def test_jumps_levels_on_sudden_backlog(self):
+        """测试积压突增时直接跳到对应级别"""
+        controller = self.make_controller()
+        self.assertEqual(controller.update(1.8, now=0.0), (LEVEL_NORMAL, LEVEL_FALLBACK_MODEL))
+
+    def test_recovers_with_hysteresis(self):
+        """测试降级需要积压足够低且停留足够久，并且每次只降一级"""
+        controller = self.make_controller()
+        controller.update(1.2, now=0.0)
+        self.assertIsNone(controller.update(0.1, now=1.0))  # 停留时间不足
+        self.assertIsNone(controller.update(0.9, now=5.0))  # 未低于 1.0 * 0.5
+        self.assertEqual(controller.update(0.1, now=5.0), (LEVEL_SKIP_PARTIALS, LEVEL_DROP_SILENCE))
+        self.assertIsNone(controller.update(0.1, now=6.0))
+        self.assertEqual(controller.update(0.1, now=7.0), (LEVEL_DROP_SILENCE, LEVEL_NORMAL))
+
+    def test_stats_and_actions(self):
+        """测试级别停留时间、事件和措施计量"""
+        controller = self.make_controller()
+        controller.update(0.0, now=0.0)
+        controller.update(1.0, now=3.0)
+        controller.record_action(ACTION_PARTIALS_SKIPPED)
+        controller.record_action(ACTION_PARTIALS_SKIPPED)
+        stats = controller.get_stats(now=4.0)
+        self.assertEqual(stats["transitions"], 1)
+        self.assertAlmostEqual(stats["seconds_in_level"]["normal"], 3.0)
+        self.assertAlmostEqual(stats["seconds_in_level"]["skip_partials"], 1.0)
+        self.assertEqual(stats["actions"][ACTION_PARTIALS_SKIPPED], 2)
+        self.assertEqual(stats["events"][0]["to"], "skip_partials")
+        self.assertEqual(stats["max_queue_seconds"], 1.0)
+
+    def test_invalid_thresholds(self):
+        """测试阈值无效时抛出异常"""
+        with self.assertRaises(ValueError):
+            self.make_controller(skip_partials_seconds=2.0, fallback_seconds=1.0)
+        with self.assertRaises(ValueError):
+            self.make_controller(drop_silence_seconds=0.0)
+
+    def test_from_config(self):
+        """测试从配置创建"""
+        controller = BackpressureController.from_config({"fallback_seconds": 3.0, "enabled": True})
+        self.assertEqual(controller.thresholds, (0.5, 1.0, 3.0))
+
+    def test_resolve_fallback_model(self):
+        """测试查找备用模型"""
+        fallback_models = {"sherpa_onnx_std": "sherpa_onnx_int8", "vosk_small": "vosk_small"}
+        self.assertEqual(resolve_fallback_model("sherpa_onnx_std", fallback_models), "sherpa_onnx_int8")
+        self.assertIsNone(resolve_fallback_model("vosk_small", fallback_models))
+        self.assertIsNone(resolve_fallback_model("sherpa_0626_std", fallback_models))
+        self.assertIsNone(resolve_fallback_model("sherpa_onnx_std", None))
+
+
+if __name__ == '__main__':
+    unittest.main()
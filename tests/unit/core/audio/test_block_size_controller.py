@@ -0,0 +1,77 @@
+"""
+自适应块大小控制单元测试
+测试AdaptiveBlockSizeController类的功能
+"""
+import unittest
+
+from src.core.audio.block_size_controller import AdaptiveBlockSizeController
+
+
+class TestAdaptiveBlockSizeController(unittest.TestCase):
+    """AdaptiveBlockSizeController类的测试用例"""
+
+    def make_controller(self, **kwargs):
+        """创建默认参数的控制器"""
+        params = dict(initial_size=4000, min_size=1600, max_size=16000, cooldown=2, smoothing=1.0)
+        params.update(kwargs)
+        return AdaptiveBlockSizeController(**params)
+
+    def test_grows_when_decoder_falls_behind(self):
+        """测试RTF过高时增大块"""
+        controller = self.make_controller()
+        changed = [controller.update(4000, 0.25) for _ in range(2)]  # RTF = 1.0
+        self.assertEqual(changed, [False, True])
+        self.assertEqual(controller.block_size, 6080)  # 4000 * 1.5，按 160 对齐
+
+    def test_shrinks_with_headroom(self):
+        """测试RTF较低时减小块"""
+        controller = self.make_controller()
+        for _ in range(2):
+            controller.update(4000, 0.01)
+        self.assertEqual(controller.block_size, 3040)  # 4000 * 0.75，按 160 对齐
+
+    def test_stays_within_bounds(self):
+        """测试块大小限制在配置范围内"""
+        controller = self.make_controller()
+        for _ in range(50):
+            controller.update(controller.block_size, 0.0)
+        self.assertEqual(controller.block_size, 1600)
+        for _ in range(50):
+            controller.update(controller.block_size, controller.block_size / 16000 * 2)
+        self.assertEqual(controller.block_size, 16000)
+
+    def test_holds_inside_target_band(self):
+        """测试RTF在目标范围内时保持不变"""
+        controller = self.make_controller()
+        for _ in range(10):
+            self.assertFalse(controller.update(4000, 0.125))  # RTF = 0.5
+        self.assertEqual(controller.block_size, 4000)
+        self.assertAlmostEqual(controller.rtf, 0.5)
+
+    def test_smoothing(self):
+        """测试RTF指数平滑"""
+        controller = self.make_controller(smoothing=0.5, cooldown=100)
+        controller.update(16000, 1.0)
+        controller.update(16000, 0.0)
+        self.assertAlmostEqual(controller.rtf, 0.5)
+        self.assertAlmostEqual(controller.last_rtf, 0.0)
+
+    def test_from_config(self):
+        """测试从配置创建"""
+        controller = AdaptiveBlockSizeController.from_config(
+            {"enabled": True, "min_block_size": 800, "max_block_size": 8000, "target_rtf_high": 0.8}, 4000
+        )
+        self.assertEqual((controller.min_size, controller.max_size), (800, 8000))
+        self.assertEqual(controller.target_rtf_high, 0.8)
+        self.assertEqual(controller.get_stats()["block_ms"], 250.0)
+
+    def test_invalid_bounds(self):
+        """测试无效的范围"""
+        with self.assertRaises(ValueError):
+            AdaptiveBlockSizeController(4000, 8000, 1600)
+        with self.assertRaises(ValueError):
+            AdaptiveBlockSizeController(4000, 1600, 8000, target_rtf_low=0.8, target_rtf_high=0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
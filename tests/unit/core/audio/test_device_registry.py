@@ -0,0 +1,105 @@
+"""
+音频设备注册表单元测试
+测试DeviceRegistry类的功能
+"""
+import threading
+import unittest
+
+from src.core.audio.device_registry import DeviceRegistry, device_key
+
+
+class Device:
+    """测试用设备"""
+
+    def __init__(self, id, name, is_input=True):
+        self.id = id
+        self.name = name
+        self.is_input = is_input
+
+
+class FakeBackend:
+    """可修改设备列表并统计枚举次数的后端"""
+
+    def __init__(self, devices):
+        self.devices = devices
+        self.calls = 0
+        self.fail = False
+        self.called = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.called.set()
+        if self.fail:
+            raise RuntimeError("backend unavailable")
+        return [Device(d.id, d.name, d.is_input) for d in self.devices]
+
+
+class TestDeviceRegistry(unittest.TestCase):
+    """DeviceRegistry类的测试用例"""
+
+    def setUp(self):
+        """创建注册表和信号记录"""
+        self.backend = FakeBackend([Device("a", "Speakers", False), Device("a", "Speakers Loopback"),
+                                    Device("b", "Mic")])
+        self.registry = DeviceRegistry(self.backend, refresh_interval=0)
+        self.changes = []
+        self.registry.devices_changed.connect(lambda *change: self.changes.append(change))
+
+    def tearDown(self):
+        """停止后台线程"""
+        self.registry.stop()
+
+    def test_device_key(self):
+        """测试设备键区分输入和输出"""
+        self.assertEqual(device_key(Device("a", "x", False)), "out:a")
+        self.assertEqual(device_key(Device("a", "x", True)), "in:a")
+
+    def test_enumerates_once(self):
+        """测试只在第一次获取时枚举"""
+        devices = self.registry.get_devices()
+        self.assertEqual([d.name for d in devices], ["Speakers", "Speakers Loopback", "Mic"])
+        self.registry.get_devices()
+        self.assertEqual(self.backend.calls, 1)
+        self.assertEqual(len(self.changes), 1)
+
+    def test_diff(self):
+        """测试刷新时只通知变化的设备，未变化的设备保持同一个对象"""
+        mic = self.registry.get_devices()[2]
+        self.changes.clear()
+
+        self.backend.devices = [Device("a", "Speakers (renamed)", False), Device("b", "Mic"), Device("c", "USB")]
+        added, removed, changed = self.registry.refresh()
+        self.assertEqual([d.name for d in added], ["USB"])
+        self.assertEqual([d.name for d in removed], ["Speakers Loopback"])
+        self.assertEqual([d.name for d in changed], ["Speakers (renamed)"])
+        self.assertIs(self.registry.get_device("in:b"), mic)
+        self.assertEqual(len(self.changes), 1)
+
+        # 没有变化时不发送信号
+        self.registry.refresh()
+        self.assertEqual(len(self.changes), 1)
+
+    def test_failure_keeps_cache(self):
+        """测试枚举失败时保留缓存"""
+        self.registry.get_devices()
+        self.backend.fail = True
+        self.assertIsNone(self.registry.refresh())
+        self.assertEqual(len(self.registry.get_devices()), 3)
+        self.assertEqual(self.registry.get_stats()["last_error"], "backend unavailable")
+
+    def test_background_refresh_on_request(self):
+        """测试后台线程运行时 request_refresh() 触发后台刷新"""
+        self.registry.get_devices()
+        self.registry.start()
+        self.assertTrue(self.registry.get_stats()["running"])
+
+        self.backend.called.clear()
+        self.backend.devices = self.backend.devices[:1]
+        self.registry.request_refresh()
+        self.assertTrue(self.backend.called.wait(2.0))
+        self.registry.stop()
+        self.assertEqual(len(self.registry.get_devices()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
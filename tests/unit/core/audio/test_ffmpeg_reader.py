@@ -0,0 +1,97 @@
+"""
+FFmpeg 流式解码单元测试
+测试PCMBlockReader和FFmpegPCMReader类的功能
+"""
+import io
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.core.audio.ffmpeg_reader import PCMBlockReader, FFmpegPCMReader, build_ffmpeg_command
+
+
+class TestPCMBlockReader(unittest.TestCase):
+    """PCMBlockReader类的测试用例"""
+
+    def test_fixed_size_float_blocks(self):
+        """测试按固定大小输出 float32 块，最后一块可以更短"""
+        pcm = np.arange(2500, dtype=np.int16)
+        blocks = list(PCMBlockReader(io.BytesIO(pcm.tobytes()), block_samples=1000))
+        self.assertEqual([len(block) for block in blocks], [1000, 1000, 500])
+        self.assertEqual(blocks[0].dtype, np.float32)
+        np.testing.assert_allclose(np.concatenate(blocks), pcm / 32768.0)
+
+    def test_bytes_blocks_drop_half_sample(self):
+        """测试输出原始字节时丢弃末尾不完整的半个样本"""
+        reader = PCMBlockReader(io.BytesIO(b"\x01\x00" * 5 + b"\x02"), block_samples=4, as_float=False)
+        self.assertEqual(list(reader), [b"\x01\x00" * 4, b"\x01\x00"])
+        self.assertEqual(reader.samples_read, 5)
+
+    def test_prefetch_is_bounded(self):
+        """测试后台线程最多预读 prefetch_blocks 块"""
+        stream = io.BytesIO(np.zeros(100 * 10, dtype=np.int16).tobytes())
+        reader = PCMBlockReader(stream, block_samples=10, prefetch_blocks=3)
+        blocks = iter(reader)
+        next(blocks)
+        reader._thread.join(timeout=0.2)  # 队列满后线程阻塞，不会读完
+        self.assertLessEqual(stream.tell(), (1 + 3 + 1) * 20)
+        self.assertEqual(len(list(blocks)), 99)
+
+    def test_invalid_block_size(self):
+        """测试块大小无效时抛出异常"""
+        with self.assertRaises(ValueError):
+            PCMBlockReader(io.BytesIO(b""), block_samples=0)
+
+
+@unittest.skipUnless(os.name == "posix", "使用 shell 脚本模拟 ffmpeg")
+class TestFFmpegPCMReader(unittest.TestCase):
+    """FFmpegPCMReader类的测试用例（用脚本代替 ffmpeg）"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """每个测试方法执行后的清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_ffmpeg(self, body):
+        """生成一个模拟 ffmpeg 的可执行脚本"""
+        path = os.path.join(self.temp_dir, "fake_ffmpeg")
+        with open(path, "w") as f:
+            f.write(f"#!{sys.executable}\nimport sys\n{body}\n")
+        os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+        return path
+
+    def test_build_command(self):
+        """测试 ffmpeg 命令输出单声道 16 位 PCM 到标准输出"""
+        command = build_ffmpeg_command("in.mp4", 16000)
+        self.assertEqual(command[-7:], ["-ar", "16000", "-ac", "1", "-f", "s16le", "-"])
+        self.assertIn("in.mp4", command)
+
+    def test_streams_blocks(self):
+        """测试按块读取 ffmpeg 的输出"""
+        ffmpeg = self.make_ffmpeg("sys.stdout.buffer.write(b'\\x00\\x40' * 3000)")
+        with FFmpegPCMReader("in.mp4", block_samples=1000, ffmpeg=ffmpeg) as reader:
+            blocks = list(reader)
+        self.assertEqual(len(blocks), 3)
+        self.assertTrue(np.allclose(blocks[0], 0.5))
+        self.assertEqual(reader.returncode, 0)
+        self.assertAlmostEqual(reader.seconds_read, 3000 / 16000)
+
+    def test_failure_raises(self):
+        """测试 ffmpeg 失败时读取结束后抛出异常并带有错误输出"""
+        ffmpeg = self.make_ffmpeg("sys.stderr.write('no such file\\n'); sys.exit(1)")
+        with FFmpegPCMReader("missing.mp4", ffmpeg=ffmpeg) as reader:
+            with self.assertRaises(RuntimeError) as context:
+                list(reader)
+        self.assertIn("no such file", str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
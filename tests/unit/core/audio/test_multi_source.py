@@ -0,0 +1,107 @@
+"""
+多设备音频采集单元测试
+测试CaptureSource和MultiSourceScheduler类的功能
+"""
+import unittest
+
+import numpy as np
+
+from src.core.audio.multi_source import CaptureSource, MultiSourceScheduler
+
+RATE = 1000  # 便于计算：1 毫秒 = 1 个样本
+
+
+def make_sources(count=2, gains=None):
+    """创建测试用的捕获流"""
+    gains = gains or [1.0] * count
+    return [CaptureSource(f"dev{i}", RATE, 4000, gain=gains[i]) for i in range(count)]
+
+
+class TestMultiSourceScheduler(unittest.TestCase):
+    """MultiSourceScheduler类的测试用例"""
+
+    def test_requires_sources(self):
+        """测试没有来源时报错"""
+        with self.assertRaises(ValueError):
+            MultiSourceScheduler([], RATE)
+
+    def test_waits_for_all_sources_to_start(self):
+        """测试在超时前等待所有来源开始捕获"""
+        sources = make_sources()
+        scheduler = MultiSourceScheduler(sources, RATE, start_timeout_ms=10000)
+        sources[0].write(np.ones(100, dtype=np.float32), timestamp=10.0)
+        self.assertEqual(scheduler.available(), 0)
+
+    def test_late_source_is_padded(self):
+        """测试较晚开始的来源在开头补静音"""
+        sources = make_sources()
+        scheduler = MultiSourceScheduler(sources, RATE)
+        sources[0].write(np.ones(100, dtype=np.float32), timestamp=10.0)  # 起始 9.9
+        sources[1].write(np.full(70, 2.0, dtype=np.float32), timestamp=10.0)  # 起始 9.93
+
+        matrix = scheduler.read_sources(100)
+        self.assertEqual(matrix.shape, (2, 100))
+        np.testing.assert_array_equal(matrix[0], np.ones(100))
+        np.testing.assert_array_equal(matrix[1, :30], np.zeros(30))
+        np.testing.assert_array_equal(matrix[1, 30:], np.full(70, 2.0))
+
+    def test_read_timestamp(self):
+        """测试读取的最后一个样本在时间轴上的捕获时间"""
+        sources = make_sources()
+        scheduler = MultiSourceScheduler(sources, RATE)
+        self.assertIsNone(scheduler.read_timestamp())
+        sources[0].write(np.ones(100, dtype=np.float32), timestamp=10.0)  # 起始 9.9
+        sources[1].write(np.ones(100, dtype=np.float32), timestamp=10.0)
+
+        scheduler.read_sources(40)
+        self.assertAlmostEqual(scheduler.read_timestamp(), 9.94)
+        scheduler.read(60)
+        self.assertAlmostEqual(scheduler.read_timestamp(RATE), 10.0)
+
+    def test_mix_applies_gains_and_clips(self):
+        """测试混音按增益相加并截断到 [-1, 1]"""
+        sources = make_sources(gains=[0.5, 1.0])
+        scheduler = MultiSourceScheduler(sources, RATE)
+        sources[0].write(np.full(50, 0.4, dtype=np.float32), timestamp=1.0)
+        sources[1].write(np.concatenate([np.full(25, 0.1), np.full(25, 0.9)]).astype(np.float32), timestamp=1.0)
+
+        out = np.zeros(64, dtype=np.float32)
+        mixed = scheduler.read(out=out)
+        self.assertEqual(len(mixed), 50)
+        np.testing.assert_allclose(mixed[:25], 0.3, rtol=1e-6)
+        np.testing.assert_allclose(mixed[25:], 1.0)
+
+    def test_lagging_source_is_zero_filled(self):
+        """测试落后超过 max_skew 的来源用静音补齐，迟到的数据被丢弃"""
+        sources = make_sources()
+        scheduler = MultiSourceScheduler(sources, RATE, max_skew_ms=100)
+        sources[0].write(np.ones(300, dtype=np.float32), timestamp=1.0)
+        sources[1].write(np.full(50, 2.0, dtype=np.float32), timestamp=0.75)
+
+        # 领先来源有 300 个样本，落后来源有 50 个，超过 max_skew 的部分可以读取
+        self.assertEqual(scheduler.available(), 200)
+        matrix = scheduler.read_sources()
+        np.testing.assert_array_equal(matrix[1, :50], np.full(50, 2.0))
+        np.testing.assert_array_equal(matrix[1, 50:], np.zeros(150))
+        self.assertEqual(sources[1].filled_frames, 150)
+
+        # 迟到的 150 个样本被丢弃，之后的数据保持对齐
+        sources[1].write(np.full(150, 3.0, dtype=np.float32))
+        sources[1].write(np.full(100, 4.0, dtype=np.float32))
+        matrix = scheduler.read_sources()
+        self.assertEqual(matrix.shape[1], 100)
+        np.testing.assert_array_equal(matrix[0], np.ones(100))
+        np.testing.assert_array_equal(matrix[1], np.full(100, 4.0))
+
+    def test_overrun_counters(self):
+        """测试溢出次数为各来源之和"""
+        sources = [CaptureSource(f"dev{i}", RATE, 10) for i in range(2)]
+        scheduler = MultiSourceScheduler(sources, RATE)
+        sources[0].write(np.zeros(15, dtype=np.float32))
+        sources[1].write(np.zeros(12, dtype=np.float32))
+        self.assertEqual(scheduler.overruns, 2)
+        self.assertEqual(len(scheduler.get_stats()["sources"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
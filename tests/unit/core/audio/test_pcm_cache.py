@@ -0,0 +1,114 @@
+"""
+解码音频缓存单元测试
+测试file_fingerprint函数和DecodedAudioCache类的功能
+"""
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from src.core.audio.ffmpeg_reader import FFmpegPCMReader
+from src.core.audio.pcm_cache import DecodedAudioCache, file_fingerprint
+
+
+class TestDecodedAudioCache(unittest.TestCase):
+    """DecodedAudioCache类的测试用例"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = DecodedAudioCache(os.path.join(self.temp_dir, "cache"), max_bytes=10 * 1024)
+
+    def tearDown(self):
+        """每个测试方法执行后的清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_media(self, name, content):
+        """创建一个“媒体文件”"""
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def store(self, media, samples):
+        """把解码结果写入缓存"""
+        writer = self.cache.writer(media)
+        writer.write(np.asarray(samples, dtype=np.int16).tobytes())
+        self.assertTrue(writer.commit())
+
+    def test_fingerprint(self):
+        """测试指纹随内容和修改时间变化，与文件名无关"""
+        first = self.make_media("a.mp4", os.urandom(1024 * 1024))
+        second = self.make_media("b.mp4", open(first, "rb").read())
+        stat_a = os.stat(first)
+        os.utime(second, ns=(stat_a.st_atime_ns, stat_a.st_mtime_ns))
+        self.assertEqual(file_fingerprint(first), file_fingerprint(second))
+
+        os.utime(second, ns=(stat_a.st_atime_ns, stat_a.st_mtime_ns + 1))
+        self.assertNotEqual(file_fingerprint(first), file_fingerprint(second))
+
+    def test_store_and_load_memmap(self):
+        """测试写入后以内存映射方式读取，不同采样率是不同条目"""
+        media = self.make_media("a.mp4", b"media")
+        self.assertIsNone(self.cache.load(media))
+        self.store(media, np.arange(100))
+        loaded = self.cache.load(media)
+        self.assertIsInstance(loaded, np.memmap)
+        np.testing.assert_array_equal(loaded, np.arange(100))
+        self.assertIsNone(self.cache.load(media, sample_rate=8000))
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_abort_discards_entry(self):
+        """测试放弃写入时不留下条目和临时文件"""
+        media = self.make_media("a.mp4", b"media")
+        writer = self.cache.writer(media)
+        writer.write(b"\0" * 100)
+        writer.abort()
+        self.assertIsNone(self.cache.lookup(media))
+        self.assertEqual(os.listdir(self.cache.directory), [])
+
+    def test_lru_eviction(self):
+        """测试超过大小上限时删除最久未使用的条目"""
+        media = [self.make_media(f"{i}.mp4", bytes([i])) for i in range(3)]
+        self.store(media[0], np.zeros(2048))
+        self.store(media[1], np.zeros(2048))
+        # 使用第一个条目，使第二个成为最久未使用
+        past = time.time() - 100
+        for path in os.listdir(self.cache.directory):
+            os.utime(os.path.join(self.cache.directory, path), (past, past))
+        self.assertIsNotNone(self.cache.lookup(media[0]))
+
+        self.store(media[2], np.zeros(2048))
+        self.assertIsNotNone(self.cache.lookup(media[0]))
+        self.assertIsNone(self.cache.lookup(media[1]))
+        self.assertIsNotNone(self.cache.lookup(media[2]))
+        self.assertEqual(self.cache.get_stats()["entries"], 2)
+
+    @unittest.skipUnless(os.name == "posix", "使用脚本模拟 ffmpeg")
+    def test_reader_skips_ffmpeg_on_hit(self):
+        """测试 FFmpegPCMReader 第一次解码时写入缓存，之后直接读取缓存"""
+        counter = os.path.join(self.temp_dir, "runs")
+        ffmpeg = os.path.join(self.temp_dir, "fake_ffmpeg")
+        with open(ffmpeg, "w") as f:
+            f.write(f"#!{sys.executable}\nimport sys\n"
+                    f"open({counter!r}, 'a').write('x')\n"
+                    "sys.stdout.buffer.write(b'\\x00\\x40' * 2500)\n")
+        os.chmod(ffmpeg, os.stat(ffmpeg).st_mode | stat.S_IEXEC)
+        media = self.make_media("a.mp4", b"media")
+
+        results = []
+        for _ in range(2):
+            with FFmpegPCMReader(media, block_samples=1000, ffmpeg=ffmpeg, cache=self.cache) as reader:
+                results.append((reader.cache_hit, [len(block) for block in reader]))
+        self.assertEqual(results, [(False, [1000, 1000, 500]), (True, [1000, 1000, 500])])
+        self.assertEqual(open(counter).read(), "x")
+        self.assertEqual(reader.samples_read, 2500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+PCM 转换单元测试
+测试PCMConverter类的功能
+"""
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from src.core.audio.pcm_converter import PCMConverter
+
+
+class TestPCMConverter(unittest.TestCase):
+    """PCMConverter类的测试用例"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        self.converter = PCMConverter(4000)
+        rng = np.random.default_rng(0)
+        self.audio = np.clip(rng.standard_normal(4000) * 0.3, -1.0, 1.0).astype(np.float32)
+
+    def test_float_to_int16_matches_legacy(self):
+        """测试与原有 astype 转换结果一致"""
+        expected = (self.audio * 32767).astype(np.int16)
+        np.testing.assert_array_equal(self.converter.float_to_int16(self.audio), expected)
+
+    def test_float_to_int16_clips(self):
+        """测试超出范围的样本被截断而不是溢出"""
+        result = self.converter.float_to_int16(np.array([1.5, -1.5, 1.0, -1.0], dtype=np.float32))
+        np.testing.assert_array_equal(result, [32767, -32768, 32767, -32767])
+
+    def test_pcm16_bytes(self):
+        """测试字节视图与 tobytes 结果一致"""
+        view = self.converter.float_to_pcm16_bytes(self.audio)
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(bytes(view), (self.audio * 32767).astype(np.int16).tobytes())
+
+    def test_cbuffer_length(self):
+        """测试传给 Vosk 的缓冲区长度"""
+        cbuffer = self.converter.float_to_pcm16_cbuffer(self.audio)
+        self.assertEqual(len(cbuffer), len(self.audio) * 2)
+
+    def test_pcm16_to_float(self):
+        """测试字节到 float32 的转换"""
+        pcm = (self.audio * 32767).astype(np.int16)
+        expected = pcm.astype(np.float32) / 32768.0
+        np.testing.assert_array_equal(self.converter.pcm16_to_float(pcm.tobytes()), expected)
+        np.testing.assert_array_equal(self.converter.pcm16_to_float(pcm), expected)
+
+    def test_buffer_reuse(self):
+        """测试相同大小的转换复用同一块缓冲区"""
+        first = self.converter.float_to_int16(self.audio)
+        second = self.converter.float_to_int16(self.audio[:1000])
+        self.assertTrue(np.shares_memory(first, second))
+
+    def test_growth(self):
+        """测试超过容量时自动扩容"""
+        audio = np.zeros(10000, dtype=np.float32)
+        self.assertEqual(len(self.converter.float_to_int16(audio)), 10000)
+        self.assertGreaterEqual(self.converter.capacity, 10000)
+
+    def test_steady_state_does_not_allocate_arrays(self):
+        """测试稳态转换不分配音频大小的数组"""
+        pcm = self.converter.float_to_pcm16_bytes(self.audio).tobytes()
+        self.converter.float_to_pcm16_cbuffer(self.audio)
+        self.converter.pcm16_to_float(pcm)
+
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(50):
+            self.converter.float_to_pcm16_cbuffer(self.audio)
+            self.converter.pcm16_to_float(pcm)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # 一个 4000 样本的 float32 块为 16000 字节
+        self.assertLess(peak - baseline, 4000)
+
+
+if __name__ == '__main__':
+    unittest.main()
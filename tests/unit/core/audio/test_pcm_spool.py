@@ -0,0 +1,132 @@
+"""
+PCM录音缓存单元测试
+测试PCMSpoolWriter和PCMSpoolReader类的功能
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.core.audio.pcm_spool import PCMSpoolWriter, PCMSpoolReader, INDEX_SUFFIX, META_SUFFIX
+
+
+class FakeRecognizer:
+    """每收到 1 秒音频返回一条完整结果的识别器"""
+
+    engine_type = "sherpa_onnx"
+
+    def __init__(self):
+        self.frames = 0
+        self.sentences = 0
+
+    def AcceptWaveform(self, data):
+        self.frames += len(data)
+        if self.frames >= 1000:
+            self.frames -= 1000
+            self.sentences += 1
+            return True
+        return False
+
+    def Result(self):
+        return json.dumps({"text": f"sentence {self.sentences}"})
+
+    def FinalResult(self):
+        return json.dumps({"text": "tail" if self.frames else ""})
+
+
+class TestPCMSpool(unittest.TestCase):
+    """PCM录音缓存的测试用例"""
+
+    def setUp(self):
+        """创建临时目录"""
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "spool", "session.pcm")
+
+    def tearDown(self):
+        """删除临时目录"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_invalid_dtype(self):
+        """测试不支持的采样格式"""
+        with self.assertRaises(ValueError):
+            PCMSpoolWriter(self.path, 1000, dtype="float64")
+
+    def test_write_grow_and_read(self):
+        """测试写入超过预分配容量后扩容，关闭后文件截断到实际长度"""
+        audio = np.linspace(-1, 1, 2500, dtype=np.float32)
+        with PCMSpoolWriter(self.path, 1000, initial_seconds=1.0) as writer:
+            for offset in range(0, len(audio), 400):
+                writer.write(audio[offset:offset + 400], timestamp=100.0 + (offset + 400) / 1000)
+        self.assertEqual(os.path.getsize(self.path), 2500 * 4)
+
+        with PCMSpoolReader(self.path) as reader:
+            self.assertEqual(reader.frames, 2500)
+            self.assertAlmostEqual(reader.duration, 2.5)
+            self.assertEqual(len(reader.index), 7)
+            np.testing.assert_array_equal(reader.read()[:, 0], audio)
+            np.testing.assert_array_equal(reader.read(1.0, 1.5)[:, 0], audio[1000:1500])
+
+    def test_int16_multichannel(self):
+        """测试 int16 多声道缓存，按声道和混合读取"""
+        left = np.full(300, 0.5, dtype=np.float32)
+        right = np.full(300, -0.25, dtype=np.float32)
+        with PCMSpoolWriter(self.path, 1000, channels=2, dtype="int16") as writer:
+            writer.write(np.stack([left, right], axis=1))
+
+        with PCMSpoolReader(self.path) as reader:
+            self.assertEqual(reader.read().dtype, np.int16)
+            blocks = [block.copy() for block in reader.iter_blocks(block_size=100, channel=1)]
+            np.testing.assert_allclose(np.concatenate(blocks), right, atol=1e-4)
+            mixed = np.concatenate([block.copy() for block in reader.iter_blocks(block_size=128)])
+            np.testing.assert_allclose(mixed, 0.125, atol=1e-4)
+
+    def test_recover_unclosed_spool(self):
+        """测试写入器未关闭时根据索引恢复样本数"""
+        writer = PCMSpoolWriter(self.path, 1000, initial_seconds=10.0)
+        writer.write(np.ones(700, dtype=np.float32))
+        writer._index_file.flush()
+        writer._mmap.flush()
+
+        with open(self.path + META_SUFFIX, encoding="utf-8") as f:
+            self.assertFalse(json.load(f)["closed"])
+        self.assertEqual(os.path.getsize(self.path + INDEX_SUFFIX), 24)
+
+        reader = PCMSpoolReader(self.path)
+        self.assertEqual(reader.frames, 700)
+        reader.close()
+        writer.close()
+
+    def test_frame_at_time(self):
+        """测试根据捕获时间查找样本位置"""
+        with PCMSpoolWriter(self.path, 1000) as writer:
+            writer.write(np.zeros(500, dtype=np.float32), timestamp=10.5)
+            # 中间有 1 秒的数据丢失
+            writer.write(np.zeros(500, dtype=np.float32), timestamp=12.0)
+
+        with PCMSpoolReader(self.path) as reader:
+            self.assertAlmostEqual(reader.started_at, 10.0)
+            self.assertEqual(reader.frame_at_time(10.25), 250)
+            self.assertEqual(reader.frame_at_time(11.75), 750)
+            self.assertEqual(reader.frame_at_time(20.0), 1000)
+
+    def test_replay_time_range(self):
+        """测试重放指定时间范围"""
+        with PCMSpoolWriter(self.path, 1000) as writer:
+            writer.write(np.zeros(5000, dtype=np.float32))
+
+        results = []
+        with PCMSpoolReader(self.path) as reader:
+            stats = reader.replay(FakeRecognizer(), start=1.0, end=3.5, block_size=250, on_result=results.append)
+
+        self.assertEqual(stats["audio_seconds"], 2.5)
+        self.assertEqual([r["text"] for r in stats["results"]], ["sentence 1", "sentence 2", "tail"])
+        self.assertEqual(results, stats["results"])
+        self.assertEqual((stats["results"][0]["start"], stats["results"][0]["end"]), (1.0, 2.0))
+        self.assertEqual((stats["results"][2]["start"], stats["results"][2]["end"]), (3.0, 3.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+"""
+流水线性能统计单元测试
+测试LatencyStats类的功能
+"""
+import unittest
+
+from src.core.audio.pipeline_stats import LatencyStats
+
+
+class TestLatencyStats(unittest.TestCase):
+    """LatencyStats类的测试用例"""
+
+    def test_empty(self):
+        """测试没有测量时的统计结果"""
+        self.assertEqual(LatencyStats().get_stats()["count"], 0)
+
+    def test_stats(self):
+        """测试平均值、分位数和最大值"""
+        stats = LatencyStats(window=100)
+        for i in range(1, 101):
+            stats.add(i / 1000)
+        result = stats.get_stats()
+        self.assertEqual(result["count"], 100)
+        self.assertAlmostEqual(result["mean_ms"], 50.5)
+        self.assertAlmostEqual(result["p50_ms"], 50.5)
+        self.assertAlmostEqual(result["max_ms"], 100.0)
+
+    def test_window(self):
+        """测试分位数只使用最近的测量，最大值使用全部测量"""
+        stats = LatencyStats(window=10)
+        stats.add(1.0)
+        for _ in range(10):
+            stats.add(0.001)
+        result = stats.get_stats()
+        self.assertAlmostEqual(result["p95_ms"], 1.0)
+        self.assertAlmostEqual(result["max_ms"], 1000.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
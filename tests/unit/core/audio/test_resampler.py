@@ -0,0 +1,83 @@
+"""
+音频重采样单元测试
+测试PolyphaseResampler类的功能
+"""
+import unittest
+
+import numpy as np
+
+from src.core.audio.resampler import PolyphaseResampler
+
+
+def tone_amplitude(resampler, input_rate, frequency):
+    """重采样一秒正弦波，返回输出的幅度"""
+    t = np.arange(input_rate) / input_rate
+    output = resampler.process(np.sin(2 * np.pi * frequency * t).astype(np.float32))
+    return np.sqrt(2) * np.std(output[len(output) // 10:])
+
+
+class TestPolyphaseResampler(unittest.TestCase):
+    """PolyphaseResampler类的测试用例"""
+
+    def test_ratio(self):
+        """测试重采样比例"""
+        resampler = PolyphaseResampler(44100, 16000)
+        self.assertEqual((resampler.up, resampler.down), (160, 441))
+        resampler = PolyphaseResampler(48000, 16000)
+        self.assertEqual((resampler.up, resampler.down), (1, 3))
+
+    def test_output_length(self):
+        """测试输出长度"""
+        for rate in (48000, 44100):
+            resampler = PolyphaseResampler(rate, 16000)
+            output = resampler.process(np.zeros(rate, dtype=np.float32))
+            self.assertEqual(len(output), 16000)
+            self.assertEqual(output.dtype, np.float32)
+
+    def test_matches_direct_convolution(self):
+        """测试与直接上采样-滤波-下采样的结果一致"""
+        resampler = PolyphaseResampler(44100, 16000, taps_per_phase=16)
+        rng = np.random.default_rng(0)
+        audio = rng.standard_normal(4410).astype(np.float32)
+        output = resampler.process(audio)
+
+        prototype = resampler._phases[:, ::-1].T.reshape(-1).astype(np.float64)
+        upsampled = np.zeros(len(audio) * resampler.up)
+        upsampled[::resampler.up] = audio
+        reference = np.convolve(upsampled, prototype)[::resampler.down][:len(output)]
+        np.testing.assert_allclose(output, reference, atol=1e-5)
+
+    def test_block_streaming_is_bit_exact(self):
+        """测试任意分块处理与一次性处理逐位相同"""
+        rng = np.random.default_rng(1)
+        audio = rng.standard_normal(48000).astype(np.float32)
+        whole = PolyphaseResampler(48000, 16000).process(audio)
+        for block in (1, 480, 12000, 7777):
+            resampler = PolyphaseResampler(48000, 16000)
+            parts = [resampler.process(audio[i:i + block]) for i in range(0, len(audio), block)]
+            np.testing.assert_array_equal(np.concatenate(parts), whole)
+
+    def test_frequency_response(self):
+        """测试通带增益与混叠抑制"""
+        for rate in (48000, 44100):
+            passband = tone_amplitude(PolyphaseResampler(rate, 16000), rate, 1000.0)
+            self.assertAlmostEqual(passband, 1.0, delta=0.01)
+            alias = tone_amplitude(PolyphaseResampler(rate, 16000), rate, 12000.0)
+            self.assertLess(alias, 1e-3)
+
+    def test_reset(self):
+        """测试重置后结果可重复"""
+        resampler = PolyphaseResampler(48000, 16000)
+        audio = np.random.default_rng(2).standard_normal(4800).astype(np.float32)
+        first = resampler.process(audio)
+        resampler.reset()
+        np.testing.assert_array_equal(resampler.process(audio), first)
+
+    def test_invalid_rates(self):
+        """测试无效采样率"""
+        with self.assertRaises(ValueError):
+            PolyphaseResampler(0, 16000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+音频环形缓冲区单元测试
+测试AudioRingBuffer类的功能
+"""
+import threading
+import unittest
+
+import numpy as np
+
+from src.core.audio.ring_buffer import AudioRingBuffer, DROP_OLDEST, DROP_NEWEST
+
+
+class TestAudioRingBuffer(unittest.TestCase):
+    """AudioRingBuffer类的测试用例"""
+
+    def test_invalid_arguments(self):
+        """测试无效参数"""
+        with self.assertRaises(ValueError):
+            AudioRingBuffer(0)
+        with self.assertRaises(ValueError):
+            AudioRingBuffer(10, drop_policy="block")
+
+    def test_write_and_read(self):
+        """测试基本读写"""
+        rb = AudioRingBuffer(8)
+        self.assertEqual(rb.write(np.arange(5, dtype=np.float32)), 5)
+        self.assertEqual(rb.available(), 5)
+        self.assertEqual(rb.free_space(), 3)
+
+        data = rb.read(3)
+        np.testing.assert_array_equal(data, [0, 1, 2])
+        self.assertEqual(rb.available(), 2)
+
+    def test_wrap_around(self):
+        """测试跨越缓冲区末尾的读写"""
+        rb = AudioRingBuffer(8)
+        rb.write(np.arange(6, dtype=np.float32))
+        rb.read(6)
+        rb.write(np.arange(6, 12, dtype=np.float32))
+
+        out = np.empty(8, dtype=np.float32)
+        data = rb.read(out=out)
+        np.testing.assert_array_equal(data, np.arange(6, 12))
+        # 使用预分配的输出缓冲区
+        self.assertTrue(np.shares_memory(data, out))
+
+    def test_drop_oldest(self):
+        """测试drop_oldest策略：保留最新数据"""
+        rb = AudioRingBuffer(8, drop_policy=DROP_OLDEST)
+        rb.write(np.arange(6, dtype=np.float32))
+        rb.write(np.arange(6, 12, dtype=np.float32))
+
+        data = rb.read()
+        np.testing.assert_array_equal(data, np.arange(4, 12))
+        stats = rb.get_stats()
+        self.assertEqual(stats["overruns"], 1)
+        self.assertEqual(stats["dropped_frames"], 4)
+        self.assertEqual(stats["total_written"], 12)
+        self.assertEqual(stats["total_read"], 8)
+
+    def test_drop_oldest_oversized_write(self):
+        """测试单次写入超过容量"""
+        rb = AudioRingBuffer(4, drop_policy=DROP_OLDEST)
+        rb.write(np.arange(10, dtype=np.float32))
+
+        np.testing.assert_array_equal(rb.read(), [6, 7, 8, 9])
+        self.assertEqual(rb.dropped_frames, 6)
+
+    def test_drop_newest(self):
+        """测试drop_newest策略：保留已缓存数据"""
+        rb = AudioRingBuffer(8, drop_policy=DROP_NEWEST)
+        rb.write(np.arange(6, dtype=np.float32))
+        self.assertEqual(rb.write(np.arange(6, 12, dtype=np.float32)), 2)
+
+        np.testing.assert_array_equal(rb.read(), np.arange(8))
+        self.assertEqual(rb.overruns, 1)
+        self.assertEqual(rb.dropped_frames, 4)
+
+    def test_clear(self):
+        """测试清空缓冲区"""
+        rb = AudioRingBuffer(8)
+        rb.write(np.ones(5, dtype=np.float32))
+        rb.clear()
+        self.assertEqual(rb.available(), 0)
+        self.assertEqual(len(rb.read()), 0)
+
+    def test_read_timestamp(self):
+        """测试样本时钟：按写入时的时间戳计算读取的最后一个样本的捕获时间"""
+        rb = AudioRingBuffer(64)
+        self.assertIsNone(rb.read_timestamp(10))
+        rb.write(np.ones(10, dtype=np.float32), timestamp=1.0)
+        rb.write(np.ones(10, dtype=np.float32), timestamp=2.0)
+        rb.read(5)
+        self.assertAlmostEqual(rb.read_timestamp(10), 0.5)
+        rb.read(10)
+        self.assertAlmostEqual(rb.read_timestamp(10), 1.5)
+        rb.read()
+        self.assertAlmostEqual(rb.read_timestamp(10), 2.0)
+
+    def test_wait_for_data_timeout(self):
+        """测试等待数据超时"""
+        rb = AudioRingBuffer(8)
+        self.assertFalse(rb.wait_for_data(4, timeout=0.01))
+        rb.write(np.ones(4, dtype=np.float32))
+        self.assertTrue(rb.wait_for_data(4, timeout=0.01))
+
+    def test_concurrent_producer_consumer(self):
+        """测试生产者与消费者线程并发读写时数据顺序正确"""
+        rb = AudioRingBuffer(1024, drop_policy=DROP_NEWEST)
+        total = 50000
+        received = []
+
+        def producer():
+            pos = 0
+            while pos < total:
+                chunk = np.arange(pos, min(pos + 100, total), dtype=np.float32)
+                written = rb.write(chunk)
+                pos += written
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+        count = 0
+        while count < total:
+            if rb.wait_for_data(1, timeout=0.1):
+                data = rb.read(256)
+                received.append(data.copy())
+                count += len(data)
+        thread.join()
+
+        # drop_newest 策略下，生产者会重试被丢弃的部分，数据应完整有序
+        np.testing.assert_array_equal(np.concatenate(received), np.arange(total, dtype=np.float32))
+
+
+if __name__ == '__main__':
+    unittest.main()
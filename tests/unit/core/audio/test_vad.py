@@ -0,0 +1,108 @@
+"""
+语音活动检测单元测试
+测试VoiceActivityDetector类的功能
+"""
+import unittest
+
+import numpy as np
+
+from src.core.audio.vad import VoiceActivityDetector
+
+
+SAMPLE_RATE = 16000
+
+
+def make_noise(seconds, amplitude=0.001, seed=0):
+    """生成低电平噪声"""
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(int(seconds * SAMPLE_RATE)) * amplitude).astype(np.float32)
+
+
+def make_tone(seconds, frequency=220.0, amplitude=0.3):
+    """生成正弦波（模拟浊音）"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def run_blocks(vad, signal, block_size=4000):
+    """按块处理音频，返回所有结果"""
+    return [vad.process(signal[i:i + block_size]) for i in range(0, len(signal), block_size)]
+
+
+class TestVoiceActivityDetector(unittest.TestCase):
+    """VoiceActivityDetector类的测试用例"""
+
+    def test_silence_is_dropped(self):
+        """测试纯噪声不输出任何音频"""
+        vad = VoiceActivityDetector(SAMPLE_RATE)
+        results = run_blocks(vad, make_noise(3))
+        self.assertTrue(all(not r.has_speech for r in results))
+        self.assertEqual(vad.get_stats()["speech_frames"], 0)
+
+    def test_speech_span_with_padding(self):
+        """测试语音区间包含前填充和拖尾"""
+        vad = VoiceActivityDetector(SAMPLE_RATE, frame_ms=20, padding_ms=200, hangover_ms=400)
+        signal = np.concatenate((make_noise(2), make_tone(1) + make_noise(1, seed=1), make_noise(2, seed=2)))
+        results = run_blocks(vad, signal)
+
+        spans = [span for r in results for span in r.spans]
+        self.assertTrue(spans)
+        start, end = spans[0][0], spans[-1][1]
+        # 语音从2秒开始，前填充200毫秒
+        self.assertLessEqual(start, 2 * SAMPLE_RATE - int(0.15 * SAMPLE_RATE))
+        self.assertGreaterEqual(start, 2 * SAMPLE_RATE - int(0.25 * SAMPLE_RATE))
+        # 语音在3秒结束，拖尾约400毫秒
+        self.assertGreaterEqual(end, 3 * SAMPLE_RATE + int(0.3 * SAMPLE_RATE))
+        self.assertLessEqual(end, 3 * SAMPLE_RATE + int(0.6 * SAMPLE_RATE))
+
+        # 输出的音频长度与区间一致
+        total = sum(len(r.speech) for r in results)
+        self.assertEqual(total, sum(e - s for s, e in spans))
+        self.assertTrue(any(r.speech_started for r in results))
+        self.assertTrue(any(r.speech_ended for r in results))
+        self.assertFalse(vad.in_speech)
+
+    def test_short_click_is_ignored(self):
+        """测试短于起始确认帧数的脉冲被忽略"""
+        vad = VoiceActivityDetector(SAMPLE_RATE, frame_ms=20, onset_frames=3)
+        signal = make_noise(1)
+        signal[8000:8160] += 0.5  # 10毫秒的脉冲
+        results = run_blocks(vad, signal)
+        self.assertTrue(all(not r.has_speech for r in results))
+
+    def test_high_zcr_noise_is_rejected(self):
+        """测试能量接近阈值的高过零率噪声被判为非语音"""
+        vad = VoiceActivityDetector(SAMPLE_RATE, min_energy_db=-55.0, zcr_margin_db=10.0)
+        rng = np.random.default_rng(3)
+        # 约 -50 dBFS 的白噪声，过零率约 0.5
+        hiss = (rng.standard_normal(SAMPLE_RATE * 2) * 0.003).astype(np.float32)
+        results = run_blocks(vad, np.concatenate((make_noise(1), hiss)))
+        self.assertTrue(all(not r.has_speech for r in results))
+
+    def test_block_size_independence(self):
+        """测试不同块大小得到相同的输出"""
+        signal = np.concatenate((make_noise(1), make_tone(0.5) + make_noise(0.5, seed=1), make_noise(1, seed=2)))
+        out_a = np.concatenate([r.speech for r in run_blocks(VoiceActivityDetector(SAMPLE_RATE), signal, 4000)])
+        out_b = np.concatenate([r.speech for r in run_blocks(VoiceActivityDetector(SAMPLE_RATE), signal, 1234)])
+        np.testing.assert_array_equal(out_a, out_b)
+
+    def test_position_counts_remainder(self):
+        """测试已接收的样本数包括不足一个子帧的尾部样本"""
+        vad = VoiceActivityDetector(SAMPLE_RATE)
+        run_blocks(vad, make_noise(0.5), 1234)
+        self.assertEqual(vad.position, int(0.5 * SAMPLE_RATE))
+
+    def test_from_config(self):
+        """测试从配置创建"""
+        vad = VoiceActivityDetector.from_config({"frame_ms": 10, "hangover_ms": 300, "enabled": True})
+        self.assertEqual(vad.frame_length, 160)
+        self.assertEqual(vad.hangover_frames, 30)
+
+    def test_invalid_frame_length(self):
+        """测试无效的子帧长度"""
+        with self.assertRaises(ValueError):
+            VoiceActivityDetector(SAMPLE_RATE, frame_ms=100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,3 @@
+"""
+translation 包的单元测试
+"""
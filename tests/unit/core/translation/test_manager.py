@@ -0,0 +1,45 @@
+"""
+翻译引擎管理器单元测试
+测试翻译引擎在第一次使用时才创建
+"""
+import unittest
+from unittest.mock import patch
+
+from src.core.translation.manager import TranslationManager
+
+
+class TestTranslationManager(unittest.TestCase):
+    """TranslationManager类的测试用例"""
+
+    @patch('src.core.translation.manager.ArgosEngine')
+    @patch('src.core.translation.manager.OpusMTEngine')
+    def test_engines_created_on_first_use(self, mock_opus, mock_argos):
+        """测试创建管理器时不加载引擎，第一次翻译时才创建且只创建一次"""
+        mock_opus.return_value.translate.return_value = ("你好", 0.1)
+        manager = TranslationManager({'opus_mt': {'model_dir': 'opus'}})
+
+        self.assertEqual(manager.get_available_engines(), ['opus_mt', 'argos'])
+        self.assertEqual(manager.engines, {})
+        mock_opus.assert_not_called()
+        mock_argos.assert_not_called()
+
+        self.assertEqual(manager.translate("hello"), ("你好", 0.1))
+        self.assertEqual(manager.translate("hello"), ("你好", 0.1))
+        mock_opus.assert_called_once_with(model_dir='opus')
+        mock_argos.assert_not_called()
+
+    @patch('src.core.translation.manager.ArgosEngine')
+    @patch('src.core.translation.manager.OpusMTEngine')
+    def test_set_engine(self, mock_opus, mock_argos):
+        """测试切换引擎不创建引擎，未注册的引擎不能选择"""
+        manager = TranslationManager()
+        self.assertTrue(manager.set_engine('argos'))
+        self.assertFalse(manager.set_engine('unknown'))
+        self.assertEqual(manager.get_current_engine(), 'argos')
+        mock_argos.assert_not_called()
+        self.assertEqual(manager.translate("hello", engine_name='unknown'), (None, 0.0))
+        self.assertEqual(manager.get_engine_info('unknown'), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+异步日志单元测试
+测试日志经有界队列由后台线程写入、队列满时丢弃不阻塞、级别检查和限频记录
+"""
+import logging
+import queue
+import unittest
+
+from src.utils.async_logging import BoundedQueueHandler, LogDispatcher, LogRateLimiter, is_enabled_for
+
+
+class ListHandler(logging.Handler):
+    """把格式化后的日志保存到列表的处理器"""
+
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append((record.levelname, record.getMessage()))
+
+
+class TestLogDispatcher(unittest.TestCase):
+    """LogDispatcher类的测试用例"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        self.dispatcher = LogDispatcher(maxsize=100)
+        self.logger = logging.getLogger("test_async_logging")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+
+    def tearDown(self):
+        """每个测试方法执行后的清理"""
+        self.dispatcher.stop()
+        for handler in self.logger.handlers[:]:
+            self.logger.removeHandler(handler)
+
+    def _queue_handlers(self):
+        return [handler for handler in self.logger.handlers if isinstance(handler, BoundedQueueHandler)]
+
+    def test_records_written_by_background_thread(self):
+        """测试记录器只挂队列处理器，日志由后台线程按处理器级别写入"""
+        console = ListHandler(logging.INFO)
+        debug_file = ListHandler(logging.DEBUG)
+        self.dispatcher.attach(self.logger, [console, debug_file])
+        self.assertEqual([handler for handler in self.logger.handlers if isinstance(handler, ListHandler)], [])
+        self.assertEqual(len(self._queue_handlers()), 1)
+
+        self.logger.debug("块 %d", 1)
+        self.logger.info("完整结果: %s", "hello")
+        self.assertTrue(self.dispatcher.flush())
+
+        self.assertEqual(console.messages, [("INFO", "完整结果: hello")])
+        self.assertEqual(debug_file.messages, [("DEBUG", "块 1"), ("INFO", "完整结果: hello")])
+
+    def test_attach_replaces_route(self):
+        """测试重复登记同一路由时替换处理器，不重复写入"""
+        old = ListHandler()
+        new = ListHandler()
+        self.dispatcher.attach(self.logger, [old])
+        self.dispatcher.attach(self.logger, [new])
+        self.assertEqual(len(self._queue_handlers()), 1)
+
+        self.logger.warning("once")
+        self.dispatcher.flush()
+        self.assertEqual(old.messages, [])
+        self.assertEqual(new.messages, [("WARNING", "once")])
+
+    def test_full_queue_drops_without_blocking(self):
+        """测试队列满时丢弃记录并计数，之后写入时报告丢弃的条数"""
+        handler = BoundedQueueHandler(queue.Queue(maxsize=1), "test", self.dispatcher)
+        for index in range(3):
+            handler.emit(logging.makeLogRecord({"msg": f"record {index}", "levelno": logging.INFO}))
+        self.assertEqual(self.dispatcher.dropped, 2)
+
+        target = ListHandler()
+        self.dispatcher.attach(self.logger, [target], route="test")
+        self.dispatcher._dispatch(handler.queue.get_nowait())
+        self.assertEqual(target.messages[0], ("WARNING", "日志队列已满，丢弃了 2 条日志"))
+        self.assertEqual(target.messages[1][1], "record 0")
+
+
+class TestLogRateLimiter(unittest.TestCase):
+    """LogRateLimiter类和级别检查的测试用例"""
+
+    def setUp(self):
+        """每个测试方法执行前的设置"""
+        self.now = 0.0
+        self.limiter = LogRateLimiter(interval=5.0, clock=lambda: self.now)
+
+    def test_allow(self):
+        """测试每个键在间隔内只允许一次，并报告省略的条数"""
+        self.assertEqual(self.limiter.allow("silence"), 0)
+        self.assertIsNone(self.limiter.allow("silence"))
+        self.assertEqual(self.limiter.allow("overrun"), 0)
+        self.now = 4.9
+        self.assertIsNone(self.limiter.allow("silence"))
+        self.now = 5.0
+        self.assertEqual(self.limiter.allow("silence"), 2)
+        self.assertIsNone(self.limiter.allow("silence"))
+
+    def test_log(self):
+        """测试限频记录和省略条数提示，级别关闭时不格式化消息"""
+        class Recorder:
+            def __init__(self, level):
+                self.level = level
+                self.messages = []
+
+            def isEnabledFor(self, level):
+                return level >= self.level
+
+            def debug(self, message):
+                self.messages.append(message)
+
+            def warning(self, message):
+                self.messages.append(message)
+
+        class Unformattable:
+            def __str__(self):
+                raise AssertionError("级别关闭时不应格式化消息")
+
+        recorder = Recorder(logging.INFO)
+        self.assertFalse(self.limiter.log(recorder, logging.DEBUG, "block", "%s", Unformattable()))
+
+        self.assertTrue(self.limiter.log(recorder, logging.WARNING, "overrun", "溢出 %d 次", 1))
+        self.assertFalse(self.limiter.log(recorder, logging.WARNING, "overrun", "溢出 %d 次", 2))
+        self.now = 10.0
+        self.assertTrue(self.limiter.log(recorder, logging.WARNING, "overrun", "溢出 %d 次", 3))
+        self.assertEqual(recorder.messages, ["溢出 1 次", "溢出 3 次（5 秒内省略了 1 条）"])
+
+    def test_is_enabled_for(self):
+        """测试级别检查，简单记录器没有 isEnabledFor() 时视为开启"""
+        logger = logging.getLogger("test_async_logging_level")
+        logger.setLevel(logging.INFO)
+        self.assertFalse(is_enabled_for(logger, logging.DEBUG))
+        self.assertTrue(is_enabled_for(logger, logging.INFO))
+        self.assertTrue(is_enabled_for(object(), logging.DEBUG))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+启动性能分析单元测试
+测试 -X importtime 输出的解析、与基线的比较，以及导入翻译模块时不会导入重量级依赖
+"""
+import os
+import unittest
+
+from src.utils.startup_profile import compare_to_baseline, heavy_imports, parse_importtime, profile_import
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+IMPORTTIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       150 |        150 |   _io
+import time:      2000 |       2500 |     torch._C
+import time:      3000 |       5500 |   torch
+import time:       400 |       6050 | src.core.translation
+Traceback (most recent call last):
+"""
+
+
+class TestStartupProfile(unittest.TestCase):
+    """启动性能分析的测试用例"""
+
+    def test_parse_importtime(self):
+        """测试解析每个模块的自身耗时、累计耗时和层级，忽略其他输出"""
+        entries = parse_importtime(IMPORTTIME_OUTPUT)
+        self.assertEqual([entry["module"] for entry in entries], ["_io", "torch._C", "torch", "src.core.translation"])
+        self.assertEqual([entry["depth"] for entry in entries], [1, 2, 1, 0])
+        self.assertEqual(entries[2]["self_ms"], 3.0)
+        self.assertEqual(entries[2]["cumulative_ms"], 5.5)
+        self.assertEqual(heavy_imports(entries), ["torch"])
+
+    def test_compare_to_baseline(self):
+        """测试耗时超过阈值、新导入了重量级依赖和导入失败算回退，测量噪声不算"""
+        baseline = {
+            "imports": {
+                "a": {"total_ms": 100.0, "heavy": []},
+                "b": {"total_ms": 1000.0, "heavy": []},
+                "c": {"total_ms": 10.0, "heavy": []},
+                "d": {"total_ms": 10.0, "heavy": []},
+            },
+            "window": {"window_ms": 800.0},
+        }
+        results = {
+            "imports": {
+                "a": {"total_ms": 140.0, "heavy": []},  # 增加量小于 MIN_REGRESSION_MS
+                "b": {"total_ms": 1300.0, "heavy": []},
+                "c": {"total_ms": 10.0, "heavy": ["torch"]},
+                "d": {"error": "ImportError"},
+            },
+            "window": {"window_ms": 900.0},
+        }
+        regressions = compare_to_baseline(results, baseline, threshold=0.25)
+        self.assertEqual([(item["module"], item["metric"]) for item in regressions],
+                         [("b", "total_ms"), ("c", "heavy"), ("d", "error")])
+
+        results["window"]["window_ms"] = 1100.0
+        self.assertIn(("window", "window_ms"),
+                      [(item["module"], item["metric"]) for item in compare_to_baseline(results, baseline)])
+
+    def test_translation_import_is_light(self):
+        """测试导入翻译模块时不导入 torch、transformers 等重量级依赖"""
+        result = profile_import("src.core.translation", cwd=PROJECT_ROOT, repeats=1)
+        self.assertNotIn("error", result)
+        self.assertEqual(result["heavy"], [])
+        self.assertGreater(result["modules"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+ASR 模型基准测试工具
+对 asr.models 中的每个识别模型，用同一组测试音频走流式识别和文件转录两条路径，
+输出实时率、首个部分结果延迟、最终结果延迟、内存峰值、加载时间和词错误率（JSON），不需要声卡和界面
+
+每个模型在单独的子进程中测试，内存峰值互不影响。测试集目录包含 WAV（或录音缓存）文件，
+参考文本放在 references.json（{"文件名": "参考文本"}）或与音频同名的 .txt 文件中。
+仓库中不包含测试集，需要用 --fixtures 或配置 asr.benchmark.fixtures_dir 指定自己准备的目录。
+
+用法:
+    python tools/benchmark_models.py --fixtures /data/asr_fixtures --output benchmark.json
+    python tools/benchmark_models.py --fixtures /data/asr_fixtures --models sherpa_0626_std sherpa_0626_int8
+    python tools/benchmark_models.py --fixtures /data/asr_fixtures --baseline benchmark_baseline.json  # 回退时退出码为 1
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.asr.benchmark import (DEFAULT_THRESHOLDS, benchmark_model, compare_to_baseline,  # noqa: E402
+                                    load_fixtures)
+
+
+def get_benchmark_config():
+    """
+    获取基准测试配置 asr.benchmark
+
+    Returns:
+        dict: 配置
+    """
+    from src.utils.config_manager import config_manager
+    config_manager.load_config()
+    return config_manager.get_config("asr", "benchmark", default={}) or {}
+
+
+def get_models(names=None):
+    """
+    获取要测试的识别模型：asr.models 中已启用的 Vosk 和 Sherpa-ONNX 模型
+
+    Args:
+        names: 指定的模型名称，None 表示全部
+
+    Returns:
+        list: 模型名称列表
+    """
+    from src.utils.config_manager import config_manager
+    models = config_manager.get_config("asr", "models", default={}) or {}
+    available = [name for name, config in models.items()
+                 if config.get("enabled", False) and name.startswith(("vosk", "sherpa"))]
+    if names:
+        return [name for name in names if name in available]
+    return available
+
+
+def run_worker(args):
+    """
+    子进程：测试一个模型，把结果写入 --worker-output
+
+    Args:
+        args: 命令行参数
+    """
+    from src.utils.config_manager import config_manager
+    config_manager.load_config()
+    # 关闭转录结果缓存和解码缓存，每次都实际识别和解码
+    config_manager.set_config(False, "asr", "transcript_cache", "enabled")
+    config_manager.set_config(False, "audio", "decoded_cache", "enabled")
+
+    from src.core.asr.model_manager import ASRModelManager
+    fixtures = load_fixtures(args.fixtures)
+    try:
+        result = benchmark_model(ASRModelManager(), args.worker, fixtures, args.sample_rate, args.block_size,
+                                 file_path=not args.streaming_only)
+    except Exception as e:
+        result = {"model": args.worker, "error": str(e)}
+    with open(args.worker_output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False)
+
+
+def run_model(args, model_name):
+    """
+    在子进程中测试一个模型
+
+    Args:
+        args: 命令行参数
+        model_name: 模型名称
+
+    Returns:
+        dict: 测试结果
+    """
+    fd, output = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    command = [
+        sys.executable, os.path.abspath(__file__), "--worker", model_name, "--worker-output", output,
+        "--fixtures", args.fixtures, "--sample-rate", str(args.sample_rate), "--block-size", str(args.block_size),
+    ]
+    if args.streaming_only:
+        command.append("--streaming-only")
+    try:
+        # 子进程的日志输出到 stderr，stdout 只输出最终的 JSON
+        subprocess.run(command, stdout=sys.stderr, timeout=args.timeout, check=False, cwd=os.getcwd())
+        with open(output, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except subprocess.TimeoutExpired:
+        return {"model": model_name, "error": f"超过 {args.timeout} 秒未完成"}
+    except (OSError, ValueError) as e:
+        return {"model": model_name, "error": f"子进程没有输出结果: {e}"}
+    finally:
+        if os.path.exists(output):
+            os.remove(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ASR 模型基准测试")
+    parser.add_argument("--fixtures", help="测试集目录（必需），默认为配置 asr.benchmark.fixtures_dir")
+    parser.add_argument("--models", nargs="+", help="要测试的模型，默认为 asr.models 中全部识别模型")
+    parser.add_argument("--sample-rate", type=int, default=16000, help="采样率")
+    parser.add_argument("--block-size", type=int, help="流式识别每块样本数，默认为配置 asr.benchmark.block_size")
+    parser.add_argument("--streaming-only", action="store_true", help="只测试流式识别路径")
+    parser.add_argument("--timeout", type=float, default=1800, help="每个模型的超时时间（秒）")
+    parser.add_argument("--output", help="结果 JSON 文件，默认输出到标准输出")
+    parser.add_argument("--baseline", help="基线结果 JSON 文件，超过回退阈值时退出码为 1")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # 加载配置时的输出不能混入标准输出的 JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        config = get_benchmark_config()
+    args.fixtures = args.fixtures or config.get("fixtures_dir")
+    if not args.fixtures:
+        print("没有指定测试集目录：请使用 --fixtures 或在配置 asr.benchmark.fixtures_dir 中设置", file=sys.stderr)
+        sys.exit(2)
+    args.block_size = args.block_size or int(config.get("block_size", 1600))
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    try:
+        fixtures = load_fixtures(args.fixtures)
+    except FileNotFoundError as e:
+        print(e, file=sys.stderr)
+        sys.exit(2)
+    if not fixtures:
+        print(f"测试集目录中没有音频文件: {args.fixtures}", file=sys.stderr)
+        sys.exit(2)
+
+    results = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "host": platform.node(),
+        "fixtures": [fixture["name"] for fixture in fixtures],
+        "block_size": args.block_size,
+        "models": {},
+    }
+    for model_name in get_models(args.models):
+        print(f"测试模型: {model_name}", file=sys.stderr)
+        results["models"][model_name] = run_model(args, model_name)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        thresholds = dict(DEFAULT_THRESHOLDS)
+        thresholds.update(config.get("thresholds") or {})
+        results["regressions"] = compare_to_baseline(results, baseline, thresholds)
+        for regression in results["regressions"]:
+            print(f"回退: {regression['model']} {regression['metric']} "
+                  f"{regression['baseline']} -> {regression['current']} (上限 {regression['limit']})", file=sys.stderr)
+        exit_code = 1 if results["regressions"] else 0
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
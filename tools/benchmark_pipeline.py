@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+转录流水线性能测试工具
+不需要声卡：用合成音频或 WAV/录音缓存文件驱动完整的 AudioWorker 流水线
+（捕获线程 → 环形缓冲区 → VAD → 识别器），报告各阶段耗时、RTF 和丢弃的块数
+
+用法:
+    python tools/benchmark_pipeline.py                               # 合成音频，模拟识别器，不限速
+    python tools/benchmark_pipeline.py --file test.wav --speed 4     # 以 4 倍速回放 WAV 文件
+    python tools/benchmark_pipeline.py --decode-rtf 1.5              # 模拟比实时慢的识别器，观察丢块
+    python tools/benchmark_pipeline.py --speed 1 --decode-rtf 1.5 --backpressure --fallback-decode-rtf 0.3
+    python tools/benchmark_pipeline.py --vosk-model models/vosk-small --file test.wav
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.audio.audio_processor import AudioWorker  # noqa: E402
+from src.core.audio.audio_source import FileAudioSource, SyntheticAudioSource  # noqa: E402
+
+
+class SimulatedRecognizer:
+    """模拟识别器：按设定的实时率消耗时间，每秒音频产生一条完整结果
+
+    接口与 SherpaOnnxASR 一致：结果是纯文本，完整结果已格式化，没有结果时返回空字符串
+    """
+
+    engine_type = "sherpa_onnx"
+
+    def __init__(self, sample_rate, decode_rtf):
+        """
+        初始化模拟识别器
+
+        Args:
+            sample_rate: 采样率
+            decode_rtf: 识别耗时与音频时长之比
+        """
+        self.sample_rate = sample_rate
+        self.decode_rtf = decode_rtf
+        self.frames = 0
+        self.sentences = 0
+
+    def AcceptWaveform(self, data):
+        if self.decode_rtf:
+            time.sleep(len(data) / self.sample_rate * self.decode_rtf)
+        self.frames += len(data)
+        if self.frames >= self.sample_rate:
+            self.frames -= self.sample_rate
+            self.sentences += 1
+            return True
+        return False
+
+    def Result(self):
+        return f"Sentence {self.sentences}."
+
+    def PartialResult(self):
+        return f"sentence {self.sentences + 1}" if self.frames else ""
+
+    def FinalResult(self):
+        # 取出当前句子剩余的音频的结果，之后从新的句子开始
+        if not self.frames:
+            return ""
+        self.frames = 0
+        self.sentences += 1
+        return f"Sentence {self.sentences}."
+
+    def Reset(self):
+        self.frames = 0
+
+
+def create_recognizer(args):
+    """
+    根据命令行参数创建识别器
+
+    Args:
+        args: 命令行参数
+
+    Returns:
+        识别器实例
+    """
+    if args.vosk_model:
+        from vosk import Model, KaldiRecognizer
+        recognizer = KaldiRecognizer(Model(args.vosk_model), args.sample_rate)
+        recognizer.engine_type = "vosk"
+        return recognizer
+    return SimulatedRecognizer(args.sample_rate, args.decode_rtf)
+
+
+def create_source(args):
+    """
+    根据命令行参数创建音频源
+
+    Args:
+        args: 命令行参数
+
+    Returns:
+        AudioSource: 音频源
+    """
+    speed = args.speed or None
+    if args.file:
+        return FileAudioSource(args.file, speed=speed)
+
+    # 语音（正弦音加少量噪声）与静音交替，直到达到设定时长
+    segments = []
+    while sum(segment["seconds"] for segment in segments) < args.seconds:
+        segments.append({"type": "tone", "frequency": 220.0, "amplitude": 0.3, "seconds": args.speech_seconds})
+        segments.append({"type": "noise", "amplitude": 0.001, "seconds": args.silence_seconds})
+    return SyntheticAudioSource(segments, speed=speed)
+
+
+def run_benchmark(args):
+    """
+    运行一次流水线测试
+
+    Args:
+        args: 命令行参数
+
+    Returns:
+        dict: 测试结果
+    """
+    recognizer = create_recognizer(args)
+    source = create_source(args)
+    if args.fallback_decode_rtf is not None:
+        def fallback_factory():
+            return SimulatedRecognizer(args.sample_rate, args.fallback_decode_rtf)
+    else:
+        fallback_factory = None
+    worker = AudioWorker(
+        source, args.sample_rate, args.block_size, recognizer,
+        ring_buffer_seconds=args.ring_seconds,
+        vad_config={"enabled": not args.no_vad},
+        adaptive_block_config={"enabled": args.adaptive_block},
+        backpressure_config={"enabled": args.backpressure},
+        fallback_recognizer_factory=fallback_factory
+    )
+    texts = []
+    worker.new_text.connect(texts.append)
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    worker.process()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    stats = worker.get_capture_stats()
+    audio_seconds = stats.get("total_written", 0) / args.sample_rate
+    decode = stats["stages"]["decode"]
+    return {
+        "source": source.name,
+        "speed": args.speed or "unthrottled",
+        "audio_seconds": audio_seconds,
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        "pipeline_rtf": wall / audio_seconds if audio_seconds else 0.0,
+        "decode_rtf": decode["count"] and decode["mean_ms"] * decode["count"] / 1000 / audio_seconds,
+        "overruns": stats.get("overruns", 0),
+        "dropped_frames": stats.get("dropped_frames", 0),
+        "dropped_blocks": stats.get("dropped_blocks", 0),
+        "high_water_ms": stats.get("high_water_mark", 0) * 1000 / args.sample_rate,
+        "final_results": sum(1 for text in texts if not text.startswith("PARTIAL:")),
+        "partial_results": sum(1 for text in texts if text.startswith("PARTIAL:")),
+        "backpressure": stats.get("backpressure"),
+        "stages": stats["stages"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="转录流水线性能测试")
+    parser.add_argument("--file", help="WAV 文件或录音缓存文件，不提供时使用合成音频")
+    parser.add_argument("--seconds", type=float, default=60.0, help="合成音频时长（秒）")
+    parser.add_argument("--speech-seconds", type=float, default=2.0, help="合成音频中每段语音的时长（秒）")
+    parser.add_argument("--silence-seconds", type=float, default=1.0, help="合成音频中每段静音的时长（秒）")
+    parser.add_argument("--speed", type=float, default=0, help="回放速度倍数，0 表示不限速")
+    parser.add_argument("--sample-rate", type=int, default=16000, help="采样率")
+    parser.add_argument("--block-size", type=int, default=4000, help="块大小（样本数）")
+    parser.add_argument("--ring-seconds", type=float, default=2.0, help="环形缓冲区时长（秒）")
+    parser.add_argument("--decode-rtf", type=float, default=0.05, help="模拟识别器的实时率")
+    parser.add_argument("--vosk-model", help="使用真实的 Vosk 模型代替模拟识别器")
+    parser.add_argument("--no-vad", action="store_true", help="关闭语音活动检测")
+    parser.add_argument("--adaptive-block", action="store_true", help="启用自适应块大小")
+    parser.add_argument("--backpressure", action="store_true", help="启用背压降级")
+    parser.add_argument("--fallback-decode-rtf", type=float, help="降级时切换到的模拟备用识别器的实时率")
+    parser.add_argument("--json", action="store_true", help="以JSON格式输出")
+    args = parser.parse_args()
+
+    result = run_benchmark(args)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return
+
+    for key, value in result.items():
+        if key in ("stages", "backpressure"):
+            continue
+        print(f"{key}: {value:.6g}" if isinstance(value, float) else f"{key}: {value}")
+    print("stages:")
+    for name, stage in result["stages"].items():
+        print(f"  {name}: count={stage['count']} mean={stage['mean_ms']:.3f}ms "
+              f"p50={stage['p50_ms']:.3f}ms p95={stage['p95_ms']:.3f}ms max={stage['max_ms']:.3f}ms")
+    backpressure = result["backpressure"]
+    if backpressure:
+        print(f"backpressure: level={backpressure['level_name']} transitions={backpressure['transitions']} "
+              f"max_queue={backpressure['max_queue_seconds']:.3f}s")
+        print(f"  seconds_in_level: {backpressure['seconds_in_level']}")
+        print(f"  actions: {backpressure['actions']}")
+        for event in backpressure["events"]:
+            print(f"  {event['from']} -> {event['to']} (queue {event['queue_seconds']:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
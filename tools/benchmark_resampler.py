@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+重采样性能测试工具
+比较多相重采样器与音频后端重采样的 CPU 开销
+
+用法:
+    python tools/benchmark_resampler.py                     # 仅测试多相重采样器
+    python tools/benchmark_resampler.py --device <设备ID>   # 同时对比音频后端的实时录音开销
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 添加项目根目录到sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.audio.resampler import PolyphaseResampler  # noqa: E402
+
+
+def benchmark_polyphase(input_rate, output_rate, seconds, block_size, taps_per_phase):
+    """
+    测试多相重采样器按块处理合成音频的性能
+
+    Args:
+        input_rate: 输入采样率
+        output_rate: 输出采样率
+        seconds: 测试音频时长（秒）
+        block_size: 每块输出样本数（与 AudioWorker 的 buffer_size 对应）
+        taps_per_phase: 每个相位的滤波器阶数
+
+    Returns:
+        dict: 测试结果
+    """
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(int(seconds * input_rate)) * 0.1).astype(np.float32)
+    input_block = int(np.ceil(block_size * input_rate / output_rate))
+
+    resampler = PolyphaseResampler(input_rate, output_rate, taps_per_phase=taps_per_phase)
+    outputs = []
+    block_times = []
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for i in range(0, len(audio), input_block):
+        t0 = time.perf_counter()
+        outputs.append(resampler.process(audio[i:i + input_block]))
+        block_times.append(time.perf_counter() - t0)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    output = np.concatenate(outputs)
+
+    # 一次性处理的结果应与分块处理逐位相同
+    reference = PolyphaseResampler(input_rate, output_rate, taps_per_phase=taps_per_phase).process(audio)
+
+    result = {
+        "path": "polyphase",
+        "input_rate": input_rate,
+        "output_rate": output_rate,
+        "taps_per_phase": taps_per_phase,
+        "audio_seconds": seconds,
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        "rtf": wall / seconds,
+        "block_ms_p50": float(np.percentile(block_times, 50) * 1000),
+        "block_ms_p99": float(np.percentile(block_times, 99) * 1000),
+        "bit_exact_across_blocks": bool(np.array_equal(output, reference)),
+        "delay_ms": resampler.delay / output_rate * 1000,
+    }
+
+    # 通带增益（1 kHz 正弦）与混叠抑制（0.75 倍输入奈奎斯特频率的正弦，高于输出奈奎斯特频率）
+    t = np.arange(input_rate) / input_rate
+    for name, frequency in (("passband_gain_db", 1000.0), ("alias_rejection_db", 0.75 * input_rate / 2)):
+        tone = np.sin(2 * np.pi * frequency * t).astype(np.float32)
+        tone_output = PolyphaseResampler(input_rate, output_rate, taps_per_phase=taps_per_phase).process(tone)
+        amplitude = np.sqrt(2) * np.std(tone_output[len(tone_output) // 10:])
+        result[name] = float(20 * np.log10(amplitude + 1e-12))
+
+    # 如果安装了 SciPy，记录 resample_poly 一次性处理的耗时（仅作参考）
+    try:
+        from scipy.signal import resample_poly
+        scipy_start = time.perf_counter()
+        resample_poly(audio, resampler.up, resampler.down)
+        result["scipy_resample_poly_seconds"] = time.perf_counter() - scipy_start
+    except ImportError:
+        pass
+
+    return result
+
+
+def benchmark_backend(device_id, input_rate, output_rate, seconds, block_size):
+    """
+    对比实时录音时两条路径的 CPU 开销：
+    音频后端直接输出 output_rate，以及以 input_rate 录音后由多相重采样器转换
+
+    Args:
+        device_id: 音频设备ID
+        input_rate: 设备原生采样率
+        output_rate: 模型采样率
+        seconds: 每条路径的录音时长（秒）
+        block_size: 每块输出样本数
+
+    Returns:
+        list: 两条路径的测试结果
+    """
+    import soundcard as sc
+
+    results = []
+    for path in ("backend", "polyphase"):
+        rate = output_rate if path == "backend" else input_rate
+        frames = block_size if path == "backend" else int(np.ceil(block_size * input_rate / output_rate))
+        resampler = PolyphaseResampler(input_rate, output_rate) if path == "polyphase" else None
+
+        mic = sc.get_microphone(id=str(device_id), include_loopback=True)
+        produced = 0
+        cpu_start = time.process_time()
+        with mic.recorder(samplerate=rate) as recorder:
+            while produced < seconds * output_rate:
+                data = recorder.record(numframes=frames)
+                data = np.mean(data, axis=1) if data.ndim > 1 else data
+                if resampler:
+                    data = resampler.process(data)
+                produced += len(data)
+        cpu = time.process_time() - cpu_start
+        results.append({
+            "path": path,
+            "capture_rate": rate,
+            "audio_seconds": produced / output_rate,
+            "cpu_seconds": cpu,
+            "cpu_per_audio_second": cpu / (produced / output_rate),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="重采样性能测试")
+    parser.add_argument("--rates", type=int, nargs="+", default=[48000, 44100], help="输入采样率列表")
+    parser.add_argument("--output-rate", type=int, default=16000, help="输出采样率")
+    parser.add_argument("--seconds", type=float, default=30.0, help="合成音频时长（秒）")
+    parser.add_argument("--block-size", type=int, default=4000, help="每块输出样本数")
+    parser.add_argument("--taps", type=int, default=32, help="每个相位的滤波器阶数")
+    parser.add_argument("--device", help="音频设备ID，提供时对比音频后端的实时录音开销")
+    parser.add_argument("--device-seconds", type=float, default=10.0, help="实时录音时长（秒）")
+    parser.add_argument("--json", action="store_true", help="以JSON格式输出")
+    args = parser.parse_args()
+
+    results = [
+        benchmark_polyphase(rate, args.output_rate, args.seconds, args.block_size, args.taps)
+        for rate in args.rates
+    ]
+    if args.device:
+        try:
+            results.extend(benchmark_backend(args.device, args.rates[0], args.output_rate,
+                                             args.device_seconds, args.block_size))
+        except Exception as e:
+            print(f"音频后端测试失败: {e}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+
+    for result in results:
+        print(f"[{result['path']}]")
+        for key, value in result.items():
+            if key == "path":
+                continue
+            print(f"  {key}: {value:.6g}" if isinstance(value, float) else f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
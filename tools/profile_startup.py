@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+启动性能分析工具
+在新的子进程中用 python -X importtime 导入启动时用到的模块，输出导入耗时、自身耗时最长的模块、
+是否导入了重量级依赖（torch、transformers 等），以及主窗口显示出来所需的时间（JSON）
+
+用法:
+    python tools/profile_startup.py --output startup.json
+    python tools/profile_startup.py --modules src.core.translation src.ui.main_window --top 20
+    python tools/profile_startup.py --window --baseline startup_baseline.json   # 超过回退阈值时退出码为 1
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.startup_profile import DEFAULT_THRESHOLD, compare_to_baseline, profile_startup  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动性能分析")
+    parser.add_argument("--modules", nargs="+", help="要测量的模块，默认为启动时导入的模块")
+    parser.add_argument("--repeats", type=int, default=3, help="每个模块的测量次数（取最快的一次）")
+    parser.add_argument("--top", type=int, default=10, help="每个模块输出自身耗时最长的模块数")
+    parser.add_argument("--window", action="store_true", help="同时测量主窗口显示出来所需的时间")
+    parser.add_argument("--timeout", type=float, default=120, help="每次测量的超时时间（秒）")
+    parser.add_argument("--output", help="结果 JSON 文件，默认输出到标准输出")
+    parser.add_argument("--baseline", help="基线结果 JSON 文件，超过回退阈值时退出码为 1")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="允许的耗时增加比例")
+    args = parser.parse_args()
+
+    results = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "host": platform.node(),
+        "python": platform.python_version(),
+    }
+    results.update(profile_startup(args.modules, str(project_root), args.repeats, args.top, args.window,
+                                   args.timeout))
+    for module, result in results["imports"].items():
+        if result.get("error"):
+            print(f"{module}: 导入失败 {result['error']}", file=sys.stderr)
+        else:
+            heavy = f"，导入了 {', '.join(result['heavy'])}" if result["heavy"] else ""
+            print(f"{module}: {result['total_ms']:.1f} ms{heavy}", file=sys.stderr)
+    if "window" in results:
+        window = results["window"]
+        print(f"主窗口: {window['window_ms']:.1f} ms" if "window_ms" in window else f"主窗口: {window['error']}",
+              file=sys.stderr)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        results["regressions"] = compare_to_baseline(results, baseline, args.threshold)
+        for regression in results["regressions"]:
+            print(f"回退: {regression['module']} {regression['metric']} "
+                  f"{regression['baseline']} -> {regression['current']} (上限 {regression['limit']})", file=sys.stderr)
+        exit_code = 1 if results["regressions"] else 0
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+模型运行时自动调优工具
+用回放音频（WAV/录音缓存文件，或合成音频）依次测试不同的线程数，选出本机最合适的 num_threads，
+可写回 config/config.json 的 asr.models.<模型>.config.runtime
+
+用法:
+    python tools/tune_runtime.py --model sherpa_0626_std --file fixtures/meeting.wav
+    python tools/tune_runtime.py --model sherpa_0626_int8 --threads 1 2 4 8 --repeats 5
+    python tools/tune_runtime.py --model sherpa_0626_std --file a.wav --file b.wav --write
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 添加项目根目录到sys.path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.audio.audio_source import FileAudioSource, SyntheticAudioSource, read_source_audio  # noqa: E402
+from src.core.asr.runtime_config import (default_thread_counts, get_model_runtime, save_model_runtime,  # noqa: E402
+                                         tune_num_threads)
+
+
+def load_audio(args):
+    """
+    根据命令行参数读取调优用的音频
+
+    Args:
+        args: 命令行参数
+
+    Returns:
+        np.ndarray: 单声道 float32 音频
+    """
+    if args.file:
+        return np.concatenate([read_source_audio(FileAudioSource(path, speed=None), args.sample_rate)
+                               for path in args.file])
+    # 语音（正弦音加少量噪声）与静音交替
+    segments = []
+    while sum(segment["seconds"] for segment in segments) < args.seconds:
+        segments.append({"type": "tone", "frequency": 220.0, "amplitude": 0.3, "seconds": 2.0})
+        segments.append({"type": "noise", "amplitude": 0.001, "seconds": 1.0})
+    return read_source_audio(SyntheticAudioSource(segments, speed=None), args.sample_rate)
+
+
+def get_recognizer_kwargs(model_name):
+    """
+    按配置创建一次模型引擎，得到创建识别器的参数
+
+    Args:
+        model_name: 模型名称
+
+    Returns:
+        dict: OnlineRecognizer.from_transducer 的关键字参数，失败时返回 None
+    """
+    from src.utils.config_manager import config_manager
+    from src.core.asr.model_manager import ASRModelManager
+
+    model_config = config_manager.get_model_config(model_name)
+    if not model_config or not model_name.startswith("sherpa"):
+        print(f"模型 {model_name} 不存在或不是 Sherpa-ONNX 模型")
+        return None
+    engine = ASRModelManager().create_model_recognizer(model_name)
+    if engine is None:
+        return None
+    kwargs = engine._recognizer_kwargs()
+    # 调优时逐个创建识别器，先释放这个引擎占用的模型内存
+    from src.core.asr.recognizer_pool import get_recognizer_pool
+    engine._release_recognizer()
+    get_recognizer_pool().clear()
+    return kwargs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模型运行时自动调优")
+    parser.add_argument("--model", required=True, help="模型名称（asr.models 中的键）")
+    parser.add_argument("--file", action="append", help="回放用的 WAV 文件或录音缓存文件，可指定多个")
+    parser.add_argument("--seconds", type=float, default=30.0, help="不提供文件时合成音频的时长（秒）")
+    parser.add_argument("--sample-rate", type=int, default=16000, help="采样率")
+    parser.add_argument("--threads", type=int, nargs="+", help="尝试的线程数，默认为 1、2、4 …… 直到 CPU 核数")
+    parser.add_argument("--repeats", type=int, default=3, help="每个线程数的测量次数")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="允许比最快结果慢的比例")
+    parser.add_argument("--write", action="store_true", help="把选出的线程数写回配置文件")
+    parser.add_argument("--json", action="store_true", help="以JSON格式输出")
+    args = parser.parse_args()
+
+    from src.utils.config_manager import config_manager
+    config_manager.load_config()
+
+    kwargs = get_recognizer_kwargs(args.model)
+    if kwargs is None:
+        sys.exit(1)
+    audio = load_audio(args)
+    if len(audio) == 0:
+        print("没有可用于调优的音频")
+        sys.exit(1)
+
+    from src.core.asr.recognizer_pool import create_transducer
+    result = tune_num_threads(
+        lambda num_threads: create_transducer(**dict(kwargs, num_threads=num_threads)),
+        audio, args.threads or default_thread_counts(), args.sample_rate, args.repeats, args.tolerance
+    )
+    result["model"] = args.model
+    result["audio_seconds"] = len(audio) / args.sample_rate
+
+    if args.write:
+        runtime = get_model_runtime(args.model)
+        runtime["num_threads"] = result["best"]
+        runtime["tuned"] = {
+            "rtf": next(item["rtf"] for item in result["results"] if item["num_threads"] == result["best"]),
+            "audio_seconds": result["audio_seconds"],
+            "host": platform.node(),
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        result["written"] = save_model_runtime(args.model, runtime)
+
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return
+
+    print(f"model: {args.model}")
+    print(f"audio_seconds: {result['audio_seconds']:.1f}")
+    for item in result["results"]:
+        marker = " *" if item["num_threads"] == result["best"] else ""
+        print(f"  num_threads={item['num_threads']}: rtf={item['rtf']:.4f}{marker}")
+    print(f"best num_threads: {result['best']}")
+    if args.write:
+        print("已写回配置文件" if result["written"] else "写回配置文件失败")
+
+
+if __name__ == "__main__":
+    main()